@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多电梯货物分配优化
+决定每件货物由哪部电梯运送及运送顺序，使整体完工时间（最大电梯负荷）最短
+"""
+
+import random
+import time
+
+from move_simulator import feasibility_matrix, trip_duration
+
+
+class Assignment:
+    """分配结果"""
+
+    def __init__(self, sequences, loads, unassigned, lower_bound, moves):
+        self.sequences = sequences  # 每部电梯依次运送的货物下标
+        self.loads = loads  # 每部电梯累计运行时长(秒)
+        self.unassigned = unassigned  # 无电梯可运送的货物下标
+        self.lower_bound = lower_bound  # 完工时间下界
+        self.moves = moves  # 局部搜索接受的改进次数
+
+    @property
+    def makespan(self):
+        return max(self.loads) if self.loads else 0.0
+
+    @property
+    def gap(self):
+        """与下界的相对差距(%)"""
+        if self.lower_bound <= 0:
+            return 0.0
+        return (self.makespan - self.lower_bound) / self.lower_bound * 100
+
+
+class _CabBins:
+    """每部电梯的货物集合，支持 O(1) 增删和增量负荷更新"""
+
+    def __init__(self, cab_count):
+        self.items = [[] for _ in range(cab_count)]
+        self.loads = [0.0] * cab_count
+        self.owner = {}
+        self.slot = {}
+
+    def add(self, item, cab, duration):
+        self.slot[item] = len(self.items[cab])
+        self.items[cab].append(item)
+        self.owner[item] = cab
+        self.loads[cab] += duration
+
+    def remove(self, item, duration):
+        cab = self.owner.pop(item)
+        members = self.items[cab]
+        index = self.slot.pop(item)
+        last = members.pop()
+        if last != item:
+            members[index] = last
+            self.slot[last] = index
+        self.loads[cab] -= duration
+        return cab
+
+
+def _durations(cabs, items, feasibility):
+    """每件货物可用电梯及对应往返耗时 {电梯下标: 耗时}"""
+    durations = [dict() for _ in items]
+    for cab_index, feasible in enumerate(feasibility):
+        cab = cabs[cab_index]
+        for item_index in feasible:
+            durations[item_index][cab_index] = trip_duration(cab, items[item_index])
+    return durations
+
+
+def greedy_lpt(durations, cab_count):
+    """LPT 贪心：按最短可用耗时从长到短，依次放到完工最早的可用电梯"""
+    bins = _CabBins(cab_count)
+    order = sorted((i for i, d in enumerate(durations) if d),
+                   key=lambda i: min(durations[i].values()), reverse=True)
+    for item in order:
+        options = durations[item]
+        cab = min(options, key=lambda c: (bins.loads[c] + options[c], bins.loads[c]))
+        bins.add(item, cab, options[cab])
+    return bins
+
+
+def _improve_bottleneck(bins, durations, rng, deadline=None, eps=1e-9):
+    """
+    尝试一次降低瓶颈电梯负荷的移动或交换，成功返回 True
+
+    交换搜索为 O(n²)，每检查一批候选就对照 deadline，超时按未找到改进返回 False
+    """
+    loads = bins.loads
+    bottleneck = max(range(len(loads)), key=loads.__getitem__)
+    peak = loads[bottleneck]
+    candidates = list(bins.items[bottleneck])
+    rng.shuffle(candidates)
+
+    # 移动：把瓶颈电梯上的一件货物挪到其他电梯
+    for item in candidates:
+        options = durations[item]
+        own = options[bottleneck]
+        for cab, duration in options.items():
+            if cab != bottleneck and loads[cab] + duration < peak - eps:
+                bins.remove(item, own)
+                bins.add(item, cab, duration)
+                return True
+
+    # 交换：与其他电梯上耗时更短的货物互换
+    for item in candidates:
+        options = durations[item]
+        own = options[bottleneck]
+        for cab, duration in options.items():
+            if cab == bottleneck:
+                continue
+            for checked, other in enumerate(bins.items[cab]):
+                if deadline is not None and checked % 256 == 0 and time.perf_counter() >= deadline:
+                    return False
+                other_options = durations[other]
+                back = other_options.get(bottleneck)
+                if back is None or back >= own - eps:
+                    continue
+                new_peak = max(peak - own + back, loads[cab] - other_options[cab] + duration)
+                if new_peak < peak - eps:
+                    bins.remove(item, own)
+                    bins.remove(other, other_options[cab])
+                    bins.add(item, cab, duration)
+                    bins.add(other, bottleneck, back)
+                    return True
+    return False
+
+
+def optimize_assignment(cabs, items, time_limit=1.0, calculator=None, seed=0, feasibility=None):
+    """
+    计算货物到电梯的分配方案
+
+    参数:
+    - cabs: CabSpec 列表
+    - items: MoveItem 列表
+    - time_limit: 局部搜索时间上限(秒)
+    - feasibility: 预先计算的可行性矩阵（可选，默认用 ElevatorCalculator 计算）
+
+    返回:
+    - Assignment，每部电梯内按耗时从短到长排序以降低平均完成时间
+    """
+    if feasibility is None:
+        feasibility = feasibility_matrix(cabs, items, calculator)
+    durations = _durations(cabs, items, feasibility)
+    unassigned = [i for i, d in enumerate(durations) if not d]
+
+    bins = greedy_lpt(durations, len(cabs))
+
+    deadline = time.perf_counter() + time_limit
+    rng = random.Random(seed)
+    moves = 0
+    while time.perf_counter() < deadline and _improve_bottleneck(bins, durations, rng, deadline):
+        moves += 1
+
+    fastest = [min(d.values()) for d in durations if d]
+    lower_bound = max(max(fastest, default=0.0), sum(fastest) / len(cabs) if cabs else 0.0)
+    sequences = []
+    for cab_index, members in enumerate(bins.items):
+        sequences.append(sorted(members, key=lambda i: (durations[i][cab_index], i)))
+    return Assignment(sequences, list(bins.loads), unassigned, lower_bound, moves)
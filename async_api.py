@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步评估接口
+供 asyncio 服务调用：小请求在事件循环内逐条计算并让出，大批量请求分块交给进程池（计算器不可序列化时
+退回线程池），限制并发块数，按完成顺序以异步迭代器流式返回，支持取消和超时
+"""
+
+import asyncio
+import atexit
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from elevator_calculator import ElevatorCalculator
+
+
+def _check_chunk(calculator, start, chunk):
+    """在执行器中评估一个分块，返回 [(下标, 结果), ...]（模块级函数以便进程池序列化）"""
+    return [(start + offset, calculator.check_elevator_capacity(*request))
+            for offset, request in enumerate(chunk)]
+
+
+def _picklable(calculator):
+    """计算器能否序列化后交给进程池（例如实例上挂了 lambda 时不能）"""
+    try:
+        pickle.dumps(calculator)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+    return True
+
+
+class AsyncElevatorService:
+    """
+    异步电梯装载评估服务
+
+    用法:
+        async with AsyncElevatorService(max_concurrency=4) as service:
+            result = await service.acheck(elevator_specs, cargo_specs, 2)
+            async for index, result in service.acheck_many(requests, timeout=5):
+                ...
+
+    参数:
+    - inline_threshold: 请求数不超过该值时直接在事件循环内计算，每条之后让出一次
+    - chunk_size: 大批量请求每个分块的条数，决定事件循环让出的粒度
+    - max_concurrency: 同时在执行器中运行的分块数上限
+    - use_processes: 是否使用进程池；默认 None 表示计算器可序列化时使用进程池，否则退回线程池
+    - executor: 外部传入的执行器（不会被 close 关闭）
+
+    注意：评估是纯 Python 计算，线程池中的分块与事件循环争用 GIL，大批量评估期间事件循环的响应会变慢
+    （每次切换间隔约 5ms），因此默认使用进程池；进程池的工作进程在首次提交时才启动。
+    无论哪种执行器，每产出一个分块的结果后都会让出一次事件循环
+    """
+
+    def __init__(self, calculator=None, inline_threshold=64, chunk_size=64, max_concurrency=4,
+                 use_processes=None, executor=None):
+        self.calculator = calculator or ElevatorCalculator()
+        self.inline_threshold = inline_threshold
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self._owns_executor = executor is None
+        if executor is None:
+            if use_processes is None:
+                use_processes = _picklable(self.calculator)
+            pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            executor = pool(max_workers=max_concurrency)
+        self.executor = executor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """关闭服务自建的执行器"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+    async def acheck(self, elevator_specs, cargo_specs, num_people=1):
+        """单条评估：计算量在微秒级，直接在事件循环内完成"""
+        return self.calculator.check_elevator_capacity(elevator_specs, cargo_specs, num_people)
+
+    async def acheck_many(self, requests, timeout=None):
+        """
+        批量评估 [(电梯规格, 货物规格, 人数), ...]，按完成顺序异步产出 (下标, 结果)
+
+        超过 timeout 秒未全部完成时取消剩余分块并抛出 asyncio.TimeoutError（内联计算时逐条检查）；
+        调用方提前停止迭代或所在任务被取消时，尚未开始的分块同样被取消
+        """
+        requests = list(requests)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        if len(requests) <= self.inline_threshold:
+            for index, request in enumerate(requests):
+                if deadline is not None and loop.time() >= deadline:
+                    raise asyncio.TimeoutError()
+                yield index, self.calculator.check_elevator_capacity(*request)
+                await asyncio.sleep(0)
+            return
+
+        chunks = [(start, requests[start:start + self.chunk_size])
+                  for start in range(0, len(requests), self.chunk_size)]
+        chunks.reverse()  # 从末尾弹出，按原顺序提交
+        pending = set()
+        try:
+            while chunks or pending:
+                while chunks and len(pending) < self.max_concurrency:
+                    start, chunk = chunks.pop()
+                    pending.add(loop.run_in_executor(self.executor, _check_chunk, self.calculator, start, chunk))
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError()
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise asyncio.TimeoutError()
+                for future in done:
+                    for item in future.result():
+                        yield item
+                    await asyncio.sleep(0)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+_default_service = None
+
+
+def _service():
+    global _default_service
+    if _default_service is None:
+        _default_service = AsyncElevatorService()
+        atexit.register(close_default_service)
+    return _default_service
+
+
+def close_default_service():
+    """关闭 acheck / acheck_many 使用的默认服务（进程退出时自动调用），之后再调用会重新创建"""
+    global _default_service
+    service, _default_service = _default_service, None
+    if service is not None:
+        service.close()
+        atexit.unregister(close_default_service)
+
+
+async def acheck(elevator_specs, cargo_specs, num_people=1):
+    """使用默认服务的单条异步评估"""
+    return await _service().acheck(elevator_specs, cargo_specs, num_people)
+
+
+def acheck_many(requests, timeout=None):
+    """使用默认服务的批量异步评估，返回异步迭代器"""
+    return _service().acheck_many(requests, timeout)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可续跑的分片审计任务
+对二进制货物目录中的每个 SKU 与电梯目录中的每个轿厢逐一评估，按 SKU 区间切分为确定性分片，
+由多个工作进程并行计算；每个分片写入独立的列式结果文件，完成后记入检查点，
+任务中断（内存不足、节点重启）后重新运行只计算未完成的分片，最后按分片顺序合并为一个结果文件
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from binary_catalog import Catalog
+from elevator_calculator import ElevatorCalculator
+from result_cache import rule_fingerprint
+from result_columns import ResultWriter, merge_results
+
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_NAME = 'checkpoint.json'
+
+
+def _file_identity(path):
+    """目录文件的身份：路径、大小和修改时间（重启后不变，文件被替换则变化）"""
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def _run_shard(calculator, cargo_path, elevator_path, num_people, shard, start, stop, out_path):
+    """
+    子进程入口：评估一个分片并原子地写出结果文件
+
+    请求编号 = SKU 下标 × 轿厢数 + 轿厢下标，与分片方式无关
+    """
+    began = time.perf_counter()
+    tmp_path = f"{out_path}.tmp"
+    if os.path.exists(tmp_path):  # 上次中断留下的半成品
+        os.remove(tmp_path)
+    loadable = 0
+    with Catalog(cargo_path) as cargo, Catalog(elevator_path) as elevators:
+        cabs = list(elevators.specs())
+        with ResultWriter(tmp_path, background=False) as writer:
+            request = start * len(cabs)
+            for cargo_specs in cargo.specs(start, stop):
+                for elevator_specs in cabs:
+                    result = calculator.check_elevator_capacity(elevator_specs, cargo_specs, num_people)
+                    writer.write(result, request)
+                    loadable += result['can_load']
+                    request += 1
+    os.replace(tmp_path, out_path)
+    return shard, request - start * len(cabs), loadable, time.perf_counter() - began
+
+
+class Progress:
+    """按各分片吞吐量估算的进度和剩余时间"""
+
+    def __init__(self, total_shards, total_rows, workers):
+        self.total_shards = total_shards
+        self.total_rows = total_rows
+        self.workers = workers
+        self.done_shards = 0
+        self.done_rows = 0
+        self.loadable = 0
+        self._rows = 0  # 本次运行完成的行数和分片耗时，用于估算吞吐量
+        self._seconds = 0.0
+
+    def skip(self, rows, loadable):
+        """记入检查点中已完成的分片（不参与吞吐量估算）"""
+        self.done_shards += 1
+        self.done_rows += rows
+        self.loadable += loadable
+
+    def update(self, rows, loadable, seconds):
+        self.skip(rows, loadable)
+        self._rows += rows
+        self._seconds += seconds
+
+    @property
+    def throughput(self):
+        """所有工作进程合计的每秒评估行数（单分片吞吐量 × 进程数）"""
+        return self._rows / self._seconds * self.workers if self._seconds > 0 else 0.0
+
+    @property
+    def eta(self):
+        """预计剩余秒数，尚无本次完成的分片时为 None"""
+        rate = self.throughput
+        return (self.total_rows - self.done_rows) / rate if rate > 0 else None
+
+    def __str__(self):
+        eta = self.eta
+        eta_text = '--:--' if eta is None else f"{int(eta) // 60}:{int(eta) % 60:02d}"
+        return (f"分片 {self.done_shards}/{self.total_shards}  行 {self.done_rows}/{self.total_rows}  "
+                f"{self.throughput:,.0f} 行/秒  预计剩余 {eta_text}")
+
+
+class AuditJob:
+    """
+    货物目录 × 电梯目录 的分片审计任务
+
+    参数:
+    - cargo_path / elevator_path: binary_catalog.py 生成的货物目录和电梯目录
+    - out_dir: 分片结果和检查点所在目录
+    - shard_size: 每个分片包含的 SKU 数
+
+    检查点记录任务参数（目录文件身份、人数、分片大小、规则指纹）和已完成分片；
+    参数不一致时拒绝续跑，避免把不同任务的分片混在一起
+    """
+
+    def __init__(self, cargo_path, elevator_path, out_dir, num_people=1, shard_size=1024, calculator=None):
+        if shard_size < 1:
+            raise ValueError("分片大小必须为正整数")
+        self.cargo_path = cargo_path
+        self.elevator_path = elevator_path
+        self.out_dir = out_dir
+        self.num_people = num_people
+        self.shard_size = shard_size
+        self.calculator = calculator or ElevatorCalculator()
+        with Catalog(cargo_path) as cargo, Catalog(elevator_path) as elevators:
+            if cargo.kind != 'cargo' or elevators.kind != 'elevator':
+                raise ValueError("需要一个货物目录和一个电梯目录")
+            self.cargo_count, self.cab_count = len(cargo), len(elevators)
+        self.params = {
+            'cargo': _file_identity(cargo_path),
+            'elevators': _file_identity(elevator_path),
+            'num_people': num_people,
+            'shard_size': shard_size,
+            'rule': rule_fingerprint(self.calculator),
+        }
+        os.makedirs(out_dir, exist_ok=True)
+        self.checkpoint_path = os.path.join(out_dir, CHECKPOINT_NAME)
+        self.completed = self._load_checkpoint()
+
+    @property
+    def shards(self):
+        """确定性分片列表 [(分片号, 起始 SKU, 结束 SKU), ...]"""
+        return [(k, start, min(start + self.shard_size, self.cargo_count))
+                for k, start in enumerate(range(0, self.cargo_count, self.shard_size))]
+
+    def shard_path(self, shard):
+        return os.path.join(self.out_dir, f"shard-{shard:05d}.col")
+
+    def pending(self):
+        """尚未完成（或结果文件已丢失）的分片"""
+        return [s for s in self.shards
+                if str(s[0]) not in self.completed or not os.path.exists(self.shard_path(s[0]))]
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CHECKPOINT_VERSION or data.get('params') != self.params:
+            raise ValueError(f"{self.checkpoint_path} 属于参数不同的审计任务，请换用新的输出目录")
+        return data['completed']
+
+    def _save_checkpoint(self):
+        """临时文件写完后替换，中断时检查点要么是旧版本要么是新版本"""
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CHECKPOINT_VERSION, 'params': self.params, 'completed': self.completed},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def run(self, workers=None, progress=None, max_shards=None):
+        """
+        计算未完成的分片，返回 Progress
+
+        参数:
+        - workers: 工作进程数（默认 CPU 数，1 表示在当前进程内计算）
+        - progress: 每完成一个分片调用 progress(Progress)
+        - max_shards: 本次最多计算的分片数（默认全部）
+        """
+        workers = workers or os.cpu_count() or 1
+        pending = self.pending()
+        status = Progress(len(self.shards), self.cargo_count * self.cab_count, workers)
+        pending_ids = {s[0] for s in pending}
+        for shard, stats in self.completed.items():
+            if int(shard) not in pending_ids:
+                status.skip(stats['rows'], stats['loadable'])
+        if max_shards is not None:
+            pending = pending[:max_shards]
+
+        def record(shard, rows, loadable, seconds):
+            self.completed[str(shard)] = {'rows': rows, 'loadable': loadable, 'seconds': round(seconds, 3)}
+            self._save_checkpoint()
+            status.update(rows, loadable, seconds)
+            if progress:
+                progress(status)
+
+        common = (self.calculator, self.cargo_path, self.elevator_path, self.num_people)
+        if workers == 1:
+            for shard, start, stop in pending:
+                record(*_run_shard(*common, shard, start, stop, self.shard_path(shard)))
+            return status
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            queue = list(reversed(pending))  # 从末尾弹出，按分片顺序提交
+            running = set()
+            while queue or running:
+                # 同时在途的分片数有上限，避免一次提交全部分片
+                while queue and len(running) < workers * 2:
+                    shard, start, stop = queue.pop()
+                    running.add(executor.submit(_run_shard, *common, shard, start, stop, self.shard_path(shard)))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(*future.result())
+        return status
+
+    def merge(self, dest=None):
+        """按分片顺序合并全部分片结果，返回合并文件路径；仍有未完成分片时抛出 ValueError"""
+        if self.pending():
+            raise ValueError(f"还有 {len(self.pending())} 个分片未完成")
+        dest = dest or os.path.join(self.out_dir, 'audit.col')
+        merge_results([self.shard_path(shard) for shard, _, _ in self.shards], dest)
+        return dest
+
+
+def main(argv=None):
+    """命令行：python audit_job.py 货物目录.bin 电梯目录.bin 输出目录 [--workers N]"""
+    parser = argparse.ArgumentParser(description="可续跑的分片审计任务（货物目录 × 电梯目录）")
+    parser.add_argument('cargo', help="货物二进制目录")
+    parser.add_argument('elevators', help="电梯二进制目录")
+    parser.add_argument('out_dir', help="分片结果和检查点目录")
+    parser.add_argument('--people', type=int, default=1, help="随行人数")
+    parser.add_argument('--shard-size', type=int, default=1024, help="每个分片的 SKU 数")
+    parser.add_argument('--workers', type=int, default=None, help="工作进程数")
+    args = parser.parse_args(argv)
+
+    job = AuditJob(args.cargo, args.elevators, args.out_dir, args.people, args.shard_size)
+    remaining = len(job.pending())
+    print(f"共 {len(job.shards)} 个分片，待计算 {remaining} 个")
+    status = job.run(args.workers, progress=lambda p: print(p, flush=True))
+    dest = job.merge()
+    print(f"已合并到 {dest}：{status.done_rows} 行，可装载 {status.loadable}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+二进制货物/电梯目录
+定长列式二进制格式（类 .npy 文件头），通过 mmap 打开，按列零拷贝访问，
+并提供从 CSV/JSONL 转换的工具
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+
+MAGIC = b'\x93ELVCAT'
+VERSION = 1
+ALIGNMENT = 64
+LABEL_SIZE = 24  # 编号列定长字节数（UTF-8，超长截断）
+
+# 各目录类型的列定义：(列名, struct 格式)
+SCHEMAS = {
+    'cargo': (('sku', f'{LABEL_SIZE}s'), ('length', 'd'), ('width', 'd'), ('height', 'd'), ('weight', 'd')),
+    'elevator': (('model', f'{LABEL_SIZE}s'), ('length', 'd'), ('width', 'd'), ('height', 'd'), ('max_weight', 'd')),
+}
+
+_PREAMBLE = struct.Struct('<7sBI')  # 魔数、版本、文件头长度
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _label_bytes(value):
+    data = str(value).encode('utf-8')[:LABEL_SIZE]
+    return data + b'\0' * (LABEL_SIZE - len(data))
+
+
+def write_catalog(path, kind, rows):
+    """
+    写入二进制目录
+
+    参数:
+    - path: 输出文件
+    - kind: 'cargo' 或 'elevator'
+    - rows: 可迭代的行，每行为 (编号, 长, 宽, 高, 重量) 或按列名索引的字典
+
+    返回:
+    - 写入的行数
+    """
+    schema = SCHEMAS[kind]
+    names = [name for name, _ in schema]
+    labels = bytearray()
+    columns = {name: array('d') for name, fmt in schema if fmt == 'd'}
+    count = 0
+    for row in rows:
+        if isinstance(row, dict):
+            row = [row[name] for name in names]
+        labels += _label_bytes(row[0])
+        for name, value in zip(names[1:], row[1:]):
+            columns[name].append(float(value))
+        count += 1
+    if sys.byteorder != 'little':
+        for values in columns.values():
+            values.byteswap()
+
+    # 先确定各列偏移量，再写文件头
+    header = {'kind': kind, 'count': count, 'byteorder': 'little', 'columns': []}
+    blocks = [(names[0], f'{LABEL_SIZE}s', bytes(labels))]
+    blocks += [(name, 'd', columns[name].tobytes()) for name in names[1:]]
+    header_len = 0
+    while True:
+        offset = _align(_PREAMBLE.size + header_len)
+        header['columns'] = []
+        for name, fmt, data in blocks:
+            header['columns'].append({'name': name, 'format': fmt, 'offset': offset, 'nbytes': len(data)})
+            offset = _align(offset + len(data))
+        encoded = json.dumps(header).encode('ascii')
+        if len(encoded) <= header_len:
+            break
+        header_len = _align(len(encoded) + _PREAMBLE.size) - _PREAMBLE.size
+
+    encoded = encoded.ljust(header_len, b' ')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, header_len))
+        f.write(encoded)
+        for (name, fmt, data), column in zip(blocks, header['columns']):
+            f.write(b'\0' * (column['offset'] - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+    return count
+
+
+class Catalog:
+    """
+    mmap 打开的二进制目录，数值列以 memoryview 形式零拷贝访问
+
+    用法:
+        with Catalog('cargo.cat') as catalog:
+            lengths = catalog.column('length')  # memoryview，format 'd'
+            specs = catalog.spec(0)             # (长, 宽, 高, 重量)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_len = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} 不是二进制目录文件")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"不支持的目录版本: {version}")
+        header = json.loads(bytes(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_len]))
+        if header['byteorder'] != sys.byteorder:
+            self.close()
+            raise ValueError("目录字节序与本机不一致")
+        self.kind = header['kind']
+        self.count = header['count']
+        self.names = [column['name'] for column in header['columns']]
+        view = memoryview(self._mmap)
+        self._views = [view]
+        self._columns = {}
+        for column in header['columns']:
+            block = view[column['offset']:column['offset'] + column['nbytes']]
+            if column['format'] == 'd':
+                block = block.cast('d')
+            self._views.append(block)
+            self._columns[column['name']] = block
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """释放所有 memoryview 后关闭 mmap"""
+        for view in reversed(getattr(self, '_views', [])):
+            view.release()
+        self._views = []
+        self._columns = {}
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def column(self, name):
+        """数值列的零拷贝 memoryview"""
+        return self._columns[name]
+
+    def label(self, index):
+        """第 index 行的编号（SKU 或电梯型号）"""
+        raw = self._columns[self.names[0]][index * LABEL_SIZE:(index + 1) * LABEL_SIZE]
+        return bytes(raw).rstrip(b'\0').decode('utf-8', errors='ignore')
+
+    def spec(self, index):
+        """第 index 行的规格元组 (长, 宽, 高, 重量/限重)"""
+        return tuple(self._columns[name][index] for name in self.names[1:])
+
+    def specs(self, start=0, stop=None):
+        """按行迭代规格元组，供逐条调用计算器的批处理使用"""
+        stop = self.count if stop is None else min(stop, self.count)
+        columns = [self._columns[name][start:stop] for name in self.names[1:]]
+        return zip(*columns)
+
+
+def _read_rows(path, kind):
+    """按扩展名读取 CSV 或 JSONL 源文件"""
+    names = [name for name, _ in SCHEMAS[kind]]
+    if path.endswith(('.jsonl', '.json')):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    yield [record[name] for name in names]
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            missing = [name for name in names if name not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"{path} 缺少列: {', '.join(missing)}")
+            for record in reader:
+                yield [record[name] for name in names]
+
+
+def convert(source, dest, kind):
+    """将 CSV/JSONL 目录转换为二进制目录，返回行数"""
+    return write_catalog(dest, kind, _read_rows(source, kind))
+
+
+def main(argv=None):
+    """命令行：python binary_catalog.py convert 源文件 目标文件 --kind cargo | info 目录文件"""
+    parser = argparse.ArgumentParser(description="二进制货物/电梯目录工具")
+    sub = parser.add_subparsers(dest='command', required=True)
+    convert_parser = sub.add_parser('convert', help="从 CSV/JSONL 转换")
+    convert_parser.add_argument('source')
+    convert_parser.add_argument('dest')
+    convert_parser.add_argument('--kind', choices=sorted(SCHEMAS), default='cargo')
+    info_parser = sub.add_parser('info', help="显示目录信息")
+    info_parser.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        count = convert(args.source, args.dest, args.kind)
+        print(f"已写入 {count} 行到 {args.dest}")
+    else:
+        with Catalog(args.path) as catalog:
+            print(f"类型: {catalog.kind}  行数: {len(catalog)}  列: {', '.join(catalog.names)}")
+            for index in range(min(5, len(catalog))):
+                print(f"  {catalog.label(index)}: {catalog.spec(index)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+轿厢逆向设计
+在轿厢 长×宽×高 和额定载重的候选空间中，按 ElevatorCalculator 的判定规则统计货物目录的可装载比例，
+返回 轿厢体积/额定载重 与 目录覆盖率 的帕累托前沿（例如“两名搬运工时覆盖 99% 目录的最小轿厢”）
+
+目录按列预处理为每个判定条件的阈值序号（二分查找），每个候选轿厢的判定
+化为整数位集的按位与和计数；覆盖数随额定载重单调不减，各载重一次分段计数得到，
+再按体积递增扫描求前沿
+"""
+
+import argparse
+import math
+from bisect import bisect_left
+from itertools import groupby, repeat
+from operator import add, and_, mul, rshift
+
+from elevator_calculator import ElevatorCalculator
+
+
+# 默认候选空间（米 / 千克）
+STANDARD_RATINGS = (400, 450, 630, 800, 1000, 1275, 1600, 2000, 2500)
+
+# 6 个摆放方向的 (长, 宽, 高) 来源轴，与 check_all_orientations 顺序一致；末项为占地面积对应的轴对
+_ORIENTATIONS = (
+    (0, 1, 2, 0), (0, 2, 1, 1), (1, 0, 2, 0), (1, 2, 0, 2), (2, 0, 1, 1), (2, 1, 0, 2),
+)
+_NEVER = 255  # 序号列中表示“任何候选值都不满足”
+_LE_TABLES = [bytes(1 if v <= t else 0 for v in range(256)) for t in range(256)]
+_EQ_TABLES = [bytes(1 if v == t else 0 for v in range(256)) for t in range(256)]
+
+
+def grid(start, stop, step):
+    """闭区间等距网格（取整避免累加误差）"""
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    return tuple(round(start + i * step, 6) for i in range(count))
+
+
+class DesignSpace:
+    """
+    候选轿厢空间
+
+    参数:
+    - lengths / widths / heights: 候选尺寸（米，升序，每项不超过 254 个值）
+    - ratings: 候选额定载重（千克，升序）
+    """
+
+    def __init__(self, lengths=None, widths=None, heights=None, ratings=STANDARD_RATINGS):
+        self.lengths = tuple(lengths or grid(0.8, 3.0, 0.05))
+        self.widths = tuple(widths or grid(0.8, 2.6, 0.05))
+        self.heights = tuple(heights or grid(2.0, 2.8, 0.1))
+        self.ratings = tuple(ratings)
+        for values in (self.lengths, self.widths, self.heights):
+            if len(values) >= _NEVER or list(values) != sorted(values):
+                raise ValueError("候选尺寸须为升序且不超过 254 个值")
+        if list(self.ratings) != sorted(self.ratings) or len(self.ratings) >= _NEVER:
+            raise ValueError("候选额定载重须为升序且不超过 254 个值")
+
+    def __len__(self):
+        return len(self.lengths) * len(self.widths) * len(self.heights) * len(self.ratings)
+
+
+class DesignPoint:
+    """帕累托前沿上的一个候选轿厢"""
+
+    def __init__(self, length, width, height, rated_load, covered, total):
+        self.length = length
+        self.width = width
+        self.height = height
+        self.rated_load = rated_load
+        self.covered = covered
+        self.total = total
+
+    @property
+    def volume(self):
+        return self.length * self.width * self.height
+
+    @property
+    def coverage(self):
+        return self.covered / self.total if self.total else 0.0
+
+    @property
+    def elevator_specs(self):
+        return (self.length, self.width, self.height, self.rated_load)
+
+    def __repr__(self):
+        return (f"DesignPoint({self.length}×{self.width}×{self.height}m, {self.rated_load}kg, "
+                f"覆盖率={self.coverage:.2%})")
+
+
+def _pack(flags):
+    """每字节 0/1 的标志序列打包为位集：第 i 项对应第 i 位"""
+    bits = 0
+    for k in range(8):
+        bits |= int.from_bytes(flags[k::8], 'little') << k
+    return bits
+
+
+def _ranks(values, thresholds):
+    """每个值满足 值 <= 阈值 的最小候选下标（无满足时为候选个数），结果为 bytes"""
+    return bytes(map(bisect_left, repeat(thresholds, len(values)), values))
+
+
+def _split(ranks):
+    """超过 254 个阈值时的序号拆为高低两字节"""
+    return bytes(map(rshift, ranks, repeat(8))), bytes(map(and_, ranks, repeat(0xFF)))
+
+
+def _area_ranks(footprints, areas, needed):
+    """满足 面积 - 占地 >= 所需 的最小面积下标（浮点判定与 _compose_result 一致）"""
+    limit = len(areas)
+    thresholds = [area - needed for area in areas]
+    ranks = list(map(bisect_left, repeat(thresholds, len(footprints)), footprints))
+    # 阈值相减的舍入可能使二分结果偏差一位，只对判定不符的少数项逐个修正
+    suspects = [i for i, (footprint, r) in enumerate(zip(footprints, ranks))
+                if (r < limit and not areas[r] - footprint >= needed)
+                or (r > 0 and areas[r - 1] - footprint >= needed)]
+    for i in suspects:
+        footprint, r = footprints[i], ranks[i]
+        while r < limit and not areas[r] - footprint >= needed:
+            r += 1
+        while r > 0 and areas[r - 1] - footprint >= needed:
+            r -= 1
+        ranks[i] = r
+    return ranks
+
+
+def _column(catalog, index, name):
+    column = getattr(catalog, 'column', None)
+    if callable(column):
+        return list(column(name))
+    return [float(row[index]) for row in catalog]
+
+
+class CatalogIndex:
+    """
+    货物目录的判定索引
+
+    货物按 “满足的最小额定载重” 分组排列，每组补齐到整字节，便于一次转换后分段计数；
+    每个判定条件（方向放入、门宽、门高、人员面积、对角线）预处理为
+    “满足条件的最小候选下标” 序号列，候选轿厢的条件位集按需生成并缓存
+    """
+
+    def __init__(self, catalog, space=None, calculator=None, num_people=2):
+        self.calculator = calculator or ElevatorCalculator()
+        self.space = space or DesignSpace()
+        self.num_people = num_people
+        calc, space = self.calculator, self.space
+        if calc.engine != 'float' or calc.use_crew_placement or calc.door_models:
+            raise ValueError("逆向设计按默认浮点规则判定，不支持精确引擎、人员站位求解或登记门型")
+
+        columns = [_column(catalog, k, name) for k, name in enumerate(('length', 'width', 'height', 'weight'))]
+        self.total = len(columns[0])
+        # 无效货物（非正尺寸或重量）永远无法装载，不参与索引
+        rows = [row for row in zip(*columns) if min(row) > 0]
+        self.count = len(rows)
+        crew_weight = num_people * calc.person_avg_weight
+        groups = [[] for _ in range(len(space.ratings) + 1)]  # 末组超过最大额定载重
+        for row in rows:
+            groups[bisect_left(space.ratings, row[3] + crew_weight)].append(row)
+
+        # 分组排列，每组以永不满足的占位项补齐到 8 的倍数，记录各组的字节区间
+        self._layout, self._segments, start = [], [], 0
+        for group in groups:
+            pad = -len(group) % 8
+            self._layout.append((len(group), pad))
+            stop = start + (len(group) + pad) // 8
+            self._segments.append((start, stop))
+            start = stop
+        self._segments.pop()  # 超重组不计入任何额定载重
+        self._nbytes = start
+        real = [row for group in groups for row in group]
+        dims = [[row[k] for row in real] for k in range(3)]
+        padded = self._padded
+
+        gap, door_gap = calc.safety_gap, calc.door_safety_gap
+        door_widths = [w * 0.8 - door_gap for w in space.widths]
+        door_heights = [h * 0.9 for h in space.heights]
+        self._ranks = {}
+        for j in range(3):
+            with_gap = list(map(add, dims[j], repeat(2 * gap, self.count)))
+            self._ranks['length', j] = padded(_ranks(with_gap, space.lengths))
+            self._ranks['width', j] = padded(_ranks(with_gap, space.widths))
+            self._ranks['height', j] = padded(_ranks(list(map(add, dims[j], repeat(gap, self.count))), space.heights))
+            self._ranks['door_width', j] = padded(_ranks(dims[j], door_widths))
+            self._ranks['door_height', j] = padded(_ranks(dims[j], door_heights))
+
+        # 对角线：货物对角线 <= 轿厢对角线，按全部候选轿厢对角线排序后求序号
+        diagonal = calc.calculate_3d_diagonal
+        self._diagonals = sorted({diagonal(l, w, h) for l in space.lengths
+                                  for w in space.widths for h in space.heights})
+        self._diagonal_index = {d: t for t, d in enumerate(self._diagonals)}
+        hi, lo = _split(list(map(bisect_left, repeat(self._diagonals, self.count),
+                                 [diagonal(l, w, h) for l, w, h, _ in real])))
+        self._ranks['diagonal_hi', 0], self._ranks['diagonal_lo', 0] = padded(hi), padded(lo)
+
+        # 人员面积：轿厢面积 - 占地面积 >= 所需面积，与 _compose_result 的浮点判定一致
+        needed = num_people * calc.person_min_space
+        self._areas = sorted({l * w for l in space.lengths for w in space.widths})
+        self._area_index = {area: t for t, area in enumerate(self._areas)}
+        if needed > 0:
+            for pair, (a, b) in enumerate(((0, 1), (0, 2), (1, 2))):
+                hi, lo = _split(_area_ranks(list(map(mul, dims[a], dims[b])), self._areas, needed))
+                self._ranks['area_hi', pair], self._ranks['area_lo', pair] = padded(hi), padded(lo)
+        self._needed = needed
+        self._all = _pack(padded(bytes(self.count)).translate(_EQ_TABLES[0]))
+        self._bits = {}
+
+    def _padded(self, ranks):
+        """按分组布局在占位项处插入 _NEVER"""
+        parts, done = [], 0
+        for size, pad in self._layout:
+            parts.append(ranks[done:done + size] + bytes([_NEVER]) * pad)
+            done += size
+        return b''.join(parts)
+
+    def _bitset(self, name, axis, t, table=_LE_TABLES):
+        key = (name, axis, t, table is _EQ_TABLES)
+        bits = self._bits.get(key)
+        if bits is None:
+            bits = self._bits[key] = _pack(self._ranks[name, axis].translate(table[t]))
+        return bits
+
+    def _wide_bits(self, name, axis, t):
+        """两字节序号 r <= t 的位集：高字节小于，或高字节相等且低字节不大于"""
+        hi, lo = t >> 8, t & 0xFF
+        bits = self._bitset(name + '_hi', axis, hi, _EQ_TABLES) & self._bitset(name + '_lo', axis, lo)
+        if hi:
+            bits |= self._bitset(name + '_hi', axis, hi - 1)
+        return bits
+
+    def _counts(self, loadable, diagonal_only):
+        """各额定载重下的可装载数：按重量分组的字节区间分段计数后累加"""
+        data = loadable.to_bytes(self._nbytes, 'little')
+        running = bin(diagonal_only).count('1')
+        counts = []
+        for start, stop in self._segments:
+            running += bin(int.from_bytes(data[start:stop], 'little')).count('1')
+            counts.append(running)
+        return counts
+
+    def scan(self, xs=None, ys=None, zs=None):
+        """
+        逐个候选轿厢给出各额定载重下的可装载数，产出 (长, 宽, 高, 计数列表)
+
+        与 check_elevator_capacity 的 can_load 规则一致：首个可放入的方向决定门通行和人员面积，
+        没有可放入方向时按对角线判定（不检查重量）。只与 (宽, 高) 或 (长, 宽) 有关的条件位集
+        在内层循环外合并，每个候选轿厢每个方向只需少量按位运算
+
+        参数:
+        - xs / ys / zs: 只扫描这些长、宽、高下标（默认全部）
+        """
+        space, calc, bitset = self.space, self.calculator, self._bitset
+        diagonal = calc.calculate_3d_diagonal
+        xs = range(len(space.lengths)) if xs is None else xs
+        zs = range(len(space.heights)) if zs is None else zs
+        for y in (range(len(space.widths)) if ys is None else ys):
+            width = space.widths[y]
+            columns = []
+            for z in zs:
+                height = space.heights[z]
+                person_ok = not calc.person_height > height
+                orientations = []
+                for a, b, c, pair in _ORIENTATIONS:
+                    fit = bitset('width', b, y) & bitset('height', c, z)
+                    door = fit & bitset('door_width', b, y) & bitset('door_height', c, z) if person_ok else 0
+                    orientations.append((a, pair, fit, door))
+                columns.append((height, orientations))
+            for x in xs:
+                length = space.lengths[x]
+                lengths = [bitset('length', j, x) for j in range(3)]
+                if self._needed > 0:
+                    t = self._area_index[length * width]
+                    areas = [self._wide_bits('area', pair, t) for pair in range(3)]
+                else:
+                    areas = [self._all] * 3
+                for height, orientations in columns:
+                    free, loadable = self._all, 0
+                    for a, pair, fit, door in orientations:
+                        valid = lengths[a] & fit
+                        if valid:
+                            first = valid & free  # 之前的方向都放不下的货物，以本方向为最佳方向
+                            free ^= first
+                            loadable |= first & door & areas[pair]
+                    t = self._diagonal_index[diagonal(length, width, height)]
+                    diagonal_only = self._wide_bits('diagonal', 0, t) & free
+                    yield length, width, height, self._counts(loadable, diagonal_only)
+
+    def covered(self, length, width, height):
+        """单个候选轿厢（尺寸须在候选空间内）在各额定载重下的可装载数"""
+        space = self.space
+        x, y, z = space.lengths.index(length), space.widths.index(width), space.heights.index(height)
+        return next(self.scan((x,), (y,), (z,)))[3]
+
+
+def pareto_front(catalog, space=None, calculator=None, num_people=2, index=None):
+    """
+    轿厢体积、额定载重与目录覆盖率的帕累托前沿
+
+    参数:
+    - catalog: [(长, 宽, 高, 重量), ...] 或 binary_catalog.Catalog
+    - space: DesignSpace 候选空间
+    - index: 已建立的 CatalogIndex（多次查询时复用）
+
+    返回:
+    - DesignPoint 列表，按体积、载重升序；每个 (体积, 载重, 覆盖数) 只保留一个轿厢
+    """
+    index = index or CatalogIndex(catalog, space, calculator, num_people)
+    ratings = index.space.ratings
+    results = sorted(index.scan(), key=lambda item: item[0] * item[1] * item[2])
+    best = [-1] * len(ratings)  # 各载重下更小体积轿厢已达到的最大覆盖数
+    front = []
+    for _, group in groupby(results, key=lambda item: item[0] * item[1] * item[2]):
+        # 同体积的轿厢合并：各载重取覆盖最多者
+        group_best = [None] * len(ratings)
+        for length, width, height, counts in group:
+            for w, count in enumerate(counts):
+                if group_best[w] is None or count > group_best[w][0]:
+                    group_best[w] = (count, length, width, height)
+        # 计数随载重不减：只有严格超过更低载重（同体积）和更小体积（同载重）时才不被支配
+        for w, (count, length, width, height) in enumerate(group_best):
+            if count > best[w] and (w == 0 or count > group_best[w - 1][0]):
+                front.append(DesignPoint(length, width, height, ratings[w], count, index.total))
+        best = [max(b, g[0]) for b, g in zip(best, group_best)]
+    return front
+
+
+def smallest_cab(front, coverage):
+    """前沿中达到目标覆盖率的最小体积轿厢（同体积取载重最小者），不存在时返回 None"""
+    feasible = [p for p in front if p.coverage >= coverage]
+    return min(feasible, key=lambda p: (p.volume, p.rated_load)) if feasible else None
+
+
+def verify(catalog, point, calculator=None, num_people=2):
+    """
+    用 check_elevator_capacity 逐项复核前沿点的可装载数（与索引的计数一致）
+    """
+    calculator = calculator or ElevatorCalculator()
+    columns = [_column(catalog, k, name) for k, name in enumerate(('length', 'width', 'height', 'weight'))]
+    return sum(1 for row in zip(*columns)
+               if calculator.check_elevator_capacity(point.elevator_specs, row, num_people)['can_load'])
+
+
+def main(argv=None):
+    """命令行：python cab_design.py 货物目录.bin [--people 2] [--coverage 0.99]"""
+    from binary_catalog import Catalog
+
+    parser = argparse.ArgumentParser(description="按货物目录覆盖率逆向求最小轿厢规格")
+    parser.add_argument('catalog', help="binary_catalog.py 生成的货物目录文件")
+    parser.add_argument('--people', type=int, default=2, help="随行搬运人数")
+    parser.add_argument('--coverage', type=float, default=0.99, help="目标覆盖率")
+    args = parser.parse_args(argv)
+
+    with Catalog(args.catalog) as catalog:
+        front = pareto_front(catalog, num_people=args.people)
+    for point in front:
+        print(f"  {point.length}×{point.width}×{point.height}m  {point.rated_load}kg  覆盖率 {point.coverage:.2%}")
+    best = smallest_cab(front, args.coverage)
+    if best is None:
+        print(f"候选空间内没有覆盖率达到 {args.coverage:.0%} 的轿厢")
+    else:
+        print(f"覆盖率 ≥ {args.coverage:.0%} 的最小轿厢: {best}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+轿厢几何模型
+在长方体轿厢内登记障碍物（扶手、镜子、操纵盘等长方体）和多个门洞（贯通门），
+货物须能在某个摆放方向下落地放在不与障碍物重叠的位置，并能从至少一个门通过。
+障碍物按 x 区间排序建立索引，重叠查询只检查 x 区间可能相交的少数障碍物
+"""
+
+from bisect import bisect_left
+
+from cab_models import get_model
+from cargo_shapes import Box
+
+
+_EPS = 1e-9
+# front/rear 垂直于长度方向，left/right 垂直于宽度方向
+WALLS = {'front': "前门", 'rear': "后门", 'left': "左侧门", 'right': "右侧门"}
+
+
+class Door:
+    """
+    门洞
+
+    参数:
+    - wall: 所在轿厢壁，'front'/'rear'（货物沿长度方向进入）或 'left'/'right'（沿宽度方向进入）
+    - width / height: 净开口宽、高(米)
+    """
+
+    def __init__(self, wall, width, height, name=None):
+        if wall not in WALLS:
+            raise ValueError(f"门所在轿厢壁须为 {', '.join(WALLS)} 之一")
+        if width <= 0 or height <= 0:
+            raise ValueError("门宽和门高必须为正数")
+        self.wall = wall
+        self.width = width
+        self.height = height
+        self.name = name or WALLS[wall]
+
+    def cross_section(self, orientation):
+        """货物以给定方向通过本门时的截面 (横向, 竖向)"""
+        l, w, h = orientation
+        return (w, h) if self.wall in ('front', 'rear') else (l, h)
+
+    def fingerprint(self):
+        return f"door({self.wall},{self.width!r},{self.height!r})"
+
+    def __repr__(self):
+        return f"Door({self.wall!r}, {self.width}, {self.height})"
+
+
+class ObstacleIndex:
+    """
+    障碍物的 x 区间排序索引
+
+    按 x 起点排序并记录最大 x 跨度，查询 [x0, x1) 时只需检查起点落在 [x0 - 最大跨度, x1) 内的障碍物；
+    跨度远大于一般障碍物的长条（如沿壁全长的扶手）单独列出、每次都检查，避免把查询窗口撑满整个轿厢。
+    另按底面高度排序，落地货物只需考虑底面低于货物顶面的障碍物
+    """
+
+    def __init__(self, boxes):
+        self.boxes = sorted(boxes, key=lambda box: box.lo[0])
+        spans = sorted(box.hi[0] - box.lo[0] for box in self.boxes)
+        limit = 4 * spans[len(spans) // 2] if spans else 0.0
+        self._long = [box for box in self.boxes if box.hi[0] - box.lo[0] > limit]
+        self._short = [box for box in self.boxes if box.hi[0] - box.lo[0] <= limit]
+        self._starts = [box.lo[0] for box in self._short]
+        self._span = max((box.hi[0] - box.lo[0] for box in self._short), default=0.0)
+        self._by_bottom = sorted(self.boxes, key=lambda box: box.lo[2])
+        self._bottoms = [box.lo[2] for box in self._by_bottom]
+        self._below = {}  # 底面低于某高度的障碍物个数 -> 子索引
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def candidates(self, x0, x1):
+        """x 区间可能与 [x0, x1) 相交的障碍物"""
+        start = bisect_left(self._starts, x0 - self._span - _EPS)
+        stop = bisect_left(self._starts, x1 - _EPS)
+        return self._long + self._short[start:stop]
+
+    def below(self, z):
+        """底面低于 z 的障碍物"""
+        return self._by_bottom[:bisect_left(self._bottoms, z - _EPS)]
+
+    def below_index(self, z):
+        """底面低于 z 的障碍物的子索引（按个数缓存，各摆放方向共用）"""
+        count = bisect_left(self._bottoms, z - _EPS)
+        if count == len(self.boxes):
+            return self
+        index = self._below.get(count)
+        if index is None:
+            index = self._below[count] = ObstacleIndex(self._by_bottom[:count])
+        return index
+
+    def overlaps(self, lo, hi):
+        """长方体 [lo, hi) 是否与任一障碍物重叠（贴合不算重叠）"""
+        x0, y0, z0 = lo
+        x1, y1, z1 = hi
+        for box in self.candidates(x0, x1):
+            (a0, b0, c0), (a1, b1, c1) = box.lo, box.hi
+            if (x0 < a1 - _EPS and a0 < x1 - _EPS and y0 < b1 - _EPS and b0 < y1 - _EPS
+                    and z0 < c1 - _EPS and c0 < z1 - _EPS):
+                return True
+        return False
+
+
+class CabGeometry:
+    """
+    带障碍物和多个门洞的轿厢
+
+    参数:
+    - length / width / height: 轿厢内净尺寸(米)，宽度方向为前门所在的壁
+    - rated_load: 额定载重(千克)
+    - doors: Door 列表
+    - obstacles: cargo_shapes.Box 列表，坐标以轿厢内壁角为原点（x 沿长度、y 沿宽度、z 向上）
+
+    可直接代替 elevator_specs 传给 ElevatorCalculator.check_elevator_capacity
+    """
+
+    def __init__(self, length, width, height, rated_load, doors=(), obstacles=(), name=None):
+        if not doors:
+            raise ValueError("轿厢至少需要一个门")
+        self.length = length
+        self.width = width
+        self.height = height
+        self.rated_load = rated_load
+        self.doors = tuple(doors)
+        self.name = name
+        self.index = ObstacleIndex(obstacles)
+
+    @classmethod
+    def from_specs(cls, elevator_specs, door_width_ratio=0.8, door_safety_gap=0.1, through=False, obstacles=()):
+        """按计算器的默认门宽规则（宽 × 比例 - 门口间隙，高 × 0.9）生成前门，through=True 时加同尺寸后门"""
+        el, ew, eh, limit = elevator_specs
+        door_width, door_height = ew * door_width_ratio - door_safety_gap, eh * 0.9
+        doors = [Door('front', door_width, door_height)]
+        if through:
+            doors.append(Door('rear', door_width, door_height))
+        return cls(el, ew, eh, limit, doors, obstacles)
+
+    @classmethod
+    def from_model(cls, code, through=False, obstacles=()):
+        """按标准轿厢型号（cab_models.py）的真实门洞生成"""
+        model = get_model(code)
+        doors = [Door('front', model.door_width, model.door_height)]
+        if through:
+            doors.append(Door('rear', model.door_width, model.door_height))
+        return cls(model.length, model.width, model.height, model.rated_load, doors, obstacles, name=model.code)
+
+    @property
+    def obstacles(self):
+        return self.index.boxes
+
+    @property
+    def dims(self):
+        return (self.length, self.width, self.height)
+
+    @property
+    def specs(self):
+        return (self.length, self.width, self.height, self.rated_load)
+
+    def add_obstacle(self, box):
+        self.index = ObstacleIndex(self.index.boxes + [box])
+
+    def fingerprint(self):
+        obstacles = ','.join(repr(box.key()) for box in self.index.boxes)
+        doors = ','.join(door.fingerprint() for door in self.doors)
+        return f"cab({self.specs!r},[{doors}],[{obstacles}])"
+
+    def place(self, orientation, safety_gap=0.0):
+        """
+        摆放方向 (长, 宽, 高) 的货物落地放置的最小角坐标 (x, y)，放不下时返回 None
+
+        可行位置若存在，把货物向 -x、-y 推到底后仍可行，此时 x、y 分别贴着安全间隙或某个障碍物的
+        远侧面，因此只需检查这些候选坐标的组合
+        """
+        l, w, h = orientation
+        x_max, y_max = self.length - safety_gap - l, self.width - safety_gap - w
+        if x_max < safety_gap - _EPS or y_max < safety_gap - _EPS or h > self.height - safety_gap + _EPS:
+            return None
+        index = self.index.below_index(h)  # 货物顶面以上的障碍物不影响落地放置
+        blocking = index.boxes
+        if not blocking:
+            return safety_gap, safety_gap
+        if not index.overlaps((safety_gap, safety_gap, 0.0), (safety_gap + l, safety_gap + w, h)):
+            return safety_gap, safety_gap
+        xs = sorted({safety_gap} | {box.hi[0] for box in blocking if safety_gap < box.hi[0] <= x_max + _EPS})
+        ys = sorted({safety_gap} | {box.hi[1] for box in blocking if safety_gap < box.hi[1] <= y_max + _EPS})
+        for x in xs:
+            for y in ys:
+                if not index.overlaps((x, y, 0.0), (x + l, y + w, h)):
+                    return x, y
+        return None
+
+    def door_access(self, orientation):
+        """
+        按摆放方向检查各门，返回 (能否通过, 问题列表, 门宽, 门高)，格式同 check_door_access
+
+        任一门可通过即可；都不能通过时报告问题最少的门
+        """
+        from elevator_calculator import Issue
+        best = None
+        for door in self.doors:
+            across, up = door.cross_section(orientation)
+            issues = []
+            if across > door.width:
+                issues.append(Issue('door_width', cargo=across, door=door.name, limit=door.width))
+            if up > door.height:
+                issues.append(Issue('door_height', cargo=up, door=door.name, limit=door.height))
+            if not issues:
+                return True, [], door.width, door.height
+            if best is None or len(issues) < len(best[1]):
+                best = (False, issues, door.width, door.height)
+        return best
+
+    def blocked_floor_area(self, below=float('inf'), exclude=None):
+        """
+        底面低于 below 的障碍物在地面上的投影面积之和（裁剪到轿厢内）
+
+        exclude 为地面矩形 (x, y, 长, 宽)（通常是货物占地），投影中落在其内的部分不计入，
+        避免与货物占地重复扣除
+        """
+        area = 0.0
+        for box in self.index.below(below):
+            x0, x1 = max(box.lo[0], 0.0), min(box.hi[0], self.length)
+            y0, y1 = max(box.lo[1], 0.0), min(box.hi[1], self.width)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            area += (x1 - x0) * (y1 - y0)
+            if exclude is not None:
+                ex, ey, el, ew = exclude
+                dx = min(x1, ex + el) - max(x0, ex)
+                dy = min(y1, ey + ew) - max(y0, ey)
+                if dx > 0 and dy > 0:
+                    area -= dx * dy
+        return area
+
+    def lowest_obstacle(self):
+        """障碍物底面的最低高度，没有障碍物时为 None"""
+        return min((box.lo[2] for box in self.index.boxes), default=None)
+
+    def __repr__(self):
+        label = f"{self.name} " if self.name else ""
+        return (f"CabGeometry({label}{self.length}×{self.width}×{self.height}m, {self.rated_load}kg, "
+                f"门 {len(self.doors)} 个, 障碍物 {len(self.index)} 个)")
+
+
+def handrail(wall, length, width, height=0.9, depth=0.05, thickness=0.05):
+    """沿侧壁（'left'/'right'）或后壁（'rear'）全长的扶手"""
+    if wall == 'left':
+        return Box(length, depth, thickness, 0.0, 0.0, height)
+    if wall == 'right':
+        return Box(length, depth, thickness, 0.0, width - depth, height)
+    if wall == 'rear':
+        return Box(depth, width, thickness, length - depth, 0.0, height)
+    raise ValueError("扶手只能装在 left/right/rear 壁")
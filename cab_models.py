@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+标准轿厢型号表
+按常见额定载重系列（参照 ISO 4190 的乘客、病床、载货电梯尺寸）内置紧凑的型号表，
+导入时一次解析并预先计算派生几何量，按型号代码 O(1) 查找；
+check_elevator_capacity、命令行和界面都可以用型号代码代替 (长, 宽, 高, 限重) 元组
+"""
+
+import math
+
+
+# 型号代码、类别、额定载重(kg)、轿厢进深、轿厢宽度、轿厢高度、门宽、门高（毫米）
+# 轿厢宽度为开门一侧的尺寸，对应计算器的“宽”，进深对应“长”
+_TABLE = """
+P630  乘客 630  1400 1100 2200  800 2100
+P800  乘客 800  1400 1350 2200  800 2100
+P1000 乘客 1000 1400 1600 2200  900 2100
+P1275 乘客 1275 1400 2000 2300 1100 2100
+P1350 乘客 1350 1500 2000 2300 1100 2100
+P1600 乘客 1600 1600 2100 2300 1100 2100
+P2000 乘客 2000 1700 2350 2300 1200 2100
+P2500 乘客 2500 2000 2350 2300 1200 2100
+B1275 病床 1275 2300 1200 2300 1100 2100
+B1600 病床 1600 2400 1400 2300 1300 2100
+B2000 病床 2000 2700 1500 2300 1300 2100
+B2500 病床 2500 2700 1800 2300 1300 2100
+G1000 载货 1000 1750 1300 2200 1100 2100
+G1600 载货 1600 2250 1500 2200 1300 2100
+G2000 载货 2000 2500 1700 2400 1500 2300
+G2500 载货 2500 2700 1800 2400 1700 2300
+G3000 载货 3000 3000 2000 2500 1800 2300
+"""
+
+
+class CabModel:
+    """标准轿厢型号（尺寸为米，派生量在构造时计算）"""
+
+    __slots__ = ('code', 'kind', 'rated_load', 'length', 'width', 'height', 'door_width', 'door_height',
+                 'specs', 'dims', 'floor_area', 'volume', 'diagonal', 'door_diagonal', 'max_persons')
+
+    def __init__(self, code, kind, rated_load, length, width, height, door_width, door_height):
+        self.code = code
+        self.kind = kind
+        self.rated_load = rated_load
+        self.length = length
+        self.width = width
+        self.height = height
+        self.door_width = door_width
+        self.door_height = door_height
+        self.dims = (length, width, height)
+        self.specs = (length, width, height, rated_load)  # 计算器的 elevator_specs
+        self.floor_area = length * width
+        self.volume = length * width * height
+        self.diagonal = math.sqrt(length ** 2 + width ** 2 + height ** 2)
+        self.door_diagonal = math.sqrt(door_width ** 2 + door_height ** 2)
+        self.max_persons = int(rated_load // 75)  # 按 75kg/人 的额定乘客数
+
+    def __repr__(self):
+        return (f"CabModel({self.code}: {self.kind} {self.rated_load}kg, "
+                f"{self.length}×{self.width}×{self.height}m, 门 {self.door_width}×{self.door_height}m)")
+
+
+def _parse(table):
+    models = {}
+    for line in table.split('\n'):
+        if not line.strip():
+            continue
+        code, kind, load, *millimetres = line.split()
+        length, width, height, door_width, door_height = (int(v) / 1000 for v in millimetres)
+        models[code] = CabModel(code, kind, int(load), length, width, height, door_width, door_height)
+    return models
+
+
+MODELS = _parse(_TABLE)
+
+
+def get_model(code):
+    """按型号代码（不区分大小写）查找，未知代码抛出 ValueError"""
+    model = MODELS.get(code.strip().upper())
+    if model is None:
+        raise ValueError(f"未知的标准轿厢型号: {code}")
+    return model
+
+
+def resolve_specs(elevator_specs):
+    """型号代码换成 (长, 宽, 高, 限重) 元组，元组原样返回"""
+    if isinstance(elevator_specs, str):
+        return get_model(elevator_specs).specs
+    return elevator_specs
+
+
+def models(kind=None):
+    """按表中顺序列出型号，可按类别（乘客/病床/载货）筛选"""
+    return [model for model in MODELS.values() if kind is None or model.kind == kind]
+
+
+def register_doors(calculator, landing_depth=1.5, codes=None):
+    """
+    为标准型号登记真实门洞（door_tables.DoorModel），门通行检查改为按实际门宽门高查表
+
+    参数:
+    - landing_depth: 候梯厅进深(米)
+    - codes: 只登记这些型号（默认全部）
+    """
+    from door_tables import DoorModel
+
+    for model in (MODELS.values() if codes is None else map(get_model, codes)):
+        door = DoorModel(model.door_width, model.door_height, landing_depth, name=f"{model.code} 门")
+        calculator.register_door(model.dims, door)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异形货物
+由长方体和圆柱组合描述 L 形沙发、圆桌、带凸出部件的设备等非长方体货物，
+按给定分辨率体素化为整数位集（Python int），在 24 种轴向旋转和若干偏航角下
+用移位与按位与判定能否放入轿厢；位集按 (形状, 分辨率, 旋转, 偏航角) 缓存，同一 SKU 只体素化一次
+"""
+
+import math
+from functools import lru_cache
+
+
+_EPS = 1e-9
+
+# 默认偏航角（度）：90° 的倍数已包含在轴向旋转中
+DEFAULT_YAWS = (0.0, 15.0, 30.0, 45.0, 60.0, 75.0)
+
+
+def _signed_permutations():
+    """24 种轴向旋转：每个结果轴取 (源轴, 方向)，行列式为 +1"""
+    rotations = []
+    for perm in ((0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0), (2, 0, 1), (2, 1, 0)):
+        parity = 1 if perm in ((0, 1, 2), (1, 2, 0), (2, 0, 1)) else -1
+        for sx in (1, -1):
+            for sy in (1, -1):
+                for sz in (1, -1):
+                    if sx * sy * sz == parity:
+                        rotations.append(((perm[0], sx), (perm[1], sy), (perm[2], sz)))
+    return tuple(rotations)
+
+
+ROTATIONS = _signed_permutations()
+# 保持竖直方向不变的旋转（不可翻倒的货物只用这些）
+UPRIGHT_ROTATIONS = tuple(i for i, r in enumerate(ROTATIONS) if r[2] == (2, 1))
+
+
+class Box:
+    """长方体部件，(x, y, z) 为最小角坐标(米)"""
+
+    kind = 'box'
+
+    def __init__(self, length, width, height, x=0.0, y=0.0, z=0.0):
+        self.lo = (x, y, z)
+        self.hi = (x + length, y + width, z + height)
+
+    def key(self):
+        return (self.kind, self.lo, self.hi)
+
+    def rotated(self, rotation, dims):
+        """在旋转后的坐标系中的部件（dims 为整体包围盒尺寸）"""
+        lo, hi = [], []
+        for axis, sign in rotation:
+            if sign > 0:
+                lo.append(self.lo[axis])
+                hi.append(self.hi[axis])
+            else:
+                lo.append(dims[axis] - self.hi[axis])
+                hi.append(dims[axis] - self.lo[axis])
+        return Box(hi[0] - lo[0], hi[1] - lo[1], hi[2] - lo[2], *lo)
+
+    def z_span(self, x0, x1, y0, y1):
+        """部件在水平矩形 [x0,x1]×[y0,y1] 上方占据的高度区间，不相交时返回 None"""
+        if x1 <= self.lo[0] + _EPS or x0 >= self.hi[0] - _EPS or y1 <= self.lo[1] + _EPS or y0 >= self.hi[1] - _EPS:
+            return None
+        return self.lo[2], self.hi[2]
+
+
+class Cylinder:
+    """圆柱部件，axis 为轴线方向 ('x'/'y'/'z')，(x, y, z) 为包围盒最小角坐标(米)"""
+
+    kind = 'cylinder'
+
+    def __init__(self, radius, length, x=0.0, y=0.0, z=0.0, axis='z'):
+        self.radius = radius
+        self.axis = 'xyz'.index(axis) if isinstance(axis, str) else axis
+        size = [2 * radius] * 3
+        size[self.axis] = length
+        self.lo = (x, y, z)
+        self.hi = (x + size[0], y + size[1], z + size[2])
+
+    def key(self):
+        return (self.kind, self.radius, self.axis, self.lo, self.hi)
+
+    def rotated(self, rotation, dims):
+        box = Box(*(h - l for l, h in zip(self.lo, self.hi)), *self.lo).rotated(rotation, dims)
+        axis = [k for k, (source, _) in enumerate(rotation) if source == self.axis][0]
+        return Cylinder(self.radius, box.hi[axis] - box.lo[axis], *box.lo, axis=axis)
+
+    def z_span(self, x0, x1, y0, y1):
+        lo, hi, r = self.lo, self.hi, self.radius
+        if x1 <= lo[0] + _EPS or x0 >= hi[0] - _EPS or y1 <= lo[1] + _EPS or y0 >= hi[1] - _EPS:
+            return None
+        if self.axis == 2:
+            cx, cy = (lo[0] + hi[0]) / 2, (lo[1] + hi[1]) / 2
+            dx = max(x0 - cx, 0.0, cx - x1)
+            dy = max(y0 - cy, 0.0, cy - y1)
+            if dx * dx + dy * dy >= r * r - _EPS:
+                return None
+            return lo[2], hi[2]
+        # 水平轴线：截面圆在矩形上方的最大弦高
+        if self.axis == 0:
+            center, a, b = (lo[1] + hi[1]) / 2, y0, y1
+        else:
+            center, a, b = (lo[0] + hi[0]) / 2, x0, x1
+        d = max(a - center, 0.0, center - b)
+        if d >= r - _EPS:
+            return None
+        half = math.sqrt(r * r - d * d)
+        cz = (lo[2] + hi[2]) / 2
+        return cz - half, cz + half
+
+
+class Shape:
+    """
+    组合形状
+
+    用法:
+        sofa = Shape([Box(2.0, 0.9, 0.8), Box(0.9, 0.8, 0.8, y=0.9)], name='L形沙发')
+        table = Shape([Cylinder(0.6, 0.04, z=0.72), Cylinder(0.05, 0.72, x=0.55, y=0.55)], name='圆桌')
+
+    部件坐标可为任意值，构造时平移到包围盒最小角为原点；upright=True 表示不可翻倒
+    """
+
+    def __init__(self, parts, name=None, upright=False):
+        parts = list(parts)
+        if not parts:
+            raise ValueError("形状至少包含一个部件")
+        origin = [min(part.lo[k] for part in parts) for k in range(3)]
+        shifted = []
+        for part in parts:
+            if isinstance(part, Cylinder):
+                size = [h - l for l, h in zip(part.lo, part.hi)]
+                shifted.append(Cylinder(part.radius, size[part.axis],
+                                        *(part.lo[k] - origin[k] for k in range(3)), axis=part.axis))
+            else:
+                shifted.append(Box(*(h - l for l, h in zip(part.lo, part.hi)),
+                                   *(part.lo[k] - origin[k] for k in range(3))))
+        self.parts = tuple(shifted)
+        self.dims = tuple(max(part.hi[k] for part in self.parts) for k in range(3))
+        self.name = name or "异形货物"
+        self.upright = upright
+        self._key = (tuple(part.key() for part in self.parts), upright)
+
+    @classmethod
+    def from_box(cls, length, width, height, name=None):
+        return cls([Box(length, width, height)], name)
+
+    def fingerprint(self):
+        return repr(self._key)
+
+    def __eq__(self, other):
+        return isinstance(other, Shape) and self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        return f"Shape({self.name!r}, dims={self.dims})"
+
+    def rotations(self):
+        """允许的旋转下标"""
+        return UPRIGHT_ROTATIONS if self.upright else tuple(range(len(ROTATIONS)))
+
+
+def _cells(length, resolution):
+    """覆盖长度所需的格数（向上取整，保守）"""
+    return max(1, math.ceil(length / resolution - _EPS))
+
+
+def voxel_size(shape, resolution, rotation=0, yaw=0.0):
+    """姿态对应的包围盒格数（只由尺寸决定，无需体素化）"""
+    a, b, c = (shape.dims[axis] for axis, _ in ROTATIONS[rotation])
+    if yaw:
+        theta = math.radians(yaw)
+        cos_t, sin_t = abs(math.cos(theta)), abs(math.sin(theta))
+        a, b = a * cos_t + b * sin_t, a * sin_t + b * cos_t
+    return _cells(a, resolution), _cells(b, resolution), _cells(c, resolution)
+
+
+class Voxels:
+    """体素化结果：size 为 (x, y, z) 格数，columns 为 {(ix, iy): z 位掩码}"""
+
+    def __init__(self, size, columns):
+        self.size = size
+        self.columns = columns
+
+    @property
+    def count(self):
+        return sum(bin(mask).count('1') for mask in self.columns.values())
+
+
+@lru_cache(maxsize=4096)
+def voxelize(shape, resolution, rotation=0, yaw=0.0):
+    """
+    体素化（缓存）：与部件相交的体素全部计为占用，判定偏保守
+
+    偏航角不为 0 时，每个水平格取其逆旋转后的外接正方形求部件高度区间
+    """
+    rotation_spec = ROTATIONS[rotation]
+    dims = tuple(shape.dims[axis] for axis, _ in rotation_spec)
+    parts = [part.rotated(rotation_spec, shape.dims) for part in shape.parts]
+    a, b, c = dims
+    theta = math.radians(yaw)
+    cos_t, sin_t = abs(math.cos(theta)), abs(math.sin(theta))
+    span_x, span_y = (a * cos_t + b * sin_t, a * sin_t + b * cos_t) if yaw else (a, b)
+    nx, ny, nz = voxel_size(shape, resolution, rotation, yaw)
+    half = resolution * (cos_t + sin_t) / 2
+    columns = {}
+    for ix in range(nx):
+        for iy in range(ny):
+            if yaw:
+                # 格中心逆旋转回部件坐标系
+                qx, qy = (ix + 0.5) * resolution - span_x / 2, (iy + 0.5) * resolution - span_y / 2
+                px = qx * math.cos(theta) + qy * math.sin(theta) + a / 2
+                py = -qx * math.sin(theta) + qy * math.cos(theta) + b / 2
+                x0, x1, y0, y1 = px - half, px + half, py - half, py + half
+            else:
+                x0, x1 = ix * resolution, (ix + 1) * resolution
+                y0, y1 = iy * resolution, (iy + 1) * resolution
+            mask = 0
+            for part in parts:
+                span = part.z_span(x0, x1, y0, y1)
+                if span is None:
+                    continue
+                k0 = max(0, math.floor(span[0] / resolution + _EPS))
+                k1 = min(nz, math.ceil(span[1] / resolution - _EPS))
+                if k1 > k0:
+                    mask |= ((1 << (k1 - k0)) - 1) << k0
+            if mask:
+                columns[ix, iy] = mask
+    return Voxels((nx, ny, nz), columns)
+
+
+@lru_cache(maxsize=4096)
+def packed_bits(shape, resolution, rotation, yaw, grid_y, grid_z):
+    """
+    按轿厢网格布局 (下标 = (ix × grid_y + iy) × grid_z + iz) 打包的位集（缓存）
+
+    放到偏移 (dx, dy, dz) 只需左移 (dx × grid_y + dy) × grid_z + dz 位
+    """
+    voxels = voxelize(shape, resolution, rotation, yaw)
+    bits = 0
+    for (ix, iy), mask in voxels.columns.items():
+        bits |= mask << ((ix * grid_y + iy) * grid_z)
+    return bits
+
+
+class ShapeFit:
+    """放入方案：旋转下标、偏航角(度)、体素偏移和对应的米制位置"""
+
+    def __init__(self, rotation, yaw, offset, position, size):
+        self.rotation = rotation
+        self.yaw = yaw
+        self.offset = offset
+        self.position = position
+        self.size = size  # 旋转后包围盒格数
+
+    @property
+    def axes(self):
+        """旋转后各结果轴对应的原始轴与方向"""
+        return ROTATIONS[self.rotation]
+
+    def __repr__(self):
+        return f"ShapeFit(rotation={self.rotation}, yaw={self.yaw}, position={self.position})"
+
+
+class CabGrid:
+    """
+    轿厢可用空间的体素网格
+
+    参数:
+    - elevator_dims: (长, 宽, 高)
+    - resolution: 体素边长(米)
+    - safety_gap: 长宽两侧和顶部保留的间隙，与 check_all_orientations 一致
+    - obstacles: 轿厢内障碍物 Box 列表（坐标以扣除间隙后的可用空间为原点）
+    """
+
+    def __init__(self, elevator_dims, resolution=0.05, safety_gap=0.0, obstacles=()):
+        el, ew, eh = elevator_dims
+        self.resolution = resolution
+        self.safety_gap = safety_gap
+        # 可用空间向下取整，不完整的格不可用
+        self.size = tuple(max(0, math.floor(v / resolution + _EPS))
+                          for v in (el - 2 * safety_gap, ew - 2 * safety_gap, eh - safety_gap))
+        self.blocked = 0
+        for obstacle in obstacles:
+            self.block(obstacle)
+
+    def block(self, obstacle):
+        """将障碍物占用的体素置位"""
+        nx, ny, nz = self.size
+        r = self.resolution
+        ranges = [(max(0, math.floor(lo / r + _EPS)), min(n, math.ceil(hi / r - _EPS)))
+                  for lo, hi, n in zip(obstacle.lo, obstacle.hi, self.size)]
+        (x0, x1), (y0, y1), (z0, z1) = ranges
+        if z1 <= z0:
+            return
+        column = ((1 << (z1 - z0)) - 1) << z0
+        for ix in range(x0, x1):
+            for iy in range(y0, y1):
+                self.blocked |= column << ((ix * ny + iy) * nz)
+
+    def place(self, shape, rotation, yaw):
+        """在给定姿态下寻找落地放置的偏移，找不到时返回 None"""
+        nx, ny, nz = self.size
+        sx, sy, sz = voxel_size(shape, self.resolution, rotation, yaw)
+        if sx > nx or sy > ny or sz > nz:
+            return None
+        if not self.blocked:
+            return 0, 0, 0
+        bits = packed_bits(shape, self.resolution, rotation, yaw, ny, nz)
+        blocked = self.blocked
+        for dx in range(nx - sx + 1):
+            for dy in range(ny - sy + 1):
+                if not (bits << ((dx * ny + dy) * nz)) & blocked:
+                    return dx, dy, 0
+        return None
+
+    def fit(self, shape, yaws=DEFAULT_YAWS):
+        """
+        按旋转、偏航角依次尝试，返回第一个可行的 ShapeFit，无法放入时返回 None
+
+        各姿态先比较包围盒格数，放不下的姿态不做位运算
+        """
+        r = self.resolution
+        seen = set()
+        for rotation in shape.rotations():
+            dims = tuple(shape.dims[axis] for axis, _ in ROTATIONS[rotation])
+            if dims in seen and not self.blocked:
+                continue
+            seen.add(dims)
+            for yaw in yaws:
+                offset = self.place(shape, rotation, yaw)
+                if offset is not None:
+                    size = voxel_size(shape, r, rotation, yaw)
+                    position = tuple(self.safety_gap + i * r for i in offset[:2]) + (offset[2] * r,)
+                    return ShapeFit(rotation, yaw, offset, position, size)
+        return None
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可插拔检查流水线
+各项检查注册为阶段并声明代价和预估拒绝率，流水线按实测统计自适应排序
+（代价低、拒绝率高的优先），只需要结论时遇到第一个不通过的阶段即停止
+"""
+
+import time
+
+from cab_geometry import CabGeometry
+from cab_models import resolve_specs
+from elevator_calculator import ElevatorCalculator, Issue
+
+
+_UNSET = object()
+
+
+class CheckContext:
+    """
+    单次检查的输入及按需计算、缓存的中间结果（摆放方向、门通行、人员站位等）
+
+    elevator_specs 可以是 (长, 宽, 高, 限重)、标准轿厢型号代码或 CabGeometry
+    （不支持的计算器设置与 check_elevator_capacity 一样报 ValueError），
+    各中间结果与 check_elevator_capacity 调用相同的计算器方法
+    """
+
+    def __init__(self, calculator, elevator_specs, cargo_specs, num_people):
+        self.calculator = calculator
+        if isinstance(elevator_specs, CabGeometry):
+            calculator.validate_geometry(elevator_specs)
+            self.geometry = elevator_specs
+            elevator_specs = elevator_specs.specs
+        else:
+            self.geometry = None
+            elevator_specs = resolve_specs(elevator_specs)
+        self.elevator_specs = elevator_specs
+        self.cargo_specs = cargo_specs
+        self.num_people = num_people
+        self.elevator_dims = tuple(elevator_specs[:3])
+        self.cargo_dims = tuple(cargo_specs[:3])
+        self._has_orientation = None
+        self._orientations = None
+        self._best = None
+        self._diagonal = None
+        self._door = None
+        self._crew = _UNSET
+
+    @property
+    def has_orientation(self):
+        """是否存在常规摆放方向（不生成利用率明细，供廉价阶段判断）"""
+        if self._has_orientation is None:
+            if self._orientations is not None or self.geometry is not None:
+                self._has_orientation = bool(self.valid_orientations)
+            else:
+                self._has_orientation = self.calculator.has_valid_orientation(self.elevator_dims, self.cargo_dims)
+        return self._has_orientation
+
+    @property
+    def valid_orientations(self):
+        if self._orientations is None:
+            if self.geometry is not None:
+                self._orientations = self.calculator.place_orientations(self.geometry, self.cargo_dims)
+            else:
+                self._orientations = self.calculator.check_all_orientations(self.elevator_dims, self.cargo_dims)
+        return self._orientations
+
+    @property
+    def best_orientation(self):
+        if self._best is None and self.valid_orientations:
+            self._best = self.calculator.select_best_orientation(self._orientations)
+        return self._best
+
+    @property
+    def diagonal(self):
+        if self._diagonal is None:
+            if self.geometry is not None:
+                self._diagonal = self.calculator.check_cab_diagonal(self.geometry, self.cargo_dims)
+            else:
+                self._diagonal = self.calculator.check_diagonal_fit(self.elevator_dims, self.cargo_dims)
+        return self._diagonal
+
+    @property
+    def door(self):
+        if self._door is None:
+            orientation = self.best_orientation['orientation']
+            if self.geometry is not None:
+                self._door = self.geometry.door_access(orientation)
+            else:
+                self._door = self.calculator.check_door_access(self.elevator_dims, orientation)
+        return self._door
+
+    @property
+    def crew(self):
+        """人员站位（未启用站位求解时为 None，与 check_elevator_capacity 一致）"""
+        if self._crew is _UNSET:
+            self._crew = None
+            if self.calculator.use_crew_placement:
+                self._crew = self.calculator.plan_crew_positions(
+                    self.elevator_dims[:2], self.best_orientation['orientation'][:2],
+                    self.num_people, self.cargo_specs[3])
+        return self._crew
+
+    @property
+    def total_weight(self):
+        return self.cargo_specs[3] + self.num_people * self.calculator.person_avg_weight
+
+    @property
+    def blocked_area(self):
+        if self.geometry is None:
+            return 0.0
+        return self.calculator.cab_blocked_area(self.geometry, self.best_orientation)
+
+
+class CheckStage:
+    """
+    检查阶段
+
+    参数:
+    - name: 阶段名
+    - check: 函数 check(ctx) -> 问题描述列表，空列表表示通过
+    - cost: 预估耗时(微秒)，有实测数据后以实测为准
+    - reject_rate: 预估拒绝率 (0~1)，有实测数据后逐步修正
+    """
+
+    def __init__(self, name, check, cost=1.0, reject_rate=0.1):
+        self.name = name
+        self.check = check
+        self.cost = cost
+        self.reject_rate = reject_rate
+        self.calls = 0
+        self.rejects = 0
+        self.timed_calls = 0
+        self.total_time = 0.0  # 抽样计时累计(微秒)
+
+    def observed_cost(self):
+        return self.total_time / self.timed_calls if self.timed_calls else self.cost
+
+    def observed_reject_rate(self, prior_weight=20):
+        """以声明的拒绝率为先验，按调用次数加权修正"""
+        return (self.rejects + self.reject_rate * prior_weight) / (self.calls + prior_weight)
+
+    def score(self):
+        """排序依据：每拒绝一次所需的期望代价，越小越靠前"""
+        return self.observed_cost() / max(self.observed_reject_rate(), 1e-6)
+
+
+# 内置阶段：调用 check_elevator_capacity 使用的同一组计算器方法，can_load 判定与其一致。
+# 没有常规摆放方向时只按对角线判定（参考实现的行为），其余阶段视为通过。
+
+def _check_validation(ctx):
+    error = ctx.calculator.validate_inputs(ctx.elevator_specs, ctx.cargo_specs, ctx.num_people)
+    return [error] if error else []
+
+
+def _check_fit(ctx):
+    if ctx.has_orientation:
+        return []
+    diag_fit, cargo_diag, elevator_diag = ctx.diagonal
+    if diag_fit:
+        return []
+    return [Issue('diagonal', cargo=cargo_diag, limit=elevator_diag)]
+
+
+def _check_door(ctx):
+    if not ctx.has_orientation:
+        return []
+    return list(ctx.door[1])
+
+
+def _check_weight(ctx):
+    if not ctx.has_orientation:
+        return []
+    el, ew, eh, limit = ctx.elevator_specs
+    # 重量判定只取决于总重和限重，货物尺寸仅用于接口参数
+    issues, _ = ctx.calculator.check_weight_distribution(ctx.total_weight, limit, ctx.cargo_dims, (el, ew, eh))
+    return issues
+
+
+def _check_person_space(ctx):
+    if not ctx.has_orientation:
+        return []
+    issues, _, _, _ = ctx.calculator.check_person_space(
+        ctx.elevator_dims, ctx.best_orientation['orientation'], ctx.num_people, ctx.crew, ctx.blocked_area)
+    return issues
+
+
+def _check_person_height(ctx):
+    if not ctx.has_orientation:
+        return []
+    return ctx.calculator.check_person_height(ctx.elevator_specs[2])
+
+
+def _check_eccentricity(ctx):
+    calculator = ctx.calculator
+    if not (calculator.use_crew_placement and calculator.check_eccentricity) or not ctx.has_orientation:
+        return []
+    issues, _ = calculator.check_load_balance(ctx.elevator_dims, ctx.crew, ctx.cargo_specs[3], ctx.num_people)
+    return issues
+
+
+def default_stages():
+    """内置检查阶段（预估代价单位：微秒）"""
+    return [
+        CheckStage('validation', _check_validation, cost=0.5, reject_rate=0.01),
+        CheckStage('fit', _check_fit, cost=5.0, reject_rate=0.2),
+        CheckStage('door', _check_door, cost=2.0, reject_rate=0.1),
+        CheckStage('weight', _check_weight, cost=0.8, reject_rate=0.05),
+        CheckStage('person_space', _check_person_space, cost=0.5, reject_rate=0.05),
+        CheckStage('person_height', _check_person_height, cost=0.2, reject_rate=0.01),
+        CheckStage('eccentricity', _check_eccentricity, cost=0.2, reject_rate=0.01),
+    ]
+
+
+class CheckPipeline:
+    """
+    检查流水线
+
+    用法:
+        pipeline = CheckPipeline(calculator)
+        pipeline.register(CheckStage('freight_only', my_check, cost=0.3, reject_rate=0.2))
+        ok = pipeline.verdict(elevator_specs, cargo_specs, 2)        # 短路判定
+        ok, issues = pipeline.evaluate(elevator_specs, cargo_specs)  # 运行全部阶段
+
+    elevator_specs 可以是 (长, 宽, 高, 限重)、标准轿厢型号代码或 CabGeometry；
+    validation 阶段固定最先执行，其余阶段按 score() 自适应排序；
+    每 sample_every 次阶段调用抽样计时一次，每 reorder_every 次判定重新排序一次
+    """
+
+    def __init__(self, calculator=None, stages=None, reorder_every=256, sample_every=16):
+        self.calculator = calculator or ElevatorCalculator()
+        self.stages = list(default_stages() if stages is None else stages)
+        self.reorder_every = reorder_every
+        self.sample_every = sample_every
+        self._order = list(self.stages)
+        self._evaluations = 0
+        self._countdown = 1
+        self.reorder()
+
+    def register(self, stage, position=None):
+        """
+        注册自定义阶段（position 为 evaluate 中的报告顺序，默认追加在末尾）
+
+        validation 必须最先运行，输入无效时其余阶段不能执行，因此 position 不会越过它：
+        指向 validation 及之前的位置都放在 validation 之后
+        """
+        if any(existing.name == stage.name for existing in self.stages):
+            raise ValueError(f"检查阶段已存在: {stage.name}")
+        if position is None:
+            self.stages.append(stage)
+        else:
+            if position < 0:
+                position = max(0, len(self.stages) + position)
+            names = [existing.name for existing in self.stages]
+            if 'validation' in names:
+                position = max(position, names.index('validation') + 1)
+            self.stages.insert(position, stage)
+        self.reorder()
+
+    def unregister(self, name):
+        """移除阶段，不需要的检查不再产生任何开销"""
+        self.stages = [stage for stage in self.stages if stage.name != name]
+        self.reorder()
+
+    def reorder(self):
+        """按实测统计重新排定判定顺序"""
+        fixed = [stage for stage in self.stages if stage.name == 'validation']
+        rest = sorted((stage for stage in self.stages if stage.name != 'validation'), key=CheckStage.score)
+        self._order = fixed + rest
+
+    @property
+    def order(self):
+        """当前判定顺序（阶段名）"""
+        return [stage.name for stage in self._order]
+
+    def _run(self, stage, ctx):
+        stage.calls += 1
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._countdown = self.sample_every
+            start = time.perf_counter()
+            issues = stage.check(ctx)
+            stage.total_time += (time.perf_counter() - start) * 1e6
+            stage.timed_calls += 1
+        else:
+            issues = stage.check(ctx)
+        if issues:
+            stage.rejects += 1
+        return issues
+
+    def verdict(self, elevator_specs, cargo_specs, num_people=1):
+        """只返回能否装载，遇到第一个不通过的阶段即停止"""
+        ctx = CheckContext(self.calculator, elevator_specs, cargo_specs, num_people)
+        self._evaluations += 1
+        if self._evaluations >= self.reorder_every:
+            self._evaluations = 0
+            self.reorder()
+        run = self._run
+        for stage in self._order:
+            if run(stage, ctx):
+                return False
+        return True
+
+    def evaluate(self, elevator_specs, cargo_specs, num_people=1):
+        """
+        按注册顺序运行全部阶段，返回 (能否装载, 问题列表)
+
+        输入无效时只报告验证问题
+        """
+        ctx = CheckContext(self.calculator, elevator_specs, cargo_specs, num_people)
+        issues = []
+        for stage in self.stages:
+            stage_issues = self._run(stage, ctx)
+            issues.extend(stage_issues)
+            if stage.name == 'validation' and stage_issues:
+                break
+        return not issues, issues
+
+    def stats(self):
+        """各阶段的调用次数、拒绝率和平均耗时(微秒)"""
+        return {stage.name: {'calls': stage.calls, 'reject_rate': stage.observed_reject_rate(),
+                             'cost': stage.observed_cost()}
+                for stage in self.stages}
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+人员站位求解器
+在货物摆放后的剩余地面上摆放人员占位（矩形或圆形），计算实际可站立人数及站位。
+摆放为贪心的 MaxRects 启发式，得到的人数是可站立人数的下界（站位确实可行，但不保证最多）；
+另给出任意货物位置下人数的面积上界，下界达到上界时才证明是最多人数
+"""
+
+import math
+
+
+class PersonFootprint:
+    """单人占位形状（矩形或圆形，单位：米）"""
+
+    def __init__(self, width, depth, shape='rect'):
+        if shape not in ('rect', 'circle'):
+            raise ValueError(f"不支持的人员占位形状: {shape}")
+        self.width = width
+        self.depth = depth
+        self.shape = shape
+
+    @classmethod
+    def from_calculator(cls, calculator, shape='rect'):
+        """
+        由计算器参数推导：宽为肩宽 person_width，进深为体厚 person_depth 与最小操作空间
+        min_operation_space 中的较大者（每人面前留出操作空间）；圆形以其中最大值为直径
+        """
+        width = calculator.person_width
+        depth = max(calculator.person_depth, calculator.min_operation_space)
+        if shape == 'circle':
+            diameter = max(width, depth)
+            return cls(diameter, diameter, 'circle')
+        return cls(width, depth, 'rect')
+
+    @property
+    def area(self):
+        """单人占用的地面面积（圆形为圆面积）"""
+        if self.shape == 'circle':
+            return math.pi * self.width * self.width / 4
+        return self.width * self.depth
+
+    def sizes(self):
+        """返回矩形占位的摆放尺寸（允许旋转90度）；圆形为外接正方形"""
+        if self.shape == 'circle' or self.width == self.depth:
+            return [(self.width, self.depth)]
+        return [(self.width, self.depth), (self.depth, self.width)]
+
+
+class CrewPlacement:
+    """
+    站位求解结果
+
+    crew_count 为找到的站位数，是可站立人数的下界；upper_bound 为货物放在任意位置时人数的上界，
+    两者相等时 is_maximum 为真
+    """
+
+    def __init__(self, crew_count, positions, cargo_position, free_rects, upper_bound=None):
+        self.crew_count = crew_count
+        self.positions = positions  # [(x, y, 宽, 深), ...]，x沿电梯长度，y沿电梯宽度；圆形为外接正方形
+        self.cargo_position = cargo_position  # (x, y, 长, 宽) 或 None
+        self.free_rects = free_rects  # 摆放完人员后仍空闲的最大矩形
+        self.upper_bound = upper_bound
+
+    @property
+    def is_maximum(self):
+        return self.upper_bound is not None and self.crew_count >= self.upper_bound
+
+    def __repr__(self):
+        return (f"CrewPlacement(crew_count={self.crew_count}, upper_bound={self.upper_bound}, "
+                f"cargo_position={self.cargo_position})")
+
+
+_EPS = 1e-9
+
+
+def _split_free_rects(free_rects, used):
+    """MaxRects 切分：从空闲最大矩形集合中扣除已占用矩形"""
+    ux, uy, uw, uh = used
+    ux2, uy2 = ux + uw, uy + uh
+    result = []
+    for fx, fy, fw, fh in free_rects:
+        fx2, fy2 = fx + fw, fy + fh
+        if ux >= fx2 - _EPS or ux2 <= fx + _EPS or uy >= fy2 - _EPS or uy2 <= fy + _EPS:
+            result.append((fx, fy, fw, fh))
+            continue
+        if ux > fx + _EPS:
+            result.append((fx, fy, ux - fx, fh))
+        if ux2 < fx2 - _EPS:
+            result.append((ux2, fy, fx2 - ux2, fh))
+        if uy > fy + _EPS:
+            result.append((fx, fy, fw, uy - fy))
+        if uy2 < fy2 - _EPS:
+            result.append((fx, uy2, fw, fy2 - uy2))
+    return _prune_contained(result)
+
+
+def _prune_contained(rects):
+    """去除被其他矩形完全包含的空闲矩形"""
+    # 按面积从大到小排列，只需与已保留的较大矩形比较
+    rects = sorted(set(rects), key=lambda r: r[2] * r[3], reverse=True)
+    pruned = []
+    for ax, ay, aw, ah in rects:
+        for bx, by, bw, bh in pruned:
+            if (ax >= bx - _EPS and ay >= by - _EPS and
+                    ax + aw <= bx + bw + _EPS and ay + ah <= by + bh + _EPS):
+                break
+        else:
+            pruned.append((ax, ay, aw, ah))
+    return pruned
+
+
+def _cargo_positions(el, ew, cl, cw, gap, room=()):
+    """
+    货物候选位置：四个角落靠墙（保留安全间隙）以及居中
+
+    room 为人员占位尺寸，给出时货物还可离开墙壁恰好一排人员的距离，使人员站在货物与墙之间
+    """
+    xs = {gap, el - gap - cl}
+    ys = {gap, ew - gap - cw}
+    for size in room:
+        xs.update(x for x in (gap + size, el - gap - cl - size) if gap <= x <= el - gap - cl)
+        ys.update(y for y in (gap + size, ew - gap - cw - size) if gap <= y <= ew - gap - cw)
+    positions = [(x, y) for x in sorted(xs) for y in sorted(ys)]
+    positions.append(((el - cl) / 2, (ew - cw) / 2))
+    return positions
+
+
+def _grid_layouts(fw, fh, sizes):
+    """
+    空闲区内按行列整块摆放的方案，返回 [(人数, 余量, [(x, y, 宽, 深), ...]), ...]
+
+    站位坐标相对空闲区左下角、按行优先排列；余量为两个方向剩余尺寸较小者的相反数，人数相同时优先贴合
+    """
+    layouts = []
+    for pw, pd in sizes:
+        cols = int((fw + _EPS) // pw)
+        rows = int((fh + _EPS) // pd)
+        if cols and rows:
+            cells = [(c * pw, r * pd, pw, pd) for r in range(rows) for c in range(cols)]
+            layouts.append((cols * rows, -min(fw - cols * pw, fh - rows * pd), cells))
+    return layouts
+
+
+def _hex_layouts(fw, fh, diameter):
+    """
+    圆形占位的摆放方案：正方形网格，以及沿长或宽方向错行排列（行距 √3/2 直径，相邻行错开半个直径），
+    格式同 _grid_layouts，站位为圆的外接正方形
+    """
+    layouts = _grid_layouts(fw, fh, [(diameter, diameter)])
+    pitch = diameter * math.sqrt(3) / 2
+    for along_x in (True, False):
+        span, depth = (fw, fh) if along_x else (fh, fw)
+        if depth + _EPS < diameter + pitch:
+            continue  # 放不下两行，与正方形网格相同
+        rows = 1 + int((depth - diameter + _EPS) // pitch)
+        cells = []
+        for r in range(rows):
+            offset = diameter / 2 if r % 2 else 0.0
+            count = int((span - offset + _EPS) // diameter)
+            for c in range(count):
+                u, v = offset + c * diameter, r * pitch
+                cells.append((u, v, diameter, diameter) if along_x else (v, u, diameter, diameter))
+        if cells:
+            used_u = max(u for u, _, _, _ in cells) + diameter if along_x else \
+                max(u for _, u, _, _ in cells) + diameter
+            layouts.append((len(cells), -min(span - used_u, depth - (rows - 1) * pitch - diameter), cells))
+    return layouts
+
+
+def _pack_people(free_rects, footprint, limit):
+    """在空闲矩形中贪心摆放人员：每次选可容纳人数最多的空闲矩形，按整块方案摆放"""
+    sizes = footprint.sizes()
+    positions = []
+    while limit is None or len(positions) < limit:
+        best = None
+        for fx, fy, fw, fh in free_rects:
+            if footprint.shape == 'circle':
+                layouts = _hex_layouts(fw, fh, footprint.width)
+            else:
+                layouts = _grid_layouts(fw, fh, sizes)
+            for count, slack, cells in layouts:
+                score = (count, slack)
+                if best is None or score > best[0]:
+                    best = (score, fx, fy, cells)
+        if best is None:
+            break
+        _, fx, fy, cells = best
+        if limit is not None:
+            # 只摆放到限制人数为止
+            cells = cells[:limit - len(positions)]
+        block = [(fx + x, fy + y, w, d) for x, y, w, d in cells]
+        positions.extend(block)
+        used_w = max(x + w for x, _, w, _ in cells)
+        used_h = max(y + d for _, y, _, d in cells)
+        free_rects = _split_free_rects(free_rects, (fx, fy, used_w, used_h))
+    return positions, free_rects
+
+
+def crew_upper_bound(elevator_dims, cargo_footprint, footprint, safety_gap=0.05):
+    """
+    货物放在任意合法位置时可站立人数的上界
+
+    货物禁区（占地外扩安全间隙）完全位于轿厢内。与禁区不重叠的占位必在其长度方向两侧
+    （两侧剩余长度合计 lx）或宽度方向两侧（合计 ly）；剩余尺寸小于占位较短边的一侧站不下任何人。
+    人数不超过可用一侧（或两侧并集）的面积 / 单人占地面积
+    """
+    el, ew = elevator_dims[0], elevator_dims[1]
+    if cargo_footprint is None:
+        return max(0, int(el * ew / footprint.area + _EPS))
+    lx = el - cargo_footprint[0] - 2 * safety_gap
+    ly = ew - cargo_footprint[1] - 2 * safety_gap
+    thinnest = min(footprint.width, footprint.depth)
+    sides = lx * ew if lx + _EPS >= thinnest else 0.0
+    ends = ly * el if ly + _EPS >= thinnest else 0.0
+    free_area = sides + ends - lx * ly if sides and ends else sides + ends
+    return max(0, int(free_area / footprint.area + _EPS))
+
+
+def solve_crew_placement(elevator_dims, cargo_footprint, footprint, safety_gap=0.05, limit=None):
+    """
+    计算货物摆放后电梯内的可行站位（人数为下界，见模块说明；upper_bound 为上界）
+
+    参数:
+    - elevator_dims: (长, 宽) 或 (长, 宽, 高)
+    - cargo_footprint: 货物占地 (长, 宽)，为 None 时表示空电梯
+    - footprint: PersonFootprint 人员占位
+    - safety_gap: 货物四周安全间隙，人员不可站入
+    - limit: 达到该人数后提前结束
+
+    返回:
+    - CrewPlacement
+    """
+    el, ew = elevator_dims[0], elevator_dims[1]
+    upper_bound = crew_upper_bound(elevator_dims, cargo_footprint, footprint, safety_gap)
+    if cargo_footprint is None:
+        positions, free_rects = _pack_people([(0.0, 0.0, el, ew)], footprint, limit)
+        return CrewPlacement(len(positions), positions, None, free_rects, upper_bound)
+
+    best = None
+    for placement in _candidate_placements(elevator_dims, cargo_footprint, footprint, safety_gap, limit):
+        if best is None or placement.crew_count > best.crew_count:
+            best = placement
+            if best.crew_count >= upper_bound or limit is not None and best.crew_count >= limit:
+                break
+    best.upper_bound = upper_bound
+    return best
+
+
+def _candidate_placements(elevator_dims, cargo_footprint, footprint, safety_gap, limit=None, room=()):
+    """逐个货物候选位置求站位，依次产出 CrewPlacement（room 见 _cargo_positions）"""
+    el, ew = elevator_dims[0], elevator_dims[1]
+    cab_rect = [(0.0, 0.0, el, ew)]
+    cl, cw = cargo_footprint[0], cargo_footprint[1]
+    for x, y in _cargo_positions(el, ew, cl, cw, safety_gap, room):
+        # 货物禁区 = 货物占地外扩安全间隙，并裁剪到电梯范围内
+        zx, zy = max(0.0, x - safety_gap), max(0.0, y - safety_gap)
+        zx2, zy2 = min(el, x + cl + safety_gap), min(ew, y + cw + safety_gap)
+        free_rects = _split_free_rects(cab_rect, (zx, zy, zx2 - zx, zy2 - zy))
+        positions, remaining = _pack_people(free_rects, footprint, limit)
+        yield CrewPlacement(len(positions), positions, (x, y, cl, cw), remaining)
+
+
+def _pick_balanced(positions, count, cost):
+    """从可行站位中贪心挑选 count 个，每次加入使 cost(已选站位) 最小的一个"""
+    chosen, rest = [], list(positions)
+    while len(chosen) < count:
+        index = min(range(len(rest)), key=lambda i: cost(chosen + [rest[i]]))
+        chosen.append(rest.pop(index))
+    return chosen, rest
+
+
+def solve_balanced_placement(elevator_dims, cargo_footprint, footprint, num_people, eccentricity,
+                             safety_gap=0.05):
+    """
+    兼顾重心的站位求解：在能站下 num_people 人的货物候选位置中选综合偏心距最小的
+
+    参数:
+    - eccentricity: 函数 eccentricity(货物位置, 人员站位列表) -> 偏心距(米)
+    - 其余参数同 solve_crew_placement
+
+    返回的 positions 中前 num_people 个为选定的人员站位；
+    没有候选位置能站下 num_people 人时与 solve_crew_placement 相同
+    """
+    if cargo_footprint is None or num_people <= 0:
+        return solve_crew_placement(elevator_dims, cargo_footprint, footprint, safety_gap)
+    best, best_score, most = None, None, None
+    # 除角落和居中外，还尝试让人员站在货物与墙之间，便于两侧重量相互抵消
+    room = {footprint.width, footprint.depth}
+    for placement in _candidate_placements(elevator_dims, cargo_footprint, footprint, safety_gap, room=room):
+        if most is None or placement.crew_count > most.crew_count:
+            most = placement
+        if placement.crew_count < num_people:
+            continue
+        cargo_position = placement.cargo_position
+        chosen, rest = _pick_balanced(placement.positions, num_people,
+                                      lambda crew: eccentricity(cargo_position, crew))
+        score = eccentricity(cargo_position, chosen)
+        if best is None or score < best_score:
+            best = CrewPlacement(placement.crew_count, chosen + rest, cargo_position, placement.free_rects)
+            best_score = score
+    best = best if best is not None else most
+    best.upper_bound = crew_upper_bound(elevator_dims, cargo_footprint, footprint, safety_gap)
+    return best
+
+
+def crew_lower_bound(calculator, elevator_dims, cargo_footprint, shape='rect'):
+    """按计算器参数求空间限制下可站立人数的下界（替代面积除法估算）"""
+    footprint = PersonFootprint.from_calculator(calculator, shape)
+    return solve_crew_placement(elevator_dims, cargo_footprint, footprint, calculator.safety_gap).crew_count
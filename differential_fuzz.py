@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+差分模糊测试
+随机生成并偏向边界（恰好放入、安全间隙边缘、对角线边缘、门宽/门高边缘、限重边缘、人员空间边缘）的用例，
+用各快速引擎与参考路径 check_elevator_capacity 逐条比对，分歧自动收缩为最简用例，同时报告各引擎吞吐量
+"""
+
+import argparse
+import math
+import random
+import time
+
+from check_pipeline import CheckPipeline
+from elevator_calculator import ElevatorCalculator
+from exact_engine import SCALE, to_mm
+from incremental import IncrementalEvaluator
+from multi_policy import MultiPolicyEvaluator, SafetyPolicy
+from result_cache import ResultCache
+from route_chain import ElevatorCab
+
+
+BOUNDARY_MODES = ('exact_fit', 'gap_edge', 'diagonal_edge', 'door_edge', 'weight_edge', 'space_edge')
+
+_LIMITS = (400, 630, 800, 1000, 1275, 1600, 2000)
+_MM = 0.001
+_SUB_MM = (0.0004, 0.00005, 1e-7)  # 非整毫米用例的边界偏移，检验取整方向和浮点比较
+_FLOAT_TIE = 1e-9  # 浮点运算次序不同导致的舍入误差
+
+
+def _mm(value):
+    """取整到毫米网格，保证为正"""
+    return max(_MM, round(value, 3))
+
+
+def _copy_calculator(base, **overrides):
+    calculator = ElevatorCalculator()
+    calculator.__dict__.update(base.__dict__)
+    calculator.__dict__.update(overrides)
+    return calculator
+
+
+class CaseGenerator:
+    """
+    用例生成器
+
+    用法:
+        generator = CaseGenerator(calculator, seed=1, boundary_ratio=0.5)
+        elevator_specs, cargo_specs, num_people = generator.case()
+
+    boundary_ratio 为边界用例的比例，其余为均匀随机用例；
+    off_grid_ratio 为边界用例中不取整到毫米的比例，这些用例的边界偏移不足 1 毫米，其余尺寸取整到毫米
+    """
+
+    def __init__(self, calculator=None, seed=0, boundary_ratio=0.5, off_grid_ratio=0.3):
+        self.calculator = calculator or ElevatorCalculator()
+        self.random = random.Random(seed)
+        self.boundary_ratio = boundary_ratio
+        self.off_grid_ratio = off_grid_ratio
+        self.mode_counts = dict.fromkeys(('random',) + BOUNDARY_MODES, 0)
+        self.off_grid_count = 0
+        self._off_grid = False
+
+    def _random_case(self):
+        rnd = self.random
+        elevator = (_mm(rnd.uniform(0.8, 3.0)), _mm(rnd.uniform(0.8, 2.5)), _mm(rnd.uniform(1.8, 3.0)),
+                    rnd.choice(_LIMITS))
+        cargo = [_mm(rnd.uniform(0.05, 3.2)), _mm(rnd.uniform(0.05, 2.2)), _mm(rnd.uniform(0.05, 2.8)),
+                 round(rnd.uniform(1, 1500), 1)]
+        return elevator, cargo, rnd.randint(0, 6)
+
+    def _edge(self):
+        """边界偏移：恰好相等或相差 1 毫米；非整毫米用例相差不足 1 毫米"""
+        if self._off_grid:
+            return self.random.choice((-1, 0, 1)) * self.random.choice(_SUB_MM)
+        return self.random.choice((-_MM, 0.0, 0.0, _MM))
+
+    def _snap(self, value):
+        """贴合边界的尺寸：通常取整到毫米，非整毫米用例保留原值"""
+        return max(_MM, value) if self._off_grid else _mm(value)
+
+    def case(self):
+        rnd = self.random
+        elevator, cargo, num_people = self._random_case()
+        mode = 'random'
+        self._off_grid = False
+        if rnd.random() < self.boundary_ratio:
+            mode = rnd.choice(BOUNDARY_MODES)
+            self._off_grid = rnd.random() < self.off_grid_ratio
+            self.off_grid_count += self._off_grid
+            getattr(self, '_' + mode)(elevator, cargo)
+            avg_weight = self.calculator.person_avg_weight
+            if mode == 'space_edge':
+                num_people = self._people
+            elif mode in ('gap_edge', 'door_edge'):
+                # 其他约束留足余量，判定只取决于贴合的边界
+                num_people = 0
+            if mode == 'weight_edge':
+                # 重量边界偏移 ±1 克
+                cargo[3] = max(0.001, round(elevator[3] - num_people * avg_weight
+                                            + rnd.choice((-0.001, 0.0, 0.001)), 3))
+            elif mode != 'random' and elevator[3] > num_people * avg_weight:
+                cargo[3] = round(rnd.uniform(0.1, 0.9) * (elevator[3] - num_people * avg_weight), 1) or 0.1
+        self.mode_counts[mode] += 1
+        return elevator, tuple(cargo), num_people
+
+    def cases(self, count):
+        for _ in range(count):
+            yield self.case()
+
+    def _limits(self, elevator):
+        gap = self.calculator.safety_gap
+        return elevator[0] - 2 * gap, elevator[1] - 2 * gap, elevator[2] - gap
+
+    def _exact_fit(self, elevator, cargo):
+        """货物各边贴合扣除安全间隙后的可用空间"""
+        dims = [limit + self._edge() for limit in self._limits(elevator)]
+        self.random.shuffle(dims)
+        cargo[:3] = [self._snap(d) for d in dims]
+
+    def _gap_edge(self, elevator, cargo):
+        """只有一条边贴合可用空间中最长的一维，其余边较小，换方向也放不下更长的边"""
+        limits = self._limits(elevator)
+        axis = limits.index(max(limits))
+        dims = [_mm(min(limits) * self.random.uniform(0.2, 0.7)) for _ in limits]
+        dims[axis] = self._snap(limits[axis] + self._edge())
+        self.random.shuffle(dims)
+        cargo[:3] = dims
+
+    def _diagonal_edge(self, elevator, cargo):
+        """细长货物放不进任何常规方向，对角线长度与电梯空间对角线相当"""
+        el, ew, eh = elevator[:3]
+        target = math.sqrt(el * el + ew * ew + eh * eh)
+        cw, ch = _mm(self.random.uniform(0.02, 0.2)), _mm(self.random.uniform(0.02, 0.2))
+        cl = math.sqrt(max(target * target - cw * cw - ch * ch, _MM))
+        cargo[:3] = [self._snap(cl + self._edge()), cw, ch]
+
+    def _door_edge(self, elevator, cargo):
+        """原始方向可以放入，其宽或高贴合门宽或门高（门通行按选定方向的宽、高判定）"""
+        ew, eh = elevator[1], elevator[2]
+        door_width = ew * 0.8 - self.calculator.door_safety_gap
+        door_height = eh * 0.9
+        limits = self._limits(elevator)
+        dims = [_mm(self.random.uniform(0.1, 0.5) * min(limits)) for _ in range(3)]
+        axis = self.random.choice((1, 2))
+        dims[axis] = self._snap((door_width, door_height)[axis - 1] + self._edge())
+        cargo[:3] = dims
+
+    def _weight_edge(self, elevator, cargo):
+        """总重量恰好等于或略超限重（重量在 case() 中按人数确定）"""
+        limits = self._limits(elevator)
+        cargo[:3] = [_mm(self.random.uniform(0.2, 0.8) * limit) for limit in limits]
+
+    def _space_edge(self, elevator, cargo):
+        """
+        货物占地使剩余面积恰好等于（或差 1 毫米长度）所选人数的所需面积；
+        货物宽不超过门宽，原始方向可以放入（人数记入 self._people，在 case() 中使用）
+        """
+        el, ew = elevator[0], elevator[1]
+        space = self.calculator.person_min_space
+        max_l, max_w, max_h = self._limits(elevator)
+        door_width = ew * 0.8 - self.calculator.door_safety_gap
+        width = _mm(self.random.uniform(0.5, 0.95) * min(max_w, door_width))
+        people = max(0, math.ceil((el * ew - max_l * width) / space)) + self.random.randint(0, 2)
+        length = (el * ew - people * space) / width
+        self._people = people
+        cargo[:3] = [self._snap(length + self._edge()), width,
+                     _mm(self.random.uniform(0.2, 0.8) * min(max_h, elevator[2] * 0.9))]
+
+
+def constraint_slacks(calculator, case):
+    """
+    参考路径各判定约束的带符号余量，>= 0 表示满足
+
+    长度约束单位为米；人员面积按 (轿厢长 + 宽 + 货物长 + 宽) 折算为米，重量为千克。
+    方向约束取各方向最小余量中的最大值（所有方向都放不下才不满足），门和人员面积按首个可放入的方向计算
+    （与 select_best_orientation 一致）。登记门型、人员站位和重心检查不是闭式长度判定，不计入
+    """
+    (el, ew, eh, limit), (cl, cw, ch, weight), num_people = case
+    gap = calculator.safety_gap
+    orientations = ((cl, cw, ch), (cl, ch, cw), (cw, cl, ch), (cw, ch, cl), (ch, cl, cw), (ch, cw, cl))
+    per_orientation = [min(el - 2 * gap - l, ew - 2 * gap - w, eh - gap - h) for l, w, h in orientations]
+    best = max(per_orientation)
+    index = next((i for i, slack in enumerate(per_orientation) if slack >= 0), per_orientation.index(best))
+    l, w, h = orientations[index]
+    slacks = {
+        'orientation': best,
+        'diagonal': math.sqrt(el * el + ew * ew + eh * eh) - math.sqrt(cl * cl + cw * cw + ch * ch),
+        'weight': limit - weight - num_people * calculator.person_avg_weight,
+        'person_height': eh - calculator.person_height,
+    }
+    if (el, ew, eh) not in calculator.door_models:
+        door_width, door_height = ew * 0.8 - calculator.door_safety_gap, eh * 0.9
+        slacks['door_width'] = door_width - w
+        slacks['door_height'] = door_height - h
+        slacks['door_diagonal'] = math.hypot(door_width, door_height) - math.hypot(w, h)
+    if not calculator.use_crew_placement:
+        slacks['person_area'] = (el * ew - l * w - num_people * calculator.person_min_space) / (el + ew + l + w)
+    return slacks
+
+
+def boundary_slack(calculator, case, verdict=None):
+    """
+    使判定变为 verdict 需要翻转的约束中余量绝对值的最大者（取各种翻转方式中最小的），即用例距该判定多远
+
+    判定结构与 check_elevator_capacity 一致：没有可放入的方向时只看空间对角线，
+    否则门、重量、人员空间和高度须全部满足。verdict 为 None 时取按余量符号推得的判定的反面；
+    分歧用例的该值不超过引擎的判定精度时归为 float_edge，只有真正导致分歧的约束参与度量
+    """
+    slacks = constraint_slacks(calculator, case)
+    placed = [name for name in slacks if name not in ('orientation', 'diagonal')]
+
+    def cost(name, ok):
+        slack = slacks[name]
+        return 0.0 if (slack >= 0) == ok else abs(slack)
+
+    if verdict is None:
+        verdict = not (all(slacks[name] >= 0 for name in placed) if slacks['orientation'] >= 0
+                       else slacks['diagonal'] >= 0)
+    if verdict:
+        return min(max([cost('orientation', True)] + [cost(name, True) for name in placed]),
+                   max(cost('orientation', False), cost('diagonal', True)))
+    return min(max(cost('orientation', True), min(cost(name, False) for name in placed)),
+               max(cost('orientation', False), cost('diagonal', False)))
+
+
+_REFERENCE_UNITS = 10  # 量化参考路径的单位为 0.1 毫米：门宽 ×0.8、门高 ×0.9 后仍为整数
+
+
+def quantised_reference(calculator):
+    """
+    精确引擎的参考路径 reference(case) -> can_load
+
+    尺寸按精确引擎的方向取整到毫米（轿厢向下，货物、间隙、人员高度和每人所需面积向上），
+    再以 0.1 毫米为单位交给浮点路径判定。取整后各量以及门宽、门高、平方和都是 2^53 以内的整数，
+    浮点比较没有舍入误差，与精确引擎应逐条一致，不设容差
+    """
+    units = _REFERENCE_UNITS
+    reference = _copy_calculator(
+        calculator, engine='float', safety_gap=to_mm(calculator.safety_gap, True) * units,
+        door_safety_gap=to_mm(calculator.door_safety_gap, True) * units,
+        person_height=to_mm(calculator.person_height, True) * units,
+        person_min_space=to_mm(calculator.person_min_space, True, SCALE * SCALE) * units * units)
+
+    def run(case):
+        (el, ew, eh, limit), (cl, cw, ch, weight), num_people = case
+        elevator = tuple(to_mm(value) * units for value in (el, ew, eh)) + (limit,)
+        cargo = tuple(to_mm(value, True) * units for value in (cl, cw, ch)) + (weight,)
+        return reference.check_elevator_capacity(elevator, cargo, num_people)['can_load']
+    return run
+
+
+class Engine:
+    """
+    待比对的引擎
+
+    参数:
+    - name: 引擎名
+    - run: 函数 run(cases) -> [can_load, ...]，cases 为 [(电梯规格, 货物规格, 人数), ...]
+    - tolerance: 判定精度(米)，分歧用例距离边界（见 boundary_slack）不超过该值时视为浮点边界差异而非错误；
+      为 None 时任何分歧都是错误
+    - reference: 函数 reference(case) -> can_load，为 None 时与参考计算器的 check_elevator_capacity 比对
+    """
+
+    def __init__(self, name, run, tolerance=_FLOAT_TIE, reference=None):
+        self.name = name
+        self.run = run
+        self.tolerance = tolerance
+        self.reference = reference
+
+
+def default_engines(calculator):
+    """与 calculator 配置对应的全部快速引擎（不适用当前配置的引擎自动跳过）"""
+    engines = []
+
+    pipeline = CheckPipeline(calculator)
+    engines.append(Engine('pipeline', lambda cases: [pipeline.verdict(*case) for case in cases]))
+
+    def run_incremental(cases):
+        # 复用同一个评估器，顺带检验输入变化后的失效处理
+        evaluator = IncrementalEvaluator(calculator, *cases[0]) if cases else None
+        verdicts = []
+        for case in cases:
+            evaluator.update(*case)
+            verdicts.append(evaluator.result()['can_load'])
+        return verdicts
+    engines.append(Engine('incremental', run_incremental))
+
+    def run_cab(cases):
+        return [ElevatorCab(elevator, num_people, calculator).check(cargo)[0]
+                for elevator, cargo, num_people in cases]
+    engines.append(Engine('route_cab', run_cab))
+
+    cache = ResultCache(':memory:', calculator)
+    # 缓存键按微米量化，相差不足半微米的输入共用结果
+    engines.append(Engine('result_cache', lambda cases: [ok for ok, _ in cache.verdicts_many(cases)],
+                          tolerance=5e-7 + _FLOAT_TIE))
+
+    if (calculator.engine == 'float' and not calculator.use_crew_placement and not calculator.check_eccentricity
+            and not calculator.door_models):
+        exact = _copy_calculator(calculator, engine='exact')
+        # 整数毫米引擎与按毫米取整的参考路径逐条比对，不设容差（站位、重心和登记门型无法换算单位，此时跳过）
+        engines.append(Engine('exact', lambda cases: [exact.check_elevator_capacity(*case)['can_load']
+                                                      for case in cases],
+                              tolerance=None, reference=quantised_reference(calculator)))
+
+    if calculator.engine == 'float' and not calculator.use_crew_placement and not calculator.door_models:
+        evaluator = MultiPolicyEvaluator(calculator)
+        policies = [SafetyPolicy.from_calculator(calculator)]
+
+        def run_policies(cases):
+            return [bool(evaluator.evaluate([elevator], [cargo], policies, num_people).verdict(0, 0, 0))
+                    for elevator, cargo, num_people in cases]
+        engines.append(Engine('multi_policy', run_policies))
+    return engines
+
+
+_SHRINK_STEPS = (lambda v: round(v, 1), lambda v: round(v, 2), lambda v: float(round(v)))
+
+
+def shrink(case, fails, max_rounds=50):
+    """
+    贪心收缩分歧用例：逐个字段尝试更简单的取值（更少的小数位、更少的人数），仍然分歧则保留
+
+    参数:
+    - fails: 函数 fails(case) -> 是否仍为分歧
+    """
+    values = list(case[0]) + list(case[1]) + [case[2]]
+
+    def build(vals):
+        return tuple(vals[0:4]), tuple(vals[4:8]), vals[8]
+
+    for _ in range(max_rounds):
+        changed = False
+        for index, value in enumerate(values):
+            if index == 8:
+                candidates = [n for n in (0, 1, value - 1) if 0 <= n < value]
+            else:
+                candidates = [step(value) for step in _SHRINK_STEPS]
+            for candidate in candidates:
+                if candidate == value or candidate <= 0 and index != 8:
+                    continue
+                trial = values[:index] + [candidate] + values[index + 1:]
+                if fails(build(trial)):
+                    values = trial
+                    changed = True
+                    break
+        if not changed:
+            break
+    return build(values)
+
+
+class Disagreement:
+    """引擎与参考路径的一条分歧"""
+
+    def __init__(self, engine, case, expected, shrunk):
+        self.engine = engine
+        self.case = case
+        self.expected = expected
+        self.shrunk = shrunk
+
+    def __repr__(self):
+        return (f"Disagreement({self.engine}: 参考={self.expected} 原始用例={self.case} "
+                f"最简用例={self.shrunk})")
+
+
+class FuzzReport:
+    """差分测试报告"""
+
+    def __init__(self, engine_names):
+        self.cases = 0
+        self.reference_time = 0.0
+        self.times = dict.fromkeys(engine_names, 0.0)
+        self.float_edges = dict.fromkeys(engine_names, 0)
+        self.mismatch_counts = dict.fromkeys(engine_names, 0)
+        self.disagreements = []  # 收缩后的分歧（每个引擎最多 max_failures 条）
+        self.mode_counts = {}
+        self.off_grid = 0  # 非整毫米的边界用例数
+
+    @property
+    def ok(self):
+        return not any(self.mismatch_counts.values())
+
+    def throughput(self, name=None):
+        """每秒用例数，name 为 None 时为参考路径"""
+        seconds = self.reference_time if name is None else self.times[name]
+        return self.cases / seconds if seconds else float('inf')
+
+    def summary(self):
+        lines = [f"用例数: {self.cases}  参考路径: {self.throughput():,.0f} 例/秒"]
+        for name in self.times:
+            lines.append(f"  {name:<13} {self.throughput(name):>12,.0f} 例/秒  "
+                         f"分歧 {self.mismatch_counts[name]}  浮点边界 {self.float_edges[name]}")
+        for disagreement in self.disagreements:
+            lines.append(f"  {disagreement}")
+        return '\n'.join(lines)
+
+
+def run_fuzz(count, seed=0, calculator=None, engines=None, batch_size=10000, boundary_ratio=0.5,
+             max_failures=5):
+    """
+    运行差分测试
+
+    参数:
+    - count: 用例总数
+    - calculator: 参考计算器（各引擎使用相同配置）
+    - engines: Engine 列表，默认 default_engines(calculator)
+    - batch_size: 每批生成和计时的用例数
+    - max_failures: 每个引擎最多收缩并记录的分歧条数
+
+    返回:
+    - FuzzReport
+    """
+    calculator = calculator or ElevatorCalculator()
+    engines = default_engines(calculator) if engines is None else list(engines)
+    generator = CaseGenerator(calculator, seed, boundary_ratio)
+    report = FuzzReport([engine.name for engine in engines])
+
+    def reference(case):
+        return calculator.check_elevator_capacity(*case)['can_load']
+
+    def excused(engine, case, verdict):
+        return engine.tolerance is not None and boundary_slack(calculator, case, verdict) <= engine.tolerance
+
+    done = 0
+    while done < count:
+        cases = list(generator.cases(min(batch_size, count - done)))
+        done += len(cases)
+        start = time.perf_counter()
+        expected = [reference(case) for case in cases]
+        report.reference_time += time.perf_counter() - start
+
+        for engine in engines:
+            start = time.perf_counter()
+            verdicts = engine.run(cases)
+            report.times[engine.name] += time.perf_counter() - start
+            engine_reference = engine.reference or reference
+            wanted = expected if engine.reference is None else [engine.reference(case) for case in cases]
+            for case, want, got in zip(cases, wanted, verdicts):
+                got = bool(got)
+                if got == want:
+                    continue
+                if excused(engine, case, got):
+                    report.float_edges[engine.name] += 1
+                    continue
+                report.mismatch_counts[engine.name] += 1
+                if report.mismatch_counts[engine.name] <= max_failures:
+                    def fails(trial, engine=engine, engine_reference=engine_reference):
+                        verdict = bool(engine.run([trial])[0])
+                        return verdict != engine_reference(trial) and not excused(engine, trial, verdict)
+                    report.disagreements.append(Disagreement(engine.name, case, want, shrink(case, fails)))
+    report.cases = done
+    report.mode_counts = dict(generator.mode_counts)
+    report.off_grid = generator.off_grid_count
+    return report
+
+
+def main(argv=None):
+    """命令行：python differential_fuzz.py --cases 1000000 [--seed 1] [--engine exact] [--crew]"""
+    parser = argparse.ArgumentParser(description="快速引擎与参考路径的差分模糊测试")
+    parser.add_argument('--cases', type=int, default=100000, help="用例总数")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch', type=int, default=10000, help="每批用例数")
+    parser.add_argument('--boundary', type=float, default=0.5, help="边界用例比例")
+    parser.add_argument('--engine', choices=['float', 'exact'], default='float', help="参考计算器的判定引擎")
+    parser.add_argument('--crew', action='store_true', help="启用人员站位求解")
+    args = parser.parse_args(argv)
+
+    calculator = ElevatorCalculator()
+    calculator.engine = args.engine
+    calculator.use_crew_placement = args.crew
+    report = run_fuzz(args.cases, args.seed, calculator, batch_size=args.batch, boundary_ratio=args.boundary)
+    print(report.summary())
+    print("用例分布: " + ', '.join(f"{mode}={n}" for mode, n in report.mode_counts.items())
+          + f"（其中非整毫米边界用例 {report.off_grid}）")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
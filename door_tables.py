@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+电梯门通行查表
+按真实门宽、门高和候梯厅进深，为每个门型预先计算 货物截面 -> 最大可通过长度 表，
+门通行检查变为查表；表可按门型缓存到磁盘
+"""
+
+import hashlib
+import math
+import os
+import struct
+from array import array
+
+
+TABLE_VERSION = 1
+TABLE_STEP = 0.01  # 表格分辨率(米)
+
+_MAGIC = b'ELVDOOR\0'
+_HEADER = struct.Struct('<8sIIId')  # 魔数、版本、宽方向格数、高方向格数、分辨率
+
+_JUMP = 10 * TABLE_STEP  # 格内落差超过该值视为跨越分界，改为精确计算
+
+_tables = {}  # 进程内缓存：门型指纹 -> DoorTable
+
+
+class DoorModel:
+    """
+    电梯门型
+
+    参数:
+    - width: 门净宽(米)
+    - height: 门净高(米)
+    - landing_depth: 候梯厅进深(米)，即货物在门外可用于转向的空间
+    """
+
+    def __init__(self, width, height, landing_depth, name=None):
+        if width <= 0 or height <= 0 or landing_depth <= 0:
+            raise ValueError("门宽、门高和候梯厅进深必须为正数")
+        self.width = width
+        self.height = height
+        self.landing_depth = landing_depth
+        self.name = name or f"{width}x{height}m/厅{landing_depth}m"
+
+    def fingerprint(self):
+        return f"door({self.width!r},{self.height!r},{self.landing_depth!r},step={TABLE_STEP!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, DoorModel) and self.fingerprint() == other.fingerprint()
+
+    def __hash__(self):
+        return hash(self.fingerprint())
+
+    def __repr__(self):
+        return f"DoorModel({self.width}, {self.height}, {self.landing_depth})"
+
+
+def rectangle_fits(p, q, a, b):
+    """
+    p×q 矩形能否（允许平面内任意旋转）放入 a×b 矩形（Carver 条件）
+    """
+    if p < q:
+        p, q = q, p
+    if a < b:
+        a, b = b, a
+    if p <= a and q <= b:
+        return True
+    if q > b:
+        return False
+    diagonal2 = p * p + q * q
+    return b * diagonal2 >= 2 * p * q * a + (p * p - q * q) * math.sqrt(diagonal2 - a * a)
+
+
+def corner_length(a, b, thickness):
+    """
+    厚度为 thickness 的长条货物能水平转过 宽a 与 宽b 两条通道直角拐角的最大长度
+
+    L(θ) = a/sinθ + b/cosθ - thickness/(sinθ·cosθ) 在 (0, π/2) 上的最小值
+    """
+    if thickness >= min(a, b):
+        return 0.0
+
+    def length(theta):
+        s, c = math.sin(theta), math.cos(theta)
+        return a / s + b / c - thickness / (s * c)
+
+    # 先粗采样定位最小值所在区间，再用黄金分割细化
+    samples = 64
+    step = (math.pi / 2) / samples
+    best = min(range(1, samples), key=lambda i: length(i * step))
+    lo, hi = (best - 1) * step or 1e-6, (best + 1) * step
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(40):
+        m1, m2 = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        if length(m1) < length(m2):
+            hi = m2
+        else:
+            lo = m1
+    return max(0.0, length((lo + hi) / 2))
+
+
+def max_passable_length(door, cross_width, cross_height):
+    """
+    截面为 宽×高 的货物能通过该门的最大长度（0 表示截面无法通过）
+
+    截面允许在门洞平面内旋转（倾斜通过）；长度受候梯厅转向限制：
+    货物可在厅内垂直于门直接推入（长度不超过厅进深），或沿厅水平转入门洞。
+    转入按门洞宽度作为第二条通道计算，未计入轿厢内的额外空间，结果偏保守。
+    """
+    if not rectangle_fits(cross_width, cross_height, door.width, door.height):
+        return 0.0
+    thickness = _turn_thickness(door, cross_width, cross_height)
+    return max(door.landing_depth, corner_length(door.landing_depth, door.width, thickness))
+
+
+def _turn_thickness(door, cross_width, cross_height):
+    """水平转向时占用的厚度：正放取截面宽，侧放取截面高，需要旋转才能通过时按整个门宽计"""
+    thicknesses = []
+    if cross_width <= door.width and cross_height <= door.height:
+        thicknesses.append(cross_width)
+    if cross_height <= door.width and cross_width <= door.height:
+        thicknesses.append(cross_height)
+    return min(thicknesses) if thicknesses else door.width
+
+
+class DoorTable:
+    """门型的 截面(宽, 高) -> 最大可通过长度 表，按 TABLE_STEP 网格存储"""
+
+    def __init__(self, door, columns, rows, values):
+        self.door = door
+        self.columns = columns  # 截面宽方向格点数
+        self.rows = rows  # 截面高方向格点数
+        self.values = values  # array('f')，下标 宽格 × rows + 高格
+
+    @classmethod
+    def build(cls, door):
+        """预计算整张表，转向长度只依赖厚度，按厚度缓存"""
+        extent = math.hypot(door.width, door.height)
+        columns = rows = int(extent / TABLE_STEP) + 2
+        corner_cache = {}
+        values = array('f', bytes(4 * columns * rows))
+        for i in range(columns):
+            w = i * TABLE_STEP
+            for j in range(rows):
+                t = j * TABLE_STEP
+                if not rectangle_fits(w, t, door.width, door.height):
+                    continue
+                thickness = _turn_thickness(door, w, t)
+                length = corner_cache.get(thickness)
+                if length is None:
+                    length = corner_cache[thickness] = max(
+                        door.landing_depth, corner_length(door.landing_depth, door.width, thickness))
+                values[i * rows + j] = length
+        return cls(door, columns, rows, values)
+
+    def lookup(self, cross_width, cross_height):
+        """
+        查表取保守值（下界）
+
+        表值随截面宽、高单调不增，取所在格较大一角 (i+1, j+1) 的值，不会高估可通过长度；
+        四个相邻格点中有无法通过的格点（可通过边界附近），
+        或格内落差远大于正常斜率（正放/旋转通过的分界处）时，改为直接精确计算
+        """
+        x, y = cross_width / TABLE_STEP, cross_height / TABLE_STEP
+        i, j = int(x), int(y)
+        if x < 0 or y < 0 or i + 1 >= self.columns or j + 1 >= self.rows:
+            return max_passable_length(self.door, cross_width, cross_height)
+        rows, values = self.rows, self.values
+        v00, v11 = values[i * rows + j], values[(i + 1) * rows + j + 1]
+        if not v11 or v00 - v11 > _JUMP:
+            return max_passable_length(self.door, cross_width, cross_height)
+        return v11
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, TABLE_VERSION, self.columns, self.rows, TABLE_STEP))
+            f.write(self.values.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, door, path):
+        with open(path, 'rb') as f:
+            magic, version, columns, rows, step = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != TABLE_VERSION or step != TABLE_STEP:
+                raise ValueError(f"{path} 不是当前版本的门通行表")
+            values = array('f')
+            values.frombytes(f.read())
+        if len(values) != columns * rows:
+            raise ValueError(f"{path} 数据不完整")
+        return cls(door, columns, rows, values)
+
+
+def door_table(door, cache_dir=None):
+    """
+    获取门型的通行表：先查进程内缓存，再查磁盘缓存，都没有时计算并写入缓存
+
+    磁盘文件名由门型参数和表格版本导出，参数变化后自动使用新文件
+    """
+    key = door.fingerprint()
+    table = _tables.get(key)
+    if table is not None:
+        return table
+    path = None
+    if cache_dir:
+        digest = hashlib.sha1(f"{TABLE_VERSION}|{key}".encode('utf-8')).hexdigest()[:16]
+        path = os.path.join(cache_dir, f"door_{digest}.tbl")
+        if os.path.exists(path):
+            try:
+                table = DoorTable.load(door, path)
+            except (ValueError, struct.error):
+                table = None
+    if table is None:
+        table = DoorTable.build(door)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            table.save(path)
+    _tables[key] = table
+    return table
@@ -7,7 +7,76 @@
 
 import math
 
+from cab_geometry import CabGeometry
+from cab_models import MODELS, get_model, resolve_specs
+from door_tables import DoorModel, door_table
+from exact_engine import SCALE, decide_any_orientation, decide_area, decide_diagonal, decide_door, \
+    decide_orientations, snap_dims, to_mm
+from yaw_fit import best_yaw
+
+# 问题代码（位掩码），用于批量结果的紧凑存储和多策略判定矩阵
+ISSUE_INVALID_INPUT = 1 << 0    # 尺寸/重量/人数参数无效
+ISSUE_DIAGONAL = 1 << 1         # 货物对角线超过电梯空间对角线
+ISSUE_DOOR_WIDTH = 1 << 2       # 货物宽度超过门宽
+ISSUE_DOOR_HEIGHT = 1 << 3      # 货物高度超过门高
+ISSUE_DOOR_DIAGONAL = 1 << 4    # 货物截面对角线超过门对角线
+ISSUE_WEIGHT = 1 << 5           # 重量超过电梯限重
+ISSUE_PERSON_SPACE = 1 << 6     # 剩余空间不足人员站立
+ISSUE_PERSON_HEIGHT = 1 << 7    # 电梯高度不足人员站立
+ISSUE_DOOR_TURN = 1 << 8        # 货物过长，无法从候梯厅转入门口
+ISSUE_ECCENTRICITY = 1 << 9     # 综合重心偏移超过允许偏心距
+
+# 问题类型 -> (问题代码, 描述模板)；问题在产生处按类型生成，代码随描述一起记录
+ISSUE_MESSAGES = {
+    'invalid_value': (ISSUE_INVALID_INPUT, "所有尺寸和重量参数必须为正数"),
+    'negative_people': (ISSUE_INVALID_INPUT, "人员数量不能为负数"),
+    'diagonal': (ISSUE_DIAGONAL, "货物对角线 {cargo:.2f}m 超过电梯空间 {limit:.2f}m"),
+    'door_width': (ISSUE_DOOR_WIDTH, "货物宽度 {cargo:.2f}m 超过{door}宽 {limit:.2f}m"),
+    'door_height': (ISSUE_DOOR_HEIGHT, "货物高度 {cargo:.2f}m 超过{door}高 {limit:.2f}m"),
+    'door_diagonal': (ISSUE_DOOR_DIAGONAL, "货物对角线 {cargo:.2f}m 超过门对角线 {limit:.2f}m"),
+    'door_turn': (ISSUE_DOOR_TURN, "货物长度 {cargo:.2f}m 超过门口可转入长度 {limit:.2f}m"),
+    'cargo_weight': (ISSUE_WEIGHT, "货物重量 {weight}kg 超过电梯限重 {limit}kg"),
+    'total_weight': (ISSUE_WEIGHT, "总重量 {weight}kg (货物+{people}人) 超过电梯限重 {limit}kg"),
+    'crew_space': (ISSUE_PERSON_SPACE, "剩余空间仅可站立 {crew}人，不足 {people}人"),
+    'person_area': (ISSUE_PERSON_SPACE, "剩余空间 {area:.2f}㎡ 不足 {people}人 所需 {needed:.2f}㎡"),
+    'person_height': (ISSUE_PERSON_HEIGHT, "电梯高度 {height}m 不足人员站立 {needed}m"),
+    'eccentricity': (ISSUE_ECCENTRICITY, "重心偏移 {eccentricity:.2f}m 超过允许偏心距 {limit:.2f}m"),
+}
+
+
+class Issue(str):
+    """
+    带问题代码的问题描述，可直接当作字符串使用
+
+    用法: Issue('door_width', cargo=1.2, door='门', limit=1.0)
+    """
+
+    def __new__(cls, kind, **values):
+        code, template = ISSUE_MESSAGES[kind]
+        issue = super().__new__(cls, template.format(**values))
+        issue.code = code
+        return issue
+
+
+def issue_mask(result):
+    """评估结果的问题代码位掩码（由 result['issue_codes'] 合并）"""
+    mask = 0
+    for code in result['issue_codes']:
+        mask |= code
+    return mask
+
+
+def _seal_issues(results):
+    """问题列表转为普通字符串（便于序列化），代码另存于 issue_codes"""
+    issues = results['issues']
+    results['issue_codes'] = [issue.code for issue in issues]
+    results['issues'] = [str(issue) for issue in issues]
+    return results
+
 class ElevatorCalculator:
+    # 判定逻辑版本：修改判定规则时递增，持久化结果缓存据此失效
+    RULE_VERSION = 5
+    
     def __init__(self):
         # 安全间隙参数 (米)
         self.safety_gap = 0.05  # 四周预留5cm安全间隙
@@ -18,7 +87,24 @@ class ElevatorCalculator:
         self.person_avg_weight = 75  # 单人平均重量(kg)
         self.person_min_space = 0.4  # 单人最小占用空间(平方米)
         self.person_height = 1.8  # 人员高度(米)
-        self.min_operation_space = 0.6  # 最小操作空间(米) - 人员活动空间
+        self.min_operation_space = 0.6  # 最小操作空间(米) - 人员活动空间，站位求解时为每人占位的最小进深
+        
+        # 人员站位求解 (启用后按实际可站立位置计算空间限制人数，替代面积除法估算)
+        self.use_crew_placement = False
+        self.person_shape = 'rect'  # 人员占位形状: 'rect' 或 'circle'
+        self.person_width = 0.5  # 站立占位宽度(米)，约为肩宽
+        self.person_depth = 0.35  # 站立占位进深(米)，约为体厚加少量前后余量
+        
+        # 几何判定引擎: 'float' 按米浮点比较；'exact' 按整数毫米比较，恰好贴合时不受浮点误差影响
+        self.engine = 'float'
+        
+        # 重心检查 (允许偏心距 = 轿厢短边 × 比例；启用后按人员站位求解的实际位置计算综合重心)
+        self.max_eccentricity_ratio = 0.1
+        self.check_eccentricity = False
+        
+        # 门型登记 (电梯尺寸 -> DoorModel)，登记后门通行检查改为查预计算的通行表
+        self.door_models = {}
+        self.door_table_dir = None  # 通行表磁盘缓存目录，None 时只在进程内缓存
         
     def calculate_3d_diagonal(self, length, width, height):
         """计算3D空间对角线长度"""
@@ -46,25 +132,44 @@ class ElevatorCalculator:
         ]
         
         valid_orientations = []
-        
-        for l, w, h in orientations:
+        if self.engine == 'exact':
+            decided = decide_orientations(elevator_dims, cargo_dims, self.safety_gap)
+            fitting = [orientation for orientation, fits in zip(orientations, decided) if fits]
+        else:
             # 考虑安全间隙后的有效尺寸
-            effective_l = l + 2 * self.safety_gap
-            effective_w = w + 2 * self.safety_gap
-            effective_h = h + self.safety_gap
-            
-            if effective_l <= el and effective_w <= ew and effective_h <= eh:
-                volume_util = (l * w * h) / (el * ew * eh) * 100
-                valid_orientations.append({
-                    'orientation': (l, w, h),
-                    'volume_utilization': volume_util,
-                    'length_util': (l / el) * 100,
-                    'width_util': (w / ew) * 100,
-                    'height_util': (h / eh) * 100
-                })
+            gap = self.safety_gap
+            fitting = [(l, w, h) for l, w, h in orientations
+                       if l + 2 * gap <= el and w + 2 * gap <= ew and h + gap <= eh]
+        if not fitting:
+            return valid_orientations
+        
+        # 体积利用率与方向无关，只算一次：各方向的值完全相同，最佳方向即首个可放入的方向，
+        # 不会因乘法次序的浮点舍入而改变
+        volume_util = (cl * cw * ch) / (el * ew * eh) * 100
+        
+        for l, w, h in fitting:
+            valid_orientations.append({
+                'orientation': (l, w, h),
+                'volume_utilization': volume_util,
+                'length_util': (l / el) * 100,
+                'width_util': (w / ew) * 100,
+                'height_util': (h / eh) * 100
+            })
         
         return valid_orientations
     
+    def has_valid_orientation(self, elevator_dims, cargo_dims):
+        """是否存在可放入的摆放方向（与 check_all_orientations 判定一致，但不生成利用率明细）"""
+        if self.engine == 'exact':
+            return decide_any_orientation(elevator_dims, cargo_dims, self.safety_gap)
+        el, ew, eh = elevator_dims
+        cl, cw, ch = cargo_dims
+        gap = self.safety_gap
+        for l, w, h in ((cl, cw, ch), (cl, ch, cw), (cw, cl, ch), (cw, ch, cl), (ch, cl, cw), (ch, cw, cl)):
+            if l + 2 * gap <= el and w + 2 * gap <= ew and h + gap <= eh:
+                return True
+        return False
+    
     def check_diagonal_fit(self, elevator_dims, cargo_dims):
         """检查对角线是否超出"""
         el, ew, eh = elevator_dims
@@ -76,63 +181,370 @@ class ElevatorCalculator:
         # 计算货物对角线
         cargo_diagonal = self.calculate_3d_diagonal(cl, cw, ch)
         
+        if self.engine == 'exact':
+            # 对角线长度仅用于提示信息，判定比较整数平方和
+            return decide_diagonal(elevator_dims, cargo_dims), cargo_diagonal, elevator_diagonal
         return cargo_diagonal <= elevator_diagonal, cargo_diagonal, elevator_diagonal
     
+    def check_yaw_fit(self, elevator_dims, cargo_dims):
+        """
+        货物立放后在地面上转任意角度能否放下（闭式解，见 yaw_fit.py），四周留安全间隙
+        
+        返回间隙最大的 yaw_fit.YawFit，任何竖直方向和转角都放不下时返回 None；
+        精确引擎下尺寸先按保守方向落到整毫米再求解
+        """
+        if self.engine == 'exact':
+            return best_yaw(snap_dims(elevator_dims), snap_dims(cargo_dims, True),
+                            to_mm(self.safety_gap, True) / SCALE)
+        return best_yaw(tuple(elevator_dims), tuple(cargo_dims), self.safety_gap)
+    
+    def register_door(self, elevator_dims, door_model):
+        """为指定尺寸的电梯登记真实门型"""
+        self.door_models[tuple(elevator_dims)] = door_model
+    
+    def door_opening(self, elevator_dims, door_width_ratio=0.8):
+        """门通行检查采用的净门洞 (宽, 高)：登记了门型时为门型尺寸扣除门口安全间隙，否则按梯宽比例和梯高估算"""
+        door_model = self.door_models.get(tuple(elevator_dims))
+        if door_model is not None:
+            return door_model.width - self.door_safety_gap, door_model.height - self.door_safety_gap
+        # 门高度通常略低于电梯高度
+        return elevator_dims[1] * door_width_ratio - self.door_safety_gap, elevator_dims[2] * 0.9
+    
     def check_door_access(self, elevator_dims, cargo_dims, door_width_ratio=0.8):
         """检查电梯门通行能力"""
         el, ew, eh = elevator_dims
         cl, cw, ch = cargo_dims
         
-        door_width = ew * door_width_ratio - self.door_safety_gap
-        door_height = eh * 0.9  # 门高度通常略低于电梯高度
+        door_model = self.door_models.get(tuple(elevator_dims))
+        if door_model is not None:
+            return self.check_door_model(door_model, cargo_dims)
+        
+        door_width, door_height = self.door_opening(elevator_dims, door_width_ratio)
+        
+        if self.engine == 'exact':
+            # 对角线长度仅用于提示信息，判定比较平方和，只在不通过时才开方
+            width_ok, height_ok, diagonal_ok = decide_door(elevator_dims, cargo_dims, self.door_safety_gap,
+                                                           int(round(door_width_ratio * 1000)))
+        else:
+            # 检查对角线通过门的情况
+            door_diagonal = self.calculate_2d_diagonal(door_width, door_height)
+            cargo_face_diagonal = self.calculate_2d_diagonal(cw, ch)
+            width_ok = cw <= door_width
+            height_ok = ch <= door_height
+            diagonal_ok = cargo_face_diagonal <= door_diagonal
         
         # 检查货物能否通过门
         issues = []
-        if cw > door_width:
-            issues.append(f"货物宽度 {cw:.2f}m 超过门宽 {door_width:.2f}m")
-        if ch > door_height:
-            issues.append(f"货物高度 {ch:.2f}m 超过门高 {door_height:.2f}m")
+        if not width_ok:
+            issues.append(Issue('door_width', cargo=cw, door='门', limit=door_width))
+        if not height_ok:
+            issues.append(Issue('door_height', cargo=ch, door='门', limit=door_height))
         
-        # 检查对角线通过门的情况
-        door_diagonal = self.calculate_2d_diagonal(door_width, door_height)
-        cargo_face_diagonal = self.calculate_2d_diagonal(cw, ch)
-        
-        if cargo_face_diagonal > door_diagonal:
-            issues.append(f"货物对角线 {cargo_face_diagonal:.2f}m 超过门对角线 {door_diagonal:.2f}m")
+        if not diagonal_ok:
+            issues.append(Issue('door_diagonal', cargo=self.calculate_2d_diagonal(cw, ch),
+                                limit=self.calculate_2d_diagonal(door_width, door_height)))
         
         return len(issues) == 0, issues, door_width, door_height
     
-    def check_weight_distribution(self, cargo_weight, elevator_limit, cargo_dims, elevator_dims):
-        """检查重量分布和重心"""
+    def check_door_model(self, door_model, cargo_dims):
+        """
+        按登记门型查表检查通行：截面可在门洞内倾斜通过，长度不超过从候梯厅转入的最大长度
+        
+        门宽、门高各扣除门口安全间隙后查表；精确引擎下门洞和转入长度的比较按整数毫米进行
+        """
         cl, cw, ch = cargo_dims
-        el, ew, eh = elevator_dims
+        gap = self.door_safety_gap
+        door_width, door_height = door_model.width - gap, door_model.height - gap
+        if door_width <= 0 or door_height <= 0:
+            max_length = 0.0
+        else:
+            clear = DoorModel(door_width, door_height, door_model.landing_depth, door_model.name)
+            max_length = door_table(clear, self.door_table_dir).lookup(cw, ch)
+        
+        if self.engine == 'exact':
+            width_over = to_mm(cw, True) > to_mm(door_model.width) - to_mm(gap, True)
+            height_over = to_mm(ch, True) > to_mm(door_model.height) - to_mm(gap, True)
+            length_over = to_mm(cl, True) > to_mm(max_length)
+        else:
+            width_over, height_over, length_over = cw > door_width, ch > door_height, cl > max_length
         
         issues = []
+        if max_length <= 0:
+            if width_over:
+                issues.append(Issue('door_width', cargo=cw, door='门', limit=door_width))
+            if height_over:
+                issues.append(Issue('door_height', cargo=ch, door='门', limit=door_height))
+        elif length_over:
+            issues.append(Issue('door_turn', cargo=cl, limit=max_length))
+        
+        return len(issues) == 0, issues, door_width, door_height
+    
+    def check_weight_distribution(self, cargo_weight, elevator_limit, cargo_dims, elevator_dims):
+        """检查总重是否超过限重，返回 (问题列表, 重量利用率%)；重心由 check_load_balance 检查"""
+        issues = []
         
         # 重量检查
         if cargo_weight > elevator_limit:
-            issues.append(f"货物重量 {cargo_weight}kg 超过电梯限重 {elevator_limit}kg")
+            issues.append(Issue('cargo_weight', weight=cargo_weight, limit=elevator_limit))
         
         # 计算重量利用率
         weight_util = (cargo_weight / elevator_limit) * 100
         
-        # 重心偏移检查 (简化计算)
-        max_eccentricity = min(el, ew) * 0.1  # 允许10%的偏心距
+        return issues, weight_util
+    
+    def analyze_load_distribution(self, elevator_dims, cargo_position, cargo_weight, crew_positions=(),
+                                  cell=None):
+        """
+        由货物位置 (x, y, 长, 宽) 和人员站位分析综合重心与地板压强
         
-        return issues, weight_util, max_eccentricity
+        cell 为压强网格单元尺寸(米)，为 None 时只计算重心
+        """
+        from load_distribution import analyze_load, crew_loads
+        el, ew = elevator_dims[0], elevator_dims[1]
+        loads = [tuple(cargo_position) + (cargo_weight,)]
+        loads.extend(crew_loads(crew_positions, self.person_avg_weight))
+        return analyze_load((el, ew), loads, min(el, ew) * self.max_eccentricity_ratio, cell)
+    
+    def plan_crew_positions(self, elevator_dims, cargo_footprint, num_people=None, cargo_weight=None):
+        """
+        求解货物周围的人员站位，返回 CrewPlacement
+
+        启用重心检查且给出人数和货物重量时，在能站下全部人员的货物位置中选综合偏心距最小的，
+        positions 的前 num_people 个为选定站位
+        """
+        from crew_placement import PersonFootprint, solve_balanced_placement, solve_crew_placement
+        footprint = PersonFootprint.from_calculator(self, self.person_shape)
+        gap = self.safety_gap
+        if self.engine == 'exact':
+            # 精确引擎下轿厢、货物占地和间隙按保守方向落到整毫米再求解
+            elevator_dims = snap_dims(elevator_dims)
+            cargo_footprint = snap_dims(cargo_footprint, True)
+            gap = to_mm(gap, True) / SCALE
+        if not self.check_eccentricity or num_people is None or cargo_weight is None:
+            return solve_crew_placement(elevator_dims, cargo_footprint, footprint, gap)
+
+        def eccentricity(cargo_position, crew):
+            return self.analyze_load_distribution(elevator_dims, cargo_position, cargo_weight, crew).eccentricity
+
+        return solve_balanced_placement(elevator_dims, cargo_footprint, footprint, num_people, eccentricity, gap)
+
+    def check_shape_fit(self, elevator_dims, shape, resolution=0.05, yaws=None):
+        """
+        异形货物（cargo_shapes.Shape）能否放入轿厢，返回 ShapeFit 或 None
+
+        按体素判定，安全间隙与 check_all_orientations 一致；
+        elevator_dims 为 CabGeometry 时避开其障碍物，否则只按空轿厢判定
+        """
+        from cargo_shapes import DEFAULT_YAWS, Box, CabGrid
+        obstacles = []
+        if isinstance(elevator_dims, CabGeometry):
+            # 障碍物坐标以轿厢内壁角为原点，网格以扣除间隙后的可用空间为原点
+            gap = self.safety_gap
+            for box in elevator_dims.obstacles:
+                (x0, y0, z0), (x1, y1, z1) = box.lo, box.hi
+                obstacles.append(Box(x1 - x0, y1 - y0, z1 - z0, x0 - gap, y0 - gap, z0))
+            elevator_dims = elevator_dims.dims
+        grid = CabGrid(elevator_dims, resolution, self.safety_gap, obstacles)
+        return grid.fit(shape, DEFAULT_YAWS if yaws is None else yaws)
+
+    def validate_inputs(self, elevator_specs, cargo_specs, num_people):
+        """输入验证，返回问题描述，输入有效时返回 None"""
+        if any(val <= 0 for val in list(elevator_specs) + list(cargo_specs)):
+            return Issue('invalid_value')
+        if num_people < 0:
+            return Issue('negative_people')
+        return None
+    
+    def select_best_orientation(self, valid_orientations):
+        """选择最佳摆放方向（最高空间利用率）"""
+        return max(valid_orientations, key=lambda x: x['volume_utilization'])
     
     def check_elevator_capacity(self, elevator_specs, cargo_specs, num_people=1):
         """
         综合检查电梯装载能力（包含人员因素）
         
         参数:
-        - elevator_specs: (长, 宽, 高, 限重) 元组
+        - elevator_specs: (长, 宽, 高, 限重) 元组，标准轿厢型号代码（见 cab_models.py），
+          或带障碍物和多个门的 CabGeometry（见 cab_geometry.py）
         - cargo_specs: (长, 宽, 高, 重量) 元组
         - num_people: 电梯内人员数量，默认为1人
         
         返回:
         - 综合评估结果（包含人员分析）
         """
+        if isinstance(elevator_specs, CabGeometry):
+            return self.check_cab_geometry(elevator_specs, cargo_specs, num_people)
+        elevator_specs = resolve_specs(elevator_specs)
+        el, ew, eh, elevator_limit = elevator_specs
+        cl, cw, ch, cargo_weight = cargo_specs
+        
+        # 输入验证
+        error = self.validate_inputs(elevator_specs, cargo_specs, num_people)
+        if error:
+            return self._compose_result(elevator_specs, cargo_specs, num_people, error=error)
+        
+        # 检查所有摆放方向
+        valid_orientations = self.check_all_orientations((el, ew, eh), (cl, cw, ch))
+        
+        if not valid_orientations:
+            # 检查对角线是否可能
+            diagonal = self.check_diagonal_fit((el, ew, eh), (cl, cw, ch))
+            return self._compose_result(elevator_specs, cargo_specs, num_people, diagonal=diagonal)
+        
+        best_orientation = self.select_best_orientation(valid_orientations)
+        
+        # 检查门通行
+        door = self.check_door_access((el, ew, eh), best_orientation['orientation'])
+        
+        # 人员站位（启用时）
+        crew = None
+        if self.use_crew_placement:
+            crew = self.plan_crew_positions((el, ew), best_orientation['orientation'][:2], num_people, cargo_weight)
+        
+        return self._compose_result(elevator_specs, cargo_specs, num_people,
+                                    valid_orientations=valid_orientations,
+                                    best_orientation=best_orientation, door=door, crew=crew)
+    
+    def check_cab_geometry(self, geometry, cargo_specs, num_people=1):
+        """
+        按轿厢几何模型（cab_geometry.CabGeometry）检查装载能力，结果格式同 check_elevator_capacity
+        
+        摆放方向须能落地放在不与障碍物重叠的位置（best_orientation 中记录 position），
+        门通行按任一门可通过判定，人员面积扣除人员身高以下、货物占地以外障碍物的占地；
+        有障碍物时不考虑倾斜斜放，平放转角只在货物顶面低于所有障碍物时采用。
+        不支持人员站位求解（及依赖它的重心检查）和登记门型，见 validate_geometry
+        """
+        self.validate_geometry(geometry)
+        elevator_specs = geometry.specs
+        error = self.validate_inputs(elevator_specs, cargo_specs, num_people)
+        if error:
+            return self._compose_result(elevator_specs, cargo_specs, num_people, error=error)
+        
+        cargo_dims = tuple(cargo_specs[:3])
+        valid_orientations = self.place_orientations(geometry, cargo_dims)
+        if not valid_orientations:
+            diagonal = self.check_cab_diagonal(geometry, cargo_dims)
+            return self._compose_result(elevator_specs, cargo_specs, num_people, diagonal=diagonal,
+                                        yaw_dims=self.cab_yaw_dims(geometry))
+        
+        best_orientation = self.select_best_orientation(valid_orientations)
+        door = geometry.door_access(best_orientation['orientation'])
+        return self._compose_result(elevator_specs, cargo_specs, num_people,
+                                    valid_orientations=valid_orientations, best_orientation=best_orientation,
+                                    door=door, blocked_area=self.cab_blocked_area(geometry, best_orientation))
+    
+    def validate_geometry(self, geometry):
+        """
+        轿厢几何模型不支持的计算器设置报 ValueError
+        
+        人员站位求解不避让障碍物，门洞由模型给出、与按轿厢尺寸登记的门型冲突
+        """
+        if self.use_crew_placement:
+            raise ValueError("轿厢几何模型不支持 use_crew_placement（站位求解不避让障碍物）")
+        if geometry.dims in self.door_models:
+            raise ValueError("轿厢几何模型按自身门洞判定门通行，不能同时为该尺寸登记门型")
+    
+    def place_orientations(self, geometry, cargo_dims):
+        """轿厢几何模型中能落地放在不与障碍物重叠位置的摆放方向（记录 position）"""
+        valid_orientations = []
+        for orientation in self.check_all_orientations(geometry.dims, cargo_dims):
+            position = geometry.place(orientation['orientation'], self.safety_gap)
+            if position is not None:
+                valid_orientations.append(dict(orientation, position=position))
+        return valid_orientations
+    
+    def cab_yaw_dims(self, geometry):
+        """
+        轿厢几何模型中平放转角判定可用的空间 (长, 宽, 高)
+        
+        高度限制在最低障碍物底面（加安全间隙）以下，货物顶面不碰任何障碍物，地面上转角放置不受其影响
+        """
+        lowest = geometry.lowest_obstacle()
+        if lowest is None:
+            return geometry.dims
+        return geometry.length, geometry.width, min(geometry.height, lowest + self.safety_gap)
+    
+    def check_cab_diagonal(self, geometry, cargo_dims):
+        """轿厢几何模型的斜放判定，格式同 check_diagonal_fit"""
+        diag_fit, cargo_diag, elevator_diag = self.check_diagonal_fit(geometry.dims, cargo_dims)
+        if diag_fit and geometry.obstacles:
+            # 障碍物会挡住倾斜放置的空间对角线，只接受顶面低于所有障碍物的平放转角方案
+            diag_fit = self.check_yaw_fit(self.cab_yaw_dims(geometry), cargo_dims) is not None
+        return diag_fit, cargo_diag, elevator_diag
+    
+    def cab_blocked_area(self, geometry, best_orientation):
+        """
+        轿厢几何模型中障碍物占去的、人员可站立的地面面积
+        
+        悬在货物上方的障碍物部分已计入货物占地，不重复扣除
+        """
+        l, w, _ = best_orientation['orientation']
+        x, y = best_orientation['position']
+        return geometry.blocked_floor_area(self.person_height, exclude=(x, y, l, w))
+    
+    def check_person_space(self, elevator_dims, orientation, num_people, crew=None, blocked_area=0.0):
+        """
+        人员空间检查，返回 (问题列表, 剩余面积, 所需面积, 空间可容纳人数)
+        
+        crew 为人员站位求解结果时按实际站位判定，否则按剩余面积估算
+        """
+        el, ew = elevator_dims[0], elevator_dims[1]
+        remaining_area = max(0, el * ew - orientation[0] * orientation[1] - blocked_area)
+        person_area_needed = num_people * self.person_min_space
+        if self.engine == 'exact':
+            # 每人所需面积向上取整到平方毫米
+            needed = num_people * to_mm(self.person_min_space, True, SCALE * SCALE) / (SCALE * SCALE)
+            area_ok = not needed or decide_area(elevator_dims, orientation, blocked_area, needed)
+        else:
+            area_ok = person_area_needed <= remaining_area
+        issues = []
+        if crew is not None:
+            # 站位求解为启发式，人数是下界：报告不足时实际可能勉强站得下，判定偏保守
+            max_people_by_space = crew.crew_count
+            if num_people > max_people_by_space:
+                issues.append(Issue('crew_space', crew=max_people_by_space, people=num_people))
+        else:
+            max_people_by_space = max(0, int(remaining_area / self.person_min_space))
+            if not area_ok:
+                issues.append(Issue('person_area', area=remaining_area, people=num_people,
+                                    needed=person_area_needed))
+        return issues, remaining_area, person_area_needed, max_people_by_space
+    
+    def check_person_height(self, elevator_height):
+        """人员站立高度检查，返回问题列表；精确引擎下按整数毫米比较"""
+        if self.engine == 'exact':
+            too_low = to_mm(self.person_height, True) > to_mm(elevator_height)
+        else:
+            too_low = self.person_height > elevator_height
+        if too_low:
+            return [Issue('person_height', height=elevator_height, needed=self.person_height)]
+        return []
+    
+    def check_load_balance(self, elevator_dims, crew, cargo_weight, num_people):
+        """
+        按人员站位求解给出的货物和人员位置检查综合重心，返回 (问题列表, LoadDistribution)
+        
+        未启用重心检查或没有站位结果时不检查，返回 ([], None)
+        """
+        if crew is None or not self.check_eccentricity or crew.cargo_position is None:
+            return [], None
+        distribution = self.analyze_load_distribution(
+            elevator_dims, crew.cargo_position, cargo_weight, crew.positions[:num_people])
+        if distribution.within_limit:
+            return [], distribution
+        return [Issue('eccentricity', eccentricity=distribution.eccentricity,
+                      limit=distribution.max_eccentricity)], distribution
+    
+    def _compose_result(self, elevator_specs, cargo_specs, num_people, error=None,
+                        valid_orientations=None, best_orientation=None, diagonal=None,
+                        door=None, crew=None, blocked_area=0.0, yaw_dims=None):
+        """
+        由各阶段的中间结果汇总评估结果
+        
+        几何相关阶段（摆放方向、对角线、门通行、人员站位）由调用方计算后传入，
+        重量、人员面积和高度等廉价检查在此完成；blocked_area 为障碍物占去的地面面积，
+        yaw_dims 为平放转角判定用的空间（默认为轿厢尺寸）
+        """
         el, ew, eh, elevator_limit = elevator_specs
         cl, cw, ch, cargo_weight = cargo_specs
         
@@ -145,25 +557,16 @@ class ElevatorCalculator:
             'person_analysis': {}
         }
         
-        # 输入验证
-        if any(val <= 0 for val in [el, ew, eh, elevator_limit, cl, cw, ch, cargo_weight]):
-            results['issues'].append("所有尺寸和重量参数必须为正数")
-            return results
-            
-        if num_people < 0:
-            results['issues'].append("人员数量不能为负数")
-            return results
+        if error:
+            results['issues'].append(error)
+            return _seal_issues(results)
         
         # 计算人员重量
         total_person_weight = num_people * self.person_avg_weight
         total_weight = cargo_weight + total_person_weight
         
-        # 检查所有摆放方向
-        valid_orientations = self.check_all_orientations((el, ew, eh), (cl, cw, ch))
-        
         if not valid_orientations:
-            # 检查对角线是否可能
-            diag_fit, cargo_diag, elevator_diag = self.check_diagonal_fit((el, ew, eh), (cl, cw, ch))
+            diag_fit, cargo_diag, elevator_diag = diagonal
             if diag_fit:
                 # 对角线可以装载，作为特殊方案返回
                 volume_util = (cl * cw * ch) / (el * ew * eh) * 100
@@ -175,44 +578,48 @@ class ElevatorCalculator:
                     'height_util': (ch / eh) * 100,
                     'diagonal_fit': True
                 }
+                yaw = self.check_yaw_fit(yaw_dims or (el, ew, eh), (cl, cw, ch))
+                if yaw is not None:
+                    # 不必倾斜，平放在地面上转一个角度即可
+                    diag_orientation['yaw'] = {
+                        'footprint': (yaw.length, yaw.width, yaw.height),
+                        'angle': yaw.degrees,
+                        'intervals': yaw.interval_degrees,
+                        'clearance': yaw.clearance,
+                    }
+                    results['recommendations'].append(
+                        f"建议货物平放（高 {yaw.height}m），长边与轿厢长度方向成 {yaw.degrees:.1f}°，可安全装载")
+                else:
+                    results['recommendations'].append("建议斜放货物（利用对角线），可安全装载")
                 results['best_orientation'] = diag_orientation
                 results['orientations'] = [diag_orientation]
-                results['recommendations'].append("建议斜放货物（利用对角线），可安全装载")
                 results['can_load'] = True
             else:
-                results['issues'].append(f"货物对角线 {cargo_diag:.2f}m 超过电梯空间 {elevator_diag:.2f}m")
+                results['issues'].append(Issue('diagonal', cargo=cargo_diag, limit=elevator_diag))
                 results['can_load'] = False
             # 人员因素检查
             if total_weight > elevator_limit:
-                results['issues'].append(f"总重量 {total_weight}kg (货物+{num_people}人) 超过电梯限重 {elevator_limit}kg")
-            return results
+                results['issues'].append(Issue('total_weight', weight=total_weight, people=num_people, limit=elevator_limit))
+            return _seal_issues(results)
         
-        # 选择最佳摆放方向（最高空间利用率）
-        best_orientation = max(valid_orientations, key=lambda x: x['volume_utilization'])
         results['best_orientation'] = best_orientation
         
-        # 检查门通行
-        door_ok, door_issues, door_width, door_height = self.check_door_access((el, ew, eh), best_orientation['orientation'])
+        # 门通行结果
+        door_ok, door_issues, door_width, door_height = door
         if not door_ok:
             results['issues'].extend(door_issues)
         
         # 检查重量分布（包含人员重量）
-        weight_issues, weight_util, max_ecc = self.check_weight_distribution(total_weight, elevator_limit, best_orientation['orientation'], (el, ew, eh))
+        weight_issues, weight_util = self.check_weight_distribution(total_weight, elevator_limit, best_orientation['orientation'], (el, ew, eh))
         results['issues'].extend(weight_issues)
         
         # 人员空间检查
-        elevator_area = el * ew
-        cargo_area = best_orientation['orientation'][0] * best_orientation['orientation'][1]
-        remaining_area = max(0, elevator_area - cargo_area)
-        person_area_needed = num_people * self.person_min_space
-        
-        if person_area_needed > remaining_area:
-            results['issues'].append(f"剩余空间 {remaining_area:.2f}㎡ 不足 {num_people}人 所需 {person_area_needed:.2f}㎡")
+        space_issues, remaining_area, person_area_needed, max_people_by_space = self.check_person_space(
+            (el, ew), best_orientation['orientation'], num_people, crew, blocked_area)
+        results['issues'].extend(space_issues)
         
         # 人员高度检查
-        person_height_needed = self.person_height
-        if person_height_needed > eh:
-            results['issues'].append(f"电梯高度 {eh}m 不足人员站立 {person_height_needed}m")
+        results['issues'].extend(self.check_person_height(eh))
         
         # 计算利用率
         results['utilizations']['weight'] = (total_weight / elevator_limit) * 100
@@ -227,11 +634,24 @@ class ElevatorCalculator:
             'remaining_area': remaining_area,
             'person_area_needed': person_area_needed,
             'max_people_by_weight': max(0, int((elevator_limit - cargo_weight) / self.person_avg_weight)),
-            'max_people_by_space': max(0, int(remaining_area / self.person_min_space))
+            'max_people_by_space': max_people_by_space
         }
+        if crew is not None:
+            results['person_analysis']['crew_positions'] = crew.positions
+            results['person_analysis']['cargo_position'] = crew.cargo_position
+        
+        # 重心检查（需要人员站位求解给出的实际位置）
+        balance_issues, distribution = self.check_load_balance((el, ew), crew, cargo_weight, num_people)
+        if distribution is not None:
+            results['load_distribution'] = {
+                'center': distribution.center,
+                'eccentricity': distribution.eccentricity,
+                'max_eccentricity': distribution.max_eccentricity,
+            }
+        results['issues'].extend(balance_issues)
         
         # 添加所有有效摆放方向
-        results['orientations'] = valid_orientations
+        results['orientations'] = list(valid_orientations)
         
         # 生成建议
         if results['issues']:
@@ -250,7 +670,7 @@ class ElevatorCalculator:
             if remaining_area < person_area_needed * 1.5:
                 results['recommendations'].append("建议优化人员站位")
         
-        return results
+        return _seal_issues(results)
 
 def check_elevator_capacity(elevator_length, elevator_width, elevator_height, 
                           elevator_weight_limit, cargo_length, cargo_width, 
@@ -286,16 +706,32 @@ def get_float_input(prompt):
         except ValueError:
             print("请输入有效的数字")
 
+def get_model_input(prompt):
+    """获取标准轿厢型号，直接回车返回 None（手动输入尺寸）"""
+    while True:
+        code = input(prompt).strip()
+        if not code:
+            return None
+        try:
+            return get_model(code)
+        except ValueError:
+            print(f"未知型号，可选: {', '.join(MODELS)}")
+
 def main():
     """主程序"""
     print("=== 电梯货物装载计算器 ===\n")
     
     # 获取电梯参数
     print("请输入电梯参数:")
-    elevator_length = get_float_input("电梯长度 (米): ")
-    elevator_width = get_float_input("电梯宽度 (米): ")
-    elevator_height = get_float_input("电梯高度 (米): ")
-    elevator_weight_limit = get_float_input("电梯限重 (千克): ")
+    model = get_model_input("标准轿厢型号 (如 P1000，直接回车手动输入尺寸): ")
+    if model:
+        print(f"已选择 {model}")
+        elevator_length, elevator_width, elevator_height, elevator_weight_limit = model.specs
+    else:
+        elevator_length = get_float_input("电梯长度 (米): ")
+        elevator_width = get_float_input("电梯宽度 (米): ")
+        elevator_height = get_float_input("电梯高度 (米): ")
+        elevator_weight_limit = get_float_input("电梯限重 (千克): ")
     
     print("\n请输入货物参数:")
     cargo_length = get_float_input("货物长度 (米): ")
@@ -5,9 +5,13 @@
 美观简约的界面设计，与主程序分离
 """
 
+import math
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
+import cab_models
 import elevator_calculator
+from incremental import IncrementalEvaluator
 
 class ElevatorCalculatorGUI:
     def __init__(self, root):
@@ -16,6 +20,9 @@ class ElevatorCalculatorGUI:
         self.root.geometry("800x700")
         self.root.configure(bg="#f8f9fa")
         
+        # 增量评估器：多次分析之间复用未变化输入对应的中间结果
+        self.evaluator = IncrementalEvaluator(elevator_calculator.ElevatorCalculator())
+        
         # 设置主题样式
         self.setup_styles()
         
@@ -78,6 +85,11 @@ class ElevatorCalculatorGUI:
         self.notebook.add(result_frame, text="📋 分析结果")
         self.create_result_page(result_frame)
         
+        # 实时调整页面
+        whatif_frame = ttk.Frame(self.notebook)
+        self.notebook.add(whatif_frame, text="🎚️ 实时调整")
+        self.create_whatif_page(whatif_frame)
+        
         # 关于页面
         about_frame = ttk.Frame(self.notebook)
         self.notebook.add(about_frame, text="ℹ️ 关于")
@@ -110,6 +122,15 @@ class ElevatorCalculatorGUI:
         self.elevator_limit.grid(row=3, column=1, padx=5, pady=5)
         self.elevator_limit.insert(0, "1000")
         
+        # 标准型号：选择后填入尺寸和限重，仍可手动修改
+        ttk.Label(elevator_group, text="标准型号:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=5)
+        self.elevator_model = ttk.Combobox(
+            elevator_group, width=22, state='readonly', font=('Segoe UI', 11),
+            values=["自定义"] + [f"{m.code}  {m.kind} {m.rated_load}kg" for m in cab_models.models()])
+        self.elevator_model.grid(row=4, column=1, padx=5, pady=5)
+        self.elevator_model.current(0)
+        self.elevator_model.bind('<<ComboboxSelected>>', self.on_model_selected)
+        
         # 货物参数组
         cargo_group = ttk.LabelFrame(parent, text="货物规格", padding=15)
         cargo_group.pack(fill=tk.X, padx=20, pady=10)
@@ -170,6 +191,165 @@ class ElevatorCalculatorGUI:
                                           foreground='#6c757d')
         self.quick_result_label.pack(pady=10)
         
+    def create_whatif_page(self, parent):
+        """创建实时调整页面：拖动滑块连续重算，显示最接近失败的约束"""
+        # 独立的增量评估器：拖动时只重算变化输入影响的阶段，不打扰参数输入页的结果
+        self.whatif_evaluator = IncrementalEvaluator(self.evaluator.calculator)
+        self.whatif_pending = False  # 已登记空闲刷新时为 True，期间的滑块回调直接合并
+        self.whatif_geometry = None  # (电梯尺寸, 缩放比例, 原点)，电梯尺寸变化时才重算
+        
+        slider_group = ttk.LabelFrame(parent, text="货物与人员", padding=15)
+        slider_group.pack(fill=tk.X, padx=20, pady=10)
+        
+        sliders = (
+            ('length', "长度 (米):", 0.1, 3.0, 1.2),
+            ('width', "宽度 (米):", 0.1, 2.5, 0.8),
+            ('height', "高度 (米):", 0.1, 2.8, 1.0),
+            ('weight', "重量 (公斤):", 0, 2000, 200),
+            ('people', "人员数量:", 0, 10, 1),
+        )
+        self.whatif_vars = {}
+        self.whatif_value_labels = {}
+        for row, (key, text, low, high, default) in enumerate(sliders):
+            ttk.Label(slider_group, text=text).grid(row=row, column=0, sticky=tk.W, padx=5, pady=3)
+            var = tk.DoubleVar(value=default)
+            ttk.Scale(slider_group, from_=low, to=high, variable=var, length=320,
+                      command=lambda _value: self.schedule_whatif()).grid(row=row, column=1, padx=5, pady=3)
+            value_label = ttk.Label(slider_group, width=10, font=('Segoe UI', 11))
+            value_label.grid(row=row, column=2, sticky=tk.W, padx=5)
+            self.whatif_vars[key] = var
+            self.whatif_value_labels[key] = value_label
+        
+        load_btn = ttk.Button(slider_group, text="📥 载入参数输入页的数值", command=self.load_whatif_inputs)
+        load_btn.grid(row=len(sliders), column=1, sticky=tk.W, padx=5, pady=5)
+        
+        feedback_group = ttk.LabelFrame(parent, text="实时结果（电梯规格取自参数输入页）", padding=10)
+        feedback_group.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        self.whatif_status = ttk.Label(feedback_group, font=('Segoe UI', 12, 'bold'))
+        self.whatif_status.pack(anchor=tk.W)
+        self.whatif_constraint = ttk.Label(feedback_group, font=('Segoe UI', 11))
+        self.whatif_constraint.pack(anchor=tk.W, pady=(2, 0))
+        
+        # 俯视图：图元只创建一次，刷新时只更新坐标和颜色
+        self.whatif_canvas = tk.Canvas(feedback_group, width=360, height=180, bg='white', highlightthickness=0)
+        self.whatif_canvas.pack(pady=5)
+        self.whatif_cab = self.whatif_canvas.create_rectangle(0, 0, 0, 0, outline=self.colors['dark'], width=2)
+        self.whatif_cargo = self.whatif_canvas.create_polygon(0, 0, 0, 0, 0, 0, outline='')
+        self.whatif_door = self.whatif_canvas.create_line(0, 0, 0, 0, fill=self.colors['primary'], width=4)
+        
+        self.whatif_timing = ttk.Label(feedback_group, foreground='#6c757d')
+        self.whatif_timing.pack(anchor=tk.W)
+        
+        self.schedule_whatif()
+    
+    def schedule_whatif(self):
+        """滑块回调只登记一次空闲刷新：快速拖动产生的多次回调合并为一次重算，不会排队"""
+        if not self.whatif_pending:
+            self.whatif_pending = True
+            self.root.after_idle(self.refresh_whatif)
+    
+    def load_whatif_inputs(self):
+        """把参数输入页的货物和人数填入滑块"""
+        try:
+            values = {
+                'length': float(self.cargo_length.get()),
+                'width': float(self.cargo_width.get()),
+                'height': float(self.cargo_height.get()),
+                'weight': float(self.cargo_weight.get()),
+                'people': int(self.num_people.get()),
+            }
+        except ValueError:
+            messagebox.showerror("输入错误", "请输入有效的数字！")
+            return
+        for key, value in values.items():
+            self.whatif_vars[key].set(value)
+        self.schedule_whatif()
+    
+    def refresh_whatif(self):
+        """按滑块的最新数值重算并重绘"""
+        self.whatif_pending = False
+        values = {key: var.get() for key, var in self.whatif_vars.items()}
+        cargo = (round(values['length'], 2), round(values['width'], 2), round(values['height'], 2),
+                 round(values['weight']))
+        people = int(round(values['people']))
+        for key, value in zip(('length', 'width', 'height', 'weight', 'people'), cargo + (people,)):
+            unit = {'weight': 'kg', 'people': '人'}.get(key, 'm')
+            self.whatif_value_labels[key].config(text=f"{value:g} {unit}")
+        
+        try:
+            elevator = tuple(float(entry.get()) for entry in (self.elevator_length, self.elevator_width,
+                                                               self.elevator_height, self.elevator_limit))
+        except ValueError:
+            self.whatif_status.config(text="⚠️ 请在参数输入页填写有效的电梯规格", foreground=self.colors['warning'])
+            return
+        
+        began = time.perf_counter()
+        self.whatif_evaluator.update(elevator, cargo, people)
+        result = self.whatif_evaluator.result()
+        margins = self.whatif_evaluator.margins()
+        elapsed = (time.perf_counter() - began) * 1000
+        
+        if result['can_load']:
+            self.whatif_status.config(text="✅ 可以安全装载", foreground=self.colors['success'])
+        else:
+            reason = result['issues'][0] if result['issues'] else "无法装载"
+            self.whatif_status.config(text=f"❌ {reason}", foreground=self.colors['danger'])
+        if margins:
+            nearest = margins[0]
+            amount = f"{abs(nearest.slack):.0f}" if nearest.unit == 'kg' else f"{abs(nearest.slack):.2f}"
+            if nearest.ok:
+                text = f"最接近失败的约束：{nearest.label}，余量 {amount}{nearest.unit}"
+            else:
+                text = f"未满足的约束：{nearest.label}，相差 {amount}{nearest.unit}"
+            self.whatif_constraint.config(text=text)
+        else:
+            self.whatif_constraint.config(text="")
+        
+        self.draw_whatif(elevator, result)
+        self.whatif_timing.config(
+            text=f"重算 {elapsed:.2f}ms（重算阶段: {', '.join(self.whatif_evaluator.recomputed) or '无'}）")
+    
+    def draw_whatif(self, elevator, result):
+        """更新俯视图：宽度方向水平，门在下方；可平放转角时按最佳转角画，其余斜放方案沿轿厢对角线旋转"""
+        el, ew = elevator[0], elevator[1]
+        canvas = self.whatif_canvas
+        if self.whatif_geometry is None or self.whatif_geometry[0] != (el, ew):
+            width, height = int(canvas['width']), int(canvas['height'])
+            scale = min((width - 40) / ew, (height - 30) / el) if el > 0 and ew > 0 else 0
+            origin = ((width - ew * scale) / 2, (height - el * scale) / 2 - 5)
+            self.whatif_geometry = ((el, ew), scale, origin)
+            x0, y0 = origin
+            canvas.coords(self.whatif_cab, x0, y0, x0 + ew * scale, y0 + el * scale)
+        _, scale, (x0, y0) = self.whatif_geometry
+        
+        best = result['best_orientation']
+        if not best or scale <= 0:
+            canvas.coords(self.whatif_cargo, 0, 0, 0, 0, 0, 0)
+        else:
+            length, width = best['orientation'][0], best['orientation'][1]
+            cx, cy = x0 + ew * scale / 2, y0 + el * scale / 2
+            yaw = best.get('yaw')
+            if yaw:
+                # 平放转角方案：按最佳转角画货物底面
+                length, width = yaw['footprint'][0], yaw['footprint'][1]
+                angle = math.radians(yaw['angle'])
+            else:
+                angle = math.atan2(el, ew) if best.get('diagonal_fit') else 0.0
+            cos, sin = math.cos(angle), math.sin(angle)
+            corners = []
+            for dx, dy in ((-width, -length), (width, -length), (width, length), (-width, length)):
+                dx, dy = dx * scale / 2, dy * scale / 2
+                corners += [cx + dx * cos - dy * sin, cy + dx * sin + dy * cos]
+            canvas.coords(self.whatif_cargo, *corners)
+            canvas.itemconfig(self.whatif_cargo,
+                              fill=self.colors['success'] if result['can_load'] else self.colors['danger'])
+        
+        door_width = max(0.0, self.whatif_evaluator.calculator.door_opening(elevator[:3])[0])
+        door_y = y0 + el * scale
+        canvas.coords(self.whatif_door, x0 + (ew - door_width) * scale / 2, door_y,
+                      x0 + (ew + door_width) * scale / 2, door_y)
+    
     def create_result_page(self, parent):
         """创建结果页面"""
         # 创建滚动文本框
@@ -237,6 +417,17 @@ class ElevatorCalculatorGUI:
         text_widget.insert(1.0, about_text)
         text_widget.configure(state='disabled')
         
+    def on_model_selected(self, event=None):
+        """选择标准型号后填入轿厢尺寸和额定载重"""
+        choice = self.elevator_model.get()
+        if choice == "自定义":
+            return
+        model = cab_models.get_model(choice.split()[0])
+        for entry, value in zip((self.elevator_length, self.elevator_width,
+                                 self.elevator_height, self.elevator_limit), model.specs):
+            entry.delete(0, tk.END)
+            entry.insert(0, f"{value:g}")
+    
     def calculate_capacity(self):
         """计算装载能力"""
         try:
@@ -260,15 +451,13 @@ class ElevatorCalculatorGUI:
                 messagebox.showerror("输入错误", "所有参数必须为正数！")
                 return
             
-            # 创建计算器实例
-            calculator = elevator_calculator.ElevatorCalculator()
-            
-            # 计算结果
-            result = calculator.check_elevator_capacity(
+            # 计算结果（只重算变化输入影响的阶段）
+            self.evaluator.update(
                 (elevator_length, elevator_width, elevator_height, elevator_limit),
                 (cargo_length, cargo_width, cargo_height, cargo_weight),
                 num_people
             )
+            result = self.evaluator.result()
             
             # 显示结果
             self.display_result(result, elevator_length, elevator_width, elevator_height, 
@@ -381,6 +570,13 @@ class ElevatorCalculatorGUI:
             if is_diagonal:
                 import math
                 self.result_text.insert(tk.END, "\n📋 对角线装载指导\n", 'header')
+                yaw = best.get('yaw')
+                if yaw:
+                    spans = '、'.join(f"{lo:.0f}°~{hi:.0f}°" for lo, hi in yaw['intervals'])
+                    turn_steps = (f"1. 货物平放（高 {yaw['footprint'][2]}m），长边与电梯长度方向成 {yaw['angle']:.0f}°"
+                                  f"（可行范围 {spans}）\n2. 保持该角度对准轿厢，不必倾斜")
+                else:
+                    turn_steps = "1. 倾斜货物，使其沿轿厢空间对角线方向\n2. 对准电梯对角线方向"
                 guide = f"""\🎯 对角线装载方案（超大货物专用）
 
 电梯尺寸：{el}×{ew}×{eh}米
@@ -398,8 +594,7 @@ class ElevatorCalculatorGUI:
 • 装载后检查四个角落的间隙
 
 🎨 装载步骤：
-1. 将货物旋转45度角
-2. 对准电梯对角线方向
+{turn_steps}
 3. 缓慢推入，注意边缘对齐
 4. 确认装载完成，关闭电梯门
                 """
@@ -545,6 +740,7 @@ class ElevatorCalculatorGUI:
         
         self.elevator_limit.delete(0, tk.END)
         self.elevator_limit.insert(0, "1000")
+        self.elevator_model.current(0)
         
         self.cargo_length.delete(0, tk.END)
         self.cargo_length.insert(0, "1.2")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+整数毫米精确判定引擎
+尺寸换算为整数毫米后比较，对角线比较平方和，判定路径上没有浮点误差和开方；
+decide_* 为以米为单位的入口，远离边界时浮点比较即可定论，边界附近才换算整数毫米
+"""
+
+import math
+from functools import lru_cache
+
+
+SCALE = 1000  # 米 -> 毫米
+_SNAP = 1e-6  # 与整数毫米相差不足此值(毫米)视为浮点误差，如 1.1 * 1000 = 1100.0000000000002
+
+
+def to_mm(value, up=False, scale=SCALE):
+    """
+    米换算为整数毫米，up 为真时向上取整，否则向下取整；面积传 scale=SCALE * SCALE 换算为平方毫米
+
+    判定偏保守：轿厢尺寸向下取整，货物尺寸和安全间隙向上取整，
+    不足 1mm 的超出不会被舍入掉
+    """
+    scaled = value * scale
+    nearest = round(scaled)
+    if abs(scaled - nearest) < _SNAP:
+        return nearest
+    return math.ceil(scaled) if up else math.floor(scaled)
+
+
+@lru_cache(maxsize=65536)
+def dims_to_mm(dims, up=False):
+    """尺寸三元组换算为整数毫米（缓存，批量评估时同一电梯/货物只换算一次），取整方向同 to_mm"""
+    a, b, c = dims
+    return to_mm(a, up), to_mm(b, up), to_mm(c, up)
+
+
+def orientation_fits(elevator_mm, cargo_mm, gap_mm):
+    """
+    按 check_all_orientations 的方向顺序返回 6 个方向是否可放入
+
+    长、宽两侧各留 gap_mm，高度只留一侧
+    """
+    el, ew, eh = elevator_mm
+    cl, cw, ch = cargo_mm
+    max_l, max_w, max_h = el - 2 * gap_mm, ew - 2 * gap_mm, eh - gap_mm
+    return (cl <= max_l and cw <= max_w and ch <= max_h,
+            cl <= max_l and ch <= max_w and cw <= max_h,
+            cw <= max_l and cl <= max_w and ch <= max_h,
+            cw <= max_l and ch <= max_w and cl <= max_h,
+            ch <= max_l and cl <= max_w and cw <= max_h,
+            ch <= max_l and cw <= max_w and cl <= max_h)
+
+
+def diagonal_fits(elevator_mm, cargo_mm):
+    """货物空间对角线不超过电梯空间对角线（比较平方和）"""
+    el, ew, eh = elevator_mm
+    cl, cw, ch = cargo_mm
+    return cl * cl + cw * cw + ch * ch <= el * el + ew * ew + eh * eh
+
+
+def door_checks(elevator_mm, cargo_mm, door_gap_mm, ratio_permille=800):
+    """
+    门通行的三项判定 (宽度通过, 高度通过, 截面对角线通过)
+
+    门宽 = 梯宽 × 比例 - 门安全间隙，门高 = 0.9 × 梯高；两侧同乘 1000 保持整数
+    """
+    _, ew, eh = elevator_mm
+    _, cw, ch = cargo_mm
+    door_width = ew * ratio_permille - door_gap_mm * 1000
+    door_height = eh * 900
+    cw, ch = cw * 1000, ch * 1000
+    return (cw <= door_width, ch <= door_height,
+            cw * cw + ch * ch <= door_width * door_width + door_height * door_height)
+
+
+def snap_dims(dims, up=False):
+    """尺寸（任意维数）按 to_mm 的取整方向落到整毫米后换回米，供偏航、站位等几何求解使用"""
+    return tuple(to_mm(value, up) / SCALE for value in dims)
+
+
+# 以米为单位的判定入口：毫米取整使每个尺寸至多偏差 1mm（间隙在长、宽方向计两次），
+# 与限值相差超过 FILTER 的浮点比较结论与整数毫米判定相同，可直接采用；
+# 只有落在 ±FILTER 带内的输入才换算为整数毫米精确判定
+FILTER = 0.004  # 米
+
+
+def decide_orientations(elevator_dims, cargo_dims, safety_gap):
+    """
+    按 check_all_orientations 的方向顺序返回 6 个方向是否可放入，结果与 orientation_fits 相同
+
+    限值收紧、放宽 FILTER 各判一次，两次结论一致说明没有比较落在带内
+    """
+    el, ew, eh = elevator_dims
+    cl, cw, ch = cargo_dims
+    gap = safety_gap + safety_gap
+    l0, w0, h0 = el - gap - FILTER, ew - gap - FILTER, eh - safety_gap - FILTER
+    l1, w1, h1 = el - gap + FILTER, ew - gap + FILTER, eh - safety_gap + FILTER
+    inner = (cl <= l0 and cw <= w0 and ch <= h0, cl <= l0 and ch <= w0 and cw <= h0,
+             cw <= l0 and cl <= w0 and ch <= h0, cw <= l0 and ch <= w0 and cl <= h0,
+             ch <= l0 and cl <= w0 and cw <= h0, ch <= l0 and cw <= w0 and cl <= h0)
+    outer = (cl <= l1 and cw <= w1 and ch <= h1, cl <= l1 and ch <= w1 and cw <= h1,
+             cw <= l1 and cl <= w1 and ch <= h1, cw <= l1 and ch <= w1 and cl <= h1,
+             ch <= l1 and cl <= w1 and cw <= h1, ch <= l1 and cw <= w1 and cl <= h1)
+    if inner == outer:
+        return inner
+    return orientation_fits(dims_to_mm(tuple(elevator_dims)), dims_to_mm(tuple(cargo_dims), True),
+                            to_mm(safety_gap, True))
+
+
+def decide_any_orientation(elevator_dims, cargo_dims, safety_gap):
+    """
+    是否存在可放入的方向，结果与 any(orientation_fits(...)) 相同
+
+    方向可任意旋转，货物尺寸与扣除间隙后的限值各自排序后逐维比较即可，无需枚举 6 个方向
+    """
+    el, ew, eh = elevator_dims
+    gap = safety_gap + safety_gap
+    a, b, c = sorted(cargo_dims)
+    x, y, z = sorted((el - gap, ew - gap, eh - safety_gap))
+    if a > x + FILTER or b > y + FILTER or c > z + FILTER:
+        return False
+    if a <= x - FILTER and b <= y - FILTER and c <= z - FILTER:
+        return True
+    return any(orientation_fits(dims_to_mm(tuple(elevator_dims)), dims_to_mm(tuple(cargo_dims), True),
+                                to_mm(safety_gap, True)))
+
+
+def decide_diagonal(elevator_dims, cargo_dims):
+    """货物空间对角线不超过电梯空间对角线，结果与 diagonal_fits 相同"""
+    el, ew, eh = elevator_dims
+    cl, cw, ch = cargo_dims
+    slack = el * el + ew * ew + eh * eh - cl * cl - cw * cw - ch * ch
+    # 平方和的取整误差不超过 2 × 尺寸 × 误差 + 误差²，逐项累加
+    band = 2 * FILTER * (abs(el) + abs(ew) + abs(eh) + abs(cl) + abs(cw) + abs(ch)) + 6 * FILTER * FILTER
+    if slack > band:
+        return True
+    if slack < -band:
+        return False
+    return diagonal_fits(dims_to_mm(tuple(elevator_dims)), dims_to_mm(tuple(cargo_dims), True))
+
+
+def decide_door(elevator_dims, cargo_dims, door_gap, ratio_permille=800):
+    """门通行的三项判定 (宽度通过, 高度通过, 截面对角线通过)，结果与 door_checks 相同"""
+    _, ew, eh = elevator_dims
+    _, cw, ch = cargo_dims
+    door_width = ew * ratio_permille / 1000 - door_gap
+    door_height = eh * 0.9
+    width_slack, height_slack = door_width - cw, door_height - ch
+    diagonal_slack = door_width * door_width + door_height * door_height - cw * cw - ch * ch
+    band = 2 * FILTER * (abs(door_width) + door_height + abs(cw) + abs(ch)) + 4 * FILTER * FILTER
+    if (abs(width_slack) <= FILTER or abs(height_slack) <= FILTER or abs(diagonal_slack) <= band):
+        return door_checks(dims_to_mm(tuple(elevator_dims)), dims_to_mm(tuple(cargo_dims), True),
+                           to_mm(door_gap, True), ratio_permille)
+    return width_slack > 0, height_slack > 0, diagonal_slack > 0
+
+
+def decide_area(elevator_dims, footprint, blocked_area, needed_area):
+    """
+    地面剩余面积（轿厢面积 - 货物占地 - 障碍物占地）是否不小于 needed_area
+
+    带内按整数平方毫米比较：轿厢向下取整，占地和所需面积向上取整
+    """
+    el, ew = elevator_dims[0], elevator_dims[1]
+    l, w = footprint[0], footprint[1]
+    slack = el * ew - l * w - blocked_area - needed_area
+    band = FILTER * (abs(el) + abs(ew) + abs(l) + abs(w)) + FILTER * FILTER
+    if slack > band:
+        return True
+    if slack < -band:
+        return False
+    area = to_mm(el) * to_mm(ew) - to_mm(l, True) * to_mm(w, True)
+    return area - to_mm(blocked_area, True, SCALE * SCALE) >= to_mm(needed_area, True, SCALE * SCALE)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量评估器
+记录各中间结果依赖的输入，输入变化时只重算失效的阶段，结果与全新评估完全一致
+"""
+
+from cab_models import resolve_specs
+from elevator_calculator import ElevatorCalculator
+
+
+# 各阶段依赖的输入（含计算器参数）和上游阶段
+STAGE_DEPENDENCIES = {
+    'validation': (('elevator_dims', 'elevator_limit', 'cargo_dims', 'cargo_weight', 'num_people'), ()),
+    'orientations': (('elevator_dims', 'cargo_dims', 'safety_gap', 'engine'), ('validation',)),
+    'diagonal': (('elevator_dims', 'cargo_dims', 'engine'), ('orientations',)),
+    'door': (('elevator_dims', 'door_safety_gap', 'engine', 'door_model'), ('orientations',)),
+    'crew': (('elevator_dims', 'safety_gap', 'engine', 'person_width', 'person_depth', 'min_operation_space',
+              'person_shape', 'use_crew_placement', 'crew_balance'), ('orientations',)),
+    'result': (('elevator_dims', 'elevator_limit', 'cargo_dims', 'cargo_weight', 'num_people', 'person_avg_weight',
+                'person_min_space', 'person_height', 'max_eccentricity_ratio', 'check_eccentricity', 'safety_gap',
+                'engine'),
+               ('validation', 'orientations', 'diagonal', 'door', 'crew')),
+}
+
+STAGE_ORDER = ('validation', 'orientations', 'diagonal', 'door', 'crew', 'result')
+
+# 参与依赖跟踪的计算器参数
+CALCULATOR_PARAMETERS = ('safety_gap', 'door_safety_gap', 'person_avg_weight', 'person_min_space',
+                         'person_height', 'person_width', 'person_depth', 'min_operation_space', 'person_shape',
+                         'use_crew_placement', 'engine', 'max_eccentricity_ratio', 'check_eccentricity')
+
+
+class Margin:
+    """
+    单项约束的余量
+
+    slack >= 0 表示满足，数值单位见 unit；relative 为相对容量的余量比例，用于比较不同单位的约束
+    """
+
+    def __init__(self, name, label, slack, capacity, unit):
+        self.name = name
+        self.label = label
+        self.slack = slack
+        self.capacity = capacity
+        self.unit = unit
+
+    @property
+    def ok(self):
+        return self.slack >= 0
+
+    @property
+    def relative(self):
+        return self.slack / self.capacity if self.capacity else self.slack
+
+    def __repr__(self):
+        return f"Margin({self.label} {self.slack:+.2f}{self.unit})"
+
+
+class IncrementalEvaluator:
+    """
+    单个 (电梯, 货物, 人数) 组合的增量评估
+
+    用法:
+        evaluator = IncrementalEvaluator(calculator, elevator_specs, cargo_specs, num_people)
+        evaluator.update(num_people=3)
+        result = evaluator.result()
+    """
+
+    def __init__(self, calculator=None, elevator_specs=None, cargo_specs=None, num_people=1):
+        self.calculator = calculator or ElevatorCalculator()
+        self.inputs = {}
+        self._stages = {}  # 阶段名 -> (依赖键, 版本号, 值)
+        self._version = 0
+        self.recomputed = []  # 最近一次 result() 重新计算的阶段
+        self.update(elevator_specs=elevator_specs, cargo_specs=cargo_specs, num_people=num_people)
+
+    def update(self, elevator_specs=None, cargo_specs=None, num_people=None):
+        """更新部分输入，未传入的输入保持不变；电梯可以是标准轿厢型号代码"""
+        if elevator_specs is not None:
+            el, ew, eh, limit = resolve_specs(elevator_specs)
+            self.inputs['elevator_dims'] = (el, ew, eh)
+            self.inputs['elevator_limit'] = limit
+        if cargo_specs is not None:
+            cl, cw, ch, weight = cargo_specs
+            self.inputs['cargo_dims'] = (cl, cw, ch)
+            self.inputs['cargo_weight'] = weight
+        if num_people is not None:
+            self.inputs['num_people'] = num_people
+
+    @property
+    def elevator_specs(self):
+        return self.inputs['elevator_dims'] + (self.inputs['elevator_limit'],)
+
+    @property
+    def cargo_specs(self):
+        return self.inputs['cargo_dims'] + (self.inputs['cargo_weight'],)
+
+    def _values(self):
+        values = dict(self.inputs)
+        for name in CALCULATOR_PARAMETERS:
+            values[name] = getattr(self.calculator, name)
+        values['door_model'] = self.calculator.door_models.get(self.inputs['elevator_dims'])
+        # 启用重心检查时站位按人数和重量选偏心最小的货物位置，否则站位与这些输入无关
+        calc = self.calculator
+        values['crew_balance'] = ((values['num_people'], values['cargo_weight'], calc.person_avg_weight,
+                                   calc.max_eccentricity_ratio)
+                                  if calc.use_crew_placement and calc.check_eccentricity else None)
+        return values
+
+    def _compute(self, name, values, upstream):
+        """计算单个阶段"""
+        calc = self.calculator
+        if name == 'validation':
+            return calc.validate_inputs(self.elevator_specs, self.cargo_specs, values['num_people'])
+        error = upstream['validation']
+        if name == 'result':
+            if error:
+                return calc._compose_result(self.elevator_specs, self.cargo_specs, values['num_people'], error=error)
+            valid, best = upstream['orientations']
+            return calc._compose_result(self.elevator_specs, self.cargo_specs, values['num_people'],
+                                        valid_orientations=valid, best_orientation=best,
+                                        diagonal=upstream['diagonal'], door=upstream['door'],
+                                        crew=upstream['crew'])
+        if error:
+            return None
+        dims, cargo = values['elevator_dims'], values['cargo_dims']
+        if name == 'orientations':
+            valid = calc.check_all_orientations(dims, cargo)
+            best = calc.select_best_orientation(valid) if valid else None
+            return valid, best
+        valid, best = upstream['orientations']
+        if name == 'diagonal':
+            return None if valid else calc.check_diagonal_fit(dims, cargo)
+        if name == 'door':
+            return calc.check_door_access(dims, best['orientation']) if valid else None
+        # name == 'crew'
+        if not valid or not values['use_crew_placement']:
+            return None
+        return calc.plan_crew_positions(dims[:2], best['orientation'][:2], values['num_people'],
+                                        values['cargo_weight'])
+
+    def result(self):
+        """
+        返回当前输入下的评估结果，只重算依赖发生变化的阶段
+
+        输入未变化时直接返回上次的结果对象，调用方不应修改它
+        """
+        values = self._values()
+        self.recomputed = []
+        upstream = {}
+        for name in STAGE_ORDER:
+            input_names, parents = STAGE_DEPENDENCIES[name]
+            key = (tuple(values[n] for n in input_names), tuple(self._stages[p][1] for p in parents))
+            cached = self._stages.get(name)
+            if cached is not None and cached[0] == key:
+                upstream[name] = cached[2]
+                continue
+            value = self._compute(name, values, upstream)
+            if cached is not None and name == 'validation' and cached[2] == value:
+                # 验证结论未变时保留版本号，下游阶段无需因人数等输入变化而失效
+                version = cached[1]
+            else:
+                self._version += 1
+                version = self._version
+            self._stages[name] = (key, version, value)
+            upstream[name] = value
+            self.recomputed.append(name)
+        return upstream['result']
+
+    def margins(self):
+        """
+        当前输入下各项约束的余量，按相对余量升序（首项即最接近失败或失败最严重的约束）
+
+        只使用已缓存的阶段结果，不额外调用几何判定；没有可放入方向时只有对角线决定能否装载。
+        登记门型时门洞余量按门宽、门高估算（实际按查表允许倾斜通过）
+        """
+        result = self.result()
+        if self._stages['validation'][2]:
+            return []
+        calc = self.calculator
+        el, ew, eh = self.inputs['elevator_dims']
+        cl, cw, ch = self.inputs['cargo_dims']
+        limit, weight, people = self.inputs['elevator_limit'], self.inputs['cargo_weight'], self.inputs['num_people']
+        gap = calc.safety_gap
+        valid, best = self._stages['orientations'][2]
+        if not valid:
+            fits, cargo_diagonal, elevator_diagonal = self._stages['diagonal'][2]
+            margins = [Margin('diagonal', "对角线", elevator_diagonal - cargo_diagonal, elevator_diagonal, 'm')]
+            if not fits:
+                # 最接近放入的方向还差多少（各方向取最紧的一轴）
+                slack = max(min(el - 2 * gap - l, ew - 2 * gap - w, eh - gap - h)
+                            for l, w, h in ((cl, cw, ch), (cl, ch, cw), (cw, cl, ch),
+                                            (cw, ch, cl), (ch, cl, cw), (ch, cw, cl)))
+                margins.append(Margin('fit', "放入轿厢", slack, min(el, ew, eh), 'm'))
+            return sorted(margins, key=lambda m: m.relative)
+
+        l, w, h = best['orientation']
+        _, _, door_width, door_height = self._stages['door'][2]
+        total = weight + people * calc.person_avg_weight
+        margins = [
+            Margin('length', "长度方向间隙", el - 2 * gap - l, el, 'm'),
+            Margin('width', "宽度方向间隙", ew - 2 * gap - w, ew, 'm'),
+            Margin('height', "高度方向间隙", eh - gap - h, eh, 'm'),
+            Margin('door_width', "门宽", door_width - w, door_width, 'm'),
+            Margin('door_height', "门高", door_height - h, door_height, 'm'),
+            Margin('weight', "载重", limit - total, limit, 'kg'),
+            Margin('person_height', "人员站立高度", eh - calc.person_height, eh, 'm'),
+        ]
+        crew = self._stages['crew'][2]
+        if crew is not None:
+            margins.append(Margin('person_space', "可站立人数", crew.crew_count - people, max(crew.crew_count, 1), '人'))
+        else:
+            analysis = result['person_analysis']
+            area = el * ew
+            margins.append(Margin('person_space', "人员面积",
+                                  analysis['remaining_area'] - analysis['person_area_needed'], area, '㎡'))
+        distribution = result.get('load_distribution')
+        if distribution is not None:
+            margins.append(Margin('eccentricity', "重心偏移", distribution['max_eccentricity'] - distribution['eccentricity'],
+                                  distribution['max_eccentricity'], 'm'))
+        return sorted(margins, key=lambda m: m.relative)
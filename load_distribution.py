@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+载荷分布分析
+由已摆放货物和人员站位计算综合重心、相对轿厢中心的偏心距，以及离散的地板压强网格
+"""
+
+import math
+from array import array
+from itertools import accumulate
+from operator import add
+
+
+class LoadDistribution:
+    """载荷分布分析结果（坐标单位：米，x 沿电梯长度，y 沿电梯宽度）"""
+
+    def __init__(self, total_mass, center, offset, max_eccentricity, grid=None):
+        self.total_mass = total_mass
+        self.center = center  # 综合重心 (x, y)
+        self.offset = offset  # 相对轿厢中心的偏移 (dx, dy)
+        self.max_eccentricity = max_eccentricity
+        self.grid = grid  # PressureGrid 或 None
+
+    @property
+    def eccentricity(self):
+        return math.hypot(*self.offset)
+
+    @property
+    def within_limit(self):
+        return self.eccentricity <= self.max_eccentricity
+
+    @property
+    def peak_pressure(self):
+        """最大地板压强 (kg/㎡)，未计算网格时为 None"""
+        return max(self.grid.values) if self.grid is not None else None
+
+
+class PressureGrid:
+    """
+    按单元格存储的地板压强 (kg/㎡)，values 下标为 x格 × ny + y格
+
+    矩形内部整格覆盖的部分压强相同，记在二维差分数组中（每个矩形只改四个角），
+    读取 values 时再用前缀和一次性叠加；只有矩形边缘的部分覆盖单元格逐格累加
+    """
+
+    def __init__(self, length, width, cell=0.05):
+        self.length = length
+        self.width = width
+        self.nx = max(1, math.ceil(length / cell - 1e-9))
+        self.ny = max(1, math.ceil(width / cell - 1e-9))
+        self.cell_x = length / self.nx
+        self.cell_y = width / self.ny
+        self._values = array('d', bytes(8 * self.nx * self.ny))
+        self._diff = array('d', bytes(8 * (self.nx + 1) * (self.ny + 1)))  # 下标为 x格 × (ny+1) + y格
+        self._dirty = False
+
+    @property
+    def values(self):
+        if self._dirty:
+            self._flush()
+        return self._values
+
+    def _flush(self):
+        """差分数组按 y 方向累加成行、再逐行沿 x 方向累加，叠加到压强值上"""
+        values, diff, ny, stride = self._values, self._diff, self.ny, self.ny + 1
+        row = [0.0] * ny
+        for ix in range(self.nx):
+            row = list(map(add, row, accumulate(diff[ix * stride:ix * stride + ny])))
+            base = ix * ny
+            values[base:base + ny] = array('d', map(add, values[base:base + ny], row))
+        self._diff = array('d', bytes(8 * len(diff)))
+        self._dirty = False
+
+    def _coverage(self, start, size, cell, count):
+        """矩形在一个轴向上与各单元格的重叠长度，返回 (首格下标, [重叠长度, ...])"""
+        end = start + size
+        first = max(0, int(start / cell))
+        last = min(count - 1, int(math.ceil(end / cell)) - 1)
+        overlaps = []
+        for index in range(first, last + 1):
+            lo, hi = index * cell, (index + 1) * cell
+            overlaps.append(max(0.0, min(hi, end) - max(lo, start)))
+        return first, overlaps
+
+    def add(self, x, y, length, width, mass):
+        """
+        叠加一个均布矩形载荷
+
+        均布载荷在网格上可分离为两个轴向重叠长度的外积。首末行列之间的单元格整格覆盖、压强相同，
+        记入差分数组；其余（首末两行、首末两列）逐格累加，单次叠加为 O(行数 + 列数)
+        """
+        if length <= 0 or width <= 0 or mass == 0:
+            return
+        density = mass / (length * width) / (self.cell_x * self.cell_y)
+        x0, cover_x = self._coverage(x, length, self.cell_x, self.nx)
+        y0, cover_y = self._coverage(y, width, self.cell_y, self.ny)
+        values, ny, span_x, span_y = self._values, self.ny, len(cover_x), len(cover_y)
+        if not span_x or not span_y:
+            return  # 矩形在网格范围之外
+        edge_x = {0, span_x - 1}
+        edge_y = (0, span_y - 1) if span_y > 1 else (0,)
+        for offset, overlap_x in enumerate(cover_x):
+            scale = density * overlap_x
+            base = (x0 + offset) * ny + y0
+            for index in (range(span_y) if offset in edge_x else edge_y):
+                values[base + index] += scale * cover_y[index]
+        if span_x > 2 and span_y > 2:
+            # 内部整格块 [x0+1, x0+span_x-1) × [y0+1, y0+span_y-1)
+            pressure = density * self.cell_x * self.cell_y
+            stride, diff = ny + 1, self._diff
+            lo_x, hi_x, lo_y, hi_y = x0 + 1, x0 + span_x - 1, y0 + 1, y0 + span_y - 1
+            diff[lo_x * stride + lo_y] += pressure
+            diff[lo_x * stride + hi_y] -= pressure
+            diff[hi_x * stride + lo_y] -= pressure
+            diff[hi_x * stride + hi_y] += pressure
+            self._dirty = True
+
+    def cell(self, ix, iy):
+        return self.values[ix * self.ny + iy]
+
+
+def center_of_gravity(loads):
+    """
+    综合重心
+
+    参数:
+    - loads: [(x, y, 长, 宽, 质量), ...]，x/y 为矩形起点
+
+    返回:
+    - (总质量, 重心x, 重心y)，总质量为 0 时重心为 None
+    """
+    total = mx = my = 0.0
+    for x, y, length, width, mass in loads:
+        total += mass
+        mx += mass * (x + length / 2)
+        my += mass * (y + width / 2)
+    if total <= 0:
+        return 0.0, None, None
+    return total, mx / total, my / total
+
+
+def crew_loads(positions, person_weight):
+    """人员站位 [(x, y, 宽, 深), ...] 转换为载荷列表"""
+    return [(x, y, w, d, person_weight) for x, y, w, d in positions]
+
+
+def analyze_load(elevator_dims, loads, max_eccentricity, cell=None):
+    """
+    分析载荷分布
+
+    参数:
+    - elevator_dims: (长, 宽) 或 (长, 宽, 高)
+    - loads: [(x, y, 长, 宽, 质量), ...]
+    - max_eccentricity: 允许的偏心距(米)
+    - cell: 压强网格单元尺寸(米)，为 None 时只算重心（用于搜索内循环）
+
+    返回:
+    - LoadDistribution
+    """
+    el, ew = elevator_dims[0], elevator_dims[1]
+    loads = list(loads)
+    total, cx, cy = center_of_gravity(loads)
+    if cx is None:
+        cx, cy = el / 2, ew / 2
+    grid = None
+    if cell is not None:
+        grid = PressureGrid(el, ew, cell)
+        for load in loads:
+            grid.add(*load)
+    return LoadDistribution(total, (cx, cy), (cx - el / 2, cy - ew / 2), max_eccentricity, grid)
+
+
+class CogAccumulator:
+    """
+    可增删载荷的重心累加器，供摆放搜索在每一步 O(1) 更新重心
+
+    用法:
+        acc = CogAccumulator((el, ew))
+        acc.add(load); acc.remove(load)
+        acc.eccentricity()
+    """
+
+    def __init__(self, elevator_dims):
+        self.half_length = elevator_dims[0] / 2
+        self.half_width = elevator_dims[1] / 2
+        self.total = 0.0
+        self.moment_x = 0.0
+        self.moment_y = 0.0
+
+    def add(self, load, sign=1):
+        x, y, length, width, mass = load
+        mass *= sign
+        self.total += mass
+        self.moment_x += mass * (x + length / 2)
+        self.moment_y += mass * (y + width / 2)
+
+    def remove(self, load):
+        self.add(load, -1)
+
+    def offset(self):
+        """重心相对轿厢中心的偏移 (dx, dy)"""
+        if self.total <= 1e-12:
+            return 0.0, 0.0
+        return self.moment_x / self.total - self.half_length, self.moment_y / self.total - self.half_width
+
+    def eccentricity(self):
+        return math.hypot(*self.offset())
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无界面装载方案报告
+由 check_elevator_capacity 结果生成带内嵌 SVG 平面图和立面图的 HTML 页面，不依赖 Tk；
+轿厢轮廓、门洞和网格按轿厢规格缓存为 SVG 模板，每份报告只填充货物和人员图形，页面逐段流式写出
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import re
+from functools import lru_cache
+from html import escape
+
+from cab_geometry import CabGeometry
+from cab_models import resolve_specs
+from elevator_calculator import ElevatorCalculator
+
+
+SVG_SIZE = 360  # 视图最长边的像素数
+_MARGIN = 24
+
+_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="zh-CN"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body{{font-family:"Segoe UI","Microsoft YaHei",sans-serif;margin:24px;color:#212529}}
+h1{{font-size:20px}} h2{{font-size:16px;border-bottom:1px solid #dee2e6;padding-bottom:4px}}
+.ok{{color:#198754}} .fail{{color:#dc3545}}
+table{{border-collapse:collapse}} td,th{{border:1px solid #dee2e6;padding:4px 10px;text-align:left}}
+.views{{display:flex;gap:32px;flex-wrap:wrap}} figure{{margin:0}}
+@media print{{body{{margin:8mm}}}}
+</style></head><body>
+"""
+_PAGE_TAIL = "</body></html>\n"
+
+# 请求 CSV/JSONL 的列名
+REQUEST_FIELDS = ('order', 'elevator_length', 'elevator_width', 'elevator_height', 'elevator_limit',
+                  'cargo_length', 'cargo_width', 'cargo_height', 'cargo_weight', 'num_people')
+
+
+def _fmt(value):
+    """SVG 坐标保留一位小数"""
+    return f"{value:.1f}"
+
+
+def _door_lines(door, el, ew, eh, scale):
+    """门洞在平面图和立面图中的图形：(平面图, 立面图)"""
+    wall, width, height, name = door
+    label = escape(name)
+    if wall in ('front', 'rear'):
+        span = min(max(width, 0.0), ew)
+        x = _MARGIN + (0.0 if wall == 'front' else el * scale)
+        y = _MARGIN + (ew - span) / 2 * scale
+        text_x = 4 if wall == 'front' else x + 4
+        plan = (f'<line x1="{_fmt(x)}" y1="{_fmt(y)}" x2="{_fmt(x)}" y2="{_fmt(y + span * scale)}" '
+                f'stroke="#0d6efd" stroke-width="6"/>'
+                f'<text x="{_fmt(text_x)}" y="{_fmt(y - 4)}" font-size="11" fill="#0d6efd">{label}</text>')
+        top = _MARGIN + (eh - min(max(height, 0.0), eh)) * scale
+        elevation = (f'<line x1="{_fmt(x)}" y1="{_fmt(top)}" x2="{_fmt(x)}" y2="{_fmt(_MARGIN + eh * scale)}" '
+                     f'stroke="#0d6efd" stroke-width="6"/>')
+        return plan, elevation
+    # 侧门：平面图画在 y=0 / y=宽 的壁上，立面图（沿长度方向的侧视）中为居中的虚线门框
+    span = min(max(width, 0.0), el)
+    x = _MARGIN + (el - span) / 2 * scale
+    y = _MARGIN + (0.0 if wall == 'left' else ew * scale)
+    text_y = y - 6 if wall == 'left' else y + 14
+    plan = (f'<line x1="{_fmt(x)}" y1="{_fmt(y)}" x2="{_fmt(x + span * scale)}" y2="{_fmt(y)}" '
+            f'stroke="#0d6efd" stroke-width="6"/>'
+            f'<text x="{_fmt(x)}" y="{_fmt(text_y)}" font-size="11" fill="#0d6efd">{label}</text>')
+    h = min(max(height, 0.0), eh)
+    elevation = (f'<rect x="{_fmt(x)}" y="{_fmt(_MARGIN + (eh - h) * scale)}" width="{_fmt(span * scale)}" '
+                 f'height="{_fmt(h * scale)}" fill="none" stroke="#0d6efd" stroke-dasharray="4 3"/>')
+    return plan, elevation
+
+
+@lru_cache(maxsize=1024)
+def cab_template(el, ew, eh, doors, obstacles=()):
+    """
+    轿厢规格对应的 SVG 模板（按规格缓存）
+
+    - doors: ((所在轿厢壁, 门宽, 门高, 名称), ...)，轿厢壁同 cab_geometry.WALLS
+    - obstacles: ((x0, y0, z0, x1, y1, z1), ...) 障碍物，坐标以轿厢内壁角为原点
+
+    返回 (比例尺 像素/米, 平面图前缀, 立面图前缀)，前缀之后追加货物图形和 '</svg>' 即为完整 SVG。
+    平面图 x 沿电梯长度、y 沿电梯宽度，前门位于 x=0 一侧；立面图为沿长度方向的侧视
+    """
+    scale = (SVG_SIZE - 2 * _MARGIN) / max(el, ew, eh)
+
+    def frame(width, height, body, label):
+        w, h = width * scale + 2 * _MARGIN, height * scale + 2 * _MARGIN
+        grid = []
+        step = 0.5 * scale
+        x = _MARGIN + step
+        while x < _MARGIN + width * scale - 1:
+            grid.append(f'<line x1="{_fmt(x)}" y1="{_MARGIN}" x2="{_fmt(x)}" y2="{_fmt(h - _MARGIN)}"/>')
+            x += step
+        y = _MARGIN + step
+        while y < _MARGIN + height * scale - 1:
+            grid.append(f'<line x1="{_MARGIN}" y1="{_fmt(y)}" x2="{_fmt(w - _MARGIN)}" y2="{_fmt(y)}"/>')
+            y += step
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{_fmt(w)}" height="{_fmt(h)}" '
+                f'viewBox="0 0 {_fmt(w)} {_fmt(h)}" role="img" aria-label="{label}">'
+                f'<g stroke="#e9ecef" stroke-width="1">{"".join(grid)}</g>'
+                f'<rect x="{_MARGIN}" y="{_MARGIN}" width="{_fmt(width * scale)}" height="{_fmt(height * scale)}" '
+                f'fill="none" stroke="#495057" stroke-width="2"/>{body}')
+
+    plan_body, elevation_body = [], []
+    for x0, y0, z0, x1, y1, z1 in obstacles:
+        x0, x1 = max(x0, 0.0), min(x1, el)
+        if x1 <= x0:
+            continue
+        y0, y1, z1 = max(y0, 0.0), min(y1, ew), min(z1, eh)
+        if y1 > y0:
+            plan_body.append(f'<rect x="{_fmt(_MARGIN + x0 * scale)}" y="{_fmt(_MARGIN + y0 * scale)}" '
+                             f'width="{_fmt((x1 - x0) * scale)}" height="{_fmt((y1 - y0) * scale)}" '
+                             f'fill="#adb5bd" fill-opacity="0.7" stroke="#6c757d"/>')
+        if z1 > z0:
+            elevation_body.append(f'<rect x="{_fmt(_MARGIN + x0 * scale)}" y="{_fmt(_MARGIN + (eh - z1) * scale)}" '
+                                  f'width="{_fmt((x1 - x0) * scale)}" height="{_fmt((z1 - z0) * scale)}" '
+                                  f'fill="#adb5bd" fill-opacity="0.7" stroke="#6c757d"/>')
+    for door in doors:
+        plan, elevation = _door_lines(door, el, ew, eh, scale)
+        plan_body.append(plan)
+        elevation_body.append(elevation)
+    plan_body.append(f'<text x="{_fmt(_MARGIN + el * scale / 2)}" y="{_MARGIN - 6}" font-size="11" '
+                     f'text-anchor="middle">{el}m</text>'
+                     f'<text x="{_fmt(_MARGIN + el * scale + 4)}" y="{_fmt(_MARGIN + ew * scale / 2)}" '
+                     f'font-size="11">{ew}m</text>')
+    elevation_body.append(f'<text x="{_fmt(_MARGIN + el * scale + 4)}" y="{_fmt(_MARGIN + eh * scale / 2)}" '
+                          f'font-size="11">{eh}m</text>')
+    return (scale, frame(el, ew, ''.join(plan_body), "平面图"), frame(el, eh, ''.join(elevation_body), "立面图"))
+
+
+def cab_outline(elevator_specs, calculator):
+    """
+    报告中绘制的轿厢：返回 ((长, 宽, 高, 限重), 门洞, 障碍物)，门洞和障碍物格式同 cab_template
+
+    CabGeometry 按其真实门洞和障碍物绘制，其余按计算器门通行检查采用的净门洞（登记门型或默认门宽规则）绘制前门
+    """
+    if isinstance(elevator_specs, CabGeometry):
+        doors = tuple((door.wall, door.width, door.height, door.name) for door in elevator_specs.doors)
+        obstacles = tuple(box.lo + box.hi for box in elevator_specs.obstacles)
+        return elevator_specs.specs, doors, obstacles
+    specs = tuple(resolve_specs(elevator_specs))
+    door_model = calculator.door_models.get(specs[:3])
+    width, height = calculator.door_opening(specs[:3])
+    return specs, (('front', width, height, door_model.name if door_model is not None else "门"),), ()
+
+
+def _plan_shapes(scale, el, ew, orientation, result):
+    """平面图中的货物和人员图形"""
+    l, w = orientation[0], orientation[1]
+    person = result.get('person_analysis', {})
+    position = person.get('cargo_position')
+    best = result.get('best_orientation') or {}
+    yaw = best.get('yaw')
+    shapes = []
+    if best.get('diagonal_fit'):
+        if yaw:
+            # 平放转角方案：按最佳转角画货物底面
+            l, w = yaw['footprint'][0], yaw['footprint'][1]
+            angle = yaw['angle']
+        else:
+            # 斜放：货物沿地面对角线方向居中
+            angle = math.degrees(math.atan2(ew, el))
+        cx, cy = _MARGIN + el * scale / 2, _MARGIN + ew * scale / 2
+        shapes.append(f'<rect x="{_fmt(cx - l * scale / 2)}" y="{_fmt(cy - w * scale / 2)}" '
+                      f'width="{_fmt(l * scale)}" height="{_fmt(w * scale)}" fill="#0dcaf0" fill-opacity="0.5" '
+                      f'stroke="#0aa2c0" transform="rotate({angle:.1f} {_fmt(cx)} {_fmt(cy)})"/>')
+    else:
+        if position is not None:
+            x, y, l, w = position
+        else:
+            x, y = (el - l) / 2, (ew - w) / 2
+        shapes.append(f'<rect x="{_fmt(_MARGIN + x * scale)}" y="{_fmt(_MARGIN + y * scale)}" '
+                      f'width="{_fmt(l * scale)}" height="{_fmt(w * scale)}" fill="#ffc107" fill-opacity="0.6" '
+                      f'stroke="#b58500"/>')
+    for x, y, pw, pd in person.get('crew_positions', ()):
+        shapes.append(f'<ellipse cx="{_fmt(_MARGIN + (x + pw / 2) * scale)}" cy="{_fmt(_MARGIN + (y + pd / 2) * scale)}" '
+                      f'rx="{_fmt(pw * scale / 2)}" ry="{_fmt(pd * scale / 2)}" fill="#198754" fill-opacity="0.5"/>')
+    return ''.join(shapes)
+
+
+def _elevation_shapes(scale, el, eh, orientation, result):
+    """立面图中的货物图形（落地放置）"""
+    l, _, h = orientation
+    person = result.get('person_analysis', {})
+    position = person.get('cargo_position')
+    x = position[0] if position is not None else (el - l) / 2
+    best = result.get('best_orientation') or {}
+    if best.get('diagonal_fit'):
+        yaw = best.get('yaw')
+        if yaw:
+            # 平放转角方案：侧视宽度为转角后底面在长度方向上的投影
+            length, width, h = yaw['footprint']
+            angle = math.radians(yaw['angle'])
+            l = length * abs(math.cos(angle)) + width * abs(math.sin(angle))
+        l, x = min(l, el), max(0.0, (el - l) / 2)
+    h = min(h, eh)
+    return (f'<rect x="{_fmt(_MARGIN + x * scale)}" y="{_fmt(_MARGIN + (eh - h) * scale)}" '
+            f'width="{_fmt(l * scale)}" height="{_fmt(h * scale)}" fill="#ffc107" fill-opacity="0.6" stroke="#b58500"/>')
+
+
+def render_views(result, elevator_specs, calculator=None):
+    """
+    返回 (平面图 SVG, 立面图 SVG)；没有可用摆放方向时货物图形为空
+
+    elevator_specs 可以是 (长, 宽, 高, 限重)、标准轿厢型号代码或 CabGeometry（绘制其门洞和障碍物）
+    """
+    calculator = calculator or ElevatorCalculator()
+    specs, doors, obstacles = cab_outline(elevator_specs, calculator)
+    el, ew, eh = specs[:3]
+    scale, plan, elevation = cab_template(el, ew, eh, doors, obstacles)
+    best = result.get('best_orientation')
+    if not best:
+        return plan + '</svg>', elevation + '</svg>'
+    orientation = best['orientation']
+    return (plan + _plan_shapes(scale, el, ew, orientation, result) + '</svg>',
+            elevation + _elevation_shapes(scale, el, eh, orientation, result) + '</svg>')
+
+
+def write_report(out, result, elevator_specs, cargo_specs, num_people=1, title=None, calculator=None):
+    """
+    将一份装载方案报告逐段写入文本流 out（文件、socket 包装器等）
+
+    参数:
+    - result: check_elevator_capacity 的返回值
+    - elevator_specs: (长, 宽, 高, 限重)、标准轿厢型号代码或 CabGeometry
+    - title: 页面标题（通常为调度单号）
+    """
+    calculator = calculator or ElevatorCalculator()
+    el, ew, eh, limit = cab_outline(elevator_specs, calculator)[0]
+    cl, cw, ch, weight = cargo_specs
+    title = escape(str(title or "电梯装载方案"))
+    write = out.write
+    write(_PAGE_HEAD.format(title=title))
+    write(f"<h1>{title}</h1>\n")
+    if result['can_load']:
+        write('<p class="ok"><strong>✅ 可以安全装载</strong></p>\n')
+    else:
+        write(f'<p class="fail"><strong>❌ 无法安全装载</strong>（{len(result["issues"])} 个问题）</p>\n')
+
+    write("<h2>规格</h2>\n<table>\n")
+    write(f"<tr><th>电梯</th><td>{el}×{ew}×{eh}m，限重 {limit}kg</td></tr>\n")
+    write(f"<tr><th>货物</th><td>{cl}×{cw}×{ch}m，重量 {weight}kg</td></tr>\n")
+    write(f"<tr><th>人员</th><td>{num_people} 人</td></tr>\n")
+    best = result.get('best_orientation')
+    if best:
+        l, w, h = best['orientation']
+        mode = "斜放（利用对角线）" if best.get('diagonal_fit') else "常规摆放"
+        write(f"<tr><th>推荐方向</th><td>{l}×{w}×{h}m，{mode}，空间利用率 {best['volume_utilization']:.1f}%</td></tr>\n")
+    write("</table>\n")
+
+    utilizations = result.get('utilizations') or {}
+    if utilizations:
+        write("<h2>利用率</h2>\n<table>\n")
+        for key, label in (('weight', "总重量"), ('cargo_weight', "货物重量"), ('person_weight', "人员重量"),
+                           ('volume', "体积")):
+            if key in utilizations:
+                write(f"<tr><th>{label}</th><td>{utilizations[key]:.1f}%</td></tr>\n")
+        write("</table>\n")
+
+    person = result.get('person_analysis') or {}
+    if 'remaining_area' in person:
+        write("<h2>人员空间</h2>\n<table>\n")
+        write(f"<tr><th>剩余面积</th><td>{person['remaining_area']:.2f}㎡</td></tr>\n")
+        write(f"<tr><th>所需面积</th><td>{person['person_area_needed']:.2f}㎡</td></tr>\n")
+        write(f"<tr><th>重量限制下最大人数</th><td>{person['max_people_by_weight']}</td></tr>\n")
+        write(f"<tr><th>空间限制下最大人数</th><td>{person['max_people_by_space']}</td></tr>\n")
+        write("</table>\n")
+
+    plan, elevation = render_views(result, elevator_specs, calculator)
+    write('<h2>装载示意图</h2>\n<div class="views">')
+    write(f"<figure>{plan}<figcaption>平面图（前门在左侧）</figcaption></figure>")
+    write(f"<figure>{elevation}<figcaption>立面图</figcaption></figure></div>\n")
+
+    for heading, items in (("发现的问题", result.get('issues')), ("建议", result.get('recommendations'))):
+        if items:
+            write(f"<h2>{heading}</h2>\n<ul>\n")
+            for item in items:
+                write(f"<li>{escape(item)}</li>\n")
+            write("</ul>\n")
+    write(_PAGE_TAIL)
+
+
+def render_report(result, elevator_specs, cargo_specs, num_people=1, title=None, calculator=None):
+    """返回完整 HTML 字符串（小批量或预览用）"""
+    out = io.StringIO()
+    write_report(out, result, elevator_specs, cargo_specs, num_people, title, calculator)
+    return out.getvalue()
+
+
+def _safe_name(order):
+    return re.sub(r'[^\w.-]+', '_', str(order)).strip('._') or 'order'
+
+
+def _unique_name(order, used):
+    """
+    单号对应的报告文件名；不同单号清理后重名（如 DO/1 与 DO_1）时追加 -2、-3 等后缀，不覆盖已生成的报告
+
+    used 为已用文件名（小写，兼容不区分大小写的文件系统），调用后登记新文件名
+    """
+    base = _safe_name(order)
+    name, suffix = base, 1
+    while f"{name}.html".lower() in used:
+        suffix += 1
+        name = f"{base}-{suffix}"
+    name = f"{name}.html"
+    used.add(name.lower())
+    return name
+
+
+def generate_reports(requests, out_dir, calculator=None):
+    """
+    批量生成报告，每个调度单一个 HTML 文件，并流式写出 index.html 汇总
+
+    参数:
+    - requests: 可迭代的 (单号, 电梯规格, 货物规格, 人数)，逐条读取，不整体载入内存
+
+    返回:
+    - 生成的报告数
+    """
+    calculator = calculator or ElevatorCalculator()
+    os.makedirs(out_dir, exist_ok=True)
+    count = 0
+    used = {'index.html'}
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as index:
+        index.write(_PAGE_HEAD.format(title="装载方案汇总"))
+        index.write("<h1>装载方案汇总</h1>\n<table>\n<tr><th>单号</th><th>结论</th><th>问题</th></tr>\n")
+        for order, elevator_specs, cargo_specs, num_people in requests:
+            result = calculator.check_elevator_capacity(elevator_specs, cargo_specs, num_people)
+            name = _unique_name(order, used)
+            with open(os.path.join(out_dir, name), 'w', encoding='utf-8') as page:
+                write_report(page, result, elevator_specs, cargo_specs, num_people, order, calculator)
+            verdict = '<span class="ok">可装载</span>' if result['can_load'] else '<span class="fail">不可装载</span>'
+            index.write(f'<tr><td><a href="{escape(name)}">{escape(str(order))}</a></td><td>{verdict}</td>'
+                        f'<td>{escape("；".join(result["issues"]))}</td></tr>\n')
+            count += 1
+        index.write("</table>\n")
+        index.write(_PAGE_TAIL)
+    return count
+
+
+def parse_request(record):
+    """
+    调度单记录（列名见 REQUEST_FIELDS 的字典）转换为 (单号, 电梯规格, 货物规格, 人数)
+
+    人数缺省（无该列、为 None 或 CSV 空单元格）时按 1 人计，明确填写的 0 保留
+    """
+    values = [float(record[name]) for name in REQUEST_FIELDS[1:9]]
+    num_people = record.get('num_people')
+    num_people = 1 if num_people is None or num_people == '' else int(num_people)
+    return record['order'], tuple(values[:4]), tuple(values[4:]), num_people
+
+
+def read_requests(path):
+    """读取 CSV 或 JSONL 调度单（列名见 REQUEST_FIELDS），逐条产出 (单号, 电梯规格, 货物规格, 人数)"""
+    if path.endswith(('.jsonl', '.json')):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield parse_request(json.loads(line))
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for record in csv.DictReader(f):
+                yield parse_request(record)
+
+
+def main(argv=None):
+    """命令行：python loading_report.py 调度单.csv 输出目录"""
+    parser = argparse.ArgumentParser(description="批量生成电梯装载方案 HTML 报告")
+    parser.add_argument('source', help="CSV/JSONL 调度单，列: " + ', '.join(REQUEST_FIELDS))
+    parser.add_argument('out_dir', help="输出目录")
+    args = parser.parse_args(argv)
+    count = generate_reports(read_requests(args.source), args.out_dir)
+    print(f"已生成 {count} 份报告到 {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搬家日离散事件仿真
+模拟多部电梯、多名搬运人员在整栋楼内运送大量货物，估算总耗时和排队情况
+"""
+
+import heapq
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from cab_geometry import CabGeometry
+from cab_models import resolve_specs
+from elevator_calculator import ElevatorCalculator
+
+
+class CabSpec:
+    """电梯轿厢（尺寸、限重及运行参数，时间单位：秒）"""
+
+    def __init__(self, specs, seconds_per_floor=1.5, door_cycle=8.0, name=None):
+        if isinstance(specs, CabGeometry):
+            # 可行性矩阵按规格元组去重并由 shm_batch 按列评估，表示不了门洞和障碍物
+            raise ValueError("搬家仿真按长方体轿厢判定，不支持 CabGeometry")
+        if isinstance(specs, str):
+            name = name or specs
+        specs = self.specs = tuple(resolve_specs(specs))  # (长, 宽, 高, 限重)，可以是标准轿厢型号代码
+        self.seconds_per_floor = seconds_per_floor
+        self.door_cycle = door_cycle  # 一次开关门耗时
+        self.name = name or f"{specs[0]}×{specs[1]}×{specs[2]}m/{specs[3]}kg"
+
+
+class MoveItem:
+    """待运送货物"""
+
+    def __init__(self, specs, floor, crew=1, load_time=60.0, unload_time=60.0, ready_time=0.0):
+        self.specs = tuple(specs)  # (长, 宽, 高, 重量)
+        self.floor = floor  # 目的楼层（相对首层）
+        self.crew = crew  # 随梯搬运人数
+        self.load_time = load_time
+        self.unload_time = unload_time
+        self.ready_time = ready_time  # 货物到达首层候梯的时间
+
+
+class MoveScenario:
+    """搬家场景：电梯组、货物清单和搬运人员总数"""
+
+    def __init__(self, cabs, items, crew_size, jitter=0.0):
+        self.cabs = list(cabs)
+        self.items = list(items)
+        self.crew_size = crew_size
+        self.jitter = jitter  # 装卸和运行时间的随机波动比例，0 表示确定性仿真
+        self._feasibility = None
+
+    def feasibility(self, calculator=None, workers=None):
+        """每部电梯可运送的货物下标列表（按尺寸去重后调用计算器，结果缓存）"""
+        if self._feasibility is None:
+            self._feasibility = feasibility_matrix(self.cabs, self.items, calculator, workers)
+        return self._feasibility
+
+
+class SimulationResult:
+    """单次仿真结果"""
+
+    def __init__(self, makespan, trips, busy_time, waits, crew_waits, infeasible):
+        self.makespan = makespan  # 最后一趟完成时刻
+        self.trips = trips  # 每部电梯运送趟数
+        self.busy_time = busy_time  # 每部电梯运行时长
+        self.waits = waits  # 每件货物候梯时长
+        self.crew_waits = crew_waits  # 电梯空闲等待搬运人员的累计时长
+        self.infeasible = infeasible  # 任何电梯都无法运送的货物下标
+
+    @property
+    def utilization(self):
+        """每部电梯的时间利用率(%)"""
+        if self.makespan <= 0:
+            return [0.0 for _ in self.busy_time]
+        return [busy / self.makespan * 100 for busy in self.busy_time]
+
+    @property
+    def mean_wait(self):
+        return sum(self.waits) / len(self.waits) if self.waits else 0.0
+
+    @property
+    def max_wait(self):
+        return max(self.waits) if self.waits else 0.0
+
+
+# 不同 (电梯, 货物) 组合数达到该值且有多个 CPU 时，改用共享内存进程池并行评估
+PARALLEL_THRESHOLD = 20000
+
+
+def feasibility_matrix(cabs, items, calculator=None, workers=None):
+    """
+    计算每部电梯可运送的货物下标
+
+    电梯按规格、货物按 (规格, 人数) 去重，每个不同组合只检查一次；
+    组合数较多时用 shm_batch 的共享内存进程池并行评估（workers=1 时始终在当前进程内计算）
+    """
+    calculator = calculator or ElevatorCalculator()
+    cab_specs = list(dict.fromkeys(cab.specs for cab in cabs))
+    item_keys = list(dict.fromkeys((item.specs, item.crew) for item in items))
+    requests = [(specs, item_specs, crew) for specs in cab_specs for item_specs, crew in item_keys]
+    if workers != 1 and len(requests) >= PARALLEL_THRESHOLD and (workers or os.cpu_count() or 1) > 1:
+        from shm_batch import SharedMemoryPool
+        with SharedMemoryPool(workers, calculator) as pool:
+            verdicts = pool.check_many(requests)['can_load']
+    else:
+        check = calculator.check_elevator_capacity
+        verdicts = [check(*request)['can_load'] for request in requests]
+
+    item_column = {key: i for i, key in enumerate(item_keys)}
+    columns = [item_column[(item.specs, item.crew)] for item in items]
+    rows = {}
+    for row, specs in enumerate(cab_specs):
+        offset = row * len(item_keys)
+        rows[specs] = [index for index, column in enumerate(columns) if verdicts[offset + column]]
+    return [list(rows[cab.specs]) for cab in cabs]
+
+
+def trip_duration(cab, item, rng=None, jitter=0.0):
+    """
+    单趟往返耗时：装货开关门 + 装货 + 上行 + 卸货开关门 + 卸货 + 返回首层
+    """
+    travel = item.floor * cab.seconds_per_floor
+    handling = item.load_time + item.unload_time
+    if rng is not None and jitter > 0:
+        travel *= rng.uniform(1 - jitter, 1 + jitter)
+        handling *= rng.uniform(1 - jitter, 1 + jitter)
+    return 2 * cab.door_cycle + handling + 2 * travel
+
+
+# 事件类型
+_ARRIVAL = 0
+_CAB_RETURN = 1
+
+
+def simulate(scenario, seed=None, calculator=None):
+    """
+    运行一次离散事件仿真
+
+    参数:
+    - scenario: MoveScenario
+    - seed: 随机种子（scenario.jitter > 0 时生效）
+    - calculator: 用于可行性检查的 ElevatorCalculator
+
+    返回:
+    - SimulationResult
+    """
+    cabs, items = scenario.cabs, scenario.items
+    feasibility = scenario.feasibility(calculator)
+    rng = random.Random(seed) if scenario.jitter > 0 else None
+
+    # 每部电梯按所需人数分若干候梯队列，货物按到达顺序进入所有可运送它的电梯的对应队列，被取走后惰性删除；
+    # 调度时在人手够用的队列队首中取最早到达的，人手不足的货物不会挡住后面人数较少的货物
+    feasible_cabs = [[] for _ in items]
+    for cab_index, feasible in enumerate(feasibility):
+        for item_index in feasible:
+            feasible_cabs[item_index].append(cab_index)
+    for index, item in enumerate(items):
+        if item.crew > scenario.crew_size:
+            feasible_cabs[index] = []
+    infeasible = [i for i, owners in enumerate(feasible_cabs) if not owners]
+
+    queues = [{} for _ in cabs]  # 电梯 -> {所需人数: deque[(到达序号, 货物下标)]}
+    taken = bytearray(len(items))
+    idle = set(range(len(cabs)))
+    idle_since = [0.0] * len(cabs)
+    free_crew = scenario.crew_size
+
+    trips = [0] * len(cabs)
+    busy_time = [0.0] * len(cabs)
+    waits = []
+    crew_waits = 0.0
+    makespan = 0.0
+
+    events = []
+    seq = 0
+    arrivals = 0
+    for index in sorted(range(len(items)), key=lambda i: items[i].ready_time):
+        if feasible_cabs[index]:
+            events.append((items[index].ready_time, seq, _ARRIVAL, index))
+            seq += 1
+    heapq.heapify(events)
+
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        # 同一时刻的事件全部处理完再调度
+        while True:
+            if kind == _ARRIVAL:
+                entry = (arrivals, payload)
+                arrivals += 1
+                for cab_index in feasible_cabs[payload]:
+                    queues[cab_index].setdefault(items[payload].crew, deque()).append(entry)
+            else:
+                cab_index, crew = payload
+                idle.add(cab_index)
+                idle_since[cab_index] = now
+                free_crew += crew
+                makespan = now
+            if not events or events[0][0] != now:
+                break
+            now, _, kind, payload = heapq.heappop(events)
+
+        for cab_index in sorted(idle):
+            chosen = None
+            for crew, queue in queues[cab_index].items():
+                while queue and taken[queue[0][1]]:
+                    queue.popleft()
+                if queue and crew <= free_crew and (chosen is None or queue[0] < chosen[0]):
+                    chosen = queue
+            if chosen is None:
+                continue
+            item_index = chosen.popleft()[1]
+            item = items[item_index]
+            taken[item_index] = 1
+            idle.discard(cab_index)
+            free_crew -= item.crew
+            crew_waits += max(0.0, now - max(idle_since[cab_index], item.ready_time))
+            waits.append(now - item.ready_time)
+
+            duration = trip_duration(cabs[cab_index], item, rng, scenario.jitter)
+            trips[cab_index] += 1
+            busy_time[cab_index] += duration
+            heapq.heappush(events, (now + duration, seq, _CAB_RETURN, (cab_index, item.crew)))
+            seq += 1
+
+    return SimulationResult(makespan, trips, busy_time, waits, crew_waits, infeasible)
+
+
+def percentile(values, q):
+    """线性插值百分位数，q 取 0-100"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+class ReplicationSummary:
+    """多次随机仿真的统计汇总"""
+
+    def __init__(self, makespans, mean_waits):
+        self.makespans = makespans
+        self.mean_waits = mean_waits
+
+    def makespan_percentiles(self, qs=(50, 90, 95, 99)):
+        return {q: percentile(self.makespans, q) for q in qs}
+
+    def wait_percentiles(self, qs=(50, 90, 95, 99)):
+        return {q: percentile(self.mean_waits, q) for q in qs}
+
+
+def _run_seeds(scenario, seeds):
+    """子进程入口：对一组种子运行仿真，只回传汇总数值"""
+    results = []
+    for seed in seeds:
+        result = simulate(scenario, seed)
+        results.append((result.makespan, result.mean_wait))
+    return results
+
+
+def run_replications(scenario, replications=100, workers=None, base_seed=0, calculator=None):
+    """
+    并行运行多次随机仿真，返回 ReplicationSummary
+
+    可行性矩阵在主进程计算一次后随场景分发，子进程不再调用计算器
+    """
+    scenario.feasibility(calculator)
+    seeds = [base_seed + i for i in range(replications)]
+    if workers == 1 or replications <= 1:
+        pairs = _run_seeds(scenario, seeds)
+    else:
+        count = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=count) as executor:
+            chunks = [seeds[i::count] for i in range(count) if seeds[i::count]]
+            pairs = []
+            for part in executor.map(_run_seeds, [scenario] * len(chunks), chunks):
+                pairs.extend(part)
+    return ReplicationSummary([p[0] for p in pairs], [p[1] for p in pairs])
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多安全策略一次评估
+与策略无关的几何量（摆放方向、利用率、对角线）每对 (电梯, 货物) 只算一次，
+各策略只做最后的比较判定，输出紧凑的 策略×(电梯, 货物) 判定矩阵
+"""
+
+from array import array
+
+from cab_geometry import CabGeometry
+from cab_models import resolve_specs
+from elevator_calculator import (
+    ElevatorCalculator, ISSUE_INVALID_INPUT, ISSUE_DIAGONAL, ISSUE_DOOR_WIDTH,
+    ISSUE_DOOR_HEIGHT, ISSUE_DOOR_DIAGONAL, ISSUE_WEIGHT, ISSUE_PERSON_SPACE,
+    ISSUE_PERSON_HEIGHT,
+)
+
+
+class SafetyPolicy:
+    """客户安全策略参数"""
+
+    def __init__(self, safety_gap=0.05, door_safety_gap=0.1, person_avg_weight=75,
+                 person_min_space=0.4, name=None):
+        self.safety_gap = safety_gap
+        self.door_safety_gap = door_safety_gap
+        self.person_avg_weight = person_avg_weight
+        self.person_min_space = person_min_space
+        self.name = name or (f"gap={safety_gap}/door={door_safety_gap}/"
+                             f"person={person_avg_weight}kg,{person_min_space}㎡")
+
+    @classmethod
+    def from_calculator(cls, calculator, name=None):
+        return cls(calculator.safety_gap, calculator.door_safety_gap,
+                   calculator.person_avg_weight, calculator.person_min_space, name)
+
+    def make_calculator(self, base=None):
+        """生成应用本策略的计算器（用于逐条对照参考结果）"""
+        calculator = ElevatorCalculator()
+        if base is not None:
+            calculator.__dict__.update(base.__dict__)
+        calculator.safety_gap = self.safety_gap
+        calculator.door_safety_gap = self.door_safety_gap
+        calculator.person_avg_weight = self.person_avg_weight
+        calculator.person_min_space = self.person_min_space
+        return calculator
+
+
+class _PairGeometry:
+    """单对 (电梯, 货物) 与策略无关的几何量"""
+
+    __slots__ = ('valid', 'orientations', 'utils', 'face_diagonals', 'diag_fit')
+
+    def __init__(self, calculator, elevator_dims, cargo_dims):
+        el, ew, eh = elevator_dims
+        cl, cw, ch = cargo_dims
+        self.valid = all(val > 0 for val in (el, ew, eh, cl, cw, ch))
+        if not self.valid:
+            return
+        # 与 check_all_orientations 相同的方向顺序和利用率计算
+        self.orientations = [(cl, cw, ch), (cl, ch, cw), (cw, cl, ch),
+                             (cw, ch, cl), (ch, cl, cw), (ch, cw, cl)]
+        self.utils = [(cl * cw * ch) / (el * ew * eh) * 100] * 6
+        self.face_diagonals = [calculator.calculate_2d_diagonal(w, h) for _, w, h in self.orientations]
+        self.diag_fit = calculator.check_diagonal_fit(elevator_dims, cargo_dims)[0]
+
+
+class PolicyVerdicts:
+    """多策略判定矩阵：每个策略一行，列为 电梯下标 × 货物数 + 货物下标"""
+
+    def __init__(self, policies, cab_count, item_count, can_load, masks):
+        self.policies = policies
+        self.cab_count = cab_count
+        self.item_count = item_count
+        self.can_load = can_load  # 每个策略一个 bytearray
+        self.masks = masks  # 每个策略一个 array('H') 问题代码位掩码
+
+    def verdict(self, policy_index, cab_index, item_index):
+        return bool(self.can_load[policy_index][cab_index * self.item_count + item_index])
+
+    def issue_mask(self, policy_index, cab_index, item_index):
+        return self.masks[policy_index][cab_index * self.item_count + item_index]
+
+    def loadable_counts(self):
+        """各策略下可装载的 (电梯, 货物) 组合数"""
+        return [sum(row) for row in self.can_load]
+
+
+class MultiPolicyEvaluator:
+    """多策略评估器，door_width_ratio、person_height 等非策略参数取自基础计算器"""
+
+    def __init__(self, calculator=None, door_width_ratio=0.8):
+        self.calculator = calculator or ElevatorCalculator()
+        self.door_width_ratio = door_width_ratio
+
+    def _door_limits(self, elevator_dims, door_safety_gap, cache):
+        """门宽、门高、门对角线，按 (电梯, 门安全间隙) 缓存"""
+        key = (elevator_dims, door_safety_gap)
+        limits = cache.get(key)
+        if limits is None:
+            _, ew, eh = elevator_dims
+            door_width = ew * self.door_width_ratio - door_safety_gap
+            door_height = eh * 0.9
+            door_diagonal = self.calculator.calculate_2d_diagonal(door_width, door_height)
+            limits = cache[key] = (door_width, door_height, door_diagonal)
+        return limits
+
+    def evaluate(self, elevator_specs_list, cargo_specs_list, policies, num_people=1):
+        """
+        评估所有 (电梯, 货物) 组合在每个策略下的装载判定
+
+        参数:
+        - elevator_specs_list: [(长, 宽, 高, 限重) 或标准轿厢型号代码, ...]
+        - cargo_specs_list: [(长, 宽, 高, 重量), ...]
+        - policies: SafetyPolicy 列表
+        - num_people: 人员数量（所有组合相同）
+
+        返回:
+        - PolicyVerdicts，判定与逐策略调用 check_elevator_capacity 的 can_load 一致
+        """
+        if self.calculator.use_crew_placement:
+            raise ValueError("多策略评估按面积规则判定人员空间，不支持 use_crew_placement")
+        if self.calculator.engine != 'float':
+            raise ValueError("多策略评估按浮点规则判定，不支持 engine='exact'")
+        if self.calculator.door_models:
+            raise ValueError("多策略评估按门宽比例判定门通行，不支持登记门型")
+        if any(isinstance(specs, CabGeometry) for specs in elevator_specs_list):
+            raise ValueError("多策略评估按长方体轿厢判定，不支持 CabGeometry")
+        elevator_specs_list = [resolve_specs(specs) for specs in elevator_specs_list]
+        person_height = self.calculator.person_height
+        cab_count, item_count = len(elevator_specs_list), len(cargo_specs_list)
+        size = cab_count * item_count
+        can_load = [bytearray(size) for _ in policies]
+        masks = [array('H', bytes(2 * size)) for _ in policies]
+        door_cache = {}
+
+        for cab_index, (el, ew, eh, elevator_limit) in enumerate(elevator_specs_list):
+            elevator_dims = (el, ew, eh)
+            elevator_area = el * ew
+            for item_index, (cl, cw, ch, cargo_weight) in enumerate(cargo_specs_list):
+                column = cab_index * item_count + item_index
+                geometry = _PairGeometry(self.calculator, elevator_dims, (cl, cw, ch))
+                if not geometry.valid or elevator_limit <= 0 or cargo_weight <= 0 or num_people < 0:
+                    for row in masks:
+                        row[column] = ISSUE_INVALID_INPUT
+                    continue
+
+                best_by_gap = {}
+                for k, policy in enumerate(policies):
+                    total_weight = cargo_weight + num_people * policy.person_avg_weight
+                    gap = policy.safety_gap
+                    # 最佳方向只取决于安全间隙，多个策略共用同一间隙时只选一次
+                    best = best_by_gap.get(gap)
+                    if best is None:
+                        best = -1
+                        for index, (l, w, h) in enumerate(geometry.orientations):
+                            if l + 2 * gap <= el and w + 2 * gap <= ew and h + gap <= eh:
+                                if best < 0 or geometry.utils[index] > geometry.utils[best]:
+                                    best = index
+                        best_by_gap[gap] = best
+
+                    mask = 0
+                    if best < 0:
+                        # 无常规方向时按对角线判定（与参考实现一致，重量只记录不影响结论）
+                        if not geometry.diag_fit:
+                            mask |= ISSUE_DIAGONAL
+                        if total_weight > elevator_limit:
+                            mask |= ISSUE_WEIGHT
+                        masks[k][column] = mask
+                        can_load[k][column] = geometry.diag_fit
+                        continue
+
+                    l, w, h = geometry.orientations[best]
+                    door_width, door_height, door_diagonal = self._door_limits(
+                        elevator_dims, policy.door_safety_gap, door_cache)
+                    if w > door_width:
+                        mask |= ISSUE_DOOR_WIDTH
+                    if h > door_height:
+                        mask |= ISSUE_DOOR_HEIGHT
+                    if geometry.face_diagonals[best] > door_diagonal:
+                        mask |= ISSUE_DOOR_DIAGONAL
+                    if total_weight > elevator_limit:
+                        mask |= ISSUE_WEIGHT
+                    remaining_area = max(0, elevator_area - l * w)
+                    if num_people * policy.person_min_space > remaining_area:
+                        mask |= ISSUE_PERSON_SPACE
+                    if person_height > eh:
+                        mask |= ISSUE_PERSON_HEIGHT
+                    masks[k][column] = mask
+                    can_load[k][column] = not mask
+
+        return PolicyVerdicts(list(policies), cab_count, item_count, can_load, masks)
+
+
+def evaluate_policies(elevator_specs_list, cargo_specs_list, policies, num_people=1, calculator=None):
+    """多策略评估的便捷入口"""
+    return MultiPolicyEvaluator(calculator).evaluate(elevator_specs_list, cargo_specs_list, policies, num_people)
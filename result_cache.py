@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+持久化结果缓存（SQLite）
+以量化后的输入和规则版本指纹为键缓存 check_elevator_capacity 结果，
+批量查询和写入，支持按容量淘汰和压缩整理
+"""
+
+import argparse
+import hashlib
+import marshal
+import sqlite3
+import struct
+
+from cab_geometry import CabGeometry
+from cab_models import resolve_specs
+from elevator_calculator import ElevatorCalculator, issue_mask
+
+
+# 量化精度：尺寸按微米、重量按克取整
+_LENGTH_SCALE = 1_000_000
+_WEIGHT_SCALE = 1_000
+_KEY_FORMAT = struct.Struct('<9q')
+
+
+def _fingerprint_value(value):
+    """将计算器参数转换为稳定的文本表示"""
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return repr(value)
+    if isinstance(value, dict):
+        items = sorted((repr(k), _fingerprint_value(v)) for k, v in value.items())
+        return '{' + ','.join(f"{k}:{v}" for k, v in items) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(_fingerprint_value(v) for v in value) + ']'
+    fingerprint = getattr(value, 'fingerprint', None)
+    if callable(fingerprint):
+        return fingerprint()
+    return repr(value)
+
+
+def rule_version(calculator):
+    """判定逻辑版本和结果序列化格式版本；与之不同的条目在任何参数配置下都已失效"""
+    return f"rule={type(calculator).RULE_VERSION}|marshal={marshal.version}"
+
+
+def rule_fingerprint(calculator):
+    """规则版本指纹：由判定逻辑版本和计算器全部参数导出"""
+    parts = [rule_version(calculator)]
+    for name in sorted(vars(calculator)):
+        parts.append(f"{name}={_fingerprint_value(getattr(calculator, name))}")
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def quantized_key(elevator_specs, cargo_specs, num_people, rule):
+    """
+    量化输入并与规则指纹一起哈希为缓存键
+
+    elevator_specs 可以是标准轿厢型号代码；为 CabGeometry 时另以其指纹（门洞、障碍物）区分
+    """
+    cab = b''
+    if isinstance(elevator_specs, CabGeometry):
+        cab = elevator_specs.fingerprint().encode('utf-8')
+        elevator_specs = elevator_specs.specs
+    el, ew, eh, limit = resolve_specs(elevator_specs)
+    cl, cw, ch, weight = cargo_specs
+    packed = _KEY_FORMAT.pack(
+        round(el * _LENGTH_SCALE), round(ew * _LENGTH_SCALE), round(eh * _LENGTH_SCALE),
+        round(limit * _WEIGHT_SCALE),
+        round(cl * _LENGTH_SCALE), round(cw * _LENGTH_SCALE), round(ch * _LENGTH_SCALE),
+        round(weight * _WEIGHT_SCALE), int(num_people),
+    )
+    return hashlib.blake2b(packed + cab + rule.encode('ascii'), digest_size=16).digest()
+
+
+def _pack_verdict(result):
+    """结论与问题代码合并为一个整数：最低位为 can_load"""
+    return int(result['can_load']) | (issue_mask(result) << 1)
+
+
+def _unpack_verdict(value):
+    return bool(value & 1), value >> 1
+
+
+class ResultCache:
+    """
+    check_elevator_capacity 结果的 SQLite 缓存
+
+    用法:
+        with ResultCache('results.db') as cache:
+            results = cache.check_many([(elevator_specs, cargo_specs, num_people), ...])
+    """
+
+    def __init__(self, path, calculator=None, max_bytes=None, batch_size=10000, touch_after=8):
+        self.path = path
+        self.touch_after = touch_after  # 命中条目落后当前时钟超过该值才刷新使用时间，减少写入
+        self.calculator = calculator or ElevatorCalculator()
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key BLOB PRIMARY KEY, rule TEXT NOT NULL, verdict INTEGER NOT NULL, payload BLOB NOT NULL,"
+            " size INTEGER NOT NULL, last_used INTEGER NOT NULL) WITHOUT ROWID")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        if 'version' not in columns:
+            # 旧格式的条目没有记录版本，compact 时按已失效处理
+            self.conn.execute("ALTER TABLE results ADD COLUMN version TEXT NOT NULL DEFAULT ''")
+        # meta 中的 bytes 为条目总大小，由触发器随写入和删除维护，淘汰时不必全表求和
+        if self.conn.execute("SELECT 1 FROM meta WHERE name = 'bytes'").fetchone() is None:
+            self.conn.execute("INSERT INTO meta (name, value) SELECT 'bytes', COALESCE(SUM(size), 0) FROM results")
+        self.conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS results_size_insert AFTER INSERT ON results BEGIN"
+            " UPDATE meta SET value = value + NEW.size WHERE name = 'bytes'; END")
+        self.conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS results_size_update AFTER UPDATE OF size ON results BEGIN"
+            " UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'bytes'; END")
+        self.conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS results_size_delete AFTER DELETE ON results BEGIN"
+            " UPDATE meta SET value = value - OLD.size WHERE name = 'bytes'; END")
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @property
+    def rule(self):
+        """当前计算器参数对应的规则指纹（参数可能随时被修改，每次重新计算）"""
+        return rule_fingerprint(self.calculator)
+
+    def _tick(self):
+        """递增并返回访问时钟，用于近似 LRU 淘汰"""
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'clock'").fetchone()
+        clock = (row[0] if row else 0) + 1
+        self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('clock', ?)", (clock,))
+        return clock
+
+    def _select(self, keys, column='payload'):
+        """批量读取 (键, 指定列, 最近使用时钟)"""
+        keys = list(keys)
+        chunk = 500  # 低于 SQLite 绑定参数上限
+        for start in range(0, len(keys), chunk):
+            part = keys[start:start + chunk]
+            placeholders = ','.join('?' * len(part))
+            yield from self.conn.execute(
+                f"SELECT key, {column}, last_used FROM results WHERE key IN ({placeholders})", part)
+
+    def get_many(self, keys):
+        """批量查询，返回 {键: 结果}"""
+        return {key: marshal.loads(payload) for key, payload, _ in self._select(keys)}
+
+    def put_many(self, entries, rule=None, clock=None):
+        """批量写入 [(键, 结果), ...]，在一个事务内完成"""
+        rule = rule or self.rule
+        version = rule_version(self.calculator)
+        with self.conn:
+            if clock is None:
+                clock = self._tick()
+            rows = []
+            for key, result in entries:
+                payload = marshal.dumps(result)
+                rows.append((key, rule, version, _pack_verdict(result), payload, len(payload), clock))
+            # 用 UPSERT 而不是 INSERT OR REPLACE：替换删除的旧行不触发删除触发器，总大小会算错
+            self.conn.executemany(
+                "INSERT INTO results (key, rule, version, verdict, payload, size, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET rule = excluded.rule,"
+                " version = excluded.version, verdict = excluded.verdict, payload = excluded.payload,"
+                " size = excluded.size, last_used = excluded.last_used", rows)
+        if self.max_bytes is not None:
+            self.evict()
+
+    def check(self, elevator_specs, cargo_specs, num_people=1):
+        """单条查询，未命中时计算并写入"""
+        return self.check_many([(elevator_specs, cargo_specs, num_people)])[0]
+
+    def check_many(self, requests):
+        """
+        批量评估 [(电梯规格, 货物规格, 人数), ...]
+
+        已缓存的结果直接读取，未命中的计算后在同一事务内写入，返回结果列表与输入顺序一致
+        """
+        return self._run(requests, full=True)
+
+    def verdicts_many(self, requests):
+        """
+        批量评估但只返回 [(can_load, 问题代码位掩码), ...]
+
+        命中时不解码完整结果，适合只需要结论的大批量复查
+        """
+        return self._run(requests, full=False)
+
+    def _run(self, requests, full):
+        rule = self.rule
+        with self.conn:
+            clock = self._tick()
+        results = []
+        batch = []
+        for request in requests:
+            batch.append(request)
+            if len(batch) >= self.batch_size:
+                results.extend(self._check_batch(batch, rule, clock, full))
+                batch = []
+        if batch:
+            results.extend(self._check_batch(batch, rule, clock, full))
+        return results
+
+    def _check_batch(self, batch, rule, clock, full):
+        keys = [quantized_key(e, c, n, rule) for e, c, n in batch]
+        found = {}
+        stale = []
+        column = 'payload' if full else 'verdict'
+        decode = marshal.loads if full else _unpack_verdict
+        for key, value, last_used in self._select(set(keys), column):
+            found[key] = decode(value)
+            if clock - last_used > self.touch_after:
+                stale.append((clock, key))
+        missing = {}
+        for key, (elevator_specs, cargo_specs, num_people) in zip(keys, batch):
+            if key not in found and key not in missing:
+                missing[key] = self.calculator.check_elevator_capacity(elevator_specs, cargo_specs, num_people)
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if stale:
+            with self.conn:
+                self.conn.executemany("UPDATE results SET last_used = ? WHERE key = ?", stale)
+        if missing:
+            self.put_many(missing.items(), rule, clock)
+            for key, result in missing.items():
+                found[key] = result if full else _unpack_verdict(_pack_verdict(result))
+        return [found[key] for key in keys]
+
+    def total_bytes(self):
+        """条目总大小（meta 中维护的累计值）"""
+        return self.conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+
+    def stats(self):
+        """缓存条目数、总字节数及当前规则下的条目数"""
+        entries = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        size = self.total_bytes()
+        current = self.conn.execute("SELECT COUNT(*) FROM results WHERE rule = ?", (self.rule,)).fetchone()[0]
+        return {'entries': entries, 'bytes': size, 'current_rule_entries': current}
+
+    def evict(self, max_bytes=None):
+        """按最近使用时间淘汰，直到总大小不超过 max_bytes，返回删除条数"""
+        limit = max_bytes if max_bytes is not None else self.max_bytes
+        if limit is None:
+            return 0
+        total = self.total_bytes()
+        if total <= limit:
+            return 0
+        victims = []
+        for key, size in self.conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+            victims.append((key,))
+            total -= size
+            if total <= limit:
+                break
+        with self.conn:
+            self.conn.executemany("DELETE FROM results WHERE key = ?", victims)
+        return len(victims)
+
+    def compact(self, other_rules=False):
+        """
+        删除判定逻辑或序列化版本已过时的条目，按容量淘汰后整理数据库文件，返回删除条数
+
+        其他参数配置（安全间隙、引擎、登记门型等）写入的条目仍然有效，默认保留；
+        other_rules=True 时一并删除规则指纹与当前计算器不同的条目
+        """
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM results WHERE version != ?",
+                                        (rule_version(self.calculator),)).rowcount
+            if other_rules:
+                removed += self.conn.execute("DELETE FROM results WHERE rule != ?", (self.rule,)).rowcount
+        removed += self.evict()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.execute("VACUUM")
+        return removed
+
+
+def main(argv=None):
+    """命令行维护工具：python result_cache.py {stats,compact,evict} 缓存文件"""
+    parser = argparse.ArgumentParser(description="电梯装载结果缓存维护")
+    parser.add_argument('command', choices=['stats', 'compact', 'evict'])
+    parser.add_argument('path', help="SQLite 缓存文件")
+    parser.add_argument('--max-bytes', type=int, default=None, help="容量上限（字节）")
+    args = parser.parse_args(argv)
+
+    with ResultCache(args.path, max_bytes=args.max_bytes) as cache:
+        if args.command == 'compact':
+            print(f"已删除 {cache.compact()} 条")
+        elif args.command == 'evict':
+            print(f"已淘汰 {cache.evict()} 条")
+        stats = cache.stats()
+        print(f"条目数: {stats['entries']}  大小: {stats['bytes']} 字节  当前规则条目: {stats['current_rule_entries']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列式结果文件
+将 check_elevator_capacity 结果按列分块流式写入紧凑的二进制文件（可追加、可按列惰性读取），
+可选同时输出 gzip 压缩的 CSV
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import math
+import os
+import queue
+import struct
+import sys
+import threading
+from array import array
+
+from elevator_calculator import issue_mask
+
+
+MAGIC = b'\x93ELVRES'
+VERSION = 1
+NAN = float('nan')
+
+# 列定义：(列名, array 类型码)。缺失的浮点值记为 NaN，缺失的整数值记为 -1
+COLUMNS = (
+    ('request', 'q'),
+    ('can_load', 'B'),
+    ('issue_mask', 'H'),
+    ('diagonal_fit', 'B'),
+    ('orientation_length', 'd'),
+    ('orientation_width', 'd'),
+    ('orientation_height', 'd'),
+    ('volume_util', 'd'),
+    ('length_util', 'd'),
+    ('width_util', 'd'),
+    ('height_util', 'd'),
+    ('weight_util', 'd'),
+    ('cargo_weight_util', 'd'),
+    ('person_weight_util', 'd'),
+    ('person_count', 'i'),
+    ('person_weight', 'd'),
+    ('remaining_area', 'd'),
+    ('person_area_needed', 'd'),
+    ('max_people_by_weight', 'i'),
+    ('max_people_by_space', 'i'),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+_PREAMBLE = struct.Struct('<7sBI')  # 魔数、版本、文件头长度
+_CHUNK = struct.Struct('<4sI')  # 块标记、行数
+_CHUNK_TAG = b'CHNK'
+_ITEMSIZES = [array(code).itemsize for _, code in COLUMNS]
+
+
+def result_row(result, request):
+    """将一条评估结果展开为按 COLUMNS 顺序排列的值"""
+    best = result['best_orientation']
+    utils = result['utilizations']
+    person = result['person_analysis']
+    if best:
+        l, w, h = best['orientation']
+        geometry = (l, w, h, best['volume_utilization'], best['length_util'],
+                    best['width_util'], best['height_util'])
+    else:
+        geometry = (NAN,) * 7
+    return (
+        request,
+        int(result['can_load']),
+        issue_mask(result),
+        int(bool(best and best.get('diagonal_fit'))),
+    ) + geometry + (
+        utils.get('weight', NAN),
+        utils.get('cargo_weight', NAN),
+        utils.get('person_weight', NAN),
+        person.get('person_count', -1),
+        person.get('person_weight', NAN),
+        person.get('remaining_area', NAN),
+        person.get('person_area_needed', NAN),
+        person.get('max_people_by_weight', -1),
+        person.get('max_people_by_space', -1),
+    )
+
+
+def _header_bytes():
+    header = json.dumps({'columns': [list(column) for column in COLUMNS], 'byteorder': 'little'}).encode('ascii')
+    return _PREAMBLE.pack(MAGIC, VERSION, len(header)) + header
+
+
+def _chunk_size(rows):
+    return _CHUNK.size + rows * sum(_ITEMSIZES)
+
+
+def _scan(f):
+    """校验文件头并返回 [(块偏移, 行数), ...] 及最后一个完整块的结束位置"""
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size:
+        raise ValueError("不是列式结果文件")
+    magic, version, header_len = _PREAMBLE.unpack(preamble)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("不是列式结果文件或版本不受支持")
+    header = json.loads(f.read(header_len))
+    if [tuple(column) for column in header['columns']] != list(COLUMNS):
+        raise ValueError("结果文件的列定义与当前版本不一致")
+    end = f.seek(0, os.SEEK_END)
+    offset = _PREAMBLE.size + header_len
+    chunks = []
+    while offset + _CHUNK.size <= end:
+        f.seek(offset)
+        tag, rows = _CHUNK.unpack(f.read(_CHUNK.size))
+        if tag != _CHUNK_TAG or offset + _chunk_size(rows) > end:
+            break
+        chunks.append((offset, rows))
+        offset += _chunk_size(rows)
+    return chunks, offset
+
+
+class ResultWriter:
+    """
+    分块流式写入评估结果
+
+    用法:
+        with ResultWriter('results.col', csv_path='results.csv.gz') as writer:
+            for result in results:
+                writer.write(result)
+
+    已存在的文件会被追加；上次异常中断留下的不完整块会先被截去。
+    background=True 时由后台线程写盘，计算线程只负责填充列缓冲。
+    """
+
+    def __init__(self, path, csv_path=None, chunk_rows=65536, background=True):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                chunks, end = _scan(f)
+            self.rows_written = sum(rows for _, rows in chunks)
+            with open(path, 'r+b') as f:
+                f.truncate(end)
+            self._file = open(path, 'ab', buffering=1 << 20)
+        else:
+            self._file = open(path, 'wb', buffering=1 << 20)
+            self._file.write(_header_bytes())
+        self._csv_file = None
+        self._csv = None
+        if csv_path:
+            append = os.path.exists(csv_path)
+            opener = gzip.open if csv_path.endswith('.gz') else open
+            self._csv_file = opener(csv_path, 'at', newline='', encoding='utf-8')
+            self._csv = csv.writer(self._csv_file)
+            if not append:
+                self._csv.writerow(COLUMN_NAMES)
+        self._next_request = self.rows_written
+        self._reset()
+        self._queue = None
+        self._thread = None
+        self._error = None
+        if background:
+            self._queue = queue.Queue(maxsize=4)
+            self._thread = threading.Thread(target=self._drain, daemon=True)
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _reset(self):
+        self._columns = [array(code) for _, code in COLUMNS]
+        self._pending = 0
+
+    def write(self, result, request=None):
+        """追加一条结果，request 为对应输入的编号（默认按写入顺序递增）"""
+        if request is None:
+            request = self._next_request
+        self._next_request = request + 1
+        for column, value in zip(self._columns, result_row(result, request)):
+            column.append(value)
+        self._pending += 1
+        if self._pending >= self.chunk_rows:
+            self.flush()
+
+    def write_many(self, results, start=None):
+        """追加多条结果，编号从 start 开始连续递增"""
+        for offset, result in enumerate(results):
+            self.write(result, None if start is None else start + offset)
+
+    def flush(self):
+        """把缓冲中的行作为一个块交给写盘"""
+        if not self._pending:
+            return
+        chunk = (self._pending, self._columns)
+        self._reset()
+        if self._queue is None:
+            self._write_chunk(chunk)
+        else:
+            if self._error:
+                raise self._error
+            self._queue.put(chunk)
+
+    def _write_chunk(self, chunk):
+        rows, columns = chunk
+        if self._csv is not None:
+            self._csv.writerows(
+                tuple('' if isinstance(v, float) and math.isnan(v) else v for v in row)
+                for row in zip(*columns))
+        if sys.byteorder != 'little':
+            for column in columns:
+                column.byteswap()
+        self._file.write(_CHUNK.pack(_CHUNK_TAG, rows))
+        for column in columns:
+            self._file.write(column.tobytes())
+        self.rows_written += rows
+
+    def _drain(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            try:
+                if self._error is None:
+                    self._write_chunk(chunk)
+            except Exception as exc:  # 在调用线程的下一次 flush/close 时抛出
+                self._error = exc
+
+    def close(self):
+        """写出剩余缓冲并关闭文件"""
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+            self._file.close()
+            self._file = None
+            if self._csv_file is not None:
+                self._csv_file.close()
+        if self._error:
+            raise self._error
+
+
+class ResultReader:
+    """
+    按块惰性读取列式结果文件，只读取请求的列
+
+    用法:
+        reader = ResultReader('results.col')
+        for chunk in reader.chunks(['can_load', 'volume_util']):
+            ...
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._chunks, _ = _scan(f)
+
+    def __len__(self):
+        return sum(rows for _, rows in self._chunks)
+
+    @property
+    def chunk_count(self):
+        return len(self._chunks)
+
+    def chunks(self, columns=None):
+        """逐块返回 {列名: array}"""
+        names = list(columns or COLUMN_NAMES)
+        wanted = []
+        for name in names:
+            if name not in COLUMN_NAMES:
+                raise KeyError(name)
+            wanted.append(COLUMN_NAMES.index(name))
+        with open(self.path, 'rb') as f:
+            for offset, rows in self._chunks:
+                column_offset = offset + _CHUNK.size
+                starts = []
+                for itemsize in _ITEMSIZES:
+                    starts.append(column_offset)
+                    column_offset += rows * itemsize
+                chunk = {}
+                for index in wanted:
+                    values = array(COLUMNS[index][1])
+                    f.seek(starts[index])
+                    values.frombytes(f.read(rows * _ITEMSIZES[index]))
+                    if sys.byteorder != 'little':
+                        values.byteswap()
+                    chunk[COLUMN_NAMES[index]] = values
+                yield chunk
+
+    def column(self, name):
+        """读取整列"""
+        values = array(COLUMNS[COLUMN_NAMES.index(name)][1])
+        for chunk in self.chunks([name]):
+            values.extend(chunk[name])
+        return values
+
+    def rows(self, columns=None):
+        """逐行返回所选列组成的元组"""
+        names = list(columns or COLUMN_NAMES)
+        for chunk in self.chunks(names):
+            yield from zip(*(chunk[name] for name in names))
+
+
+def merge_results(sources, dest):
+    """
+    按顺序拼接多个列式结果文件的完整块（原样复制，不重新编码），返回总行数
+
+    先写入临时文件再替换，中断时不会留下半个目标文件
+    """
+    tmp_path = f"{dest}.tmp"
+    total = 0
+    with open(tmp_path, 'wb') as out:
+        out.write(_header_bytes())
+        for source in sources:
+            with open(source, 'rb') as f:
+                chunks, _ = _scan(f)
+                for offset, rows in chunks:
+                    f.seek(offset)
+                    out.write(f.read(_chunk_size(rows)))
+                    total += rows
+    os.replace(tmp_path, dest)
+    return total
+
+
+def main(argv=None):
+    """命令行：python result_columns.py 结果文件，显示行数和可装载比例"""
+    parser = argparse.ArgumentParser(description="列式结果文件信息")
+    parser.add_argument('path')
+    args = parser.parse_args(argv)
+    reader = ResultReader(args.path)
+    total = len(reader)
+    loadable = sum(sum(chunk['can_load']) for chunk in reader.chunks(['can_load']))
+    print(f"行数: {total}  块数: {reader.chunk_count}  可装载: {loadable}"
+          + (f" ({loadable / total * 100:.1f}%)" if total else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搬运路线检查
+路线由依次经过的路段组成（直走廊、L 形拐角、门洞、电梯轿厢），
+货物按顺序逐段检查，遇到第一个无法通过的路段即停止；各路段判定按几何参数缓存
+"""
+
+from functools import lru_cache
+from itertools import permutations
+
+from cab_geometry import CabGeometry
+from cab_models import resolve_specs
+from door_tables import DoorModel, corner_length, door_table, rectangle_fits
+from elevator_calculator import ElevatorCalculator
+from result_cache import rule_fingerprint
+
+
+@lru_cache(maxsize=65536)
+def _corner_limit(width_in, width_out, thickness):
+    return corner_length(width_in, width_out, thickness)
+
+
+def _geometry_key(item_specs):
+    """纯几何路段的判定与货物朝向、重量无关，按排序后的尺寸缓存"""
+    return tuple(sorted(item_specs[:3]))
+
+
+def _carry_orientations(item_dims):
+    """货物搬运姿态 (沿行进方向长度, 水平厚度, 竖直高度)，去除重复"""
+    return set(permutations(item_dims))
+
+
+class Corridor:
+    """直走廊：货物截面（可在截面内倾斜）需能通过 宽×高"""
+
+    kind = 'corridor'
+    item_key = staticmethod(_geometry_key)
+
+    def __init__(self, width, height, name=None):
+        self.width = width
+        self.height = height
+        self.name = name or f"走廊 {width}m"
+
+    def key(self):
+        return (self.kind, self.width, self.height)
+
+    def check(self, item_specs):
+        for _, thickness, vertical in _carry_orientations(item_specs[:3]):
+            if rectangle_fits(thickness, vertical, self.width, self.height):
+                return True, None
+        return False, f"货物截面无法通过{self.name}（宽 {self.width}m，高 {self.height}m）"
+
+
+class Corner:
+    """L 形拐角：货物水平转过 进口宽×出口宽 的直角拐角，竖直高度不超过净高"""
+
+    kind = 'corner'
+    item_key = staticmethod(_geometry_key)
+
+    def __init__(self, width_in, width_out, height, name=None):
+        self.width_in = width_in
+        self.width_out = width_out
+        self.height = height
+        self.name = name or f"拐角 {width_in}m/{width_out}m"
+
+    def key(self):
+        return (self.kind, self.width_in, self.width_out, self.height)
+
+    def check(self, item_specs):
+        for length, thickness, vertical in _carry_orientations(item_specs[:3]):
+            if vertical > self.height:
+                continue
+            if length <= _corner_limit(self.width_in, self.width_out, thickness):
+                return True, None
+        return False, f"货物无法转过{self.name}"
+
+
+class Doorway:
+    """门洞：使用门型通行表（截面可倾斜通过，长度受门外转向空间限制）"""
+
+    kind = 'doorway'
+    item_key = staticmethod(_geometry_key)
+
+    def __init__(self, width, height, landing_depth, name=None, table_dir=None):
+        self.door = DoorModel(width, height, landing_depth)
+        self.name = name or f"门 {width}m×{height}m"
+        self.table_dir = table_dir
+        self._table = None
+
+    def key(self):
+        return (self.kind, self.door.fingerprint())
+
+    def check(self, item_specs):
+        if self._table is None:
+            self._table = door_table(self.door, self.table_dir)
+        table = self._table
+        for length, thickness, vertical in _carry_orientations(item_specs[:3]):
+            if length <= table.lookup(thickness, vertical):
+                return True, None
+        return False, f"货物无法通过{self.name}"
+
+
+class ElevatorCab:
+    """电梯轿厢：调用 ElevatorCalculator 综合判定（elevator_specs 可以是标准轿厢型号代码或 CabGeometry）"""
+
+    kind = 'elevator'
+    item_key = staticmethod(tuple)
+
+    def __init__(self, elevator_specs, num_people=1, calculator=None, name=None):
+        if isinstance(elevator_specs, str):
+            name = name or f"电梯 {elevator_specs}"
+        if isinstance(elevator_specs, CabGeometry):
+            self.elevator_specs = elevator_specs
+        else:
+            self.elevator_specs = tuple(resolve_specs(elevator_specs))
+        self.num_people = num_people
+        self.calculator = calculator or ElevatorCalculator()
+        self.name = name or "电梯"
+
+    def key(self):
+        # 计算器参数可能在运行中被修改，键中包含规则指纹；轿厢几何模型按其指纹区分
+        cab = self.elevator_specs
+        if isinstance(cab, CabGeometry):
+            cab = cab.fingerprint()
+        return (self.kind, cab, self.num_people, rule_fingerprint(self.calculator))
+
+    def check(self, item_specs):
+        result = self.calculator.check_elevator_capacity(self.elevator_specs, tuple(item_specs), self.num_people)
+        if result['can_load']:
+            return True, None
+        return False, f"{self.name}: " + ('；'.join(result['issues']) or "无法装载")
+
+
+class RouteVerdict:
+    """单件货物的路线检查结果"""
+
+    def __init__(self, passable, blocked_at=None, segment=None, reason=None):
+        self.passable = passable
+        self.blocked_at = blocked_at  # 第一个无法通过的路段下标
+        self.segment = segment  # 该路段名称
+        self.reason = reason
+
+    def __repr__(self):
+        if self.passable:
+            return "RouteVerdict(passable=True)"
+        return f"RouteVerdict(passable=False, blocked_at={self.blocked_at}, segment={self.segment!r})"
+
+
+class Route:
+    """
+    搬运路线
+
+    用法:
+        route = Route([Doorway(1.0, 2.1, 3.0, name='单元门'), Corridor(1.2, 2.4),
+                       Corner(1.2, 1.1, 2.4), ElevatorCab((1.6, 1.4, 2.3, 1000)),
+                       Doorway(0.9, 2.0, 1.3, name='入户门')])
+        verdict = route.evaluate((2.1, 0.9, 0.85, 120))
+
+    cache 可在多条路线之间共享，几何参数相同的路段复用判定
+    """
+
+    def __init__(self, segments, cache=None):
+        self.segments = list(segments)
+        self.cache = {} if cache is None else cache
+
+    def _segment_verdict(self, segment, segment_key, item_specs):
+        key = (segment_key, segment.item_key(item_specs))
+        verdict = self.cache.get(key)
+        if verdict is None:
+            verdict = self.cache[key] = segment.check(item_specs)
+        return verdict
+
+    def evaluate(self, item_specs):
+        """按顺序检查各路段，返回 RouteVerdict"""
+        return self._evaluate(tuple(item_specs), [segment.key() for segment in self.segments])
+
+    def _evaluate(self, item_specs, segment_keys):
+        for index, (segment, segment_key) in enumerate(zip(self.segments, segment_keys)):
+            ok, reason = self._segment_verdict(segment, segment_key, item_specs)
+            if not ok:
+                return RouteVerdict(False, index, segment.name, reason)
+        return RouteVerdict(True)
+
+    def evaluate_catalog(self, items):
+        """
+        批量检查整个货物目录，返回与输入顺序一致的 RouteVerdict 列表
+
+        路段键只计算一次；规格相同的货物直接复用结果
+        """
+        segment_keys = [segment.key() for segment in self.segments]
+        seen = {}
+        verdicts = []
+        for item_specs in items:
+            item_specs = tuple(item_specs)
+            verdict = seen.get(item_specs)
+            if verdict is None:
+                verdict = seen[item_specs] = self._evaluate(item_specs, segment_keys)
+            verdicts.append(verdict)
+        return verdicts
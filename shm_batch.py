@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享内存批量评估
+输入列和输出列都放在 multiprocessing.shared_memory 块中，工作进程只接收 (起始行, 行数) 区间，
+按列读取输入、把结果按 result_columns.COLUMNS 写回输出列，逐行的元组和结果字典都不跨进程序列化
+"""
+
+import argparse
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from multiprocessing import shared_memory
+
+from elevator_calculator import ElevatorCalculator
+from result_columns import COLUMNS, result_row
+
+
+# 输入列：(列名, array 类型码)
+INPUT_COLUMNS = (
+    ('elevator_length', 'd'),
+    ('elevator_width', 'd'),
+    ('elevator_height', 'd'),
+    ('elevator_limit', 'd'),
+    ('cargo_length', 'd'),
+    ('cargo_width', 'd'),
+    ('cargo_height', 'd'),
+    ('cargo_weight', 'd'),
+    ('num_people', 'i'),
+)
+INPUT_NAMES = tuple(name for name, _ in INPUT_COLUMNS)
+
+
+def _layout(columns, rows):
+    """各列在共享块中的 (偏移, 类型码)，每列 8 字节对齐；返回布局和总字节数"""
+    layout, offset = [], 0
+    for _, code in columns:
+        layout.append((offset, code))
+        offset += (rows * array(code).itemsize + 7) // 8 * 8
+    return layout, max(offset, 1)
+
+
+def _views(block, layout, rows):
+    """共享块上按列的类型化 memoryview"""
+    buffer = block.buf
+    return [buffer[offset:offset + rows * array(code).itemsize].cast(code) for offset, code in layout]
+
+
+def _release(views):
+    for view in views:
+        view.release()
+
+
+def _typed_column(name, code, source):
+    """
+    输入列转换为目标类型码；类型一致的 array / memoryview 原样返回
+
+    整数列允许取值为整数的浮点数（如 array('d') 中的 2.0），其余无法无损转换的值报 ValueError
+    """
+    if isinstance(source, array) and source.typecode == code:
+        return source
+    if isinstance(source, memoryview) and source.format == code and source.ndim == 1:
+        return source
+    try:
+        return array(code, source)
+    except TypeError:
+        pass
+    if code != 'd':
+        values = list(source)
+        if all(isinstance(value, float) and value.is_integer() for value in values):
+            return array(code, map(int, values))
+    raise ValueError(f"输入列 {name} 无法转换为类型 {code!r}")
+
+
+# 工作进程状态：初始化时取得计算器
+_worker = {'calculator': None}
+
+
+def _init_worker(calculator):
+    _worker['calculator'] = calculator
+
+
+def _check_range(in_name, out_name, rows, start, stop):
+    """
+    子进程入口：评估 [start, stop) 行，结果写入输出块，只返回评估行数
+
+    每个任务挂接输入、输出块，返回前释放视图并关闭，批量结束后子进程不再映射已 unlink 的块
+    （进程池的子进程与主进程共用资源跟踪器，块由主进程 unlink 时统一注销）
+    """
+    calculator = _worker['calculator']
+    blocks, views = [], []
+    try:
+        in_block = shared_memory.SharedMemory(name=in_name)
+        blocks.append(in_block)
+        out_block = shared_memory.SharedMemory(name=out_name)
+        blocks.append(out_block)
+        inputs = _views(in_block, _layout(INPUT_COLUMNS, rows)[0], rows)
+        views.extend(inputs)
+        outputs = _views(out_block, _layout(COLUMNS, rows)[0], rows)
+        views.extend(outputs)
+        parts = [column[start:stop] for column in inputs]
+        views.extend(parts)
+        el, ew, eh, limit, cl, cw, ch, weight, people = parts
+        check = calculator.check_elevator_capacity
+        for offset, values in enumerate(zip(el, ew, eh, limit, cl, cw, ch, weight, people)):
+            row = start + offset
+            result = check(values[:4], values[4:8], values[8])
+            for column, value in zip(outputs, result_row(result, row)):
+                column[row] = value
+    finally:
+        _release(views)
+        for block in blocks:
+            block.close()
+    return stop - start
+
+
+def _check_chunk(calculator, chunk):
+    """对照组入口：逐行元组进、结果字典出（按 pickle 序列化）"""
+    return [calculator.check_elevator_capacity(*request) for request in chunk]
+
+
+def pack_requests(requests):
+    """[(电梯规格, 货物规格, 人数), ...] 转换为 {输入列名: array}"""
+    columns = {name: array(code) for name, code in INPUT_COLUMNS}
+    targets = [columns[name] for name in INPUT_NAMES]
+    for elevator_specs, cargo_specs, num_people in requests:
+        for column, value in zip(targets, (*elevator_specs, *cargo_specs, num_people)):
+            column.append(value)
+    return columns
+
+
+class SharedMemoryPool:
+    """
+    基于共享内存的多进程批量评估
+
+    用法:
+        with SharedMemoryPool(workers=4) as pool:
+            columns = pool.check_columns(inputs)  # {输出列名: array}，列定义同 result_columns.COLUMNS
+
+    参数:
+    - workers: 工作进程数（默认 CPU 数）
+    - chunk_rows: 每个任务的行数
+    """
+
+    def __init__(self, workers=None, calculator=None, chunk_rows=4096):
+        self.calculator = calculator or ElevatorCalculator()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        # fork 出的子进程会继承创建时主进程里尚未 unlink 的共享块映射，有 forkserver 时改用它启动
+        context = None
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_init_worker,
+                                            initargs=(self.calculator,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+
+    def check_columns(self, columns):
+        """
+        按列评估
+
+        参数:
+        - columns: {输入列名: 序列}，列名见 INPUT_COLUMNS（可为 array 或 binary_catalog 的 memoryview），
+          类型码与 INPUT_COLUMNS 不同的列先转换，无法无损转换时报 ValueError
+
+        返回:
+        - {输出列名: array}，request 列为行号
+        """
+        rows = len(columns[INPUT_NAMES[0]])
+        if any(len(columns[name]) != rows for name in INPUT_NAMES):
+            raise ValueError("输入列长度不一致")
+        if rows == 0:
+            return {name: array(code) for name, code in COLUMNS}
+        sources = [_typed_column(name, code, columns[name]) for name, code in INPUT_COLUMNS]
+        in_layout, in_size = _layout(INPUT_COLUMNS, rows)
+        out_layout, out_size = _layout(COLUMNS, rows)
+        blocks, views = [], []
+        try:
+            inputs = shared_memory.SharedMemory(create=True, size=in_size)
+            blocks.append(inputs)
+            outputs = shared_memory.SharedMemory(create=True, size=out_size)
+            blocks.append(outputs)
+            views = _views(inputs, in_layout, rows)
+            for view, source in zip(views, sources):
+                view[:] = source
+            _release(views)
+            ranges = [(start, min(start + self.chunk_rows, rows)) for start in range(0, rows, self.chunk_rows)]
+            futures = [self.executor.submit(_check_range, inputs.name, outputs.name, rows, start, stop)
+                       for start, stop in ranges]
+            for future in futures:
+                future.result()
+            views = _views(outputs, out_layout, rows)
+            return {name: array(code, view) for view, (name, code) in zip(views, COLUMNS)}
+        finally:
+            # 出错时也先释放全部视图，否则 close() 报 BufferError 掩盖原始异常且跳过 unlink
+            _release(views)
+            for block in blocks:
+                try:
+                    block.close()
+                finally:
+                    block.unlink()
+
+    def check_many(self, requests):
+        """按请求列表评估，返回 {输出列名: array}"""
+        return self.check_columns(pack_requests(requests))
+
+
+def random_requests(count, seed=0):
+    """基准测试用的随机请求"""
+    rnd = random.Random(seed)
+    return [((round(rnd.uniform(1.0, 2.5), 2), round(rnd.uniform(0.9, 2.0), 2), round(rnd.uniform(2.0, 2.8), 2),
+              rnd.choice((630, 800, 1000, 1600))),
+             (round(rnd.uniform(0.2, 2.4), 2), round(rnd.uniform(0.2, 1.2), 2), round(rnd.uniform(0.2, 2.0), 2),
+              round(rnd.uniform(5, 900), 1)),
+             rnd.randint(0, 3)) for _ in range(count)]
+
+
+def benchmark(count=100000, workers=None, chunk_rows=4096, seed=0):
+    """
+    对比共享内存路径与按 pickle 传递元组和结果字典的进程池，返回各自耗时(秒)
+
+    两种方式都使用已启动的进程池，计时不含进程启动
+    """
+    calculator = ElevatorCalculator()
+    requests = random_requests(count, seed)
+    columns = pack_requests(requests)
+    timings = {}
+
+    with SharedMemoryPool(workers, calculator, chunk_rows) as pool:
+        pool.check_columns({name: column[:1] for name, column in columns.items()})  # 预热
+        began = time.perf_counter()
+        shared = pool.check_columns(columns)
+        timings['shared_memory'] = time.perf_counter() - began
+
+    with ProcessPoolExecutor(max_workers=pool.workers) as executor:
+        list(executor.map(_check_chunk, [calculator] * pool.workers, [requests[:1]] * pool.workers))
+        began = time.perf_counter()
+        chunks = [requests[i:i + chunk_rows] for i in range(0, count, chunk_rows)]
+        results = [r for part in executor.map(_check_chunk, [calculator] * len(chunks), chunks) for r in part]
+        timings['pickle'] = time.perf_counter() - began
+
+    if list(shared['can_load']) != [int(r['can_load']) for r in results]:
+        raise AssertionError("共享内存路径与对照组结果不一致")
+    return timings
+
+
+def main(argv=None):
+    """命令行：python shm_batch.py [--rows 100000] [--workers N]，输出两种进程池的耗时对比"""
+    parser = argparse.ArgumentParser(description="共享内存批量评估基准测试")
+    parser.add_argument('--rows', type=int, default=100000, help="请求行数")
+    parser.add_argument('--workers', type=int, default=None, help="工作进程数")
+    parser.add_argument('--chunk', type=int, default=4096, help="每个任务的行数")
+    args = parser.parse_args(argv)
+
+    timings = benchmark(args.rows, args.workers, args.chunk)
+    for name, seconds in timings.items():
+        print(f"{name:>14}: {seconds:.3f}s  {args.rows / seconds:,.0f} 行/秒")
+    print(f"共享内存路径加速 {timings['pickle'] / timings['shared_memory']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+调度单目录持续接入
+轮询订单系统投放 JSONL 文件的目录，从记录的偏移处读取新追加的完整行，按小批量评估，
+每批结果写成一个 JSONL 文件（临时文件写完后替换），随后原子地更新各源文件的已处理偏移；
+读取、评估、写出之间是有界队列，下游变慢时上游阻塞而不是无限缓存。
+重启后从已提交的偏移继续：写出结果后、提交偏移前中断的那一批会以同一批次号重新生成并覆盖，
+不会出现重复记录
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+from elevator_calculator import ElevatorCalculator
+from loading_report import parse_request
+
+
+STATE_VERSION = 1
+STATE_NAME = 'offsets.json'
+_STOP = object()  # 写出队列的结束标记
+
+
+def _atomic_write(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def summarize(order, result):
+    """结果文件中的一条记录"""
+    best = result['best_orientation']
+    return {
+        'order': order,
+        'can_load': result['can_load'],
+        'issues': result['issues'],
+        'orientation': list(best['orientation']) if best else None,
+        'diagonal_fit': bool(best and best.get('diagonal_fit')),
+        'weight_util': result['utilizations'].get('weight'),
+    }
+
+
+class SpoolIngestor:
+    """
+    调度单目录的持续接入
+
+    用法:
+        ingestor = SpoolIngestor('spool', 'results')
+        ingestor.run()              # 一直运行，其他线程调用 ingestor.stop() 或 Ctrl-C 结束
+        ingestor.run(idle_exit=5)   # 连续 5 秒没有新记录后退出
+
+    参数:
+    - spool_dir: 投放目录，只读取扩展名为 suffix 的文件；文件只追加，未以换行结尾的末行等写完再读
+    - out_dir: 结果目录，含 results-批次号.jsonl 和偏移记录 offsets.json
+    - batch_size / batch_timeout: 每批最多的记录数、凑批最长等待秒数
+    - poll_interval: 没有新数据时重新扫描目录的间隔(秒)
+    - max_pending: 读取到评估之间的队列容量（行）；max_batches 为评估到写出之间的队列容量（批）
+    """
+
+    def __init__(self, spool_dir, out_dir, calculator=None, batch_size=256, batch_timeout=0.5,
+                 poll_interval=1.0, max_pending=4096, max_batches=4, suffix='.jsonl'):
+        if batch_size < 1:
+            raise ValueError("批大小必须为正整数")
+        self.spool_dir = spool_dir
+        self.out_dir = out_dir
+        self.calculator = calculator or ElevatorCalculator()
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.poll_interval = poll_interval
+        self.suffix = suffix
+        self.lines = queue.Queue(max_pending)
+        self.batches = queue.Queue(max_batches)
+        self._stop = threading.Event()
+        self._failure = None  # 读取或写出线程的异常，run 结束时重新抛出
+        self.stats = {'records': 0, 'errors': 0, 'batches': 0, 'stalls': 0}
+        os.makedirs(out_dir, exist_ok=True)
+        self.state_path = os.path.join(out_dir, STATE_NAME)
+        self.state = self._load_state()
+
+    def _load_state(self):
+        """{'version', 'batch': 已写出的最后批次号, 'files': {文件名: [inode, 已处理偏移]}}"""
+        if not os.path.exists(self.state_path):
+            return {'version': STATE_VERSION, 'batch': 0, 'files': {}}
+        with open(self.state_path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION:
+            raise ValueError(f"{self.state_path} 的版本不受支持")
+        return state
+
+    def batch_path(self, batch):
+        return os.path.join(self.out_dir, f"results-{batch:08d}.jsonl")
+
+    def stop(self):
+        """请求停止：当前批次写出并提交偏移后 run 返回"""
+        self._stop.set()
+
+    def _put(self, target, item):
+        """有界队列的阻塞写入，队列满时计一次背压并等待，收到停止请求返回 False"""
+        try:
+            target.put_nowait(item)
+            return True
+        except queue.Full:
+            self.stats['stalls'] += 1
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _guard(self, loop):
+        """线程入口：记录第一个异常并请求停止，由 run 重新抛出"""
+        try:
+            loop()
+        except BaseException as e:
+            if self._failure is None:
+                self._failure = e
+            self._stop.set()
+
+    def _hand_off(self, writer, item):
+        """
+        向写出队列放入一批或结束标记，队列满时等待（停止请求不中断，已评估的批次照常写出）
+
+        写出线程已退出时返回 False，不会因写出线程异常而永久阻塞
+        """
+        while writer.is_alive():
+            try:
+                self.batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read_loop(self):
+        """读取线程：按文件名顺序读取各文件新追加的完整行，放入行队列"""
+        positions = {name: tuple(entry) for name, entry in self.state['files'].items()}
+        while not self._stop.is_set():
+            found = False
+            for name in sorted(os.listdir(self.spool_dir)):
+                if not name.endswith(self.suffix):
+                    continue
+                path = os.path.join(self.spool_dir, name)
+                try:
+                    f = open(path, 'rb')
+                except FileNotFoundError:  # 列目录后被移走
+                    continue
+                with f:
+                    inode = os.fstat(f.fileno()).st_ino
+                    known_inode, offset = positions.get(name, (inode, 0))
+                    if known_inode != inode or os.fstat(f.fileno()).st_size < offset:
+                        offset = 0  # 同名的新文件
+                    f.seek(offset)
+                    while not self._stop.is_set():
+                        line = f.readline()
+                        if not line.endswith(b'\n'):
+                            break
+                        offset += len(line)
+                        found = True
+                        if not self._put(self.lines, (name, inode, offset, line)):
+                            return
+                        positions[name] = (inode, offset)
+            if not found:
+                self._stop.wait(self.poll_interval)
+
+    def _evaluate(self, items):
+        """评估一批行，返回 (结果记录列表, {文件名: [inode, 偏移]})"""
+        records, offsets = [], {}
+        check = self.calculator.check_elevator_capacity
+        for name, inode, offset, line in items:
+            offsets[name] = [inode, offset]
+            text = line.strip()
+            if not text:
+                continue
+            try:
+                order, elevator_specs, cargo_specs, num_people = parse_request(json.loads(text))
+            except (ValueError, KeyError, TypeError) as e:
+                records.append({'source': name, 'offset': offset - len(line), 'error': str(e)})
+                self.stats['errors'] += 1
+                continue
+            record = summarize(order, check(elevator_specs, cargo_specs, num_people))
+            record['source'] = name
+            records.append(record)
+        return records, offsets
+
+    def _write_loop(self):
+        """写出线程：按批次号写结果文件，再提交偏移"""
+        while True:
+            item = self.batches.get()
+            if item is _STOP:
+                return
+            records, offsets = item
+            batch = self.state['batch'] + 1
+            _atomic_write(self.batch_path(batch),
+                          ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+            self.state['batch'] = batch
+            self.state['files'].update(offsets)
+            _atomic_write(self.state_path, json.dumps(self.state, ensure_ascii=False))
+            self.stats['batches'] += 1
+
+    def _next_batch(self, idle_deadline):
+        """凑一批：等到第一行后，最多再等 batch_timeout 秒或凑满 batch_size 行"""
+        items = []
+        while not items:
+            if self._stop.is_set() or (idle_deadline is not None and time.monotonic() > idle_deadline):
+                return items
+            try:
+                items.append(self.lines.get(timeout=0.05))
+            except queue.Empty:
+                continue
+        deadline = time.monotonic() + self.batch_timeout
+        while len(items) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self.lines.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def run(self, idle_exit=None):
+        """
+        持续接入，直到 stop() 被调用、收到 KeyboardInterrupt 或连续 idle_exit 秒没有新记录
+
+        返回统计 {'records', 'errors', 'batches', 'stalls'}（stalls 为队列满而阻塞的次数）；
+        停止时队列中尚未评估的行不提交偏移，下次运行重新读取。
+        读取或写出线程出错时停止接入，未写出的批次不提交偏移，run 重新抛出该异常
+        """
+        self._stop.clear()
+        self._failure = None
+        reader = threading.Thread(target=self._guard, args=(self._read_loop,), name='spool-reader', daemon=True)
+        writer = threading.Thread(target=self._guard, args=(self._write_loop,), name='spool-writer', daemon=True)
+        reader.start()
+        writer.start()
+        try:
+            idle_deadline = None if idle_exit is None else time.monotonic() + idle_exit
+            while not self._stop.is_set():
+                items = self._next_batch(idle_deadline)
+                if not items:
+                    break
+                records, offsets = self._evaluate(items)
+                self.stats['records'] += len(records)
+                # 写出队列满时在此阻塞，评估随之放慢
+                if not self._hand_off(writer, (records, offsets)):
+                    break
+                if idle_exit is not None:
+                    idle_deadline = time.monotonic() + idle_exit
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stop.set()
+            self._hand_off(writer, _STOP)
+            writer.join()
+            reader.join()
+        if self._failure is not None:
+            raise self._failure
+        return dict(self.stats)
+
+
+def main(argv=None):
+    """命令行：python spool_ingest.py 投放目录 结果目录 [--batch 256] [--poll 1.0]，Ctrl-C 停止"""
+    parser = argparse.ArgumentParser(description="持续接入调度单目录中的 JSONL 文件并逐批评估")
+    parser.add_argument('spool_dir', help="投放目录")
+    parser.add_argument('out_dir', help="结果和偏移记录目录")
+    parser.add_argument('--batch', type=int, default=256, help="每批最多记录数")
+    parser.add_argument('--batch-timeout', type=float, default=0.5, help="凑批最长等待秒数")
+    parser.add_argument('--poll', type=float, default=1.0, help="目录轮询间隔(秒)")
+    parser.add_argument('--idle-exit', type=float, default=None, help="连续空闲该秒数后退出（默认一直运行）")
+    args = parser.parse_args(argv)
+
+    ingestor = SpoolIngestor(args.spool_dir, args.out_dir, batch_size=args.batch,
+                             batch_timeout=args.batch_timeout, poll_interval=args.poll)
+    print(f"监视 {args.spool_dir}，已写出 {ingestor.state['batch']} 批，Ctrl-C 停止", flush=True)
+    stats = ingestor.run(idle_exit=args.idle_exit)
+    print(f"本次评估 {stats['records']} 条（无法解析 {stats['errors']} 条），写出 {stats['batches']} 批，"
+          f"背压阻塞 {stats['stalls']} 次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+多电梯货物分配优化测试
+"""
+
+import time
+import unittest
+
+from move_simulator import CabSpec, MoveItem, trip_duration
+from assignment_optimizer import optimize_assignment, greedy_lpt
+
+
+class TestAssignmentOptimizer(unittest.TestCase):
+    """测试货物分配优化"""
+
+    def setUp(self):
+        self.small_cab = CabSpec((1.4, 1.1, 2.2, 630), seconds_per_floor=2.0, door_cycle=5.0)
+        self.large_cab = CabSpec((2.5, 2.0, 2.8, 2000), seconds_per_floor=2.0, door_cycle=5.0)
+
+    def test_balances_identical_cabs(self):
+        """两部相同电梯时负荷应均分"""
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=f) for f in (10, 10, 20, 20)]
+        result = optimize_assignment([self.large_cab, self.large_cab], items, time_limit=0.1)
+        self.assertAlmostEqual(result.loads[0], result.loads[1])
+        self.assertAlmostEqual(result.makespan, result.lower_bound)
+
+    def test_respects_feasibility(self):
+        """大件只能分给大电梯，装不下的货物单独列出"""
+        items = [
+            MoveItem((2.0, 1.5, 1.8, 300), floor=5),
+            MoveItem((0.5, 0.4, 0.5, 20), floor=5),
+            MoveItem((6.0, 3.0, 3.0, 300), floor=5),
+        ]
+        result = optimize_assignment([self.small_cab, self.large_cab], items, time_limit=0.1)
+        self.assertIn(0, result.sequences[1])
+        self.assertEqual(result.unassigned, [2])
+        assigned = sorted(i for seq in result.sequences for i in seq)
+        self.assertEqual(assigned, [0, 1])
+
+    def test_loads_match_sequences(self):
+        """增量维护的负荷与按分配结果重新计算一致"""
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=f % 37 + 1) for f in range(200)]
+        cabs = [self.small_cab, self.large_cab, CabSpec((1.6, 1.4, 2.3, 1000), seconds_per_floor=1.0)]
+        result = optimize_assignment(cabs, items, time_limit=0.2)
+        for cab, sequence, load in zip(cabs, result.sequences, result.loads):
+            self.assertAlmostEqual(load, sum(trip_duration(cab, items[i]) for i in sequence), places=6)
+        self.assertGreaterEqual(result.makespan, result.lower_bound - 1e-9)
+
+    def test_local_search_not_worse_than_greedy(self):
+        """局部搜索结果不劣于 LPT 贪心初始解"""
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=f % 23 + 1, load_time=f % 7 * 10) for f in range(150)]
+        cabs = [self.small_cab, self.large_cab]
+        durations = [{c: trip_duration(cab, item) for c, cab in enumerate(cabs)} for item in items]
+        greedy = max(greedy_lpt(durations, len(cabs)).loads)
+        result = optimize_assignment(cabs, items, time_limit=0.2)
+        self.assertLessEqual(result.makespan, greedy + 1e-9)
+
+    def test_time_limit_bounds_swap_search(self):
+        """大实例的 O(n²) 交换搜索也遵守 time_limit"""
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=10 + i % 2) for i in range(4001)]
+        feasibility = [list(range(len(items)))] * 2
+        began = time.perf_counter()
+        optimize_assignment([self.large_cab, self.large_cab], items, time_limit=0.05, feasibility=feasibility)
+        self.assertLess(time.perf_counter() - began, 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
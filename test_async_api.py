@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+异步评估接口测试
+"""
+
+import asyncio
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import async_api
+from async_api import AsyncElevatorService
+from elevator_calculator import ElevatorCalculator
+
+
+class _SlowCalculator(ElevatorCalculator):
+    """每次评估固定耗时，用于测试超时和取消"""
+
+    def check_elevator_capacity(self, elevator_specs, cargo_specs, num_people=1):
+        time.sleep(0.01)
+        return super().check_elevator_capacity(elevator_specs, cargo_specs, num_people)
+
+
+class TestAsyncApi(unittest.TestCase):
+    """测试异步单条/批量评估、超时与取消"""
+
+    def setUp(self):
+        base = [
+            ((1.6, 1.4, 2.3, 1000), (1.2, 0.8, 1.0, 200), 1),
+            ((1.0, 0.8, 2.0, 500), (2.1, 0.9, 0.85, 120), 1),
+            ((2.0, 1.8, 2.5, 1500), (2.0, 0.8, 0.5, 100), 2),
+        ]
+        self.requests = base * 100
+        calculator = ElevatorCalculator()
+        self.expected = [calculator.check_elevator_capacity(*r) for r in self.requests]
+
+    def test_acheck(self):
+        """单条评估与同步接口一致"""
+        async def run():
+            async with AsyncElevatorService() as service:
+                return await service.acheck(*self.requests[0])
+        self.assertEqual(asyncio.run(run()), self.expected[0])
+
+    def test_acheck_many_inline_and_offloaded(self):
+        """小批量内联、大批量分块，结果按下标与同步接口一致"""
+        async def run(requests, **kwargs):
+            async with AsyncElevatorService(chunk_size=32, **kwargs) as service:
+                return [item async for item in service.acheck_many(requests)]
+
+        small = asyncio.run(run(self.requests[:10]))
+        self.assertEqual([index for index, _ in small], list(range(10)))
+        large = dict(asyncio.run(run(self.requests, max_concurrency=3)))
+        self.assertEqual([large[i] for i in range(len(self.requests))], self.expected)
+
+    def test_timeout_and_cancellation(self):
+        """超时抛出 TimeoutError；提前停止迭代后未开始的分块被取消"""
+        async def timed_out():
+            async with AsyncElevatorService(_SlowCalculator(), chunk_size=5, max_concurrency=2) as service:
+                async for _ in service.acheck_many(self.requests, timeout=0.05):
+                    pass
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(timed_out())
+
+        async def early_stop():
+            calculator = _SlowCalculator()
+            calls = []
+            original = calculator.check_elevator_capacity
+            calculator.check_elevator_capacity = lambda *args: calls.append(1) or original(*args)
+            async with AsyncElevatorService(calculator, chunk_size=5, max_concurrency=2) as service:
+                stream = service.acheck_many(self.requests)
+                async for _ in stream:
+                    break
+                await stream.aclose()
+            await asyncio.sleep(0.1)
+            return len(calls)
+
+        self.assertLess(asyncio.run(early_stop()), len(self.requests) // 2)
+
+    def test_inline_timeout(self):
+        """内联计算的小批量同样受超时限制"""
+        async def run():
+            async with AsyncElevatorService(_SlowCalculator(), inline_threshold=64) as service:
+                return [item async for item in service.acheck_many(self.requests[:50], timeout=0.05)]
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(run())
+
+    def test_default_executor(self):
+        """默认使用进程池；计算器不可序列化时退回线程池"""
+        service = AsyncElevatorService()
+        self.assertIsInstance(service.executor, ProcessPoolExecutor)
+        service.close()
+        calculator = ElevatorCalculator()
+        calculator.check_elevator_capacity = lambda *args: None
+        service = AsyncElevatorService(calculator)
+        self.assertIsInstance(service.executor, ThreadPoolExecutor)
+        service.close()
+
+    def test_event_loop_stays_responsive(self):
+        """大批量评估期间并发的计时协程仍能持续运行，不会被整批计算阻塞"""
+        async def run():
+            gaps, stop = [], asyncio.Event()
+
+            async def ticker():
+                last = time.perf_counter()
+                while not stop.is_set():
+                    await asyncio.sleep(0.001)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0.01)
+            started = time.perf_counter()
+            async with AsyncElevatorService() as service:
+                count = len([item async for item in service.acheck_many(self.requests * 20)])
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await task
+            return count, elapsed, gaps
+
+        count, elapsed, gaps = asyncio.run(run())
+        self.assertEqual(count, len(self.requests) * 20)
+        self.assertGreater(len(gaps), 10)
+        self.assertLess(max(gaps), elapsed / 2)
+
+    def test_default_service_closed(self):
+        """默认服务可显式关闭，之后再次调用会重新创建"""
+        first = asyncio.run(async_api.acheck(*self.requests[0]))
+        self.assertEqual(first, self.expected[0])
+        service = async_api._default_service
+        async_api.close_default_service()
+        self.assertIsNone(async_api._default_service)
+        with self.assertRaises(RuntimeError):
+            service.executor.submit(int)
+        asyncio.run(async_api.acheck(*self.requests[0]))
+        self.assertIsNot(async_api._default_service, service)
+        async_api.close_default_service()
+
+
+if __name__ == '__main__':
+    unittest.main()
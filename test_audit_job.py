@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+分片审计任务测试
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from audit_job import AuditJob
+from binary_catalog import write_catalog
+from elevator_calculator import ElevatorCalculator
+from result_columns import ResultReader
+
+
+class TestAuditJob(unittest.TestCase):
+    """测试分片、检查点续跑与合并"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cargo_path = os.path.join(self.tmpdir.name, 'cargo.bin')
+        self.elevator_path = os.path.join(self.tmpdir.name, 'elevators.bin')
+        self.out_dir = os.path.join(self.tmpdir.name, 'audit')
+        self.cargo = [(f'SKU{i}', 0.5 + 0.1 * i, 0.6, 0.4 + 0.05 * i, 50 + 40 * i) for i in range(10)]
+        self.elevators = [('小', 1.1, 1.0, 2.1, 630), ('大', 2.0, 1.6, 2.4, 1600)]
+        write_catalog(self.cargo_path, 'cargo', self.cargo)
+        write_catalog(self.elevator_path, 'elevator', self.elevators)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def job(self, **kwargs):
+        return AuditJob(self.cargo_path, self.elevator_path, self.out_dir, num_people=1, shard_size=3, **kwargs)
+
+    def test_resume_and_merge(self):
+        """中断后只计算剩余分片，合并结果与逐条评估一致"""
+        job = self.job()
+        self.assertEqual([s[1:] for s in job.shards], [(0, 3), (3, 6), (6, 9), (9, 10)])
+        reports = []
+        status = job.run(workers=1, progress=reports.append, max_shards=2)
+        self.assertEqual((status.done_shards, status.done_rows), (2, 12))
+        self.assertIsNotNone(status.eta)
+        with self.assertRaises(ValueError):
+            job.merge()
+
+        resumed = self.job()
+        self.assertEqual([s[0] for s in resumed.pending()], [2, 3])
+        status = resumed.run(workers=2)
+        self.assertEqual((status.done_shards, status.done_rows), (4, 20))
+        reader = ResultReader(resumed.merge())
+        self.assertEqual(list(reader.column('request')), list(range(20)))
+
+        calculator = ElevatorCalculator()
+        expected = [int(calculator.check_elevator_capacity(e[1:], c[1:], 1)['can_load'])
+                    for c in self.cargo for e in self.elevators]
+        self.assertEqual(list(reader.column('can_load')), expected)
+        self.assertEqual(status.loadable, sum(expected))
+        self.assertEqual(self.job().run(workers=1).done_rows, 20)  # 全部完成后再次运行不重复计算
+
+    def test_lost_shard_file_is_recomputed(self):
+        """检查点中已完成但结果文件丢失的分片会重新计算"""
+        job = self.job()
+        job.run(workers=1)
+        os.remove(job.shard_path(1))
+        self.assertEqual([s[0] for s in self.job().pending()], [1])
+
+    def test_mismatched_checkpoint(self):
+        """参数不同的任务拒绝复用检查点"""
+        self.job().run(workers=1, max_shards=1)
+        with open(os.path.join(self.out_dir, 'checkpoint.json'), encoding='utf-8') as f:
+            self.assertIn('0', json.load(f)['completed'])
+        with self.assertRaises(ValueError):
+            AuditJob(self.cargo_path, self.elevator_path, self.out_dir, num_people=2, shard_size=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
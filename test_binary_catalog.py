@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+二进制目录测试
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from binary_catalog import ALIGNMENT, Catalog, convert, write_catalog
+
+
+class TestBinaryCatalog(unittest.TestCase):
+    """测试二进制目录的写入、转换与 mmap 读取"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.rows = [
+            ('SKU-沙发', 2.1, 0.9, 0.85, 120),
+            ('SKU-冰箱', 0.7, 0.7, 1.8, 90.5),
+            ('SKU-超长编号-0123456789abcdefghij', 1.2, 0.8, 1.0, 200),
+        ]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_round_trip(self):
+        """写入后按行、按列读取的数值一致，列按 64 字节对齐"""
+        path = self.path('cargo.cat')
+        self.assertEqual(write_catalog(path, 'cargo', self.rows), 3)
+        with Catalog(path) as catalog:
+            self.assertEqual(catalog.kind, 'cargo')
+            self.assertEqual(len(catalog), 3)
+            self.assertEqual(catalog.spec(1), (0.7, 0.7, 1.8, 90.5))
+            self.assertEqual(list(catalog.column('weight')), [120.0, 90.5, 200.0])
+            self.assertEqual(catalog.label(0), 'SKU-沙发')
+            self.assertEqual(list(catalog.specs(1, 3)), [row[1:] for row in self.rows[1:]])
+            self.assertEqual(catalog.column('length').format, 'd')
+        with open(path, 'rb') as f:
+            data = f.read()
+        with Catalog(path) as catalog:
+            start = data.index(bytes(catalog.column('length').cast('B')))
+            self.assertEqual(start % ALIGNMENT, 0)
+
+    def test_convert_csv_and_jsonl(self):
+        """CSV 与 JSONL 转换结果相同"""
+        csv_path, jsonl_path = self.path('fleet.csv'), self.path('fleet.jsonl')
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write('model,length,width,height,max_weight\n')
+            f.write('P8,1.4,1.1,2.2,630\nP13,1.6,1.4,2.3,1000\n')
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'model': 'P8', 'length': 1.4, 'width': 1.1, 'height': 2.2, 'max_weight': 630}) + '\n')
+            f.write(json.dumps({'model': 'P13', 'length': 1.6, 'width': 1.4, 'height': 2.3, 'max_weight': 1000}) + '\n')
+        self.assertEqual(convert(csv_path, self.path('a.cat'), 'elevator'), 2)
+        self.assertEqual(convert(jsonl_path, self.path('b.cat'), 'elevator'), 2)
+        with Catalog(self.path('a.cat')) as a, Catalog(self.path('b.cat')) as b:
+            self.assertEqual(list(a.specs()), list(b.specs()))
+            self.assertEqual(a.label(1), 'P13')
+
+    def test_missing_column_and_bad_file(self):
+        """缺列与非目录文件给出明确错误"""
+        csv_path = self.path('bad.csv')
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write('sku,length,width\nA,1,1\n')
+        with self.assertRaises(ValueError):
+            convert(csv_path, self.path('bad.cat'), 'cargo')
+        with self.assertRaises(ValueError):
+            Catalog(csv_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+轿厢逆向设计测试
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from binary_catalog import Catalog, write_catalog
+from cab_design import CatalogIndex, DesignSpace, grid, pareto_front, smallest_cab, verify
+from elevator_calculator import ElevatorCalculator
+
+
+class TestCabDesign(unittest.TestCase):
+    """测试与逐项判定一致、前沿非支配性和最小轿厢选择"""
+
+    def setUp(self):
+        self.calc = ElevatorCalculator()
+        rnd = random.Random(3)
+        self.catalog = [(rnd.randint(1, 12) * 0.25, rnd.randint(1, 10) * 0.25, rnd.randint(1, 12) * 0.25,
+                         rnd.choice([50, 300, 900, 1500, 2600])) for _ in range(120)]
+        self.space = DesignSpace(grid(1.0, 2.5, 0.25), grid(1.0, 2.0, 0.25), (1.5, 2.0, 2.5), (450, 1000, 2000))
+
+    def expected(self, specs, people):
+        return sum(1 for row in self.catalog
+                   if self.calc.check_elevator_capacity(specs, row, people)['can_load'])
+
+    def test_matches_calculator(self):
+        """每个候选轿厢、每个额定载重的可装载数与 check_elevator_capacity 逐项判定一致"""
+        for people in (0, 2, 4):
+            index = CatalogIndex(self.catalog, self.space, self.calc, people)
+            for length, width, height, counts in index.scan():
+                for rating, count in zip(self.space.ratings, counts):
+                    self.assertEqual(count, self.expected((length, width, height, rating), people),
+                                     (length, width, height, rating, people))
+
+    def test_matches_calculator_on_mm_grid(self):
+        """毫米网格上的随机目录（体积乘积有浮点舍入）计数同样与逐项判定一致"""
+        rnd = random.Random(17)
+        catalog = [(rnd.randint(100, 2600) / 1000, rnd.randint(100, 1800) / 1000, rnd.randint(100, 2400) / 1000,
+                    rnd.randint(10, 2000)) for _ in range(150)]
+        space = DesignSpace(grid(1.0, 2.6, 0.15), grid(0.9, 2.1, 0.15), (2.1, 2.35, 2.6), (630, 1000, 1600))
+        index = CatalogIndex(catalog, space, self.calc, 1)
+        for length, width, height, counts in index.scan():
+            for rating, count in zip(space.ratings, counts):
+                specs = (length, width, height, rating)
+                expected = sum(1 for row in catalog if self.calc.check_elevator_capacity(specs, row, 1)['can_load'])
+                self.assertEqual(count, expected, specs)
+
+    def test_front_is_non_dominated(self):
+        """前沿点互不支配，且与全部候选点的暴力求解一致"""
+        front = pareto_front(self.catalog, self.space, self.calc, num_people=2)
+        index = CatalogIndex(self.catalog, self.space, self.calc, 2)
+        points = [(l * w * h, rating, count) for l, w, h, counts in index.scan()
+                  for rating, count in zip(self.space.ratings, counts)]
+        brute = {p for p in points
+                 if not any(q != p and q[0] <= p[0] and q[1] <= p[1] and q[2] >= p[2] for q in points)}
+        self.assertEqual({(p.volume, p.rated_load, p.covered) for p in front}, brute)
+        for point in front:
+            self.assertEqual(verify(self.catalog, point, self.calc, 2), point.covered)
+
+    def test_smallest_cab(self):
+        """最小轿厢达到目标覆盖率，且前沿中没有体积更小的可行点"""
+        front = pareto_front(self.catalog, self.space, self.calc, num_people=2)
+        best = smallest_cab(front, 0.5)
+        self.assertGreaterEqual(best.coverage, 0.5)
+        self.assertFalse([p for p in front if p.coverage >= 0.5 and p.volume < best.volume])
+        self.assertIsNone(smallest_cab(front, 1.01))
+
+    def test_invalid_items_and_binary_catalog(self):
+        """无效货物计入总数但永不可装载；二进制目录按列读取"""
+        rows = [('A', 1.0, 0.5, 0.5, 100), ('B', 0, 0.5, 0.5, 100), ('C', 1.0, 0.5, 0.5, -1)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cargo.bin')
+            write_catalog(path, 'cargo', rows)
+            with Catalog(path) as catalog:
+                index = CatalogIndex(catalog, self.space, self.calc, 1)
+        self.assertEqual((index.total, index.count), (3, 1))
+        self.assertEqual(index.covered(2.5, 2.0, 2.5), [1, 1, 1])
+
+    def test_unsupported_rules(self):
+        """精确引擎和人员站位求解不支持逆向设计"""
+        for attr, value in (('engine', 'exact'), ('use_crew_placement', True)):
+            calculator = ElevatorCalculator()
+            setattr(calculator, attr, value)
+            with self.assertRaises(ValueError):
+                CatalogIndex(self.catalog, self.space, calculator)
+        with self.assertRaises(ValueError):
+            DesignSpace(lengths=(2.0, 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
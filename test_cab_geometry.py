@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+轿厢几何模型测试
+"""
+
+import random
+import unittest
+
+from cab_geometry import CabGeometry, Door, ObstacleIndex, handrail
+from cargo_shapes import Box
+from door_tables import DoorModel
+from elevator_calculator import ElevatorCalculator
+
+
+class TestCabGeometry(unittest.TestCase):
+    """测试障碍物索引、落地放置、多门通行和计算器接入"""
+
+    def setUp(self):
+        self.calc = ElevatorCalculator()
+
+    def test_bare_cab_matches_box_model(self):
+        """无障碍物的单门轿厢与 (长, 宽, 高, 限重) 元组的判定一致"""
+        rng = random.Random(5)
+        for _ in range(500):
+            specs = (rng.uniform(0.9, 2.6), rng.uniform(0.9, 2.2), rng.uniform(1.9, 2.8), rng.choice([630, 1000]))
+            cargo = (rng.uniform(0.1, 2.6), rng.uniform(0.1, 1.8), rng.uniform(0.1, 2.5), rng.uniform(10, 800))
+            people = rng.randint(0, 3)
+            expected = self.calc.check_elevator_capacity(specs, cargo, people)
+            actual = self.calc.check_elevator_capacity(CabGeometry.from_specs(specs), cargo, people)
+            self.assertEqual(actual['can_load'], expected['can_load'], (specs, cargo, people))
+            self.assertEqual(actual['person_analysis'], expected['person_analysis'])
+
+    def test_obstacles_block_placement(self):
+        """操纵盘占去一角后，窄货物换位放置，满宽货物放不下"""
+        panel = Box(0.6, 0.1, 1.2, 0.2, 0.0, 0.3)
+        cab = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000), obstacles=[panel])
+        result = self.calc.check_elevator_capacity(cab, (1.0, 0.6, 0.8, 100), 1)
+        self.assertTrue(result['can_load'])
+        x, y = result['best_orientation']['position']
+        self.assertFalse(cab.index.overlaps((x, y, 0), (x + 1.0, y + 0.6, 0.8)))
+        self.assertIsNone(cab.place((1.5, 1.28, 0.8), self.calc.safety_gap))
+        self.assertIsNotNone(cab.place((1.5, 1.28, 0.2), self.calc.safety_gap))  # 矮于操纵盘底面
+        self.assertFalse(self.calc.check_elevator_capacity(cab, (1.5, 1.28, 1.28, 100), 0)['can_load'])
+
+    def test_handrails_and_floor_area(self):
+        """贴着安全间隙的扶手不妨碍放置；人员面积扣除身高以下障碍物的占地"""
+        rails = [handrail(wall, 1.6, 1.4) for wall in ('left', 'right', 'rear')]
+        cab = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000), obstacles=rails)
+        self.assertEqual(cab.place((1.5, 1.3, 1.5), 0.05), (0.05, 0.05))
+        bare = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000))
+        cargo = (1.0, 0.8, 0.5, 50)
+        with_rails = self.calc.check_elevator_capacity(cab, cargo, 1)['person_analysis']['remaining_area']
+        without = self.calc.check_elevator_capacity(bare, cargo, 1)['person_analysis']['remaining_area']
+        self.assertAlmostEqual(without - with_rails, cab.blocked_floor_area())
+
+    def test_obstacle_over_cargo_not_double_counted(self):
+        """悬在货物上方的搁板已计入货物占地，人员面积只扣除货物占地以外的部分"""
+        shelf = Box(0.6, 0.3, 0.1, 0.0, 0.0, 1.0)
+        cab = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000), obstacles=[shelf])
+        result = self.calc.check_elevator_capacity(cab, (1.0, 0.8, 0.5, 50), 1)
+        self.assertEqual(result['best_orientation']['position'], (0.05, 0.05))
+        blocked = 0.6 * 0.3 - (0.6 - 0.05) * (0.3 - 0.05)
+        self.assertAlmostEqual(result['person_analysis']['remaining_area'], 1.6 * 1.4 - 1.0 * 0.8 - blocked)
+        self.assertAlmostEqual(cab.blocked_floor_area(exclude=(0.05, 0.05, 1.0, 0.8)), blocked)
+
+    def test_yaw_under_obstacles(self):
+        """顶面低于所有障碍物时采用平放转角方案，贴地障碍物挡住时不采用"""
+        cargo = (2.2, 0.15, 0.15, 20)
+        rail = CabGeometry.from_specs((2.0, 1.6, 2.0, 1000), obstacles=[handrail('rear', 2.0, 1.6)])
+        result = self.calc.check_elevator_capacity(rail, cargo, 1)
+        self.assertTrue(result['can_load'])
+        self.assertEqual(result['best_orientation']['yaw']['footprint'], (2.2, 0.15, 0.15))
+        block = CabGeometry.from_specs((2.0, 1.6, 2.0, 1000), obstacles=[Box(0.2, 0.2, 0.5, 0.0, 0.0, 0.0)])
+        self.assertFalse(self.calc.check_elevator_capacity(block, cargo, 1)['can_load'])
+
+    def test_unsupported_settings(self):
+        """站位求解和同尺寸登记门型与轿厢几何模型冲突，报错而不是静默忽略"""
+        cab = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000))
+        cargo = (1.0, 0.6, 0.8, 100)
+        self.calc.use_crew_placement = True
+        with self.assertRaises(ValueError):
+            self.calc.check_elevator_capacity(cab, cargo, 1)
+        self.calc.use_crew_placement = False
+        self.calc.register_door(cab.dims, DoorModel(0.9, 2.1, 1.5))
+        with self.assertRaises(ValueError):
+            self.calc.check_elevator_capacity(cab, cargo, 1)
+
+    def test_through_cab_doors(self):
+        """贯通门任一门可通过即可；侧门按货物长度方向的截面判定"""
+        cargo = (1.2, 1.0, 1.0, 80)
+        narrow = CabGeometry(1.6, 1.4, 2.3, 1000, [Door('front', 0.9, 2.1)])
+        through = CabGeometry(1.6, 1.4, 2.3, 1000, [Door('front', 0.9, 2.1), Door('rear', 1.1, 2.1)])
+        self.assertFalse(self.calc.check_elevator_capacity(narrow, cargo, 1)['can_load'])
+        self.assertTrue(self.calc.check_elevator_capacity(through, cargo, 1)['can_load'])
+        self.assertEqual(Door('left', 1.0, 2.0).cross_section((1.2, 0.6, 0.9)), (1.2, 0.9))
+        cab = CabGeometry.from_model('B1600', through=True)
+        self.assertEqual([d.wall for d in cab.doors], ['front', 'rear'])
+        with self.assertRaises(ValueError):
+            Door('roof', 1.0, 2.0)
+
+    def test_index_matches_brute_force(self):
+        """区间索引的重叠判定与逐个比较一致，只检查 x 区间附近的少数障碍物"""
+        rng = random.Random(2)
+        boxes = [Box(rng.uniform(0.02, 0.2), rng.uniform(0.02, 0.3), rng.uniform(0.1, 1.0),
+                     rng.uniform(0, 3), rng.uniform(0, 2), rng.uniform(0, 2)) for _ in range(300)]
+        index = ObstacleIndex(boxes)
+        for _ in range(500):
+            lo = (rng.uniform(0, 3), rng.uniform(0, 2), rng.uniform(0, 2))
+            hi = tuple(v + rng.uniform(0.01, 0.3) for v in lo)
+            brute = any(all(a < d and c < b for a, b, c, d in zip(lo, hi, box.lo, box.hi)) for box in boxes)
+            self.assertEqual(index.overlaps(lo, hi), brute)
+            self.assertLess(len(index.candidates(lo[0], hi[0])), len(boxes) // 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
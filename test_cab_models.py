@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+标准轿厢型号表测试
+"""
+
+import unittest
+
+from cab_models import MODELS, get_model, models, register_doors, resolve_specs
+from elevator_calculator import ElevatorCalculator
+from incremental import IncrementalEvaluator
+
+
+class TestCabModels(unittest.TestCase):
+    """测试型号解析、派生几何量和计算器接入"""
+
+    def test_table(self):
+        """型号表解析为米制尺寸，派生量预先计算，门洞不超过轿厢"""
+        model = get_model('p1000')
+        self.assertIs(model, MODELS['P1000'])
+        self.assertEqual(model.specs, (1.4, 1.6, 2.2, 1000))
+        self.assertAlmostEqual(model.floor_area, 2.24)
+        self.assertEqual(model.max_persons, 13)
+        for model in MODELS.values():
+            self.assertLessEqual(model.door_width, model.width)
+            self.assertLessEqual(model.door_height, model.height)
+        self.assertEqual([m.code for m in models('病床')], ['B1275', 'B1600', 'B2000', 'B2500'])
+        with self.assertRaises(ValueError):
+            get_model('X999')
+
+    def test_calculator_accepts_code(self):
+        """型号代码与对应元组的评估结果完全一致"""
+        calculator = ElevatorCalculator()
+        cargo = (1.9, 0.8, 0.6, 150)
+        self.assertEqual(calculator.check_elevator_capacity('B1600', cargo, 2),
+                         calculator.check_elevator_capacity(MODELS['B1600'].specs, cargo, 2))
+        self.assertEqual(resolve_specs((1, 1, 2, 500)), (1, 1, 2, 500))
+
+        evaluator = IncrementalEvaluator(calculator)
+        evaluator.update('G2000', cargo, 2)
+        self.assertEqual(evaluator.elevator_specs, MODELS['G2000'].specs)
+
+    def test_register_doors(self):
+        """登记真实门洞后门宽按型号门宽（扣除门口安全间隙）报告"""
+        calculator = ElevatorCalculator()
+        register_doors(calculator, landing_depth=2.0, codes=['P630'])
+        self.assertEqual(len(calculator.door_models), 1)
+        ok, issues, door_width, door_height = calculator.check_door_access(MODELS['P630'].dims, (0.5, 0.9, 1.0))
+        self.assertFalse(ok)
+        gap = calculator.door_safety_gap
+        self.assertEqual((door_width, door_height), (0.8 - gap, 2.1 - gap))
+
+
+if __name__ == '__main__':
+    unittest.main()
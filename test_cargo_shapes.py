@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+异形货物体素判定测试
+"""
+
+import unittest
+
+from cargo_shapes import (
+    ROTATIONS, UPRIGHT_ROTATIONS, Box, CabGrid, Cylinder, Shape, packed_bits, voxelize,
+)
+from cab_geometry import CabGeometry
+from elevator_calculator import ElevatorCalculator
+
+
+class TestCargoShapes(unittest.TestCase):
+    """测试体素化、旋转、障碍物判定和缓存"""
+
+    def setUp(self):
+        self.sofa = Shape([Box(2.0, 0.9, 0.8), Box(0.9, 0.8, 0.8, y=0.9)], name='L形沙发')
+        self.table = Shape([Cylinder(0.6, 0.04, z=0.72), Cylinder(0.05, 0.72, x=0.55, y=0.55)], name='圆桌')
+
+    def test_rotations(self):
+        """24 种轴向旋转互不相同，其中 4 种保持竖直"""
+        self.assertEqual(len(set(ROTATIONS)), 24)
+        self.assertEqual(len(UPRIGHT_ROTATIONS), 4)
+
+    def test_voxel_volume(self):
+        """网格对齐的长方体组合体素数精确，任意旋转下不变"""
+        expected = round((2.0 * 0.9 * 0.8 + 0.9 * 0.8 * 0.8) / 0.1 ** 3)
+        for rotation in range(24):
+            self.assertEqual(voxelize(self.sofa, 0.1, rotation).count, expected)
+        self.assertEqual(voxelize(self.sofa, 0.1).size, (20, 17, 8))
+
+    def test_cylinder_is_conservative(self):
+        """圆柱体素覆盖其真实体积，且不超过包围盒"""
+        voxels = voxelize(self.table, 0.05)
+        self.assertEqual(voxels.size, (24, 24, 16))
+        top_cells = sum(1 for mask in voxels.columns.values() if mask >> 14)
+        self.assertGreaterEqual(top_cells * 0.05 ** 2, 3.14159 * 0.6 ** 2)
+        self.assertLess(top_cells, 24 * 24)
+
+    def test_box_matches_orientation_check(self):
+        """网格对齐的长方体与常规方向检查结论一致"""
+        calculator = ElevatorCalculator()
+        for cargo in [(1.2, 0.8, 1.0), (1.5, 0.5, 0.5), (1.6, 0.5, 0.5), (2.2, 0.4, 0.4), (0.5, 0.5, 2.3)]:
+            expected = bool(calculator.check_all_orientations((1.6, 1.4, 2.3), cargo))
+            fit = calculator.check_shape_fit((1.6, 1.4, 2.3), Shape.from_box(*cargo), yaws=(0.0,))
+            self.assertEqual(fit is not None, expected, cargo)
+
+    def test_yaw_and_obstacles(self):
+        """偏航放置可放入更长的物品；障碍物迫使更换位置或姿态"""
+        rod = Shape.from_box(1.7, 0.2, 0.2, name='钢管')
+        grid = CabGrid((1.6, 1.4, 1.2), resolution=0.02)
+        fit = grid.fit(rod)
+        self.assertIsNotNone(fit)
+        self.assertNotEqual(fit.yaw, 0.0)
+
+        upright = Shape([Box(0.6, 0.6, 1.0)], upright=True)
+        blocked = CabGrid((1.0, 1.0, 2.0), resolution=0.1, obstacles=[Box(0.5, 1.0, 2.0)])
+        fit = blocked.fit(upright)
+        self.assertIsNone(fit)
+        partly = CabGrid((1.2, 1.0, 2.0), resolution=0.1, obstacles=[Box(0.4, 0.4, 2.0)])
+        fit = partly.fit(upright, yaws=(0.0,))
+        self.assertEqual(fit.offset[:2], (0, 4))
+
+    def test_cab_geometry_obstacles(self):
+        """传入 CabGeometry 时避开操纵盘等障碍物，不再只按包围盒判定"""
+        calculator = ElevatorCalculator()
+        panel = Box(0.3, 0.4, 2.3, x=1.3, y=0.0)
+        cab = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000), obstacles=[panel])
+        wide = Shape.from_box(1.45, 1.3, 1.3)
+        self.assertIsNotNone(calculator.check_shape_fit((1.6, 1.4, 2.3), wide, yaws=(0.0,)))
+        self.assertIsNone(calculator.check_shape_fit(cab, wide, yaws=(0.0,)))
+
+        narrow = Shape.from_box(1.2, 1.25, 1.0)
+        fit = calculator.check_shape_fit(cab, narrow, yaws=(0.0,))
+        self.assertIsNotNone(fit)
+        x, y, _ = fit.position
+        self.assertFalse(cab.index.overlaps((x, y, 0.0), (x + 1.2, y + 1.25, 1.0)))
+
+    def test_bitsets_cached(self):
+        """同一形状、分辨率和姿态的位集只计算一次"""
+        shape = Shape([Box(0.4, 0.3, 0.2), Cylinder(0.1, 0.3, x=0.1, y=0.05, z=0.2)])
+        voxelize.cache_clear()
+        packed_bits.cache_clear()
+        first = packed_bits(shape, 0.05, 0, 0.0, 20, 30)
+        again = packed_bits(Shape([Box(0.4, 0.3, 0.2), Cylinder(0.1, 0.3, x=0.1, y=0.05, z=0.2)]),
+                            0.05, 0, 0.0, 20, 30)
+        self.assertEqual(first, again)
+        self.assertEqual(packed_bits.cache_info().hits, 1)
+        self.assertEqual(voxelize.cache_info().misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
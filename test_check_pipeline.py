@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+可插拔检查流水线测试
+"""
+
+import random
+import unittest
+
+from cab_geometry import CabGeometry, handrail
+from cab_models import MODELS
+from check_pipeline import CheckPipeline, CheckStage
+from door_tables import DoorModel
+from elevator_calculator import ElevatorCalculator
+from cargo_shapes import Box
+
+
+def _random_cases(seed, count):
+    rnd = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        elevator = (round(rnd.uniform(0.8, 3.0), 2), round(rnd.uniform(0.8, 2.5), 2),
+                    round(rnd.uniform(1.8, 3.0), 2), rnd.choice([630, 800, 1000, 1600]))
+        cargo = (round(rnd.uniform(0.1, 3.0), 2), round(rnd.uniform(0.1, 2.0), 2),
+                 round(rnd.uniform(0.1, 2.6), 2), round(rnd.uniform(1, 1500), 1))
+        cases.append((elevator, cargo, rnd.randint(0, 4)))
+    return cases
+
+
+class TestCheckPipeline(unittest.TestCase):
+    """测试判定一致性、自适应排序和自定义阶段"""
+
+    def test_matches_calculator(self):
+        """短路判定和完整评估与 check_elevator_capacity 的结论一致"""
+        for crew in (False, True):
+            calculator = ElevatorCalculator()
+            calculator.use_crew_placement = crew
+            pipeline = CheckPipeline(calculator, reorder_every=50)
+            for elevator, cargo, people in _random_cases(7, 400):
+                expected = calculator.check_elevator_capacity(elevator, cargo, people)['can_load']
+                self.assertEqual(pipeline.verdict(elevator, cargo, people), expected)
+                self.assertEqual(pipeline.evaluate(elevator, cargo, people)[0], expected)
+
+    def test_parity_with_options(self):
+        """型号代码、轿厢几何模型、真实门型、站位求解和重心检查下，判定和问题列表与 check_elevator_capacity 一致"""
+        rnd = random.Random(11)
+        codes = sorted(MODELS)
+        for crew, eccentricity, engine in ((False, False, 'float'), (True, False, 'exact'), (True, True, 'float')):
+            calculator = ElevatorCalculator()
+            calculator.use_crew_placement = crew
+            calculator.check_eccentricity = eccentricity
+            calculator.engine = engine
+            pipeline = CheckPipeline(calculator, reorder_every=50)
+            cases = _random_cases(13, 150)
+            for code in codes[:4]:
+                calculator.register_door(MODELS[code].dims, DoorModel(MODELS[code].door_width, MODELS[code].door_height, 1.5))
+            for elevator, cargo, people in cases:
+                kind = rnd.randrange(3)
+                if kind == 1:
+                    elevator = rnd.choice(codes)
+                elif kind == 2:
+                    el, ew = elevator[:2]
+                    obstacles = [handrail('rear', el, ew), Box(0.0, 0.0, 1.0, 0.2, 0.2, 0.3)]
+                    elevator = CabGeometry.from_specs(elevator, obstacles=obstacles[:rnd.randint(0, 2)])
+                    if crew:
+                        # 轿厢几何模型不支持站位求解，两条路径都报错
+                        with self.assertRaises(ValueError):
+                            calculator.check_elevator_capacity(elevator, cargo, people)
+                        with self.assertRaises(ValueError):
+                            pipeline.verdict(elevator, cargo, people)
+                        continue
+                expected = calculator.check_elevator_capacity(elevator, cargo, people)
+                self.assertEqual(pipeline.verdict(elevator, cargo, people), expected['can_load'])
+                ok, issues = pipeline.evaluate(elevator, cargo, people)
+                self.assertEqual(ok, expected['can_load'])
+                best = expected['best_orientation']
+                if best is not None and not best.get('diagonal_fit'):
+                    self.assertEqual(issues, expected['issues'])
+                else:
+                    # 没有常规摆放方向时总重超限不影响结论，流水线不报告
+                    self.assertEqual(issues, expected['issues'][:len(issues)])
+
+    def test_invalid_input(self):
+        """无效输入只报告验证问题"""
+        ok, issues = CheckPipeline().evaluate((0, 1.4, 2.3, 1000), (1.0, 0.5, 0.5, 50))
+        self.assertFalse(ok)
+        self.assertEqual(len(issues), 1)
+
+    def test_adaptive_order(self):
+        """代价低、拒绝率高的自定义阶段在统计后排到前面，validation 始终第一"""
+        pipeline = CheckPipeline(reorder_every=20)
+        pipeline.register(CheckStage('light_only', lambda ctx: ['限载货物重量'] if ctx.cargo_specs[3] > 100 else [],
+                                     cost=50.0, reject_rate=0.01))
+        self.assertEqual(pipeline.order[-1], 'light_only')
+        for elevator, cargo, people in _random_cases(3, 200):
+            pipeline.verdict(elevator, cargo, people)
+        self.assertEqual(pipeline.order[0], 'validation')
+        self.assertEqual(pipeline.order[1], 'light_only')
+        self.assertGreater(pipeline.stats()['light_only']['reject_rate'], 0.5)
+
+    def test_register_and_unregister(self):
+        """自定义阶段参与评估，重名报错，移除后不再执行"""
+        calls = []
+
+        def no_tall_items(ctx):
+            calls.append(1)
+            return ['货物高度超过 1.5m'] if max(ctx.cargo_dims) > 1.5 else []
+
+        pipeline = CheckPipeline()
+        pipeline.register(CheckStage('no_tall_items', no_tall_items))
+        with self.assertRaises(ValueError):
+            pipeline.register(CheckStage('no_tall_items', no_tall_items))
+        ok, issues = pipeline.evaluate((1.6, 1.4, 2.3, 1000), (1.8, 0.5, 0.5, 50))
+        self.assertFalse(ok)
+        self.assertIn('货物高度超过 1.5m', issues)
+        self.assertTrue(pipeline.verdict((1.6, 1.4, 2.3, 1000), (1.0, 0.5, 0.5, 50)))
+
+        pipeline.unregister('no_tall_items')
+        count = len(calls)
+        self.assertTrue(pipeline.evaluate((1.6, 1.4, 2.3, 1000), (1.8, 0.5, 0.5, 50))[0])
+        self.assertEqual(len(calls), count)
+
+    def test_register_position_stays_after_validation(self):
+        """position=0 或负数越过 validation 时放在其后，无效输入不会运行自定义阶段"""
+        calls = []
+
+        def reads_cargo(ctx):
+            calls.append(1)
+            return [] if ctx.cargo_dims[0] > 0 else ['货物尺寸无效']
+
+        pipeline = CheckPipeline()
+        pipeline.register(CheckStage('reads_cargo', reads_cargo), position=0)
+        pipeline.register(CheckStage('first_negative', lambda ctx: []), position=-len(pipeline.stages) - 5)
+        self.assertEqual([stage.name for stage in pipeline.stages][:3], ['validation', 'first_negative', 'reads_cargo'])
+        ok, issues = pipeline.evaluate((1.6, 1.4, 2.3, 1000), (-1.0, 0.5, 0.5, 50))
+        self.assertFalse(ok)
+        self.assertEqual(calls, [])
+        self.assertNotIn('货物尺寸无效', issues)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+人员站位求解器测试
+"""
+
+import math
+import random
+import unittest
+
+from elevator_calculator import ElevatorCalculator
+from crew_placement import PersonFootprint, crew_upper_bound, solve_crew_placement
+
+
+def _overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw - 1e-9 and bx < ax + aw - 1e-9 and ay < by + bh - 1e-9 and by < ay + ah - 1e-9
+
+
+class TestCrewPlacement(unittest.TestCase):
+    """测试人员站位求解"""
+
+    def setUp(self):
+        self.calculator = ElevatorCalculator()
+        self.footprint = PersonFootprint.from_calculator(self.calculator)
+
+    def test_thin_strip_holds_nobody(self):
+        """剩余面积足够但只是窄条时，面积估算会高估人数"""
+        placement = solve_crew_placement((2.0, 1.3), (1.9, 0.92), self.footprint)
+        area_estimate = int((2.0 * 1.3 - 1.9 * 0.92) / self.calculator.person_min_space)
+        self.assertGreater(area_estimate, 0)
+        self.assertEqual(placement.crew_count, 0)
+
+    def test_positions_are_inside_cab_and_disjoint(self):
+        """站位不越界、互不重叠且不压货物安全区"""
+        el, ew = 2.4, 2.0
+        placement = solve_crew_placement((el, ew), (1.0, 0.6), self.footprint)
+        self.assertGreater(placement.crew_count, 0)
+        cx, cy, cl, cw = placement.cargo_position
+        gap = self.calculator.safety_gap
+        cargo_zone = (cx - gap, cy - gap, cl + 2 * gap, cw + 2 * gap)
+        for i, pos in enumerate(placement.positions):
+            x, y, w, d = pos
+            self.assertGreaterEqual(x, -1e-9)
+            self.assertGreaterEqual(y, -1e-9)
+            self.assertLessEqual(x + w, el + 1e-9)
+            self.assertLessEqual(y + d, ew + 1e-9)
+            self.assertFalse(_overlaps(pos, cargo_zone))
+            for other in placement.positions[i + 1:]:
+                self.assertFalse(_overlaps(pos, other))
+
+    def test_limit_stops_early(self):
+        """达到所需人数后提前结束"""
+        placement = solve_crew_placement((2.5, 2.0), None, self.footprint, limit=3)
+        self.assertEqual(placement.crew_count, 3)
+
+    def test_calculator_uses_placement(self):
+        """启用站位求解后，计算器按实际站位判断人员空间"""
+        elevator = (2.0, 1.3, 2.3, 1000)
+        cargo = (1.9, 0.92, 1.0, 100)
+        self.assertTrue(self.calculator.check_elevator_capacity(elevator, cargo, 1)['can_load'])
+
+        self.calculator.use_crew_placement = True
+        result = self.calculator.check_elevator_capacity(elevator, cargo, 1)
+        self.assertFalse(result['can_load'])
+        self.assertEqual(result['person_analysis']['max_people_by_space'], 0)
+        self.assertEqual(result['person_analysis']['crew_positions'], [])
+
+    def test_readme_example_has_standing_room(self):
+        """默认站立占位下，README 示例（1.6×1.4 轿厢、1.2×0.8 货物）仍能站下随行人员"""
+        self.calculator.use_crew_placement = True
+        result = self.calculator.check_elevator_capacity((1.6, 1.4, 2.3, 1000), (1.2, 0.8, 1.0, 200), 1)
+        self.assertTrue(result['can_load'])
+        self.assertGreaterEqual(result['person_analysis']['max_people_by_space'], 1)
+
+    def test_min_operation_space_sets_depth(self):
+        """占位进深取体厚与最小操作空间中的较大者"""
+        self.assertEqual((self.footprint.width, self.footprint.depth), (0.5, 0.6))
+        self.calculator.min_operation_space = 0.3
+        footprint = PersonFootprint.from_calculator(self.calculator)
+        self.assertEqual(footprint.depth, self.calculator.person_depth)
+
+    def test_upper_bound_proves_maximum(self):
+        """下界与上界相等时证明已是最多人数"""
+        strip = solve_crew_placement((2.0, 1.3), (1.9, 0.92), self.footprint)
+        self.assertEqual(strip.upper_bound, 0)
+        self.assertTrue(strip.is_maximum)
+        readme = solve_crew_placement((1.6, 1.4), (1.2, 0.8), self.footprint)
+        self.assertEqual(readme.crew_count, readme.upper_bound)
+        self.assertTrue(readme.is_maximum)
+
+    def test_upper_bound_never_below_count(self):
+        """随机尺寸下上界不小于求得的人数"""
+        rng = random.Random(26)
+        for shape in ('rect', 'circle'):
+            footprint = PersonFootprint.from_calculator(self.calculator, shape)
+            for _ in range(200):
+                el, ew = rng.uniform(1.0, 3.0), rng.uniform(1.0, 2.5)
+                cargo = (rng.uniform(0.2, el - 0.1), rng.uniform(0.2, ew - 0.1)) if rng.random() < 0.8 else None
+                placement = solve_crew_placement((el, ew), cargo, footprint)
+                self.assertLessEqual(placement.crew_count, placement.upper_bound)
+                self.assertEqual(placement.upper_bound,
+                                 crew_upper_bound((el, ew), cargo, footprint, self.calculator.safety_gap))
+
+    def test_circle_uses_hex_rows(self):
+        """圆形占位错行排列，比外接正方形网格站得多且互不重叠"""
+        footprint = PersonFootprint.from_calculator(self.calculator, 'circle')
+        diameter = footprint.width
+        placement = solve_crew_placement((1.6, 1.12), None, footprint)
+        square_grid = int(1.6 // diameter) * int(1.12 // diameter)
+        self.assertGreater(placement.crew_count, square_grid)
+        centres = [(x + w / 2, y + d / 2) for x, y, w, d in placement.positions]
+        for i, (ax, ay) in enumerate(centres):
+            self.assertTrue(diameter / 2 - 1e-9 <= ax <= 1.6 - diameter / 2 + 1e-9)
+            self.assertTrue(diameter / 2 - 1e-9 <= ay <= 1.12 - diameter / 2 + 1e-9)
+            for bx, by in centres[i + 1:]:
+                self.assertGreaterEqual(math.hypot(ax - bx, ay - by), diameter - 1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
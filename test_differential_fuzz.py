@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+差分模糊测试工具测试
+"""
+
+import unittest
+
+from differential_fuzz import (BOUNDARY_MODES, CaseGenerator, Engine, boundary_slack, quantised_reference,
+                               run_fuzz)
+from elevator_calculator import ElevatorCalculator
+
+
+class TestDifferentialFuzz(unittest.TestCase):
+    """测试用例生成、分歧检测与收缩"""
+
+    def test_engines_agree(self):
+        """全部快速引擎与参考路径一致，精确引擎与按毫米取整的参考路径逐条一致"""
+        report = run_fuzz(3000, seed=11, batch_size=1000)
+        self.assertTrue(report.ok, report.summary())
+        self.assertIn('exact', report.times)
+        self.assertEqual(report.float_edges['exact'], 0)
+        self.assertEqual(report.cases, 3000)
+        for mode in BOUNDARY_MODES:
+            self.assertGreater(report.mode_counts[mode], 0)
+        self.assertGreater(report.off_grid, 0)
+
+    def test_boundary_cases(self):
+        """边界用例落在判定边界上"""
+        calculator = ElevatorCalculator()
+        generator = CaseGenerator(calculator, seed=3, boundary_ratio=1.0)
+        slacks = [boundary_slack(calculator, generator.case()) for _ in range(500)]
+        near = sum(1 for slack in slacks if slack <= 0.0011)
+        self.assertGreater(near, 250)
+
+    def test_slack_of_disagreeing_constraint(self):
+        """只度量使判定翻转所需的约束：其他约束贴边不会把远离边界的分歧算作浮点边界"""
+        calculator = ElevatorCalculator()
+        # 货物宽恰为门宽 1.5 × 0.8 - 0.1 = 1.1，但超重 100kg：判定为不可装载。翻转判定要么改变重量结论，
+        # 要么让所有方向都放不下（改由对角线判定），后者需要 0.4m
+        case = ((2.0, 1.5, 2.4, 630), (1.0, 1.1, 1.0, 730.0), 0)
+        self.assertFalse(calculator.check_elevator_capacity(*case)['can_load'])
+        self.assertAlmostEqual(boundary_slack(calculator, case, True), 0.4)
+        self.assertAlmostEqual(boundary_slack(calculator, case), 0.4)
+        # 同一货物不超重时，门宽边界就是判定边界
+        light = ((2.0, 1.5, 2.4, 630), (1.0, 1.1, 1.0, 300.0), 0)
+        self.assertLess(boundary_slack(calculator, light), 1e-9)
+
+    def test_quantised_reference(self):
+        """量化参考路径与精确引擎在浮点路径误判的恰好贴合处一致"""
+        calculator = ElevatorCalculator()
+        exact = ElevatorCalculator()
+        exact.engine = 'exact'
+        reference = quantised_reference(calculator)
+        for case in [((2.0, 0.204, 2.0, 1000), (1.5, 0.104, 1.5, 10.0), 0),
+                     ((2.0, 0.204, 2.0, 1000), (1.5, 0.1041, 1.5, 10.0), 0),
+                     ((0.6, 1.5, 2.4, 1000), (0.5, 1.0, 0.5, 10.0), 1)]:
+            self.assertEqual(reference(case), exact.check_elevator_capacity(*case)['can_load'], case)
+        # 剩余面积恰为 1 人所需：浮点路径算出 0.3999999999999999 判为不足，量化参考与精确引擎判为可装载
+        case = ((0.6, 1.5, 2.4, 1000), (0.5, 1.0, 0.5, 10.0), 1)
+        self.assertFalse(calculator.check_elevator_capacity(*case)['can_load'])
+        self.assertTrue(reference(case))
+
+    def test_off_grid_cases(self):
+        """非整毫米的边界用例距离边界不足 1 毫米，且不落在毫米网格上"""
+        calculator = ElevatorCalculator()
+        generator = CaseGenerator(calculator, seed=4, boundary_ratio=1.0, off_grid_ratio=1.0)
+        cases = [generator.case() for _ in range(300)]
+        off_grid = [case for case in cases if any(abs(v * 1000 - round(v * 1000)) > 1e-6 for v in case[1][:3])]
+        self.assertGreater(len(off_grid), 100)
+        near = sum(1 for case in cases if boundary_slack(calculator, case) < 0.001)
+        self.assertGreater(near, 150)
+
+    def test_mismatch_is_shrunk(self):
+        """忽略重量的错误引擎被发现，分歧收缩为更简单且仍然分歧的用例"""
+        calculator = ElevatorCalculator()
+        light = ElevatorCalculator()
+
+        def ignore_weight(cases):
+            return [light.check_elevator_capacity(e, c[:3] + (1.0,), 0)['can_load'] for e, c, _ in cases]
+
+        report = run_fuzz(500, seed=5, calculator=calculator, engines=[Engine('broken', ignore_weight)],
+                          max_failures=1)
+        self.assertFalse(report.ok)
+        disagreement = report.disagreements[0]
+        elevator, cargo, num_people = disagreement.shrunk
+        self.assertNotEqual(ignore_weight([disagreement.shrunk])[0],
+                            calculator.check_elevator_capacity(elevator, cargo, num_people)['can_load'])
+        digits = lambda case: sum(len(repr(v)) for v in case[0] + case[1])
+        self.assertLessEqual(digits(disagreement.shrunk), digits(disagreement.case))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+门通行查表测试
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+import door_tables
+from door_tables import (
+    DoorModel, DoorTable, corner_length, door_table, max_passable_length, rectangle_fits,
+)
+from elevator_calculator import ElevatorCalculator, ISSUE_DOOR_TURN, issue_mask
+from result_cache import rule_fingerprint
+
+
+class TestDoorTables(unittest.TestCase):
+    """测试门型通行表的几何判定、查表精度和缓存"""
+
+    def setUp(self):
+        self.door = DoorModel(0.9, 2.0, 1.5)
+
+    def test_geometry(self):
+        """拐角公式与截面旋转条件"""
+        # 厚度为 0 时两条 1m 通道的最大长度为 2^(3/2)
+        self.assertAlmostEqual(corner_length(1, 1, 0), 2 ** 1.5, places=6)
+        self.assertEqual(corner_length(1, 1, 1), 0.0)
+        # 细长截面可在正方形门洞内斜向通过，但不能超过对角线
+        self.assertTrue(rectangle_fits(1.2, 0.1, 1, 1))
+        self.assertFalse(rectangle_fits(1.5, 0.1, 1, 1))
+        self.assertEqual(max_passable_length(self.door, 1.0, 2.1), 0.0)
+        self.assertGreaterEqual(max_passable_length(self.door, 0.5, 1.0), self.door.landing_depth)
+
+    def test_lookup_matches_exact(self):
+        """查表不高估可通过长度，与直接计算的误差在几个格距以内"""
+        table = DoorTable.build(self.door)
+        rng = random.Random(3)
+        for _ in range(2000):
+            w, h = rng.uniform(0, 2.4), rng.uniform(0, 2.4)
+            exact = max_passable_length(self.door, w, h)
+            self.assertLessEqual(table.lookup(w, h), exact + 1e-6)
+            self.assertAlmostEqual(table.lookup(w, h), exact, delta=3 * door_tables.TABLE_STEP)
+
+    def test_disk_cache(self):
+        """通行表写入磁盘后可直接读取"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            door = DoorModel(1.1, 2.1, 1.8)
+            door_tables._tables.pop(door.fingerprint(), None)
+            built = door_table(door, tmpdir)
+            files = os.listdir(tmpdir)
+            self.assertEqual(len(files), 1)
+            loaded = DoorTable.load(door, os.path.join(tmpdir, files[0]))
+            self.assertEqual(loaded.values, built.values)
+
+    def test_calculator_integration(self):
+        """登记门型后门通行改为查表，过长货物给出转入长度问题"""
+        calculator = ElevatorCalculator()
+        elevator = (2.6, 1.6, 2.4, 1600)
+        before = rule_fingerprint(calculator)
+        calculator.register_door(elevator[:3], DoorModel(0.9, 2.1, 1.2))
+        self.assertNotEqual(rule_fingerprint(calculator), before)
+
+        result = calculator.check_elevator_capacity(elevator, (2.2, 0.6, 0.5, 60))
+        self.assertFalse(result['can_load'])
+        self.assertTrue(issue_mask(result) & ISSUE_DOOR_TURN)
+
+        result = calculator.check_elevator_capacity(elevator, (1.0, 0.6, 0.5, 60))
+        self.assertTrue(result['can_load'])
+
+        # 门宽扣除门口安全间隙：0.75m 宽截面放不进 0.8m 门
+        ok, issues, door_width, _ = calculator.check_door_model(DoorModel(0.8, 2.0, 2.0), (1.0, 0.75, 1.95))
+        self.assertFalse(ok)
+        self.assertAlmostEqual(door_width, 0.8 - calculator.door_safety_gap)
+
+        # 截面宽于门但可在门洞内倾斜通过
+        ok, issues, _, _ = calculator.check_door_model(DoorModel(0.8, 2.0, 2.0), (1.0, 1.1, 0.3))
+        self.assertTrue(ok, issues)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,7 +11,7 @@ from unittest.mock import patch
 from io import StringIO
 
 # 导入被测试的程序
-from elevator_calculator import ElevatorCalculator
+from elevator_calculator import ElevatorCalculator, ISSUE_DIAGONAL, ISSUE_INVALID_INPUT, ISSUE_WEIGHT, issue_mask
 
 class TestElevatorCalculatorRealScenarios(unittest.TestCase):
     """测试真实场景下的电梯装载计算"""
@@ -165,6 +165,17 @@ class TestEdgeCases(unittest.TestCase):
         self.assertFalse(result['can_load'])
         self.assertGreaterEqual(len(result['issues']), 2)  # 至少2个问题
 
+    def test_issue_codes_follow_issues(self):
+        """问题代码在产生处记录，与问题描述一一对应，不依赖描述文字"""
+        result = self.calculator.check_elevator_capacity((2.0, 1.5, 2.5, 2000), (10.0, 5.0, 3.0, 5000))
+        self.assertEqual(result['issue_codes'], [ISSUE_DIAGONAL, ISSUE_WEIGHT])
+        self.assertEqual(issue_mask(result), ISSUE_DIAGONAL | ISSUE_WEIGHT)
+        self.assertTrue(all(type(issue) is str for issue in result['issues']))
+
+        result = self.calculator.check_elevator_capacity((1.5, 1.2, 2.0, 1000), (-1.0, 0.5, 0.5, 100))
+        self.assertEqual(result['issue_codes'], [ISSUE_INVALID_INPUT])
+        self.assertEqual(len(result['issues']), 1)
+
 def run_comprehensive_tests():
     """运行综合测试并输出结果"""
     print("=== 电梯货物装载计算器 - 实际场景测试 ===\n")
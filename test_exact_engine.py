@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+整数毫米精确判定引擎测试
+"""
+
+import random
+import unittest
+
+from elevator_calculator import ElevatorCalculator
+from exact_engine import (decide_any_orientation, decide_area, decide_diagonal, decide_door, decide_orientations,
+                          diagonal_fits, dims_to_mm, door_checks, orientation_fits, to_mm)
+
+
+class TestExactEngine(unittest.TestCase):
+    """测试精确引擎的判定与浮点引擎的一致性"""
+
+    def setUp(self):
+        self.exact = ElevatorCalculator()
+        self.exact.engine = 'exact'
+        self.float = ElevatorCalculator()
+
+    def test_exact_fit_boundaries(self):
+        """恰好贴合（含安全间隙）时精确引擎判定可放入"""
+        # 0.104 + 2 × 0.05 在浮点下略大于 0.204
+        self.assertEqual(self.float.check_all_orientations((2.0, 0.204, 2.0), (1.5, 0.104, 1.5)), [])
+        valid = self.exact.check_all_orientations((2.0, 0.204, 2.0), (1.5, 0.104, 1.5))
+        # 长、高相同，两个方向等价
+        self.assertEqual([o['orientation'] for o in valid], [(1.5, 0.104, 1.5)] * 2)
+        self.assertEqual(orientation_fits((1000, 800, 2000), (900, 700, 1950), 50),
+                         (True, False, False, False, False, False))
+
+    def test_sub_mm_excess_rejected(self):
+        """不足 1mm 的超出不会被舍入掉：轿厢向下取整、货物和间隙向上取整"""
+        self.assertEqual(self.exact.check_all_orientations((1.0, 0.5, 2.0), (0.9004, 0.3, 1.0)), [])
+        self.assertEqual(len(self.exact.check_all_orientations((1.0, 0.5, 2.0), (0.9, 0.3, 1.0))), 1)
+        self.assertEqual(self.exact.check_all_orientations((0.9996, 0.5, 2.0), (0.9, 0.3, 1.0)), [])
+        self.assertEqual((to_mm(1.1), to_mm(1.1, True)), (1100, 1100))
+        self.assertEqual((to_mm(0.9004), to_mm(0.9004, True)), (900, 901))
+
+    def test_squared_comparisons(self):
+        """对角线与门截面比较平方和，等长时判定通过"""
+        self.assertTrue(diagonal_fits((3000, 4000, 0), (5000, 0, 0)))
+        self.assertFalse(diagonal_fits((3000, 4000, 0), (5001, 0, 0)))
+        # 梯宽 1000mm、比例 0.8、门间隙 100mm：门宽 700mm，门高 0.9 × 2000 = 1800mm
+        self.assertEqual(door_checks((0, 1000, 2000), (0, 700, 1800), 100), (True, True, True))
+        self.assertEqual(door_checks((0, 1000, 2000), (0, 701, 1800), 100), (False, True, False))
+
+    def test_matches_float_engine_away_from_boundaries(self):
+        """远离边界的随机输入下两种引擎结果一致"""
+        rng = random.Random(7)
+        # 电梯长宽取整厘米、高取整分米，货物尺寸以 5mm 结尾，任何比较都不会恰好相等
+        for _ in range(500):
+            elevator = (rng.randint(100, 250) / 100, rng.randint(80, 200) / 100, rng.randint(20, 30) / 10,
+                        rng.uniform(400, 1600))
+            cargo = tuple((rng.randint(20, high) * 10 + 5) / 1000 for high in (250, 150, 200))
+            cargo += (rng.uniform(10, 500),)
+            people = rng.randint(0, 3)
+            self.assertEqual(self.exact.check_elevator_capacity(elevator, cargo, people),
+                             self.float.check_elevator_capacity(elevator, cargo, people))
+
+    def test_filtered_decisions_match_integer_checks(self):
+        """以米为单位的判定入口与整数毫米判定逐项一致，含大量恰在边界和差 1mm 以内的输入"""
+        rng = random.Random(11)
+        for _ in range(3000):
+            cab = tuple(rng.randint(500, 3000) / 1000 for _ in range(3))
+            # 货物尺寸取在某个限值附近，迫使比较落入浮点过滤带
+            limits = (cab[0] - 0.1, cab[1] - 0.1, cab[2] - 0.05, cab[1] * 0.8 - 0.1, cab[2] * 0.9)
+            cargo = tuple(max(0.01, rng.choice(limits) + rng.randint(-3, 3) * rng.choice((0.0004, 0.001)))
+                          for _ in range(3))
+            cab_mm, cargo_mm = dims_to_mm(cab), dims_to_mm(cargo, True)
+            fitting = orientation_fits(cab_mm, cargo_mm, 50)
+            self.assertEqual(decide_orientations(cab, cargo, 0.05), fitting)
+            self.assertEqual(decide_any_orientation(cab, cargo, 0.05), any(fitting))
+            self.assertEqual(decide_diagonal(cab, cargo), diagonal_fits(cab_mm, cargo_mm))
+            self.assertEqual(decide_door(cab, cargo, 0.1), door_checks(cab_mm, cargo_mm, 100))
+            area = cab_mm[0] * cab_mm[1] - cargo_mm[0] * cargo_mm[1]
+            needed = round(area / 1e6 + rng.randint(-2, 2) * 1e-6, 6)
+            self.assertEqual(decide_area(cab, cargo, 0.0, needed), area >= to_mm(needed, True, 1000 * 1000))
+
+    def test_exact_person_area(self):
+        """精确引擎下人员面积按整数平方毫米判定：恰好够用时通过"""
+        # 剩余面积 1.0 × 1.2 - 0.8 × 1.0 = 0.4 恰为 1 人所需，浮点下算出 0.3999999999999999
+        self.assertEqual(len(self.float.check_person_space((1.0, 1.2, 2.0), (0.8, 1.0, 1.0), 1)[0]), 1)
+        self.assertEqual(self.exact.check_person_space((1.0, 1.2, 2.0), (0.8, 1.0, 1.0), 1)[0], [])
+        self.assertEqual(len(self.exact.check_person_space((1.0, 1.2, 2.0), (0.8, 1.0, 1.0), 2)[0]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+增量评估器测试
+"""
+
+import random
+import unittest
+
+from elevator_calculator import ElevatorCalculator
+from incremental import IncrementalEvaluator
+
+
+class TestIncrementalEvaluator(unittest.TestCase):
+    """测试增量评估"""
+
+    def setUp(self):
+        self.calculator = ElevatorCalculator()
+        self.evaluator = IncrementalEvaluator(self.calculator, (1.6, 1.4, 2.3, 1000), (1.2, 0.8, 1.0, 200), 1)
+        self.evaluator.result()
+
+    def fresh(self):
+        ev = self.evaluator
+        return self.calculator.check_elevator_capacity(ev.elevator_specs, ev.cargo_specs, ev.inputs['num_people'])
+
+    def test_people_change_skips_geometry(self):
+        """只修改人数时不重算摆放方向和门通行"""
+        self.evaluator.update(num_people=4)
+        result = self.evaluator.result()
+        self.assertEqual(self.evaluator.recomputed, ['validation', 'result'])
+        self.assertEqual(result, self.fresh())
+
+    def test_parameter_change_invalidates_dependents(self):
+        """修改门安全间隙只重算门通行"""
+        self.calculator.door_safety_gap = 0.3
+        result = self.evaluator.result()
+        self.assertEqual(self.evaluator.recomputed, ['door', 'result'])
+        self.assertEqual(result, self.fresh())
+
+    def test_unchanged_inputs_recompute_nothing(self):
+        """输入未变时不重算任何阶段"""
+        self.evaluator.result()
+        self.assertEqual(self.evaluator.recomputed, [])
+
+    def test_random_updates_match_fresh_evaluation(self):
+        """随机修改输入和参数后结果与全新评估一致"""
+        rng = random.Random(4)
+        for _ in range(2000):
+            choice = rng.random()
+            if choice < 0.5:
+                self.evaluator.update(num_people=rng.choice([-1, 0, 1, 2, 3, 6]))
+            elif choice < 0.65:
+                dims = tuple(round(rng.uniform(-0.1, 2.4), 2) for _ in range(3))
+                self.evaluator.update(cargo_specs=dims + (rng.choice([50, 400, 1200]),))
+            elif choice < 0.8:
+                dims = tuple(round(rng.uniform(0.5, 2.8), 2) for _ in range(3))
+                self.evaluator.update(elevator_specs=dims + (rng.choice([500, 1000]),))
+            elif choice < 0.9:
+                self.calculator.safety_gap = rng.choice([0, 0.05, 0.1])
+            else:
+                self.calculator.use_crew_placement = rng.random() < 0.5
+            self.assertEqual(self.evaluator.result(), self.fresh())
+
+    def test_margins_agree_with_can_load(self):
+        """全部余量非负当且仅当可以装载；首项为最接近失败的约束"""
+        rng = random.Random(7)
+        for _ in range(1000):
+            self.evaluator.update(elevator_specs=(rng.uniform(0.8, 2.6), rng.uniform(0.8, 2.2), rng.uniform(1.7, 2.8),
+                                                  rng.choice([400, 1000])),
+                                  cargo_specs=(rng.uniform(0.1, 2.6), rng.uniform(0.1, 1.6), rng.uniform(0.1, 2.4),
+                                               rng.uniform(10, 900)),
+                                  num_people=rng.randint(0, 4))
+            margins = self.evaluator.margins()
+            self.assertEqual(all(m.ok for m in margins), self.evaluator.result()['can_load'])
+            self.assertEqual(margins[0].relative, min(m.relative for m in margins))
+
+    def test_margins_reuse_cached_stages(self):
+        """余量只读取缓存阶段；人数增加一人，载重余量减少一人体重"""
+        before = {m.name: m.slack for m in self.evaluator.margins()}
+        self.evaluator.update(num_people=2)
+        after = {m.name: m.slack for m in self.evaluator.margins()}
+        self.assertEqual(self.evaluator.recomputed, ['validation', 'result'])
+        self.assertAlmostEqual(before['weight'] - after['weight'], self.calculator.person_avg_weight)
+        self.assertAlmostEqual(before['person_space'] - after['person_space'], self.calculator.person_min_space)
+        self.assertEqual(after['door_width'], before['door_width'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+载荷分布分析测试
+"""
+
+import unittest
+
+from elevator_calculator import ElevatorCalculator, ISSUE_ECCENTRICITY, issue_mask
+from load_distribution import CogAccumulator, PressureGrid, analyze_load, center_of_gravity
+
+
+class TestLoadDistribution(unittest.TestCase):
+    """测试重心、偏心距和地板压强网格"""
+
+    def test_center_of_gravity(self):
+        """重心为各矩形中心按质量加权"""
+        loads = [(0.0, 0.0, 1.0, 1.0, 100), (1.0, 0.0, 1.0, 1.0, 300)]
+        total, cx, cy = center_of_gravity(loads)
+        self.assertEqual(total, 400)
+        self.assertAlmostEqual(cx, 1.25)
+        self.assertAlmostEqual(cy, 0.5)
+        self.assertEqual(center_of_gravity([]), (0.0, None, None))
+
+    def test_eccentricity_limit(self):
+        """居中载荷无偏心，靠角载荷超过限值"""
+        centered = analyze_load((2.0, 1.6), [(0.6, 0.4, 0.8, 0.8, 200)], 0.16)
+        self.assertAlmostEqual(centered.eccentricity, 0.0)
+        self.assertTrue(centered.within_limit)
+        corner = analyze_load((2.0, 1.6), [(0.05, 0.05, 0.8, 0.8, 200)], 0.16)
+        self.assertFalse(corner.within_limit)
+
+    def test_pressure_grid_conserves_mass(self):
+        """网格压强积分等于总质量，非对齐矩形按重叠面积分摊"""
+        grid = PressureGrid(2.0, 1.6, cell=0.1)
+        grid.add(0.33, 0.27, 0.51, 0.44, 120)
+        grid.add(1.2, 0.8, 0.6, 0.6, 75)
+        mass = sum(grid.values) * grid.cell_x * grid.cell_y
+        self.assertAlmostEqual(mass, 195, places=6)
+        # 完全被覆盖的单元格压强等于均布压强
+        self.assertAlmostEqual(grid.cell(5, 4), 120 / (0.51 * 0.44), places=6)
+        self.assertEqual(grid.cell(0, 0), 0.0)
+        result = analyze_load((2.0, 1.6), [(1.2, 0.8, 0.6, 0.6, 75)], 0.16, cell=0.1)
+        self.assertAlmostEqual(result.peak_pressure, 75 / 0.36, places=6)
+
+    def test_pressure_grid_matches_cell_intersection(self):
+        """差分叠加与逐格计算矩形相交一致，叠加途中读取 values 不影响结果"""
+        loads = [(0.33, 0.27, 0.51, 0.44, 120), (1.2, 0.8, 0.6, 0.6, 75), (0.02, 1.31, 0.07, 0.2, 30),
+                 (0.0, 0.0, 2.0, 1.6, 400), (1.55, 0.05, 0.5, 0.12, 60)]
+        grid = PressureGrid(2.0, 1.6, cell=0.1)
+        for index, load in enumerate(loads):
+            grid.add(*load)
+            if index == 1:
+                grid.values
+        for ix in range(grid.nx):
+            for iy in range(grid.ny):
+                lo_x, lo_y = ix * grid.cell_x, iy * grid.cell_y
+                expected = 0.0
+                for x, y, length, width, mass in loads:
+                    overlap_x = max(0.0, min(lo_x + grid.cell_x, x + length) - max(lo_x, x))
+                    overlap_y = max(0.0, min(lo_y + grid.cell_y, y + width) - max(lo_y, y))
+                    expected += mass / (length * width) * overlap_x * overlap_y / (grid.cell_x * grid.cell_y)
+                self.assertAlmostEqual(grid.cell(ix, iy), expected, places=6)
+
+    def test_accumulator_matches_batch(self):
+        """累加器增删后与一次性计算一致"""
+        loads = [(0.1, 0.2, 0.5, 0.4, 80), (1.0, 0.9, 0.6, 0.6, 75), (0.4, 0.1, 0.3, 0.3, 20)]
+        acc = CogAccumulator((2.0, 1.6))
+        for load in loads:
+            acc.add(load)
+        acc.remove(loads[2])
+        expected = analyze_load((2.0, 1.6), loads[:2], 0.16)
+        self.assertAlmostEqual(acc.offset()[0], expected.offset[0])
+        self.assertAlmostEqual(acc.offset()[1], expected.offset[1])
+
+    def test_calculator_balances_load(self):
+        """启用重心检查后按偏心距选择货物位置和站位，居中均衡的布置可以通过"""
+        calculator = ElevatorCalculator()
+        calculator.use_crew_placement = True
+        calculator.check_eccentricity = True
+        for elevator, cargo in (((1.6, 1.4, 2.3, 1000), (0.8, 0.6, 0.8, 300)),
+                                ((2.4, 2.0, 2.5, 1600), (1.0, 0.6, 0.8, 600))):
+            result = calculator.check_elevator_capacity(elevator, cargo, 1)
+            distribution = result['load_distribution']
+            self.assertEqual(distribution['max_eccentricity'], min(elevator[:2]) * calculator.max_eccentricity_ratio)
+            self.assertLessEqual(distribution['eccentricity'], distribution['max_eccentricity'])
+            self.assertFalse(issue_mask(result) & ISSUE_ECCENTRICITY)
+            self.assertTrue(result['can_load'], result['issues'])
+
+    def test_calculator_flags_eccentricity(self):
+        """任何布置都无法平衡时给出重心偏移问题"""
+        calculator = ElevatorCalculator()
+        calculator.use_crew_placement = True
+        calculator.check_eccentricity = True
+        # 轻货物占满宽度，人员只能站在货物一端，无论货物放在哪里都偏向人员一侧
+        result = calculator.check_elevator_capacity((2.4, 1.4, 2.3, 1000), (1.4, 0.9, 0.5, 30), 1)
+        self.assertGreater(result['load_distribution']['eccentricity'],
+                           result['load_distribution']['max_eccentricity'])
+        self.assertTrue(issue_mask(result) & ISSUE_ECCENTRICITY)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+无界面装载方案报告测试
+"""
+
+import json
+import math
+import os
+import tempfile
+import unittest
+
+from cab_geometry import CabGeometry, Door
+from cab_models import get_model
+from cargo_shapes import Box
+from elevator_calculator import ElevatorCalculator
+from door_tables import DoorModel
+from loading_report import (cab_outline, cab_template, generate_reports, parse_request, read_requests, render_report,
+                            render_views)
+
+
+class TestLoadingReport(unittest.TestCase):
+    """测试 HTML/SVG 渲染、模板缓存和批量输出"""
+
+    def setUp(self):
+        self.calculator = ElevatorCalculator()
+        self.elevator = (1.6, 1.4, 2.3, 1000)
+
+    def test_render_report(self):
+        """报告包含结论、规格、两个视图，标题被转义"""
+        cargo = (1.2, 0.8, 1.0, 200)
+        result = self.calculator.check_elevator_capacity(self.elevator, cargo, 1)
+        page = render_report(result, self.elevator, cargo, 1, title='<DO-1>')
+        self.assertIn('可以安全装载', page)
+        self.assertIn('&lt;DO-1&gt;', page)
+        self.assertEqual(page.count('<svg'), 2)
+        self.assertEqual(page.count('</svg>'), 2)
+        self.assertTrue(page.rstrip().endswith('</html>'))
+
+    def test_model_code(self):
+        """电梯规格为型号代码时按型号尺寸渲染"""
+        cargo = (1.2, 0.8, 1.0, 200)
+        result = self.calculator.check_elevator_capacity('P1000', cargo, 1)
+        el, ew, eh, limit = get_model('P1000').specs
+        page = render_report(result, 'P1000', cargo, 1)
+        self.assertIn(f"{el}×{ew}×{eh}m，限重 {limit}kg", page)
+        self.assertEqual(render_views(result, 'P1000'), render_views(result, get_model('P1000').specs))
+
+    def test_cab_geometry(self):
+        """轿厢几何模型按真实门洞和障碍物绘制"""
+        cab = CabGeometry(1.6, 1.4, 2.3, 1000, [Door('front', 0.9, 2.1), Door('left', 1.0, 2.0, name='侧门')],
+                          [Box(0.6, 0.1, 1.2, 0.2, 0.0, 0.3)])
+        cargo = (1.0, 0.6, 0.8, 100)
+        result = self.calculator.check_elevator_capacity(cab, cargo, 1)
+        page = render_report(result, cab, cargo, 1)
+        self.assertIn('1.6×1.4×2.3m，限重 1000kg', page)
+        self.assertIn('侧门', page)
+        plan, elevation = render_views(result, cab)
+        self.assertEqual(plan.count('#adb5bd'), 1)
+        self.assertEqual(elevation.count('#adb5bd'), 1)
+        self.assertEqual(plan.count('stroke="#0d6efd" stroke-width="6"'), 2)
+
+    def test_diagonal_and_failed_views(self):
+        """斜放方案旋转绘制，无法装载时只画轿厢轮廓"""
+        diagonal = self.calculator.check_elevator_capacity(self.elevator, (2.6, 0.3, 0.3, 50), 1)
+        plan, _ = render_views(diagonal, self.elevator)
+        self.assertIn('rotate(', plan)
+        failed = self.calculator.check_elevator_capacity(self.elevator, (3.5, 1.0, 1.0, 50), 1)
+        plan, elevation = render_views(failed, self.elevator)
+        self.assertNotIn('#ffc107', plan + elevation)
+        page = render_report(failed, self.elevator, (3.5, 1.0, 1.0, 50))
+        self.assertIn('无法安全装载', page)
+        self.assertIn('货物对角线', page)
+
+    def test_yaw_view(self):
+        """平放转角方案按结果中的转角和底面绘制，与界面一致"""
+        elevator = (1.6, 1.4, 1.5, 1000)
+        result = self.calculator.check_elevator_capacity(elevator, (1.7, 0.15, 0.15, 30), 0)
+        yaw = result['best_orientation']['yaw']
+        plan, elevation = render_views(result, elevator)
+        self.assertIn(f"rotate({yaw['angle']:.1f} ", plan)
+        self.assertNotIn(f"rotate({math.degrees(math.atan2(1.4, 1.6)):.1f} ", plan)
+        # 侧视宽度为底面在长度方向上的投影，不超过轿厢长度
+        scale = cab_template(1.6, 1.4, 1.5, cab_outline(elevator, self.calculator)[1])[0]
+        angle = math.radians(yaw['angle'])
+        extent = 1.7 * math.cos(angle) + 0.15 * math.sin(angle)
+        self.assertIn(f'width="{extent * scale:.1f}"', elevation)
+
+    def test_registered_door(self):
+        """登记了门型时按门通行检查实际采用的净门洞绘制"""
+        calculator = ElevatorCalculator()
+        calculator.register_door(self.elevator[:3], DoorModel(0.9, 2.1, 1.5, name='货梯门'))
+        specs, doors, _ = cab_outline(self.elevator, calculator)
+        self.assertEqual(specs, self.elevator)
+        (wall, width, height, name), = doors
+        self.assertEqual((wall, name), ('front', '货梯门'))
+        self.assertAlmostEqual(width, 0.8)
+        self.assertAlmostEqual(height, 2.0)
+        default = cab_outline(self.elevator, self.calculator)[1][0]
+        self.assertEqual(default[1:3], self.calculator.door_opening(self.elevator[:3]))
+        result = calculator.check_elevator_capacity(self.elevator, (1.2, 0.8, 1.0, 200), 1)
+        self.assertIn('货梯门', render_views(result, self.elevator, calculator)[0])
+
+    def test_template_cached_per_cab(self):
+        """同一轿厢规格只生成一次模板"""
+        cab_template.cache_clear()
+        for cargo in [(1.2, 0.8, 1.0, 200), (0.5, 0.5, 0.5, 20), (1.0, 0.6, 1.8, 90)]:
+            result = self.calculator.check_elevator_capacity(self.elevator, cargo, 1)
+            render_report(result, self.elevator, cargo)
+        info = cab_template.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+
+    def test_generate_reports(self):
+        """批量生成每单一页并写出汇总页"""
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'orders.jsonl')
+            with open(source, 'w', encoding='utf-8') as f:
+                for order, cargo in (('DO/1', (1.2, 0.8, 1.0, 200)), ('DO/2', (1.2, 0.8, 1.0, 1200))):
+                    record = dict(zip(('cargo_length', 'cargo_width', 'cargo_height', 'cargo_weight'), cargo))
+                    record.update(order=order, elevator_length=1.6, elevator_width=1.4, elevator_height=2.3,
+                                  elevator_limit=1000, num_people=1)
+                    f.write(json.dumps(record) + '\n')
+            out_dir = os.path.join(tmp, 'reports')
+            self.assertEqual(generate_reports(read_requests(source), out_dir), 2)
+            self.assertEqual(sorted(os.listdir(out_dir)), ['DO_1.html', 'DO_2.html', 'index.html'])
+            with open(os.path.join(out_dir, 'index.html'), encoding='utf-8') as f:
+                index = f.read()
+            self.assertIn('href="DO_2.html"', index)
+            self.assertIn('不可装载', index)
+
+    def test_colliding_names_and_people(self):
+        """清理后重名的单号不互相覆盖；明确填写 0 人不按缺省 1 人处理"""
+        requests = [(order, self.elevator, (1.2, 0.8, 1.0, 200), 1) for order in ('DO/1', 'DO_1', 'do 1', 'index')]
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(generate_reports(requests, tmp), 4)
+            self.assertEqual(sorted(os.listdir(tmp)),
+                             ['DO_1-2.html', 'DO_1.html', 'do_1-3.html', 'index-2.html', 'index.html'])
+
+        record = dict(order='A', elevator_length=1.6, elevator_width=1.4, elevator_height=2.3, elevator_limit=1000,
+                      cargo_length=1.2, cargo_width=0.8, cargo_height=1.0, cargo_weight=200)
+        self.assertEqual(parse_request(record)[3], 1)
+        self.assertEqual(parse_request(dict(record, num_people=None))[3], 1)
+        self.assertEqual(parse_request(dict(record, num_people=''))[3], 1)
+        self.assertEqual(parse_request(dict(record, num_people=0))[3], 0)
+        self.assertEqual(parse_request(dict(record, num_people='0'))[3], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+搬家日离散事件仿真测试
+"""
+
+import unittest
+
+from cab_geometry import CabGeometry
+from cab_models import get_model
+from elevator_calculator import ElevatorCalculator
+from move_simulator import (CabSpec, MoveItem, MoveScenario, feasibility_matrix, simulate, run_replications,
+                            trip_duration)
+
+
+class CountingCalculator(ElevatorCalculator):
+    """记录检查次数的计算器"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def check_elevator_capacity(self, *args):
+        self.calls += 1
+        return super().check_elevator_capacity(*args)
+
+
+class TestMoveSimulator(unittest.TestCase):
+    """测试搬家日仿真"""
+
+    def setUp(self):
+        self.small_cab = CabSpec((1.4, 1.1, 2.2, 630), seconds_per_floor=2.0, door_cycle=5.0)
+        self.large_cab = CabSpec((2.5, 2.0, 2.8, 2000), seconds_per_floor=2.0, door_cycle=5.0)
+
+    def test_single_cab_serial_trips(self):
+        """单部电梯时总耗时等于各趟往返耗时之和"""
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=10, load_time=30, unload_time=30) for _ in range(3)]
+        scenario = MoveScenario([self.small_cab], items, crew_size=2)
+        result = simulate(scenario)
+        expected = sum(trip_duration(self.small_cab, item) for item in items)
+        self.assertAlmostEqual(result.makespan, expected)
+        self.assertEqual(result.trips, [3])
+        self.assertEqual(result.infeasible, [])
+
+    def test_oversized_item_uses_large_cab(self):
+        """只有大电梯能装的货物不会分配给小电梯"""
+        items = [MoveItem((2.0, 1.5, 1.8, 300), floor=5)]
+        scenario = MoveScenario([self.small_cab, self.large_cab], items, crew_size=2)
+        result = simulate(scenario)
+        self.assertEqual(result.trips, [0, 1])
+
+    def test_infeasible_and_crew_limits(self):
+        """装不下或人手不够的货物记为无法运送"""
+        items = [MoveItem((5.0, 3.0, 3.0, 300), floor=5), MoveItem((0.5, 0.4, 0.5, 20), floor=5, crew=3)]
+        scenario = MoveScenario([self.large_cab], items, crew_size=2)
+        result = simulate(scenario)
+        self.assertEqual(result.infeasible, [0, 1])
+        self.assertEqual(result.makespan, 0.0)
+
+    def test_crew_is_shared_between_cabs(self):
+        """只有一名搬运人员时两部电梯无法同时运行"""
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=10) for _ in range(2)]
+        one_mover = simulate(MoveScenario([self.large_cab, self.large_cab], items, crew_size=1))
+        two_movers = simulate(MoveScenario([self.large_cab, self.large_cab], items, crew_size=2))
+        self.assertAlmostEqual(one_mover.makespan, 2 * two_movers.makespan)
+
+    def test_replications_are_reproducible(self):
+        """相同种子的随机仿真结果一致"""
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=f) for f in range(1, 20)]
+        scenario = MoveScenario([self.small_cab, self.large_cab], items, crew_size=2, jitter=0.2)
+        first = run_replications(scenario, replications=5, workers=1, base_seed=7)
+        second = run_replications(scenario, replications=5, workers=1, base_seed=7)
+        self.assertEqual(first.makespans, second.makespans)
+        percentiles = first.makespan_percentiles((50, 99))
+        self.assertLessEqual(percentiles[50], percentiles[99])
+
+    def test_feasibility_checks_each_distinct_pair_once(self):
+        """相同规格的电梯和相同 (规格, 人数) 的货物只检查一次"""
+        cabs = [self.small_cab, self.large_cab, CabSpec(self.small_cab.specs)]
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=3), MoveItem((2.0, 1.5, 1.8, 300), floor=4),
+                 MoveItem((0.5, 0.4, 0.5, 20), floor=9), MoveItem((0.5, 0.4, 0.5, 20), floor=2, crew=2)]
+        calculator = CountingCalculator()
+        matrix = feasibility_matrix(cabs, items, calculator, workers=1)
+        self.assertEqual(calculator.calls, 2 * 3)
+        self.assertEqual(matrix, [[0, 2, 3], [0, 1, 2, 3], [0, 2, 3]])
+
+    def test_model_code_cab(self):
+        """轿厢规格可以是标准轿厢型号代码，名称取型号"""
+        cab = CabSpec('P630', seconds_per_floor=2.0)
+        self.assertEqual(cab.specs, get_model('P630').specs)
+        self.assertEqual(cab.name, 'P630')
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=3), MoveItem((2.2, 1.2, 1.0, 80), floor=3)]
+        self.assertEqual(feasibility_matrix([cab], items, workers=1),
+                         feasibility_matrix([CabSpec(get_model('P630').specs)], items, workers=1))
+        with self.assertRaises(ValueError):
+            CabSpec(CabGeometry.from_model('P630'))
+
+    def test_blocked_item_does_not_hold_queue(self):
+        """人手不足的货物等待时，后到的、所需人数较少的货物可先走"""
+        items = [MoveItem((0.5, 0.4, 0.5, 20), floor=10, crew=1),
+                 MoveItem((0.5, 0.4, 0.5, 20), floor=10, crew=2, ready_time=1.0),
+                 MoveItem((0.5, 0.4, 0.5, 20), floor=10, crew=1, ready_time=2.0)]
+        result = simulate(MoveScenario([self.large_cab, self.large_cab], items, crew_size=2))
+        duration = trip_duration(self.large_cab, items[0])
+        self.assertEqual(result.waits, [0.0, 0.0, duration + 1.0])  # 第三件返回后人手才够
+        self.assertEqual(result.trips, [2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+多安全策略评估测试
+"""
+
+import random
+import unittest
+
+from cab_geometry import CabGeometry
+from cab_models import get_model
+from elevator_calculator import ElevatorCalculator, issue_mask, ISSUE_WEIGHT, ISSUE_INVALID_INPUT
+from multi_policy import SafetyPolicy, MultiPolicyEvaluator, evaluate_policies
+
+
+class TestMultiPolicy(unittest.TestCase):
+    """测试多策略判定矩阵"""
+
+    def setUp(self):
+        rng = random.Random(11)
+
+        def dim():
+            return round(rng.uniform(0.2, 2.6), 2)
+
+        self.cabs = [(1.6, 1.4, 2.3, 1000), (2.5, 2.0, 2.8, 2000), (1.0, 0.8, 2.0, 500)]
+        self.cabs += [(dim(), dim(), dim() + 0.5, rng.choice([500, 1000, 1600])) for _ in range(5)]
+        self.items = [(1.2, 0.8, 1.0, 200), (2.1, 0.9, 0.85, 120), (0, 0.5, 0.5, 100)]
+        self.items += [(dim(), dim(), dim(), rng.choice([20, 300, 900])) for _ in range(30)]
+        self.policies = [
+            SafetyPolicy(),
+            SafetyPolicy(safety_gap=0.0, door_safety_gap=0.05),
+            SafetyPolicy(safety_gap=0.1, door_safety_gap=0.15, person_avg_weight=80, person_min_space=0.5),
+            SafetyPolicy(safety_gap=0.1, person_avg_weight=70, person_min_space=0.3),
+        ]
+
+    def test_matches_reference_per_policy(self):
+        """每个策略的判定和问题代码与逐次调用参考实现一致"""
+        for people in (0, 1, 3):
+            verdicts = evaluate_policies(self.cabs, self.items, self.policies, people)
+            for k, policy in enumerate(self.policies):
+                calculator = policy.make_calculator()
+                for c, cab in enumerate(self.cabs):
+                    for i, item in enumerate(self.items):
+                        result = calculator.check_elevator_capacity(cab, item, people)
+                        self.assertEqual(verdicts.verdict(k, c, i), result['can_load'])
+                        self.assertEqual(verdicts.issue_mask(k, c, i), issue_mask(result))
+
+    def test_policy_changes_verdict(self):
+        """更严格的人员策略会使原本可装载的组合失败"""
+        cab, item = (1.6, 1.4, 2.3, 700), (1.2, 0.8, 1.0, 400)
+        verdicts = evaluate_policies([cab], [item], [SafetyPolicy(), SafetyPolicy(person_avg_weight=160)], 2)
+        self.assertEqual(verdicts.loadable_counts(), [1, 0])
+        self.assertTrue(verdicts.issue_mask(1, 0, 0) & ISSUE_WEIGHT)
+
+    def test_invalid_input_marked_for_all_policies(self):
+        """无效输入在所有策略下都标记为参数错误"""
+        verdicts = evaluate_policies([(1.6, 1.4, 2.3, 1000)], [(0, 0.5, 0.5, 100)], self.policies)
+        for k in range(len(self.policies)):
+            self.assertFalse(verdicts.verdict(k, 0, 0))
+            self.assertEqual(verdicts.issue_mask(k, 0, 0), ISSUE_INVALID_INPUT)
+
+    def test_model_codes(self):
+        """型号代码与对应的规格元组判定相同"""
+        codes = ['P630', 'P1000', 'G2000']
+        by_code = evaluate_policies(codes, self.items, self.policies)
+        by_specs = evaluate_policies([get_model(code).specs for code in codes], self.items, self.policies)
+        self.assertEqual(by_code.loadable_counts(), by_specs.loadable_counts())
+        for k in range(len(self.policies)):
+            for c in range(len(codes)):
+                for i in range(len(self.items)):
+                    self.assertEqual(by_code.issue_mask(k, c, i), by_specs.issue_mask(k, c, i))
+
+    def test_rejects_crew_placement_mode(self):
+        """启用站位求解的计算器不能用于多策略评估"""
+        calculator = ElevatorCalculator()
+        calculator.use_crew_placement = True
+        with self.assertRaises(ValueError):
+            MultiPolicyEvaluator(calculator).evaluate(self.cabs, self.items, self.policies)
+
+    def test_rejects_cab_geometry(self):
+        """轿厢几何模型不能用于多策略评估"""
+        with self.assertRaises(ValueError):
+            evaluate_policies([CabGeometry.from_specs(self.cabs[0])], self.items, self.policies)
+
+
+if __name__ == "__main__":
+    unittest.main()
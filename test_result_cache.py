@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+持久化结果缓存测试
+"""
+
+import os
+import tempfile
+import unittest
+
+from cab_geometry import CabGeometry
+from cab_models import get_model
+from cargo_shapes import Box
+from elevator_calculator import ElevatorCalculator, issue_mask
+from result_cache import ResultCache, main, rule_fingerprint
+
+
+class TestResultCache(unittest.TestCase):
+    """测试 SQLite 结果缓存"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cache.db')
+        self.requests = [
+            ((1.6, 1.4, 2.3, 1000), (1.2, 0.8, 1.0, 200), 1),
+            ((1.0, 0.8, 2.0, 500), (2.1, 0.9, 0.85, 120), 1),
+            ((2.0, 1.8, 2.5, 1500), (2.0, 0.8, 0.5, 100), 2),
+            ((1.5, 1.2, 2.0, 1000), (0, 0.5, 0.5, 100), 1),
+            ((1.6, 1.4, 2.3, 1000), (1.2, 0.8, 1.0, 200), 1),
+        ]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_results_match_calculator(self):
+        """缓存命中与未命中时结果都与直接计算一致"""
+        calculator = ElevatorCalculator()
+        expected = [calculator.check_elevator_capacity(*r) for r in self.requests]
+        with ResultCache(self.path) as cache:
+            self.assertEqual(cache.check_many(self.requests), expected)
+            self.assertEqual(cache.misses, 4)
+        with ResultCache(self.path) as cache:
+            self.assertEqual(cache.check_many(self.requests), expected)
+            self.assertEqual(cache.hits, 5)
+            self.assertEqual(cache.misses, 0)
+            verdicts = cache.verdicts_many(self.requests)
+        self.assertEqual(verdicts, [(r['can_load'], issue_mask(r)) for r in expected])
+
+    def test_parameter_change_changes_rule(self):
+        """修改计算器参数后旧结果不再命中，压缩时被删除"""
+        calculator = ElevatorCalculator()
+        with ResultCache(self.path, calculator) as cache:
+            cache.check_many(self.requests)
+            old_rule = rule_fingerprint(calculator)
+            calculator.safety_gap = 0.2
+            self.assertNotEqual(rule_fingerprint(calculator), old_rule)
+            result = cache.check(*self.requests[0])
+            self.assertEqual(result, calculator.check_elevator_capacity(*self.requests[0]))
+            # 其他参数配置的条目仍然有效，默认不删除
+            self.assertEqual(cache.compact(), 0)
+            self.assertEqual(cache.stats()['entries'], 5)
+            self.assertEqual(cache.compact(other_rules=True), 4)
+            self.assertEqual(cache.stats()['entries'], 1)
+
+    def test_compact_removes_stale_versions(self):
+        """判定逻辑版本变化后，compact 删除旧版本写入的条目，命令行维护工具不误删其他配置的条目"""
+        class NextVersion(ElevatorCalculator):
+            RULE_VERSION = ElevatorCalculator.RULE_VERSION + 1
+
+        tuned = ElevatorCalculator()
+        tuned.safety_gap = 0.08
+        with ResultCache(self.path, tuned) as cache:
+            cache.check_many(self.requests)
+        main(['compact', self.path])
+        with ResultCache(self.path, tuned) as cache:
+            cache.check_many(self.requests)
+            self.assertEqual(cache.misses, 0)
+        with ResultCache(self.path, NextVersion()) as cache:
+            cache.check_many(self.requests[:1])
+            self.assertEqual(cache.compact(), 4)
+            self.assertEqual(cache.stats()['entries'], 1)
+
+    def test_running_size_total(self):
+        """总大小由触发器维护，覆盖写入、淘汰和压缩后都与逐条求和一致"""
+        with ResultCache(self.path, max_bytes=10 ** 9) as cache:
+            def check_total():
+                total = cache.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+                self.assertEqual(cache.total_bytes(), total)
+                self.assertEqual(cache.stats()['bytes'], total)
+
+            cache.check_many(self.requests)
+            check_total()
+            results = cache.check_many(self.requests[:2])
+            cache.put_many([(key, results[0]) for key, _, _ in cache._select(
+                [row[0] for row in cache.conn.execute("SELECT key FROM results")], 'size')])
+            check_total()
+            cache.evict(cache.total_bytes() // 2)
+            check_total()
+            cache.compact(other_rules=True)
+            check_total()
+
+    def test_size_based_eviction(self):
+        """超过容量上限时按最近使用时间淘汰"""
+        with ResultCache(self.path) as cache:
+            cache.check_many(self.requests[:2])
+            cache.check_many(self.requests[2:4])
+            size = cache.stats()['bytes']
+            removed = cache.evict(size // 2)
+            self.assertGreater(removed, 0)
+            self.assertLessEqual(cache.stats()['bytes'], size // 2)
+            # 较新的条目保留
+            cache.hits = 0
+            cache.check_many(self.requests[3:4])
+            self.assertEqual(cache.hits, 1)
+
+    def test_cab_geometry(self):
+        """轿厢几何模型按指纹区分缓存条目"""
+        cargo = (1.5, 1.28, 0.8, 100)
+        bare = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000))
+        panel = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000), obstacles=[Box(0.6, 0.1, 1.2, 0.2, 0.0, 0.3)])
+        calculator = ElevatorCalculator()
+        expected = [calculator.check_elevator_capacity(cab, cargo, 0) for cab in (bare, panel)]
+        self.assertNotEqual(expected[0]['can_load'], expected[1]['can_load'])
+        with ResultCache(self.path) as cache:
+            self.assertEqual(cache.check_many([(bare, cargo, 0), (panel, cargo, 0)]), expected)
+            self.assertEqual(cache.misses, 2)
+
+    def test_model_codes(self):
+        """型号代码与对应的规格元组共用缓存条目"""
+        cargo = (1.2, 0.8, 1.0, 200)
+        with ResultCache(self.path) as cache:
+            result = cache.check_many([('P1000', cargo, 1)])[0]
+            self.assertEqual(result, ElevatorCalculator().check_elevator_capacity('P1000', cargo, 1))
+            cache.check_many([(get_model('P1000').specs, cargo, 1)])
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
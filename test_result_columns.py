@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+列式结果文件测试
+"""
+
+import csv
+import gzip
+import math
+import os
+import tempfile
+import unittest
+
+from elevator_calculator import ElevatorCalculator, issue_mask
+from result_columns import COLUMN_NAMES, ResultReader, ResultWriter, merge_results
+
+
+class TestResultColumns(unittest.TestCase):
+    """测试列式结果的写入、追加与读取"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'results.col')
+        calculator = ElevatorCalculator()
+        requests = [
+            ((1.6, 1.4, 2.3, 1000), (1.2, 0.8, 1.0, 200), 1),
+            ((1.0, 0.8, 2.0, 500), (2.1, 0.9, 0.85, 120), 1),
+            ((2.0, 1.8, 2.5, 1500), (2.0, 0.8, 0.5, 100), 2),
+            ((1.5, 1.2, 2.0, 1000), (0, 0.5, 0.5, 100), 1),
+        ]
+        self.results = [calculator.check_elevator_capacity(*r) for r in requests]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """读回的列与结果字典一致，缺失值为 NaN / -1"""
+        with ResultWriter(self.path, chunk_rows=3) as writer:
+            writer.write_many(self.results)
+        reader = ResultReader(self.path)
+        self.assertEqual(len(reader), 4)
+        self.assertEqual(reader.chunk_count, 2)
+        self.assertEqual(list(reader.column('request')), [0, 1, 2, 3])
+        self.assertEqual(list(reader.column('can_load')), [int(r['can_load']) for r in self.results])
+        self.assertEqual(list(reader.column('issue_mask')), [issue_mask(r) for r in self.results])
+        first = self.results[0]
+        volume = reader.column('volume_util')
+        self.assertEqual(volume[0], first['best_orientation']['volume_utilization'])
+        self.assertTrue(math.isnan(volume[3]))
+        self.assertEqual(reader.column('max_people_by_space')[0], first['person_analysis']['max_people_by_space'])
+        self.assertEqual(reader.column('person_count')[3], -1)
+
+    def test_append_and_truncated_tail(self):
+        """追加写入延续编号，中断留下的半个块被忽略并在追加时截去"""
+        with ResultWriter(self.path, background=False) as writer:
+            writer.write_many(self.results[:2])
+        with open(self.path, 'ab') as f:
+            f.write(b'CHNK\x05\x00\x00\x00partial')
+        self.assertEqual(len(ResultReader(self.path)), 2)
+        with ResultWriter(self.path) as writer:
+            writer.write_many(self.results[2:])
+        reader = ResultReader(self.path)
+        self.assertEqual(list(reader.column('request')), [0, 1, 2, 3])
+        rows = list(reader.rows(['request', 'can_load']))
+        self.assertEqual(rows[2], (2, int(self.results[2]['can_load'])))
+
+    def test_compressed_csv(self):
+        """可选的 gzip CSV 与二进制文件行数相同"""
+        csv_path = os.path.join(self.tmpdir.name, 'results.csv.gz')
+        with ResultWriter(self.path, csv_path=csv_path) as writer:
+            writer.write_many(self.results)
+        with gzip.open(csv_path, 'rt', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(tuple(rows[0]), COLUMN_NAMES)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[4][COLUMN_NAMES.index('volume_util')], '')
+
+    def test_merge(self):
+        """拼接保留各文件的块和编号顺序"""
+        parts = [os.path.join(self.tmpdir.name, f'part{k}.col') for k in range(2)]
+        for k, part in enumerate(parts):
+            with ResultWriter(part, chunk_rows=1) as writer:
+                writer.write_many(self.results[2 * k:2 * k + 2], start=2 * k)
+        self.assertEqual(merge_results(parts, self.path), 4)
+        reader = ResultReader(self.path)
+        self.assertEqual(reader.chunk_count, 4)
+        self.assertEqual(list(reader.column('request')), [0, 1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+搬运路线检查测试
+"""
+
+import unittest
+
+from cab_geometry import CabGeometry
+from cab_models import get_model
+from cargo_shapes import Box
+from elevator_calculator import ElevatorCalculator
+from route_chain import Corner, Corridor, Doorway, ElevatorCab, Route
+
+
+class TestRouteChain(unittest.TestCase):
+    """测试路段判定、首个阻断路段和缓存复用"""
+
+    def setUp(self):
+        self.route = Route([
+            Doorway(1.0, 2.1, 3.0, name='单元门'),
+            Corridor(1.2, 2.4),
+            Corner(1.2, 1.1, 2.4),
+            ElevatorCab((1.6, 1.4, 2.3, 1000)),
+            Doorway(0.9, 2.0, 1.3, name='入户门'),
+        ])
+
+    def test_segments(self):
+        """各类路段的基本判定"""
+        self.assertTrue(Corridor(1.0, 2.0).check((3.0, 0.8, 1.5, 50))[0])
+        self.assertFalse(Corridor(1.0, 2.0).check((3.0, 1.5, 2.5, 50))[0])
+        # 截面 1.1 × 0.2 需在 1.0 × 1.0 截面内倾斜才能通过
+        self.assertTrue(Corridor(1.0, 1.0).check((3.0, 1.1, 0.2, 50))[0])
+        self.assertTrue(Corner(1.0, 1.0, 2.4).check((2.0, 0.3, 0.3, 20))[0])
+        self.assertFalse(Corner(1.0, 1.0, 2.4).check((3.5, 0.3, 0.3, 20))[0])
+
+    def test_first_blocking_segment(self):
+        """小件可通过全程，过长货物停在第一个无法通过的路段"""
+        self.assertTrue(self.route.evaluate((1.2, 0.8, 1.0, 200)).passable)
+        verdict = self.route.evaluate((3.2, 0.5, 0.5, 50))
+        self.assertFalse(verdict.passable)
+        self.assertEqual(verdict.blocked_at, 2)
+        self.assertEqual(verdict.segment, self.route.segments[2].name)
+        # 之后的路段没有被检查
+        elevator_key = self.route.segments[3].key()
+        self.assertNotIn((elevator_key, (3.2, 0.5, 0.5, 50)), self.route.cache)
+
+    def test_elevator_segment_matches_calculator(self):
+        """电梯路段与计算器结论一致"""
+        calculator = ElevatorCalculator()
+        for item in [(1.2, 0.8, 1.0, 200), (1.2, 0.8, 1.0, 1200), (2.1, 0.9, 0.85, 120)]:
+            expected = calculator.check_elevator_capacity((1.6, 1.4, 2.3, 1000), item, 1)['can_load']
+            self.assertEqual(ElevatorCab((1.6, 1.4, 2.3, 1000)).check(item)[0], expected)
+
+    def test_model_code(self):
+        """电梯路段接受标准轿厢型号代码"""
+        cab = ElevatorCab('P1000')
+        self.assertEqual(cab.elevator_specs, get_model('P1000').specs)
+        self.assertEqual(cab.key(), ElevatorCab(get_model('P1000').specs).key())
+        item = (1.2, 0.8, 1.0, 200)
+        self.assertEqual(cab.check(item)[0], ElevatorCalculator().check_elevator_capacity('P1000', item, 1)['can_load'])
+
+    def test_cab_geometry(self):
+        """电梯路段接受轿厢几何模型，障碍物不同的轿厢不共用缓存"""
+        item = (1.5, 1.28, 0.8, 100)
+        bare = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000))
+        panel = CabGeometry.from_specs((1.6, 1.4, 2.3, 1000), obstacles=[Box(0.6, 0.1, 1.2, 0.2, 0.0, 0.3)])
+        calculator = ElevatorCalculator()
+        for cab in (bare, panel):
+            expected = calculator.check_elevator_capacity(cab, item, 1)['can_load']
+            self.assertEqual(ElevatorCab(cab).check(item)[0], expected)
+        self.assertNotEqual(ElevatorCab(bare).key(), ElevatorCab(panel).key())
+
+    def test_catalog_and_shared_cache(self):
+        """批量检查与逐件一致，几何路段按尺寸复用判定"""
+        items = [(1.2, 0.8, 1.0, 200), (0.8, 1.0, 1.2, 90), (3.2, 0.5, 0.5, 50), (1.2, 0.8, 1.0, 200)]
+        verdicts = self.route.evaluate_catalog(items)
+        self.assertEqual([v.passable for v in verdicts], [self.route.evaluate(i).passable for i in items])
+        corridor_key = self.route.segments[1].key()
+        corridor_entries = [key for key in self.route.cache if key[0] == corridor_key]
+        self.assertEqual(len(corridor_entries), 2)
+
+        other = Route([Corridor(1.2, 2.4)], cache=self.route.cache)
+        before = len(other.cache)
+        other.evaluate((1.0, 1.2, 0.8, 10))
+        self.assertEqual(len(other.cache), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
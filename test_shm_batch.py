@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+共享内存批量评估测试
+"""
+
+import math
+import os
+import unittest
+from array import array
+
+from elevator_calculator import ElevatorCalculator
+from result_columns import COLUMN_NAMES, result_row
+from shm_batch import INPUT_NAMES, SharedMemoryPool, pack_requests, random_requests
+
+
+class TestSharedMemoryPool(unittest.TestCase):
+    """测试共享内存路径与逐条评估一致"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = SharedMemoryPool(workers=2, chunk_rows=64)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_matches_calculator(self):
+        """输出列与逐条评估后按 result_row 展开的值一致（跨多个分块和多次批量）"""
+        calculator = ElevatorCalculator()
+        for seed in (1, 2):
+            requests = random_requests(300, seed) + [((1.6, 1.4, 2.3, 1000), (0, 0.5, 0.5, 100), 1)]
+            columns = self.pool.check_many(requests)
+            for row, request in enumerate(requests):
+                expected = result_row(calculator.check_elevator_capacity(*request), row)
+                actual = tuple(columns[name][row] for name in COLUMN_NAMES)
+                for name, a, b in zip(COLUMN_NAMES, actual, expected):
+                    if isinstance(b, float) and math.isnan(b):
+                        self.assertTrue(math.isnan(a), (row, name))
+                    else:
+                        self.assertEqual(a, b, (row, name))
+
+    def test_column_input(self):
+        """接受任意序列列输入；空输入返回空列，长度不一致时报错"""
+        columns = pack_requests(random_requests(10))
+        as_lists = {name: list(columns[name]) for name in INPUT_NAMES}
+        self.assertEqual(self.pool.check_columns(as_lists)['can_load'], self.pool.check_columns(columns)['can_load'])
+        self.assertEqual(len(self.pool.check_many([])['can_load']), 0)
+        as_lists['cargo_weight'].pop()
+        with self.assertRaises(ValueError):
+            self.pool.check_columns(as_lists)
+
+    def test_column_typecodes(self):
+        """类型码不同的列先转换；无法转换时报 ValueError，共享块不泄漏"""
+        columns = pack_requests(random_requests(20))
+        expected = self.pool.check_columns(columns)['can_load']
+        as_double = dict(columns, num_people=array('d', columns['num_people']))
+        self.assertEqual(self.pool.check_columns(as_double)['can_load'], expected)
+
+        before = set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+        as_double['num_people'][0] = 1.5
+        with self.assertRaises(ValueError):
+            self.pool.check_columns(as_double)
+        with self.assertRaises(ValueError):
+            self.pool.check_columns(dict(columns, cargo_weight=['heavy'] * 20))
+        if os.path.isdir('/dev/shm'):
+            self.assertEqual(set(os.listdir('/dev/shm')) - before, set())
+
+    @unittest.skipUnless(os.path.isdir('/proc/self'), "需要 /proc 查看子进程映射")
+    def test_workers_detach_after_batch(self):
+        """批量结束后子进程不再映射共享块"""
+        self.pool.check_many(random_requests(200, 3))
+        for pid in self.pool.executor._processes:
+            with open(f'/proc/{pid}/maps') as f:
+                self.assertNotIn('/dev/shm/psm_', f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
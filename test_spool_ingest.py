@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+调度单目录持续接入测试
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from elevator_calculator import ElevatorCalculator
+from spool_ingest import STATE_NAME, SpoolIngestor
+
+
+def order(i):
+    return {'order': f'SO{i:03d}', 'elevator_length': 1.6, 'elevator_width': 1.4, 'elevator_height': 2.3,
+            'elevator_limit': 1000, 'cargo_length': 0.5 + 0.05 * i, 'cargo_width': 0.6,
+            'cargo_height': 0.8, 'cargo_weight': 40 + 30 * i, 'num_people': 1}
+
+
+class TestSpoolIngestor(unittest.TestCase):
+    """测试增量读取、偏移续跑和背压"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.spool = os.path.join(self.tmpdir.name, 'spool')
+        self.out = os.path.join(self.tmpdir.name, 'out')
+        os.makedirs(self.spool)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def append(self, name, text):
+        with open(os.path.join(self.spool, name), 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    def lines(self, *numbers):
+        return ''.join(json.dumps(order(i)) + '\n' for i in numbers)
+
+    def ingest(self, **kwargs):
+        options = dict(batch_size=4, batch_timeout=0.02, poll_interval=0.02)
+        options.update(kwargs)
+        return SpoolIngestor(self.spool, self.out, **options).run(idle_exit=0.3)
+
+    def results(self):
+        records = []
+        for name in sorted(os.listdir(self.out)):
+            if name.startswith('results-'):
+                with open(os.path.join(self.out, name), encoding='utf-8') as f:
+                    records.extend(json.loads(line) for line in f)
+        return records
+
+    def test_tail_and_resume(self):
+        """只处理完整行；重启后从记录的偏移继续，不重复处理"""
+        self.append('a.jsonl', self.lines(0, 1, 2))
+        self.append('b.jsonl', self.lines(3) + json.dumps(order(4))[:20])  # 末行尚未写完
+        stats = self.ingest()
+        self.assertEqual(stats['records'], 4)
+        self.assertEqual([r['order'] for r in self.results()], ['SO000', 'SO001', 'SO002', 'SO003'])
+
+        self.append('b.jsonl', json.dumps(order(4))[20:] + '\n')
+        self.append('a.jsonl', self.lines(5))
+        stats = self.ingest()
+        self.assertEqual(stats['records'], 2)
+        records = self.results()
+        self.assertEqual(sorted(r['order'] for r in records), [f'SO{i:03d}' for i in range(6)])
+
+        calculator = ElevatorCalculator()
+        for record in records:
+            i = int(record['order'][2:])
+            o = order(i)
+            expected = calculator.check_elevator_capacity(
+                (1.6, 1.4, 2.3, 1000), (o['cargo_length'], 0.6, 0.8, o['cargo_weight']), 1)
+            self.assertEqual(record['can_load'], expected['can_load'])
+            self.assertEqual(record['issues'], expected['issues'])
+
+        self.assertEqual(self.ingest()['records'], 0)
+
+    def test_uncommitted_batch_is_rewritten(self):
+        """结果已写出但偏移未提交时，重新运行以同一批次号覆盖，不产生重复记录"""
+        self.append('a.jsonl', self.lines(0, 1))
+        self.ingest(batch_size=100)
+        committed = os.path.join(self.tmpdir.name, 'committed.json')
+        shutil.copy(os.path.join(self.out, STATE_NAME), committed)
+        self.append('a.jsonl', self.lines(2, 3))
+        self.ingest(batch_size=100)
+        shutil.copy(committed, os.path.join(self.out, STATE_NAME))  # 模拟提交偏移前中断
+
+        self.assertEqual(self.ingest(batch_size=100)['records'], 2)
+        self.assertEqual([r['order'] for r in self.results()], ['SO000', 'SO001', 'SO002', 'SO003'])
+
+    def test_backpressure_and_errors(self):
+        """队列容量很小时读取线程阻塞等待，所有记录仍按顺序处理；无法解析的行记为错误"""
+        self.append('a.jsonl', self.lines(*range(30)) + '{"order": "bad"}\n' + self.lines(30))
+        stats = self.ingest(batch_size=2, max_pending=2, max_batches=1)
+        self.assertGreater(stats['stalls'], 0)
+        self.assertEqual(stats['errors'], 1)
+        records = self.results()
+        self.assertEqual([r.get('order') for r in records if 'error' not in r], [f'SO{i:03d}' for i in range(31)])
+        self.assertEqual(len(records), 32)
+
+    def test_replaced_file_restarts(self):
+        """同名文件被替换（inode 变化）时从头读取"""
+        self.append('a.jsonl', self.lines(0, 1))
+        self.ingest()
+        os.remove(os.path.join(self.spool, 'a.jsonl'))
+        self.append('a.jsonl', self.lines(7))
+        self.assertEqual(self.ingest()['records'], 1)
+        self.assertEqual(self.results()[-1]['order'], 'SO007')
+
+    def test_writer_failure_propagates(self):
+        """写出线程出错时 run 不再阻塞在写出队列上，而是重新抛出该异常，偏移不提交"""
+        self.append('a.jsonl', self.lines(*range(20)))
+        ingestor = SpoolIngestor(self.spool, self.out, batch_size=1, batch_timeout=0.02, poll_interval=0.02,
+                                 max_batches=1)
+        ingestor.batch_path = lambda batch: os.path.join(self.out, 'missing', f'{batch}.jsonl')
+        outcome = []
+
+        def run():
+            try:
+                ingestor.run()
+            except OSError as e:
+                outcome.append(e)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(outcome), 1)
+        self.assertIsInstance(outcome[0], FileNotFoundError)
+        self.assertFalse(os.path.exists(os.path.join(self.out, STATE_NAME)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+平面转角放置判定测试
+"""
+
+import math
+import random
+import unittest
+
+from elevator_calculator import ElevatorCalculator
+from yaw_fit import _clearance, best_angles, best_yaw, yaw_fit
+
+
+class TestYawFit(unittest.TestCase):
+    """测试闭式解与逐角度扫描一致，以及计算器中的斜放方案"""
+
+    def test_matches_angle_sweep(self):
+        """可行区间和最佳转角与逐角度扫描一致"""
+        rng = random.Random(7)
+        steps = 720
+        for _ in range(300):
+            floor = (rng.uniform(0.8, 3.0), rng.uniform(0.8, 3.0))
+            footprint = (rng.uniform(0.1, 3.5), rng.uniform(0.1, 2.0))
+            gap = rng.choice((0.0, 0.05))
+            fit = yaw_fit(floor, footprint, gap)
+            A, B = floor[0] - 2 * gap, floor[1] - 2 * gap
+            sweep = []
+            for i in range(steps + 1):
+                theta = math.pi / 2 * i / steps
+                clearance = _clearance(theta, A, B, fit.length, fit.width)
+                sweep.append(clearance)
+                inside = any(lo - 1e-9 <= theta <= hi + 1e-9 for lo, hi in fit.intervals)
+                if abs(clearance) > 1e-9:
+                    self.assertEqual(inside, clearance > 0, (floor, footprint, gap, theta))
+            self.assertGreaterEqual(fit.clearance, max(sweep) - 1e-9)
+            self.assertAlmostEqual(fit.clearance, _clearance(fit.angle, A, B, fit.length, fit.width))
+            self.assertEqual(fit.fits, fit.clearance >= -1e-9)
+
+    def test_axis_and_rotated(self):
+        """能正放时最佳转角为 0；细长货物只能在中间角度放下"""
+        fit = yaw_fit((2.0, 1.6), (1.2, 0.8), 0.05)
+        self.assertEqual(fit.angle, 0.0)
+        self.assertEqual(fit.interval_degrees[0][0], 0.0)
+
+        fit = yaw_fit((2.0, 1.6), (0.15, 2.2), 0.05)
+        self.assertEqual(len(fit.intervals), 1)
+        lo, hi = fit.interval_degrees[0]
+        self.assertTrue(0 < lo <= fit.degrees <= hi < 90)
+
+        self.assertFalse(yaw_fit((2.0, 1.6), (2.6, 0.3), 0.05).fits)
+
+    def test_best_angles_batch(self):
+        """按列批量计算与逐条一致，放不下的行为 NaN"""
+        rows = [((2.0, 1.6), (2.2, 0.15)), ((2.0, 1.6), (1.2, 0.8)), ((1.6, 1.4), (2.5, 0.3))]
+        angles = best_angles([r[0][0] for r in rows], [r[0][1] for r in rows],
+                             [r[1][0] for r in rows], [r[1][1] for r in rows], 0.05)
+        for (floor, footprint), angle in zip(rows, angles):
+            fit = yaw_fit(floor, footprint, 0.05)
+            if fit.fits:
+                self.assertAlmostEqual(angle, fit.angle)
+            else:
+                self.assertTrue(math.isnan(angle))
+
+    def test_calculator_diagonal_plan(self):
+        """对角线方案中可平放转角时给出最佳转角，只能倾斜时不给出"""
+        calculator = ElevatorCalculator()
+        result = calculator.check_elevator_capacity((2.0, 1.6, 2.0, 1000), (2.2, 0.15, 0.15, 20), 1)
+        yaw = result['best_orientation']['yaw']
+        self.assertTrue(result['can_load'])
+        self.assertEqual(yaw['footprint'], (2.2, 0.15, 0.15))
+        self.assertTrue(any(lo <= yaw['angle'] <= hi for lo, hi in yaw['intervals']))
+        self.assertIn(f"{yaw['angle']:.1f}°", result['recommendations'][0])
+
+        result = calculator.check_elevator_capacity((1.6, 1.4, 2.3, 1000), (2.5, 0.3, 0.3, 20), 1)
+        self.assertTrue(result['best_orientation']['diagonal_fit'])
+        self.assertNotIn('yaw', result['best_orientation'])
+        self.assertIsNone(best_yaw((1.6, 1.4, 2.3), (2.5, 0.3, 0.3), calculator.safety_gap))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+平面转角放置判定
+货物底面（矩形 a × b）在轿厢地面内绕竖直轴转任意角度 θ 放置，四周留安全间隙。
+θ 为货物长边与轿厢长度方向的夹角，占用的长、宽分别为
+    a·cosθ + b·sinθ = R·cos(θ - φ)，a·sinθ + b·cosθ = R·cos(θ - ψ)
+其中 R 为底面对角线，φ = atan2(b, a)，ψ = π/2 - φ，
+每个约束的可行集都是 |θ - 中心角| ≥ acos(可用尺寸 / R)，可行角区间和最佳角度都有闭式解，
+每次查询只做常数次三角运算
+"""
+
+import math
+from array import array
+from itertools import repeat
+
+
+HALF_PI = math.pi / 2
+_EPS = 1e-12
+
+
+def _clearance(theta, A, B, a, b):
+    """转角 θ 时长、宽两个方向剩余间隙中较小的一个（负数表示放不下）"""
+    c, s = math.cos(theta), math.sin(theta)
+    return min(A - (a * c + b * s), B - (a * s + b * c))
+
+
+def _best(A, B, a, b):
+    """
+    最小剩余间隙最大的转角及该间隙，a ≥ b
+
+    θ ∈ [0, φ] 时两个占用尺寸都随 θ 增大，θ ∈ [ψ, π/2] 时都随 θ 减小，
+    中间段长度方向间隙递减、宽度方向间隙递增，最优点为两者相等处（夹到 [φ, ψ] 内）；
+    因此只需比较 0、π/2 和该交点三处
+    """
+    best_theta, best_clear = 0.0, _clearance(0.0, A, B, a, b)
+    clear = _clearance(HALF_PI, A, B, a, b)
+    if clear > best_clear:
+        best_theta, best_clear = HALF_PI, clear
+    if a - b > _EPS:
+        phi = math.atan2(b, a)
+        # A - R·cos(θ-φ) = B - R·cos(θ-ψ)  ⇔  sin(θ - π/4) = (B - A) / (2R·sin(π/4 - φ))
+        ratio = (B - A) / (2 * math.hypot(a, b) * math.sin(math.pi / 4 - phi))
+        theta = math.pi / 4 + math.asin(max(-1.0, min(1.0, ratio)))
+        theta = max(phi, min(HALF_PI - phi, theta))
+        clear = _clearance(theta, A, B, a, b)
+        if clear > best_clear:
+            best_theta, best_clear = theta, clear
+    return best_theta, best_clear
+
+
+def _excluded(center, available, radius):
+    """|θ - center| < acos(available / radius) 的开区间，即该方向占用超出可用尺寸的转角"""
+    half = math.acos(max(-1.0, min(1.0, available / radius)))
+    return center - half, center + half
+
+
+def _intervals(A, B, a, b):
+    """[0, π/2] 内的可行转角闭区间列表（最多两段）"""
+    radius = math.hypot(a, b)
+    if radius == 0:
+        return [(0.0, HALF_PI)] if A >= 0 and B >= 0 else []
+    phi = math.atan2(b, a)
+    cut = sorted((_excluded(phi, A, radius), _excluded(HALF_PI - phi, B, radius)))
+    intervals, start = [], 0.0
+    for lo, hi in cut:
+        if lo - start > -_EPS and start <= HALF_PI:
+            intervals.append((start, min(max(lo, start), HALF_PI)))
+        start = max(start, hi)
+    if start <= HALF_PI + _EPS:
+        intervals.append((min(start, HALF_PI), HALF_PI))
+    # 两个排除区间的并集之外即可行；数值误差下把相接的端点并为一段
+    merged = []
+    for lo, hi in intervals:
+        if merged and lo <= merged[-1][1] + _EPS:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+class YawFit:
+    """
+    平面转角放置的判定结果（角度为弧度，用 degrees / interval_degrees 取度数）
+
+    - length / width / height: 货物底面长边、短边和竖直高度
+    - intervals: [0, π/2] 内可行转角闭区间列表，空表示任何转角都放不下
+    - angle: 最小剩余间隙最大的转角；clearance 为该转角下的最小剩余间隙(米)
+    """
+
+    __slots__ = ('length', 'width', 'height', 'intervals', 'angle', 'clearance')
+
+    def __init__(self, length, width, height, intervals, angle, clearance):
+        self.length = length
+        self.width = width
+        self.height = height
+        self.intervals = intervals
+        self.angle = angle
+        self.clearance = clearance
+
+    @property
+    def fits(self):
+        return bool(self.intervals)
+
+    @property
+    def degrees(self):
+        return math.degrees(self.angle)
+
+    @property
+    def interval_degrees(self):
+        return [(math.degrees(lo), math.degrees(hi)) for lo, hi in self.intervals]
+
+    def __repr__(self):
+        spans = ', '.join(f"{lo:.1f}°~{hi:.1f}°" for lo, hi in self.interval_degrees) or '无'
+        return (f"YawFit({self.length}×{self.width}m, 最佳 {self.degrees:.1f}°, "
+                f"间隙 {self.clearance:.3f}m, 可行 {spans})")
+
+
+def yaw_fit(floor, footprint, safety_gap=0.0, height=0.0):
+    """
+    货物底面在轿厢地面内转任意角度放置的判定
+
+    参数:
+    - floor: 轿厢地面 (长, 宽)
+    - footprint: 货物底面 (长, 宽)，顺序不限
+    - safety_gap: 四周安全间隙
+    - height: 货物竖直高度，只记录在结果中
+
+    返回:
+    - YawFit
+    """
+    el, ew = floor
+    a, b = max(footprint), min(footprint)
+    A, B = el - 2 * safety_gap, ew - 2 * safety_gap
+    intervals = _intervals(A, B, a, b)
+    angle, clearance = _best(A, B, a, b)
+    return YawFit(a, b, height, intervals, angle, clearance)
+
+
+def best_yaw(elevator_dims, cargo_dims, safety_gap=0.0):
+    """
+    货物分别以三条棱竖直时的平面转角判定，返回最小剩余间隙最大的可行结果，都放不下时返回 None
+
+    竖直方向要求 高 + 安全间隙 ≤ 轿厢高度，与常规摆放方向一致
+    """
+    el, ew, eh = elevator_dims
+    best = None
+    for i, height in enumerate(cargo_dims):
+        if height + safety_gap > eh:
+            continue
+        footprint = cargo_dims[:i] + cargo_dims[i + 1:]
+        fit = yaw_fit((el, ew), footprint, safety_gap, height)
+        if fit.fits and (best is None or fit.clearance > best.clearance):
+            best = fit
+    return best
+
+
+def _best_angle(el, ew, a, b, gap):
+    if a < b:
+        a, b = b, a
+    angle, clearance = _best(el - 2 * gap, ew - 2 * gap, a, b)
+    return angle if clearance >= 0 else math.nan
+
+
+def best_angles(elevator_lengths, elevator_widths, cargo_lengths, cargo_widths, safety_gap=0.0):
+    """
+    按列批量计算最佳转角，返回 array('d')，放不下的行为 NaN
+
+    各行彼此独立、只做常数次运算，可直接作用于 binary_catalog 的列或 array
+    """
+    return array('d', map(_best_angle, elevator_lengths, elevator_widths, cargo_lengths, cargo_widths,
+                          repeat(safety_gap)))